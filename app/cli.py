@@ -0,0 +1,367 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - CLI Headless                                      ║
+║ scan / crawl / pdf / count sem PyQt6 (progresso em JSON Lines)               ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    python -m app.cli scan https://docs.exemplo.com -o pages.json
+    python -m app.cli crawl --pages pages.json -o docs.md --model gpt-4o
+    python -m app.cli crawl --url https://docs.exemplo.com --spider -o docs.md
+    python -m app.cli pdf manual.pdf outro.pdf --output-dir saida/
+    python -m app.cli pdf manual.pdf --profile     # perfil em logs/profiles/
+    python -m app.cli build docs.manifest.json -o docs.md   # rebuild sem crawl
+    python -m app.cli update docs.manifest.json             # só o que mudou
+    python -m app.cli prune saida/ jobs/ --dry-run           # corpos sem manifesto
+    python -m app.cli count docs.md
+    python -m app.cli serve --port 8765 --crawl-workers 2 --pdf-workers 2
+
+stdout recebe apenas eventos JSON (um por linha); logs vão para stderr.
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+from pathlib import Path
+
+# stdout é reservado para os eventos JSON Lines
+_EVENTS_OUT = sys.stdout
+
+# Console do logger do motor no stderr (ver logger.LOG_STREAM_ENV); vale também
+# para os processos do crawl sharded, que herdam o ambiente e importam o logger
+# antes de qualquer código nosso rodar
+LOG_STREAM_ENV = "LCB_LOG_STREAM"
+
+COMMANDS = ("scan", "crawl", "build", "update", "prune", "pdf", "count", "serve")
+
+PROFILE_HELP = "Grava cProfile/tracemalloc do job em logs/profiles (ou LCB_PROFILE=1)"
+
+
+def emit(event: str, **fields):
+    """Escreve um evento JSON (uma linha) no stdout"""
+    record = {"event": event, "ts": round(time.time(), 3)}
+    record.update(fields)
+    _EVENTS_OUT.write(json.dumps(record, ensure_ascii=False) + "\n")
+    _EVENTS_OUT.flush()
+
+
+@contextlib.contextmanager
+def _logs_to_stderr():
+    """Importa módulos do motor com prints/handlers de console apontando para stderr"""
+    with contextlib.redirect_stdout(sys.stderr):
+        # Telemetria/profiling importam o logger do motor sob demanda; configurado
+        # aqui, o handler de console já nasce no stderr
+        import app.converters.web_engine.logger  # noqa: F401
+        yield
+
+
+# ===========================================
+# 2. COMANDOS
+# ===========================================
+
+def cmd_scan(args) -> int:
+    """Mapeia páginas elegíveis a partir da seed"""
+    with _logs_to_stderr():
+        from app.converters.web_converter import WebToMarkdownConverter
+        converter = WebToMarkdownConverter()
+
+    emit("scan_started", url=args.url)
+    success, pages = asyncio.run(converter.scan_pages(args.url, profile=args.profile or None))
+
+    if args.output and success:
+        Path(args.output).write_text(json.dumps(pages, ensure_ascii=False, indent=2), encoding='utf-8')
+
+    emit("scan_finished", success=success, count=len(pages), output=args.output,
+         pages=None if args.output else pages)
+    return 0 if success else 1
+
+
+def cmd_crawl(args) -> int:
+    """Baixa páginas (lista do scan, spider ou página única) e gera o consolidado"""
+    with _logs_to_stderr():
+        from app.converters.web_converter import WebToMarkdownConverter
+        from app.converters.web_engine.page_store import PageStore
+        from app.converters.web_engine.writer import ConsolidatedWriter
+        converter = WebToMarkdownConverter()
+
+    # Falhas definitivas (após retentativas), com a classe de cada uma
+    failures = []
+
+    async def run() -> tuple[bool, list[dict]]:
+        if args.pages:
+            pages = json.loads(Path(args.pages).read_text(encoding='utf-8'))
+            pages = [p for p in pages if p.get("selected", True)]
+        elif args.spider:
+            emit("scan_started", url=args.url)
+            success, pages = await converter.scan_pages(args.url, profile=args.profile or None)
+            emit("scan_finished", success=success, count=len(pages))
+            if not success:
+                return False, []
+        else:
+            pages = [{"url": args.url, "title": "", "selected": True}]
+
+        emit("crawl_started", total=len(pages))
+        return await converter.crawl_selected_pages(
+            pages,
+            max_age=args.max_age,
+            processes=args.processes,
+            profile=args.profile or None,
+            on_page=lambda page: emit("page", url=page["url"], title=page["title"],
+                                      tokens=page["tokens"], chars=len(page["markdown"])),
+            on_progress=lambda event: emit("progress", **event),
+            failures=failures
+        )
+
+    success, contents = asyncio.run(run())
+    if not success or not contents:
+        emit("crawl_finished", success=False, message="Nenhum conteúdo baixado", failures=failures)
+        return 1
+
+    token_counter = converter.crawler_service.token_counter
+    token_budget = args.budget or token_counter.CONTEXT_WINDOWS.get(args.model)
+
+    store = None if args.no_store else PageStore(args.store)
+    writer = ConsolidatedWriter(token_counter, store=store)
+    # Seed do spider no manifesto: o update incremental descobre páginas novas por ela
+    success, message = writer.write(contents, args.output, token_budget=token_budget,
+                                    split_shards=args.shards,
+                                    source={"seed": args.url} if args.spider else None)
+
+    if success and args.chunks:
+        from app.utils.chunker import SemanticChunker
+        chunker = SemanticChunker(token_counter, max_tokens=args.chunk_tokens,
+                                  overlap_tokens=args.chunk_overlap)
+        chunks_ok, chunks_message = chunker.export(contents, args.chunks)
+        emit("chunks_finished", success=chunks_ok, message=chunks_message)
+
+    emit("crawl_finished", success=success, message=message, pages=len(contents),
+         tokens=sum(page["tokens"] for page in contents), failures=failures)
+    return 0 if success else 1
+
+
+def cmd_build(args) -> int:
+    """Reconstrói o Markdown consolidado a partir de um manifesto (sem crawl)"""
+    with _logs_to_stderr():
+        from app.converters.web_engine.page_store import PageStore
+        from app.converters.web_engine.writer import ConsolidatedWriter
+        store = PageStore(args.store)
+
+    token_counter = None
+    if args.model:
+        from app.utils.token_counter import TokenCounter
+        token_counter = TokenCounter(args.model)
+    token_budget = args.budget or (token_counter.CONTEXT_WINDOWS.get(args.model) if token_counter else None)
+
+    writer = ConsolidatedWriter(token_counter, store=store)
+    success, message = writer.write_manifest(args.manifest, args.output, token_budget=token_budget,
+                                             split_shards=args.shards or None)
+    emit("build_finished", success=success, message=message, manifest=args.manifest)
+    return 0 if success else 1
+
+
+def cmd_update(args) -> int:
+    """Atualiza um documento do manifesto: revalida e re-renderiza só o que mudou"""
+    with _logs_to_stderr():
+        from app.converters.web_engine.crawler import WebCrawlerService
+        from app.converters.web_engine.page_store import PageStore
+        from app.converters.web_engine.updater import IncrementalUpdater
+        updater = IncrementalUpdater(WebCrawlerService(), PageStore(args.store))
+
+    emit("update_started", manifest=args.manifest)
+    success, changelog = asyncio.run(updater.update(
+        args.manifest,
+        discover=not args.no_discover,
+        on_page=lambda page: emit("page", url=page["url"], title=page["title"],
+                                  tokens=page["tokens"], chars=len(page["markdown"])),
+        on_progress=lambda event: emit("progress", **event)
+    ))
+    emit("update_finished", success=success, manifest=args.manifest, changelog=changelog)
+    return 0 if success else 1
+
+
+def cmd_prune(args) -> int:
+    """Apaga do page store os corpos que nenhum manifesto referencia"""
+    with _logs_to_stderr():
+        from app.converters.web_engine.page_store import PageStore
+        store = PageStore(args.store)
+
+    try:
+        stats = store.prune(args.paths, min_age=args.min_age, dry_run=args.dry_run)
+    except ValueError as e:
+        emit("prune_finished", success=False, message=str(e))
+        return 1
+    emit("prune_finished", success=True, dry_run=args.dry_run, store=str(store.root), **stats)
+    return 0
+
+
+def cmd_pdf(args) -> int:
+    """Converte um ou mais PDFs em Markdown"""
+    with _logs_to_stderr():
+        from app.converters.pdf_converter import PdfToMarkdownConverter
+        converter = PdfToMarkdownConverter()
+
+    failures = 0
+    for pdf in args.inputs:
+        pdf_p = Path(pdf)
+        if args.output and len(args.inputs) == 1:
+            output_p = Path(args.output)
+        else:
+            output_dir = Path(args.output_dir) if args.output_dir else pdf_p.parent
+            output_p = output_dir / f"{pdf_p.stem}.md"
+
+        emit("pdf_started", input=str(pdf_p), output=str(output_p))
+        started = time.perf_counter()
+        success, message = converter.process(str(pdf_p), str(output_p), profile=args.profile or None)
+        emit("pdf_finished", input=str(pdf_p), output=str(output_p), success=success,
+             message=message, seconds=round(time.perf_counter() - started, 3))
+        failures += 0 if success else 1
+
+    return 0 if failures == 0 else 1
+
+
+def cmd_count(args) -> int:
+    """Conta tokens de arquivos Markdown/texto"""
+    with _logs_to_stderr():
+        from app.utils.token_counter import TokenCounter
+        counter = TokenCounter(args.model)
+
+    total = 0
+    for file in args.files:
+        tokens = counter.count_tokens_in_file(Path(file))
+        total += tokens
+        emit("count", file=file, tokens=tokens)
+
+    emit("count_finished", files=len(args.files), tokens=total, model=args.model)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """Sobe o job server HTTP local (instância aquecida compartilhada)"""
+    with _logs_to_stderr():
+        from app.server import JobServer
+        server = JobServer(host=args.host, port=args.port, crawl_workers=args.crawl_workers,
+                           pdf_workers=args.pdf_workers, max_queue=args.max_queue,
+                           data_dir=args.data_dir)
+
+    emit("serve_started", url=f"http://{args.host}:{args.port}")
+    server.serve_forever()
+    return 0
+
+
+# ===========================================
+# 3. PARSER E MAIN
+# ===========================================
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta parser de argumentos dos subcomandos"""
+    parser = argparse.ArgumentParser(
+        prog="llm-context-builder",
+        description="LLM Context Builder headless (sem GUI). Eventos em JSON Lines no stdout."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="Mapeia páginas a partir de uma seed")
+    scan.add_argument("url")
+    scan.add_argument("-o", "--output", help="Salva a lista de páginas em JSON")
+    scan.add_argument("--profile", action="store_true", help=PROFILE_HELP)
+    scan.set_defaults(func=cmd_scan)
+
+    crawl = sub.add_parser("crawl", help="Baixa páginas e gera o Markdown consolidado")
+    source = crawl.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pages", help="JSON gerado por 'scan' (respeita 'selected')")
+    source.add_argument("--url", help="URL da página (ou seed com --spider)")
+    crawl.add_argument("--spider", action="store_true", help="Faz scan + crawl de todos os links")
+    crawl.add_argument("-o", "--output", required=True, help="Arquivo .md de saída")
+    crawl.add_argument("--budget", type=int, help="Orçamento de tokens do arquivo")
+    crawl.add_argument("--model", help="Usa a janela de contexto do modelo como orçamento")
+    crawl.add_argument("--shards", action="store_true", help="Divide em partes em vez de truncar")
+    crawl.add_argument("--max-age", type=float,
+                       help="Idade máxima (s) do conteúdo renderado no scan para reaproveitar")
+    crawl.add_argument("-j", "--processes", type=int, default=1,
+                       help="Divide o crawl entre N processos (jobs grandes)")
+    crawl.add_argument("--chunks", help="Exporta chunks RAG (.jsonl ou .parquet)")
+    crawl.add_argument("--chunk-tokens", type=int, default=512)
+    crawl.add_argument("--chunk-overlap", type=int, default=64)
+    crawl.add_argument("--profile", action="store_true", help=PROFILE_HELP)
+    crawl.add_argument("--store", help="Pasta do page store (default: <raiz>/page_store)")
+    crawl.add_argument("--no-store", action="store_true",
+                       help="Não grava corpos no page store nem o <saída>.manifest.json")
+    crawl.set_defaults(func=cmd_crawl)
+
+    build = sub.add_parser("build", help="Gera o Markdown a partir de um manifesto do page store")
+    build.add_argument("manifest", help="<saída>.manifest.json gravado pelo crawl")
+    build.add_argument("-o", "--output", help="Arquivo .md (default: o do manifesto)")
+    build.add_argument("--budget", type=int, help="Orçamento de tokens (default: o do manifesto)")
+    build.add_argument("--model", help="Usa a janela de contexto do modelo como orçamento")
+    build.add_argument("--shards", action="store_true", help="Divide em partes em vez de truncar")
+    build.add_argument("--store", help="Pasta do page store (default: <raiz>/page_store)")
+    build.set_defaults(func=cmd_build)
+
+    update = sub.add_parser("update", help="Re-crawl incremental de um documento com manifesto")
+    update.add_argument("manifest", help="<saída>.manifest.json gravado pelo crawl")
+    update.add_argument("--no-discover", action="store_true",
+                        help="Não procura páginas novas/removidas a partir da seed (só revalida)")
+    update.add_argument("--store", help="Pasta do page store (default: <raiz>/page_store)")
+    update.set_defaults(func=cmd_update)
+
+    prune = sub.add_parser("prune", help="Remove do page store corpos sem manifesto que os use")
+    prune.add_argument("paths", nargs="+",
+                       help="Manifestos ou pastas com os *.manifest.json de todos os documentos que usam o store")
+    prune.add_argument("--store", help="Pasta do page store (default: <raiz>/page_store)")
+    prune.add_argument("--min-age", type=float, default=3600,
+                       help="Não apaga corpos mais novos que isso, em segundos (crawl em andamento)")
+    prune.add_argument("--dry-run", action="store_true", help="Só informa o que seria apagado")
+    prune.set_defaults(func=cmd_prune)
+
+    pdf = sub.add_parser("pdf", help="Converte PDFs em Markdown")
+    pdf.add_argument("inputs", nargs="+")
+    pdf.add_argument("-o", "--output", help="Arquivo .md (apenas com um PDF)")
+    pdf.add_argument("--output-dir", help="Pasta de saída (default: pasta do PDF)")
+    pdf.add_argument("--profile", action="store_true", help=PROFILE_HELP)
+    pdf.set_defaults(func=cmd_pdf)
+
+    count = sub.add_parser("count", help="Conta tokens de arquivos")
+    count.add_argument("files", nargs="+")
+    count.add_argument("--model", default="gpt-4")
+    count.set_defaults(func=cmd_count)
+
+    serve = sub.add_parser("serve", help="Sobe o job server HTTP local")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--crawl-workers", type=int, default=2)
+    serve.add_argument("--pdf-workers", type=int, default=2)
+    serve.add_argument("--max-queue", type=int, default=100)
+    serve.add_argument("--data-dir", help="Pasta da fila/resultados (default: <raiz>/jobs)")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    """Executa o subcomando e retorna o código de saída"""
+    os.environ[LOG_STREAM_ENV] = "stderr"
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "spider", False) and not args.url:
+        parser.error("--spider requer --url")
+
+    try:
+        return args.func(args)
+    except Exception as e:
+        emit("error", command=args.command, message=str(e))
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
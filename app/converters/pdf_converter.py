@@ -12,8 +12,14 @@ VAI CORINTHIANS!!
 # 1. IMPORTS E CONFIGURAÇÕES
 # ===========================================
 
+import os
 from pathlib import Path
-import pymupdf4llm
+
+from app.utils import profiling, telemetry
+from app.utils.cancellation import OperationCancelled
+
+# Páginas convertidas por lote (checkpoint de pausa/cancelamento entre lotes)
+PAGES_PER_BATCH = 10
 
 
 # ===========================================
@@ -73,12 +79,55 @@ class PdfToMarkdownConverter:
             Exception: Caso conversão falhe
         """
         try:
-            md_text = pymupdf4llm.to_markdown(str(pdf_path))
+            import pymupdf4llm  # Lazy: ~0.7s de import, só quando converte
+            with telemetry.stage("convert"):
+                md_text = pymupdf4llm.to_markdown(str(pdf_path))
             return md_text
             
         except Exception as e:
             raise Exception(f"Falha na conversão: {e}")
 
+    def convert_in_batches(self, pdf_path: Path, output_path: Path, cancel_token,
+                           batch_pages: int = PAGES_PER_BATCH) -> None:
+        """Converte em lotes de páginas gravando num arquivo temporário (.part)
+
+        O .part só substitui o destino ao final; em cancelamento ou erro ele é
+        removido e o destino fica intacto.
+
+        Args:
+            pdf_path: Caminho do arquivo PDF
+            output_path: Caminho de destino do arquivo .md
+            cancel_token: CancellationToken (checkpoint entre lotes)
+            batch_pages: Páginas por lote
+
+        Raises:
+            OperationCancelled: Se o token for cancelado
+            Exception: Caso conversão falhe
+        """
+        import pymupdf
+        import pymupdf4llm
+
+        part_path = output_path.with_name(output_path.name + ".part")
+        try:
+            with pymupdf.open(str(pdf_path)) as doc, open(part_path, 'w', encoding='utf-8') as part:
+                total = doc.page_count
+                for start in range(0, total, batch_pages):
+                    cancel_token.checkpoint_sync({"pagina": start, "total": total})
+                    pages = list(range(start, min(start + batch_pages, total)))
+                    with telemetry.stage("convert"):
+                        markdown = pymupdf4llm.to_markdown(doc, pages=pages)
+                    with telemetry.stage("write"):
+                        part.write(markdown)
+
+            os.replace(part_path, output_path)
+
+        except OperationCancelled:
+            part_path.unlink(missing_ok=True)
+            raise
+        except Exception as e:
+            part_path.unlink(missing_ok=True)
+            raise Exception(f"Falha na conversão: {e}")
+
     # =======================================
     # 2.4: SALVAR ARQUIVO
     # =======================================
@@ -94,7 +143,8 @@ class PdfToMarkdownConverter:
             Exception: Caso salvamento falhe
         """
         try:
-            output_path.write_text(content, encoding='utf-8')
+            with telemetry.stage("write"):
+                output_path.write_text(content, encoding='utf-8')
             
         except Exception as e:
             raise Exception(f"Falha ao salvar arquivo: {e}")
@@ -103,16 +153,32 @@ class PdfToMarkdownConverter:
     # 2.5: PROCESSO PRINCIPAL
     # =======================================
 
-    def process(self, pdf_path: str, output_path: str) -> tuple[bool, str]:
+    def process(self, pdf_path: str, output_path: str, cancel_token=None,
+                profile: bool = None) -> tuple[bool, str]:
         """Executa conversão completa
         
         Args:
             pdf_path: Caminho do PDF (string)
             output_path: Caminho de destino do .md (string)
+            cancel_token: CancellationToken opcional (converte em lotes de páginas)
+            profile: Grava cProfile/tracemalloc do job em logs/profiles
+                (None = variável LCB_PROFILE)
             
         Returns:
             Tupla (sucesso: bool, mensagem: str)
         """
+        with profiling.profile_job("pdf", enabled=profile), \
+                telemetry.job("pdf", file=str(pdf_path)), telemetry.page(str(pdf_path)):
+            success, message = self._process(pdf_path, output_path, cancel_token)
+            if success:
+                telemetry.annotate(bytes_in=Path(pdf_path).stat().st_size,
+                                   bytes_out=Path(output_path).stat().st_size)
+            else:
+                telemetry.annotate(status="failed")
+            return success, message
+
+    def _process(self, pdf_path: str, output_path: str, cancel_token) -> tuple[bool, str]:
+        """Corpo de process (envolvido no job de telemetria)"""
         try:
             pdf_p = Path(pdf_path)
             output_p = Path(output_path)
@@ -121,6 +187,11 @@ class PdfToMarkdownConverter:
             if not self.validate_pdf_path(pdf_p):
                 return False, f"Arquivo PDF inválido ou não encontrado: {pdf_path}"
             
+            # 2.5.2: CONVERTER E SALVAR EM LOTES (CANCELÁVEL)
+            if cancel_token is not None:
+                self.convert_in_batches(pdf_p, output_p, cancel_token)
+                return True, f"Conversão concluída com sucesso!\nArquivo salvo: {output_path}"
+
             # 2.5.2: CONVERTER
             md_content = self.convert_pdf_to_markdown(pdf_p)
             
@@ -129,6 +200,9 @@ class PdfToMarkdownConverter:
             
             return True, f"Conversão concluída com sucesso!\nArquivo salvo: {output_path}"
             
+        except OperationCancelled:
+            return False, "Conversão cancelada pelo usuário"
+
         except Exception as e:
             return False, f"Erro: {e}"
 
@@ -12,16 +12,17 @@ class WebToMarkdownConverter:
 
         logger.info("=" * 60)
         logger.info("WebToMarkdownConverter inicializado (V3.0 Modular)")
-import asyncio
+import threading
 from pathlib import Path
 from datetime import datetime
 
 # Importações dos módulos modulares (imports relativos)
 from .web_engine.logger import logger
 from .web_engine.crawler import WebCrawlerService
+from app.utils.async_loop import get_loop_thread
+from app.utils.profiling import profile_job
 
 # Importações crawl4ai necessárias para métodos internos
-from crawl4ai import AsyncWebCrawler
 from crawl4ai.async_configs import BrowserConfig
 
 logger.info("=" * 60)
@@ -35,10 +36,14 @@ logger.info("=" * 60)
 class WebToMarkdownConverter:
     """Fachada para o sistema web modular - mantém compatibilidade com GUI"""
 
-    def __init__(self):
-        """Inicializa conversor web"""
+    def __init__(self, keep_browsers_warm: bool = False):
+        """Inicializa conversor web
+
+        Args:
+            keep_browsers_warm: Mantém browsers abertos entre jobs (instância compartilhada)
+        """
         # Instancia os serviços modulares
-        self.crawler_service = WebCrawlerService()
+        self.crawler_service = WebCrawlerService(keep_browsers_warm=keep_browsers_warm)
 
         logger.info("=" * 60)
         logger.info("WebToMarkdownConverter inicializado (V3.0 Modular)")
@@ -60,23 +65,41 @@ class WebToMarkdownConverter:
             (sucesso, mensagem)
         """
         try:
+            # Executa no event loop persistente (browsers/caches sobrevivem entre jobs)
+            loop_thread = get_loop_thread()
             if spider_mode:
                 # Spider mode antigo - agora delega para scan + crawl
-                return asyncio.run(self._process_spider_legacy(url, output_path))
+                return loop_thread.run(self._process_spider_legacy(url, output_path))
             else:
                 # Single page mode
-                return asyncio.run(self._process_single_page(url, output_path))
+                return loop_thread.run(self._process_single_page(url, output_path))
         except Exception as e:
             logger.exception(f"Erro no process_web: {e}")
             return False, f"Erro: {e}"
 
-    async def scan_pages(self, url: str) -> tuple[bool, list[dict]]:
-        """Wrapper para scan_pages do crawler service"""
-        return await self.crawler_service.scan_pages(url)
+    async def scan_pages(self, url: str, cancel_token=None, keep_content: bool = True,
+                         profile: bool = None) -> tuple[bool, list[dict]]:
+        """Wrapper para scan_pages do crawler service
 
-    async def crawl_selected_pages(self, selected_pages: list[dict]) -> tuple[bool, list[dict]]:
-        """Wrapper para crawl_selected_pages do crawler service"""
-        return await self.crawler_service.crawl_selected_pages(selected_pages)
+        profile: Grava cProfile/tracemalloc/tasks do job em logs/profiles
+        (None = variável LCB_PROFILE)
+        """
+        with profile_job("scan", enabled=profile):
+            return await self.crawler_service.scan_pages(
+                url, cancel_token=cancel_token, keep_content=keep_content
+            )
+
+    async def crawl_selected_pages(self, selected_pages: list[dict], on_page=None,
+                                   on_progress=None, cancel_token=None,
+                                   max_age: float = None, processes: int = 1,
+                                   profile: bool = None, failures: list = None) -> tuple[bool, list[dict]]:
+        """Wrapper para crawl_selected_pages do crawler service (profile: ver scan_pages)"""
+        with profile_job("crawl", enabled=profile):
+            return await self.crawler_service.crawl_selected_pages(
+                selected_pages, on_page=on_page, on_progress=on_progress,
+                cancel_token=cancel_token, max_age=max_age, processes=processes,
+                failures=failures
+            )
 
     # =======================================
     # MÉTODOS PRIVADOS
@@ -91,9 +114,18 @@ class WebToMarkdownConverter:
             render_type = await analyzer.detect_render_type(url)
             crawler_config = analyzer.get_crawler_config(render_type)
 
+            # Fast path SSR: HTML do servidor já tem o conteúdo (sem browser)
+            service = self.crawler_service
+            if service._use_static(render_type):
+                fetched = await service.static_fetcher.fetch(url)
+                if fetched is not None:
+                    md_limpo = service.cleaner.limpar_markdown_google(fetched[1])
+                    Path(output_path).write_text(md_limpo, encoding='utf-8')
+                    return True, f"Arquivo salvo: {output_path}"
+
             # Crawl da página
             browser_cfg = BrowserConfig(headless=True, verbose=False)
-            async with AsyncWebCrawler(config=browser_cfg) as crawler:
+            async with self.crawler_service.browser_session("crawl", browser_cfg) as crawler:
                 result = await crawler.arun(url=url, config=crawler_config)
 
                 if not result.success:
@@ -126,31 +158,35 @@ class WebToMarkdownConverter:
                 return False, "Falha no crawl"
 
             # Gerar arquivo consolidado
-            documento = []
-            documento.append("# Documentação\n")
-            documento.append(f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
+            from .web_engine.writer import ConsolidatedWriter
+            return ConsolidatedWriter(self.crawler_service.token_counter).write(contents, output_path)
 
-            documento.append("## 📑 Índice\n")
-            for i, page in enumerate(contents, 1):
-                documento.append(f"{i}. {page['title']}")
+        except Exception as e:
+            logger.exception(f"Erro no spider legacy: {e}")
+            return False, f"Erro: {e}"
 
-            documento.append("\n---\n")
 
-            for page in contents:
-                documento.append(f"\n## 📄 {page['title']}\n")
-                documento.append(f"> Fonte: {page['url']}\n")
-                documento.append(page['markdown'])
-                documento.append("\n---\n")
+# ===========================================
+# INSTÂNCIA COMPARTILHADA (GUI)
+# ===========================================
+
+_shared_converter = None
+_shared_converter_lock = threading.Lock()
 
-            texto_final = "\n".join(documento)
-            output_p = Path(output_path)
-            output_p.write_text(texto_final, encoding='utf-8')
 
-            return True, f"Arquivo salvo: {output_path}\n{len(contents)} páginas"
+def get_shared_converter() -> WebToMarkdownConverter:
+    """Conversor único da aplicação (cache + browsers aquecidos)
 
-        except Exception as e:
-            logger.exception(f"Erro no spider legacy: {e}")
-            return False, f"Erro: {e}"
+    Scan → seleção → crawl usam a mesma instância no event loop persistente,
+    então o crawl aproveita o cache do scan e o browser já iniciado. Os
+    browsers são fechados no shutdown do loop.
+    """
+    global _shared_converter
+    with _shared_converter_lock:
+        if _shared_converter is None:
+            _shared_converter = WebToMarkdownConverter(keep_browsers_warm=True)
+            get_loop_thread().add_shutdown_hook(_shared_converter.crawler_service.close)
+        return _shared_converter
 
 
 # ===========================================
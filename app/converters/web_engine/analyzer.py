@@ -6,6 +6,8 @@
 """
 
 from .logger import logger
+from .profiles import PROFILE_TEXT, PROFILES, dom_stable_wait, install_resource_blocking
+from app.utils import telemetry
 
 # Importações crawl4ai necessárias
 try:
@@ -23,7 +25,24 @@ except ImportError as e:
 class WebAnalyzer:
     """Analisador de tecnologias web para configuração otimizada"""
 
-    def __init__(self):
+    # Perfil de render padrão por tipo de renderização
+    DEFAULT_PROFILES = {
+        "SSR": PROFILE_TEXT,
+        "CSR_REACT": PROFILE_TEXT,
+        "CSR_ANGULAR": PROFILE_TEXT,
+    }
+
+    def __init__(self, profiles: dict = None):
+        """Inicializa analisador
+
+        Args:
+            profiles: Sobrescreve o perfil por render_type
+                (ex: {"CSR_ANGULAR": "full"} para um site que quebra sem fontes)
+        """
+        self.profiles = {**self.DEFAULT_PROFILES, **(profiles or {})}
+        for render_type, profile in self.profiles.items():
+            if profile not in PROFILES:
+                raise ValueError(f"Perfil inválido para {render_type}: {profile}")
         logger.info("WebAnalyzer inicializado")
 
     async def detect_render_type(self, url: str) -> str:
@@ -34,15 +53,28 @@ class WebAnalyzer:
             "CSR_ANGULAR" - Angular SPA (Client-Side Rendering)
             "CSR_REACT" - React SPA
         """
+        with telemetry.stage("detect_render_type"):
+            render_type = await self._detect_render_type(url)
+
+        job = telemetry.current_job()
+        if job is not None:
+            job.fields["render_type"] = render_type
+        return render_type
+
+    async def _detect_render_type(self, url: str) -> str:
+        """Detecção em si (2 renders rápidos + majority vote)"""
         logger.info("Detectando tipo de renderização...")
 
         try:
             browser_config = BrowserConfig(headless=True, verbose=False)
             quick_config = CrawlerRunConfig(
-                wait_until="networkidle",
+                wait_until="domcontentloaded",
+                wait_for=dom_stable_wait(500, selector=""),
+                wait_for_timeout=8000,
                 page_timeout=10000,
                 magic=True,
-                verbose=False
+                verbose=False,
+                shared_data={"render_profile": PROFILE_TEXT}
             )
 
             # Tenta 2x + majority vote
@@ -50,30 +82,11 @@ class WebAnalyzer:
             for tentativa in range(2):
                 logger.debug(f"  Tentativa {tentativa + 1}/2")
                 async with AsyncWebCrawler(config=browser_config) as crawler:
+                    install_resource_blocking(crawler)
                     result = await crawler.arun(url=url, config=quick_config)
 
                     if result.success:
-                        html = str(result.html or "")
-                        html_lower = html.lower()
-
-                        # Detecta Angular (verifica primeiro por ser mais específico)
-                        if "<app-root" in html or "ng-version" in html or "ng-app" in html_lower:
-                            resultados.append("CSR_ANGULAR")
-
-                        # Detecta React
-                        elif ('div id="root"' in html or 'div id="app"' in html or
-                              "_reactFiber" in html or "react-root" in html):
-                            resultados.append("CSR_REACT")
-
-                        # Detecta conteúdo SSR (se não achou placeholders de SPA)
-                        elif len(html) > 5000 and ("<h1" in html or "<main" in html):
-                            # Verifica se não é um skeleton de SPA muito curto
-                            if html_lower.count("<") > 50:
-                                resultados.append("SSR")
-                            else:
-                                resultados.append("SSR")
-                        else:
-                            resultados.append("SSR")
+                        resultados.append(self.classify_html(str(result.html or "")))
                     else:
                         logger.warning(f"    Tentativa {tentativa + 1} falhou: {result.error_message}")
                         resultados.append("SSR")  # Falha → assume SSR
@@ -88,15 +101,37 @@ class WebAnalyzer:
             logger.exception(f"Erro ao detectar renderização: {e}")
             return "SSR"
 
-    def get_crawler_config(self, render_type: str) -> CrawlerRunConfig:
+    @staticmethod
+    def classify_html(html: str) -> str:
+        """Classifica o HTML renderado ("CSR_ANGULAR", "CSR_REACT" ou "SSR")
+
+        Sem placeholder de SPA, o conteúdo é considerado do servidor.
+        """
+        # Detecta Angular (verifica primeiro por ser mais específico)
+        if "<app-root" in html or "ng-version" in html or "ng-app" in html.lower():
+            return "CSR_ANGULAR"
+
+        # Detecta React
+        if ('div id="root"' in html or 'div id="app"' in html or
+                "_reactFiber" in html or "react-root" in html):
+            return "CSR_REACT"
+
+        return "SSR"
+
+    def get_crawler_config(self, render_type: str, profile: str = None) -> CrawlerRunConfig:
         """Retorna configuração otimizada por tipo de renderização
 
         Args:
             render_type: Tipo detectado ("SSR", "CSR_ANGULAR", "CSR_REACT")
+            profile: "text" (enxuto) ou "full" (None = perfil do render_type)
 
         Returns:
             CrawlerRunConfig otimizada
         """
+        profile = profile or self.profiles.get(render_type, PROFILE_TEXT)
+        if profile == PROFILE_TEXT:
+            return self._get_text_config(render_type)
+
         if render_type == "CSR_ANGULAR":
             logger.info("Usando configuração Angular SPA (robusta)")
             js_code = """
@@ -138,6 +173,53 @@ class WebAnalyzer:
             )
 
 
+    def _get_text_config(self, render_type: str) -> CrawlerRunConfig:
+        """Perfil de texto: sem imagens/mídia/fontes/trackers, espera DOM estável
+
+        O bloqueio é feito pelo hook instalado em cada AsyncWebCrawler
+        (install_resource_blocking) a partir de shared_data["render_profile"].
+        """
+        shared_data = {"render_profile": PROFILE_TEXT}
+
+        if render_type == "CSR_ANGULAR":
+            logger.info("Usando configuração Angular SPA (perfil texto)")
+            return CrawlerRunConfig(
+                wait_until="domcontentloaded",
+                wait_for=dom_stable_wait(700),  # Substitui networkidle + setTimeout(3000)
+                wait_for_timeout=30000,
+                page_timeout=60000,
+                magic=False,  # Desativar automação mágica para isolamento
+                verbose=False,
+                shared_data=shared_data
+            )
+
+        elif render_type == "CSR_REACT":
+            logger.info("Usando configuração React SPA (perfil texto)")
+            return CrawlerRunConfig(
+                # Scroll antes da espera: o DOM estável já inclui o conteúdo lazy
+                js_code_before_wait="window.scrollTo(0, document.body.scrollHeight);",
+                wait_until="domcontentloaded",
+                wait_for=dom_stable_wait(500),
+                wait_for_timeout=15000,
+                page_timeout=20000,
+                magic=True,
+                verbose=False,
+                shared_data=shared_data
+            )
+
+        else:  # SSR
+            logger.info("Usando configuração SSR (perfil texto)")
+            return CrawlerRunConfig(
+                wait_until="domcontentloaded",
+                wait_for=dom_stable_wait(300, selector=""),
+                wait_for_timeout=5000,
+                page_timeout=10000,
+                magic=True,
+                verbose=False,
+                shared_data=shared_data
+            )
+
+
 # ===========================================
 # TESTE DO MÓDULO
 # ===========================================
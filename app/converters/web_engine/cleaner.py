@@ -6,6 +6,7 @@
 """
 
 from .logger import logger
+import logging
 import re
 
 # ===========================================
@@ -27,16 +28,20 @@ class WebCleaner:
         Returns:
             Markdown limpo sem menus/rodapés
         """
+        # Hot path (uma chamada por página, um registro por linha): o nível é
+        # checado uma vez e os registros usam formatação % preguiçosa
+        debug = logger.isEnabledFor(logging.DEBUG)
+
         logger.info("Iniciando limpeza do Markdown...")
-        logger.debug(f"Tamanho do texto bruto: {len(texto_bruto)} caracteres")
+        logger.debug("Tamanho do texto bruto: %d caracteres", len(texto_bruto))
 
         # ✅ CORREÇÃO P5: Remove tags <script> e <style> antes de qualquer processamento
         texto_sem_scripts = re.sub(r'<script.*?>.*?</script>', '', texto_bruto, flags=re.DOTALL | re.IGNORECASE)
         texto_sem_scripts = re.sub(r'<style.*?>.*?</style>', '', texto_sem_scripts, flags=re.DOTALL | re.IGNORECASE)
-        logger.debug(f"Após remover <script>/<style>: {len(texto_sem_scripts)} caracteres")
+        logger.debug("Após remover <script>/<style>: %d caracteres", len(texto_sem_scripts))
 
         linhas = texto_sem_scripts.split('\n')
-        logger.debug(f"Total de linhas: {len(linhas)}")
+        logger.debug("Total de linhas: %d", len(linhas))
 
         # Palavras que indicam lixo de navegação
         lixo_nav = [
@@ -62,19 +67,21 @@ class WebCleaner:
             # O conteúdo útil geralmente começa em um heading (# ## ### ####)
             if not linhas_limpas and l.startswith("#"):
                 primeiro_heading = l[:50] + "..." if len(l) > 50 else l
-                logger.info(f"Início do conteúdo encontrado na linha {i+1}: {primeiro_heading}")
+                logger.info("Início do conteúdo encontrado na linha %d: %s", i + 1, primeiro_heading)
 
             # Remove links soltos de navegação lateral (curtos e com "docs")
             if l.startswith("[") and "docs" in l.lower() and len(l) < 80:
                 if "](" in l and l.count("[") == 1:
-                    logger.debug(f"Linha {i+1} removida (link de navegação): {l[:60]}")
+                    if debug:
+                        logger.debug("Linha %d removida (link de navegação): %s", i + 1, l[:60])
                     continue
 
             # ✅ CORREÇÃO: Limpeza inteligente com zona de segurança
             if any(x in l.lower() for x in lixo_nav):
                 # ZONA DE SEGURANÇA: Não remove se linha longa (>60 chars)
                 if len(l) > 60:
-                    logger.debug(f"Linha {i+1} PRESERVADA (zona de segurança >60 chars): {l[:60]}")
+                    if debug:
+                        logger.debug("Linha %d PRESERVADA (zona de segurança >60 chars): %s", i + 1, l[:60])
                     linhas_limpas.append(linha)
                     continue
 
@@ -83,12 +90,14 @@ class WebCleaner:
                     # Verifica se tem contexto (mais de 3 palavras)
                     words = l.split()
                     if len(words) > 3:
-                        logger.debug(f"Linha {i+1} PRESERVADA (texto corrido): {l[:60]}")
+                        if debug:
+                            logger.debug("Linha %d PRESERVADA (texto corrido): %s", i + 1, l[:60])
                         linhas_limpas.append(linha)
                         continue
 
                 # Caso contrário, remove (é lixo de navegação verdadeiro)
-                logger.debug(f"Linha {i+1} removida (palavra proibida): {l[:60]}")
+                if debug:
+                    logger.debug("Linha %d removida (palavra proibida): %s", i + 1, l[:60])
                 continue
 
             linhas_limpas.append(linha)
@@ -124,7 +133,8 @@ class WebCleaner:
 
                 # Se encontrou 3+ linhas consecutivas de links curtos, remove o bloco
                 if count_consecutivos >= 3:
-                    logger.debug(f"Removido bloco de {count_consecutivos} links consecutivos (menu lateral) nas linhas {i+1}-{j}")
+                    logger.debug("Removido bloco de %d links consecutivos (menu lateral) nas linhas %d-%d",
+                                 count_consecutivos, i + 1, j)
                     i = j  # Pula todo o bloco
                     continue
                 else:
@@ -157,9 +167,9 @@ class WebCleaner:
 
             texto_limpo = "\n".join(linhas_fallback)
             texto_limpo = re.sub(r'\n{3,}', '\n\n', texto_limpo)
-            logger.info(f"Linhas após fallback: {len(linhas_fallback)}")
+            logger.info("Linhas após fallback: %d", len(linhas_fallback))
 
-        logger.info(f"Tamanho final do texto limpo: {len(texto_limpo)} caracteres")
+        logger.info("Tamanho final do texto limpo: %d caracteres", len(texto_limpo))
         return texto_limpo
 
 
@@ -6,6 +6,7 @@
 """
 
 import asyncio
+import contextlib
 import time
 import uuid
 from pathlib import Path
@@ -15,6 +16,15 @@ from datetime import datetime
 from .logger import logger
 from .analyzer import WebAnalyzer
 from .cleaner import WebCleaner
+from .progress import CrawlProgress
+from . import retry
+from .hosts import HostController, HostUnavailable
+from .profiles import PROFILE_TEXT, install_resource_blocking
+from .static_fetcher import StaticFetcher, validators_from_headers
+from .postprocess import PostProcessor, extract_title_from_html
+from app.utils.token_counter import TokenCounter
+from app.utils.cancellation import OperationCancelled
+from app.utils import telemetry
 
 # ===========================================
 # FIX: EVENT LOOP PARA WINDOWS
@@ -32,6 +42,10 @@ except ImportError as e:
     logger.critical(f"ERRO FATAL: Dependência crawl4ai não encontrada: {e}")
     raise e
 
+# Limite (ms) do render por link no scan com o perfil de texto (ver _title_config)
+SCAN_PAGE_TIMEOUT = 10000
+SCAN_WAIT_TIMEOUT = 5000
+
 # ===========================================
 # CLASSE WEB CRAWLER SERVICE
 # ===========================================
@@ -39,42 +53,276 @@ except ImportError as e:
 class WebCrawlerService:
     """Serviço core de crawling web com cache e paralelização"""
 
-    def __init__(self):
+    # Seletor restritivo do miolo da página (evita vazamento de menus/headers)
+    CONTENT_SELECTOR = "main, article, [role='main']"
+
+    # Render types cujo HTML do servidor já traz o conteúdo (fast path HTTP)
+    STATIC_RENDER_TYPES = ("SSR",)
+
+    def __init__(self, keep_browsers_warm: bool = False, static_fast_path: bool = True,
+                 postprocess: str = "thread", postprocess_workers: int = None):
+        """Inicializa serviço
+
+        Args:
+            keep_browsers_warm: Mantém browsers abertos entre jobs (requer que
+                todos os jobs rodem no mesmo event loop persistente)
+            static_fast_path: Baixa páginas SSR via HTTP (sem browser), com
+                fallback para o browser quando o HTML não traz o conteúdo
+            postprocess: Executor da limpeza/título/hash/tokens ("thread" ou "process")
+            postprocess_workers: Workers desse executor (default: min(4, núcleos))
+        """
         self.analyzer = WebAnalyzer()
         self.cleaner = WebCleaner()
+        self.token_counter = TokenCounter()
+        self.static_fetcher = StaticFetcher(self.CONTENT_SELECTOR) if static_fast_path else None
+        self.postprocessor = PostProcessor(self.cleaner, self.token_counter,
+                                           kind=postprocess, workers=postprocess_workers)
 
         # Cache de páginas
         self._cache = {}  # {url_normalizada: (html, markdown, timestamp)}
         self._cache_ttl = 3600  # 1 hora em segundos
+        self._validators = {}  # {url_normalizada: {"etag", "lastmod"}} dos renders
+
+        # Retentativas por classe de falha e falhas definitivas do último crawl
+        # (jobs concorrentes recebem as suas via crawl_selected_pages(failures=...))
+        self.retry_policy = retry.RetryPolicy()
+        self.last_failures = []
+
+        # Circuit breaker + politeness por host (sobrevive entre jobs)
+        self.hosts = HostController()
+
+        # Browsers aquecidos ({"scan"|"crawl": AsyncWebCrawler}) e loop dono deles
+        self.keep_browsers_warm = keep_browsers_warm
+        self._browsers = {}
+        self._browser_users = {}  # browser → jobs usando agora (aquecidos e descartados)
+        self._browsers_loop = None
+        self._browsers_lock = None
 
         logger.info("WebCrawlerService inicializado")
 
+    # =======================================
+    # BROWSERS AQUECIDOS
+    # =======================================
+
+    @contextlib.asynccontextmanager
+    async def browser_session(self, key: str, browser_cfg):
+        """Fornece um AsyncWebCrawler: aquecido (reutilizado) ou descartável
+
+        Com keep_browsers_warm o browser de cada `key` é iniciado uma vez e
+        reaproveitado pelos jobs seguintes (inclusive simultâneos, no job
+        server). Qualquer exceção (inclusive cancelamento) descarta o browser
+        para não reaproveitar um estado quebrado: jobs novos sobem outro, e o
+        descartado só fecha quando o último job que ainda o usa terminar.
+        """
+        if not self.keep_browsers_warm:
+            async with AsyncWebCrawler(config=browser_cfg) as crawler:
+                install_resource_blocking(crawler)
+                yield crawler
+            return
+
+        loop = asyncio.get_running_loop()
+        if self._browsers_loop is not loop:
+            # Browsers de outro loop não podem ser usados (nem fechados) aqui
+            self._browsers = {}
+            self._browser_users = {}
+            self._browsers_loop = loop
+            self._browsers_lock = asyncio.Lock()
+
+        async with self._browsers_lock:
+            crawler = self._browsers.get(key)
+            if crawler is None:
+                crawler = AsyncWebCrawler(config=browser_cfg)
+                install_resource_blocking(crawler)
+                await crawler.start()
+                self._browsers[key] = crawler
+                logger.info(f"Browser aquecido iniciado: {key}")
+            self._browser_users[crawler] = self._browser_users.get(crawler, 0) + 1
+
+        broken = False
+        try:
+            yield crawler
+        except BaseException:
+            broken = True
+            raise
+        finally:
+            await self._release_browser(key, crawler, broken)
+
+    async def _release_browser(self, key: str, crawler, broken: bool):
+        """Devolve um browser aquecido ao fim de um job
+
+        Quebrado, sai de _browsers na hora; fecha quando não há mais jobs
+        usando (um browser saudável fica aquecido mesmo sem usuários).
+        """
+        if broken and self._browsers.get(key) is crawler:
+            del self._browsers[key]
+
+        users = self._browser_users.get(crawler, 1) - 1
+        if users > 0:
+            self._browser_users[crawler] = users
+            return
+        self._browser_users.pop(crawler, None)
+        if self._browsers.get(key) is not crawler:
+            await self._close_crawler(key, crawler)
+
+    async def _close_browser(self, key: str):
+        """Fecha e descarta um browser aquecido"""
+        crawler = self._browsers.pop(key, None)
+        if crawler is not None:
+            await self._close_crawler(key, crawler)
+
+    async def _close_crawler(self, key: str, crawler):
+        """Fecha um browser (já fora de _browsers)"""
+        try:
+            await crawler.close()
+            logger.info(f"Browser aquecido fechado: {key}")
+        except Exception as e:
+            logger.error(f"Erro ao fechar browser {key}: {e}")
+
+    async def close(self):
+        """Fecha browsers aquecidos, o pool HTTP e o executor (shutdown do loop persistente)"""
+        for key in list(self._browsers):
+            await self._close_browser(key)
+        if self.static_fetcher:
+            await self.static_fetcher.close()
+        self.postprocessor.shutdown(wait=False)
+
+    # =======================================
+    # FAST PATH SSR (SEM BROWSER)
+    # =======================================
+
+    def _use_static(self, render_type: str) -> bool:
+        """True se o render_type permite baixar via HTTP puro"""
+        return self.static_fetcher is not None and render_type in self.STATIC_RENDER_TYPES
+
+    async def _fetch_static(self, url: str) -> str | None:
+        """Baixa uma página via HTTP e guarda (html, markdown) no cache
+
+        Returns:
+            HTML da página ou None se ela precisa do browser
+        """
+        with telemetry.page(url, counted=False, phase="static_fetch"):
+            try:
+                async with self.hosts.slot(url):
+                    fetched = await self.static_fetcher.fetch(url)
+            except HostUnavailable:
+                fetched = None
+            if fetched is None:
+                telemetry.annotate(status="fallback")
+                return None
+
+            html, markdown = fetched
+            self._save_to_cache(url, html, markdown)
+            return html
+
+    async def _prefetch_static(self, urls: list[str], cancel_token, partial: list) -> int:
+        """Baixa um chunk via HTTP em paralelo (páginas que falharem ficam para o browser)
+
+        Returns:
+            Número de páginas resolvidas sem browser
+        """
+        if not urls:
+            return 0
+        results = await self._gather_cancellable([self._fetch_static(u) for u in urls], cancel_token, partial)
+        return sum(1 for r in results if isinstance(r, str))
+
     # =======================================
     # CACHE DE PÁGINAS
     # =======================================
 
-    def _get_from_cache(self, url: str) -> tuple[str, str] | None:
-        """Retorna (html, markdown) do cache se válido"""
+    def _get_from_cache(self, url: str, max_age: float = None) -> tuple[str, str] | None:
+        """Retorna (html, markdown) do cache se válido
+
+        Args:
+            url: URL da página
+            max_age: Idade máxima aceita em segundos (None = TTL do cache)
+        """
         normalized = self._normalize_url(url)
 
         if normalized in self._cache:
             cached_data, timestamp = self._cache[normalized]
-            if time.time() - timestamp < self._cache_ttl:
-                logger.debug(f"  Cache HIT: {url}")
+            age = time.time() - timestamp
+            if max_age is not None and age >= max_age:
+                logger.debug("  Cache ANTIGO (%.0fs > %ss): %s", age, max_age, url)
+                return None
+            if age < self._cache_ttl:
+                logger.debug("  Cache HIT: %s", url)
                 return cached_data
             else:
                 # Remove cache expirado
                 del self._cache[normalized]
-                logger.debug(f"  Cache EXPIRADO: {url}")
+                logger.debug("  Cache EXPIRADO: %s", url)
 
-        logger.debug(f"  Cache MISS: {url}")
+        logger.debug("  Cache MISS: %s", url)
         return None
 
+    def _is_cached(self, url: str, max_age: float = None) -> bool:
+        """Verifica se a URL tem entrada válida no cache (sem logar)"""
+        entry = self._cache.get(self._normalize_url(url))
+        limit = self._cache_ttl if max_age is None else min(max_age, self._cache_ttl)
+        return entry is not None and time.time() - entry[1] < limit
+
+    def _cached_html_size(self, url: str) -> int:
+        """Tamanho em bytes do HTML em cache (0 se ausente)"""
+        entry = self._cache.get(self._normalize_url(url))
+        return len(entry[0][0].encode('utf-8')) if entry else 0
+
     def _save_to_cache(self, url: str, html: str, markdown: str):
         """Salva no cache"""
         normalized = self._normalize_url(url)
         self._cache[normalized] = ((html, markdown), time.time())
 
+    def cache_entries(self, urls: list[str], max_age: float = None) -> list[tuple[str, str, str, float]]:
+        """Entradas válidas do cache para `urls` (url, html, markdown, timestamp)
+
+        Levadas aos processos do crawl sharded (ver seed_cache), que nascem
+        com cache vazio: página já renderizada no scan não é renderizada de novo.
+        """
+        entries = []
+        for url in urls:
+            if self._is_cached(url, max_age):
+                (html, markdown), timestamp = self._cache[self._normalize_url(url)]
+                entries.append((url, html, markdown, timestamp))
+        return entries
+
+    def seed_cache(self, entries: list[tuple[str, str, str, float]]):
+        """Carrega entradas de cache_entries mantendo o horário original (idade/max_age)"""
+        for url, html, markdown, timestamp in entries:
+            self._cache[self._normalize_url(url)] = ((html, markdown), timestamp)
+
+    def validators_for(self, url: str) -> dict:
+        """ETag/Last-Modified vistos no último download da página ({} se nenhum)
+
+        "validators_from" diz de onde vieram: "static" (HTML do fast path, o
+        próprio conteúdo) ou "render" (documento inicial do browser; numa SPA
+        é o shell, que não muda quando o conteúdo muda).
+        """
+        if self.static_fetcher is not None and self.static_fetcher.validators.get(url):
+            return {**self.static_fetcher.validators[url], "validators_from": "static"}
+        found = self._validators.get(self._normalize_url(url))
+        return {**found, "validators_from": "render"} if found else {}
+
+    def estimate_cached_tokens(self, url: str) -> int | None:
+        """Estima tokens de uma página a partir do cache (sem novo download)
+
+        Returns:
+            Tokens do markdown limpo ou None se a página não está no cache
+        """
+        cached = self._get_from_cache(url)
+        if not cached:
+            return None
+
+        _, md_from_cache = cached
+        md_limpo = self.cleaner.limpar_markdown_google(md_from_cache)
+        return self.token_counter.count_tokens(md_limpo)
+
+    async def estimate_cached_tokens_async(self, url: str) -> int | None:
+        """estimate_cached_tokens com a limpeza/contagem no executor"""
+        cached = self._get_from_cache(url)
+        if not cached:
+            return None
+        processed = await self.postprocessor.process(cached[1])
+        return processed["tokens"]
+
     def _normalize_url(self, url: str) -> str:
         """Normaliza URL removendo query strings e fragments"""
         parsed = urlparse(url)
@@ -159,7 +407,7 @@ class WebCrawlerService:
                             links.append(normalized)
 
                     except Exception as e:
-                        logger.debug(f"Erro ao processar link {full_url}: {e}")
+                        logger.debug("Erro ao processar link %s: %s", full_url, e)
                         continue
 
         except Exception as e:
@@ -173,52 +421,126 @@ class WebCrawlerService:
 
     def _extract_title_from_html(self, html: str, url: str) -> str:
         """Extrai título de <title> ou <meta property="og:title">"""
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Tenta <title>
-            if soup.title and soup.title.string:
-                return soup.title.string.strip()
-
-            # Tenta og:title
-            og_title = soup.find('meta', property='og:title')
-            if og_title and og_title.get('content'):
-                return og_title['content'].strip()
-
-        except Exception as e:
-            logger.debug(f"Erro ao extrair título: {e}")
-
-        # Fallback: última parte da URL
-        path_parts = urlparse(url).path.strip('/').split('/')
-        return path_parts[-1].replace('-', ' ').title() if path_parts else "Sem Título"
-
-    async def _get_page_title(self, crawler, url: str) -> str:
-        """Extrai título via lightweight crawl"""
-        try:
-            # Crawl rápido (somente head, 5s timeout)
-            quick_config = CrawlerRunConfig(
-                wait_until="networkidle",
-                page_timeout=5000,
-                magic=True,
-                verbose=False
+        return extract_title_from_html(html, url)
+
+    def _title_config(self, crawler_config) -> CrawlerRunConfig:
+        """Config do render por link no scan
+
+        No perfil de texto reaproveita a config do crawl (mesma espera e
+        bloqueio), para que o conteúdo guardado no handoff tenha a mesma
+        qualidade, mas com os tempos limitados (SCAN_PAGE_TIMEOUT /
+        SCAN_WAIT_TIMEOUT): o loop de títulos é sequencial e, sem a raiz de
+        conteúdo, cada link esperaria o wait_for_timeout inteiro do crawl.
+        Página que estoura o limite falha aqui, não entra no cache e é
+        renderizada com a config completa no PASSO C. No perfil completo
+        mantém o crawl rápido de 5s.
+        """
+        if self._scan_matches_crawl(crawler_config):
+            return crawler_config.clone(
+                cache_mode=CacheMode.BYPASS,
+                css_selector=self.CONTENT_SELECTOR,
+                page_timeout=min(crawler_config.page_timeout or SCAN_PAGE_TIMEOUT, SCAN_PAGE_TIMEOUT),
+                wait_for_timeout=min(crawler_config.wait_for_timeout or SCAN_WAIT_TIMEOUT, SCAN_WAIT_TIMEOUT)
             )
 
-            result = await crawler.arun(url=url, config=quick_config)
+        return CrawlerRunConfig(
+            wait_until="networkidle",
+            page_timeout=5000,
+            magic=True,
+            verbose=False,
+            css_selector=self.CONTENT_SELECTOR
+        )
 
-            if result.success:
-                return self._extract_title_from_html(str(result.html or ""), url)
+    @staticmethod
+    def _scan_matches_crawl(crawler_config) -> bool:
+        """True se o render do scan usa a config do crawl (perfil de texto)
 
-        except Exception as e:
-            logger.debug(f"Erro ao obter título de {url}: {e}")
+        Só então o conteúdo renderado no scan pode ir para o cache do
+        handoff: no perfil completo o scan é o render rápido de 5s, sem as
+        esperas de SPA do crawl (js_code, wait_for), e guardá-lo faria o
+        crawl reaproveitar uma página renderada pela metade.
+        """
+        shared = getattr(crawler_config, "shared_data", None) or {}
+        return crawler_config is not None and shared.get("render_profile") == PROFILE_TEXT
 
-        return "Sem Título"
+    async def _get_page_title(self, crawler, url: str, keep_content: bool = False,
+                              crawler_config=None, static: bool = False) -> str:
+        """Extrai título via lightweight crawl
+
+        Args:
+            crawler: AsyncWebCrawler do scan
+            url: URL da página
+            keep_content: Se True, guarda HTML/markdown renderados no cache para
+                o crawl reaproveitar (handoff scan → crawl, sem novo render);
+                render do browser só no perfil de texto (ver _scan_matches_crawl)
+            crawler_config: Config do render_type detectado (define o perfil)
+            static: Tenta o fast path HTTP antes do browser (sites SSR)
+        """
+        with telemetry.page(url, phase="scan_title"):
+            try:
+                if static and self.static_fetcher:
+                    async with self.hosts.slot(url):
+                        fetched = await self.static_fetcher.fetch(url)
+                    if fetched is not None:
+                        html, markdown = fetched
+                        if keep_content:
+                            self._save_to_cache(url, html, markdown)
+                        with telemetry.stage("title"):
+                            return await self.postprocessor.extract_title(html, url)
+
+                # Render já com o seletor de conteúdo do crawl, para que o
+                # markdown renderado aqui sirva ao PASSO C
+                quick_config = self._title_config(crawler_config)
+
+                async with self.hosts.slot(url):
+                    with telemetry.stage("render"):
+                        result = await crawler.arun(url=url, config=quick_config)
+                    self.hosts.record(url, retry.classify_result(result))
+
+                if result.success:
+                    html = str(result.html or "")
+                    if keep_content and result.markdown and self._scan_matches_crawl(crawler_config):
+                        self._save_to_cache(url, html, result.markdown)
+                        self._validators[self._normalize_url(url)] = validators_from_headers(
+                            getattr(result, "response_headers", None))
+                    with telemetry.stage("title"):
+                        return await self.postprocessor.extract_title(html, url)
+
+            except HostUnavailable as e:
+                logger.debug("Título de %s ignorado: %s", url, e)
+
+            except Exception as e:
+                logger.debug("Erro ao obter título de %s: %s", url, e)
+                self.hosts.record(url, retry.classify_exception(e))
+
+            telemetry.annotate(status="failed")
+            return "Sem Título"
 
     # =======================================
     # MÉTODOS DE CRAWLING
     # =======================================
 
-    async def scan_pages(self, seed_url: str) -> tuple[bool, list[dict]]:
-        """PASSO A (SCAN): Identifica páginas elegíveis SEM baixar conteúdo"""
+    async def scan_pages(self, seed_url: str, cancel_token=None,
+                         keep_content: bool = True) -> tuple[bool, list[dict]]:
+        """PASSO A (SCAN): Identifica páginas elegíveis
+
+        Args:
+            seed_url: URL inicial
+            cancel_token: CancellationToken opcional (checkpoint a cada página)
+            keep_content: Guarda no cache o conteúdo renderado de cada link
+                (o crawl pula o browser para essas páginas enquanto frescas)
+
+        Raises:
+            OperationCancelled: Se o token for cancelado (partial = páginas já mapeadas)
+        """
+        with telemetry.job("scan", url=seed_url) as job:
+            success, pages = await self._scan_pages(seed_url, cancel_token, keep_content)
+            if job is not None:
+                job.fields.update(success=success, pages_found=len(pages))
+            return success, pages
+
+    async def _scan_pages(self, seed_url: str, cancel_token, keep_content: bool) -> tuple[bool, list[dict]]:
+        """Corpo do scan (scan_pages envolve no job de telemetria)"""
         logger.info(f"SCAN INICIADO: {seed_url}")
 
         # 1. Detectar tipo de renderização para config otimizada
@@ -235,19 +557,16 @@ class WebCrawlerService:
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8"
             }
         )
-        # Usar config otimizada com JS para expansão de menus (se CSR)
-        run_cfg = CrawlerRunConfig(
+        # Usar config otimizada com JS para expansão de menus (se CSR) e o perfil de render
+        run_cfg = crawler_config.clone(
             cache_mode=CacheMode.BYPASS,
-            page_timeout=crawler_config.page_timeout or 30000,
-            js_code=crawler_config.js_code,
-            wait_until=crawler_config.wait_until,
-            wait_for=crawler_config.wait_for
+            page_timeout=crawler_config.page_timeout or 30000
         )
 
         pages = []
 
         try: # Try/Except interno para garantir log de erro no arquivo
-            async with AsyncWebCrawler(config=browser_cfg) as crawler:
+            async with self.browser_session("scan", browser_cfg) as crawler:
 
                 # 2. Smart Retry (Resgatado da V2)
                 urls_to_try = [seed_url]
@@ -267,28 +586,49 @@ class WebCrawlerService:
 
                 logger.info(f"Tentando acessar seed com variações: {urls_to_try}")
 
+                failure = None
                 for try_url in urls_to_try:
-                    logger.info(f"Tentando Crawl em: {try_url}")
-                    result = await crawler.arun(url=try_url, config=run_cfg)
-
-                    if result.success and "404" not in result.markdown[:100]:
-                        valid_seed_result = result
-                        valid_url = try_url
-                        logger.info(f"Seed válida encontrada: {valid_url}")
+                    attempt = 1
+                    while True:
+                        if cancel_token:
+                            await cancel_token.checkpoint({"fase": "seed", "url": try_url})
+                        logger.info(f"Tentando Crawl em: {try_url}")
+                        try:
+                            result = await crawler.arun(url=try_url, config=run_cfg)
+                            failure = retry.classify_result(result) or retry.classify_soft_404(result.markdown)
+                        except Exception as e:
+                            failure = retry.classify_exception(e)
+
+                        if failure is None:
+                            valid_seed_result = result
+                            valid_url = try_url
+                            logger.info(f"Seed válida encontrada: {valid_url}")
+                            break
+
+                        # Falha transitória: mesma URL de novo, com backoff
+                        delay = self.retry_policy.decide(failure, attempt)
+                        if delay is None:
+                            logger.warning(f"Falha ao acessar {try_url} [{failure['kind']}]: {failure['message']}")
+                            break
+                        logger.info(f"Falha [{failure['kind']}] em {try_url} - nova tentativa em {delay:.1f}s")
+                        await self._gather_cancellable([asyncio.sleep(delay)], cancel_token, pages)
+                        attempt += 1
+
+                    # Variações de URL só ajudam quando o problema é a URL, não o host
+                    if valid_seed_result or failure["kind"] in retry.HOST_FAILURES:
                         break
-                    else:
-                        logger.warning(f"Falha ao acessar {try_url}: {result.error_message}")
 
                 if not valid_seed_result:
                     logger.error("TODAS as tentativas de Seed falharam.")
                     return False, []
 
                 # 3. Adiciona a Seed Garantida (Correção da Lista Vazia)
-                title_seed = self._extract_title_from_html(str(valid_seed_result.html or ""), valid_url)
+                title_seed = await self.postprocessor.extract_title(str(valid_seed_result.html or ""), valid_url)
                 pages.append({
                     "url": valid_url,
                     "title": title_seed,
-                    "selected": True
+                    "selected": True,
+                    "tokens": None
                 })
 
                 # 4. Extrai Links (Com filtro relaxado do Passo 1)
@@ -297,21 +637,112 @@ class WebCrawlerService:
 
                 # Crawl leve para títulos dos links
                 for link in links:
-                    title = await self._get_page_title(crawler, link)
+                    if cancel_token:
+                        await cancel_token.checkpoint({"fase": "titulos", "mapeadas": len(pages),
+                                                       "total": len(links) + 1}, partial=pages)
+                    title = await self._get_page_title(crawler, link, keep_content=keep_content,
+                                                       crawler_config=crawler_config,
+                                                       static=self._use_static(render_type))
                     pages.append({
                         "url": link,
                         "title": title,
-                        "selected": True
+                        "selected": True,
+                        "tokens": None
                     })
 
+            # 5. Custo estimado em tokens para páginas já presentes no cache
+            estimates = await asyncio.gather(*(self.estimate_cached_tokens_async(p["url"]) for p in pages))
+            for page, tokens in zip(pages, estimates):
+                page["tokens"] = tokens
+                page["cached"] = tokens is not None
+
+            logger.info(f"Handoff scan → crawl: {sum(p['cached'] for p in pages)}/{len(pages)} páginas em cache")
+
             return True, pages
 
+        except OperationCancelled:
+            logger.warning(f"SCAN CANCELADO: {len(pages)} páginas mapeadas")
+            raise
+
         except Exception as e:
             logger.exception(f"ERRO FATAL NO SCAN_PAGES: {e}")
             return False, []
 
-    async def crawl_selected_pages(self, selected_pages: list[dict]) -> tuple[bool, list[dict]]:
-        """PASSO C (EXECUTAR): Baixa apenas páginas selecionadas pelo usuário"""
+    async def discover_links(self, seed_url: str) -> list[str] | None:
+        """Seed + links internos com um único download (sem títulos nem handoff)
+
+        Usado pelo update incremental para achar páginas novas/removidas sem
+        refazer o scan inteiro.
+
+        Returns:
+            [seed, links...] ou None se a seed não pôde ser baixada
+        """
+        render_type = await self.analyzer.detect_render_type(seed_url)
+        html = None
+        if self._use_static(render_type):
+            fetched = await self.static_fetcher.fetch(seed_url)
+            html = fetched[0] if fetched else None
+
+        if html is None:
+            run_cfg = self.analyzer.get_crawler_config(render_type).clone(cache_mode=CacheMode.BYPASS)
+            try:
+                async with self.browser_session("scan", BrowserConfig(headless=True, verbose=False)) as crawler:
+                    result = await crawler.arun(url=seed_url, config=run_cfg)
+                failure = retry.classify_result(result)
+            except Exception as e:
+                failure = retry.classify_exception(e)
+            if failure is not None:
+                logger.error(f"Falha ao baixar a seed {seed_url} [{failure['kind']}]: {failure['message']}")
+                return None
+            html = str(result.html or "")
+
+        return [seed_url] + self.extract_internal_links(html, seed_url)
+
+    async def crawl_selected_pages(self, selected_pages: list[dict], on_page=None,
+                                   on_progress=None, cancel_token=None,
+                                   max_age: float = None, processes: int = 1,
+                                   failures: list = None, render_type: str = None) -> tuple[bool, list[dict]]:
+        """PASSO C (EXECUTAR): Baixa apenas páginas selecionadas pelo usuário
+
+        Args:
+            selected_pages: Páginas escolhidas no dialog de seleção
+            on_page: Callback opcional chamado com o dict de cada página
+                (url, title, markdown, tokens) assim que ela é processada
+            on_progress: Callback opcional chamado com o evento de progresso
+                (ver CrawlProgress.snapshot) a cada página concluída
+            cancel_token: CancellationToken opcional. Pausa entre chunks (as
+                páginas em andamento terminam); cancelamento aborta o chunk atual
+            max_age: Idade máxima (s) do conteúdo em cache/renderado no scan
+                para ser reaproveitado sem browser (None = TTL do cache)
+            processes: Com > 1, divide jobs grandes entre processos (um event
+                loop e browser por processo, ver sharding.crawl_sharded)
+            failures: Lista que recebe as falhas definitivas deste crawl. Jobs
+                concorrentes no mesmo service (job server) devem passar a sua;
+                last_failures aponta só para a do crawl mais recente
+            render_type: Tipo de renderização já detectado (None = detecta
+                pela primeira página; shards recebem o do processo pai)
+
+        Returns:
+            (sucesso, lista de páginas com contagem de tokens por página)
+
+        Raises:
+            OperationCancelled: Se o token for cancelado (partial = páginas baixadas)
+        """
+        failures = [] if failures is None else failures
+        self.last_failures = failures
+        with telemetry.job("crawl", pages_selected=len(selected_pages), processes=processes) as job:
+            success, contents = await self._crawl_selected_pages(
+                selected_pages, on_page, on_progress, cancel_token, max_age, processes, failures,
+                render_type
+            )
+            if job is not None:
+                job.fields.update(success=success, pages_kept=len(contents),
+                                  failures_by_kind=retry.summarize(failures))
+            return success, contents
+
+    async def _crawl_selected_pages(self, selected_pages, on_page, on_progress, cancel_token,
+                                    max_age, processes, failures, render_type) -> tuple[bool, list[dict]]:
+        """Corpo do crawl (crawl_selected_pages envolve no job de telemetria)"""
         logger.info("CRAWLING: Baixando páginas selecionadas...")
         logger.info(f"Páginas selecionadas: {len(selected_pages)}")
 
@@ -319,15 +750,38 @@ class WebCrawlerService:
             logger.warning("Nenhuma página selecionada")
             return False, []
 
+        from .sharding import SHARD_MIN_PAGES, crawl_sharded
+        if processes > 1 and len(selected_pages) >= SHARD_MIN_PAGES:
+            try:
+                # Detecção feita uma vez aqui (sem browser extra em cada processo)
+                render_type = render_type or await self.analyzer.detect_render_type(selected_pages[0]["url"])
+                return await crawl_sharded(self, selected_pages, processes, on_page=on_page,
+                                           on_progress=on_progress, cancel_token=cancel_token,
+                                           max_age=max_age, failures=failures, render_type=render_type)
+            except OperationCancelled:
+                raise
+            except Exception as e:
+                logger.exception(f"Erro no crawl sharded: {e}")
+                return False, []
+
         try:
             # Detectar renderização da primeira página
-            render_type = await self.analyzer.detect_render_type(selected_pages[0]["url"])
+            render_type = render_type or await self.analyzer.detect_render_type(selected_pages[0]["url"])
             crawler_config = self.analyzer.get_crawler_config(render_type)
 
 
 
             contents = []
+            positions = {}  # id(página) → índice na seleção (retentativas chegam depois)
             seen_hashes = set()  # Deduplicação de conteúdo
+            progress = CrawlProgress(len(selected_pages))
+            use_static = self._use_static(render_type)
+            static_pages = 0
+
+            # Falhas transitórias voltam pela fila com backoff; as definitivas
+            # vão para o relatório final
+            retry_queue = retry.RetryQueue()
+            report = retry.FailureReport(failures)
 
             # Browser configuration
             browser_cfg = BrowserConfig(
@@ -335,116 +789,262 @@ class WebCrawlerService:
                 verbose=False
             )
 
-            async with AsyncWebCrawler(config=browser_cfg) as crawler:
-                # ✅ PARALELIZAÇÃO: Processar em chunks de 5 URLs (seguro)
-                chunk_size = 5
+            # Browser aberto sob demanda: no fast path SSR só sobe se alguma
+            # página precisar de fallback
+            async with contextlib.AsyncExitStack() as browser_stack:
+                crawler = None
+
+                # ✅ PARALELIZAÇÃO: Processar em chunks (HTTP puro aguenta mais)
+                chunk_size = 20 if use_static else 5
+                next_index = 0
+                chunk_number = 0
+
+                while next_index < len(selected_pages) or retry_queue:
+                    # ✅ CHECKPOINT: Pausa/cancelamento entre chunks
+                    if cancel_token:
+                        await cancel_token.checkpoint(
+                            {"proximo_indice": next_index, "total": len(selected_pages),
+                             "baixadas": len(contents), "retentativas": len(retry_queue)},
+                            partial=contents
+                        )
+
+                    # Retentativas já liberadas entram primeiro; o resto do
+                    # chunk é completado com páginas novas
+                    chunk = retry_queue.pop_due(chunk_size)
+                    fresh = selected_pages[next_index:next_index + chunk_size - len(chunk)]
+                    chunk += [((next_index + i, p), 1) for i, p in enumerate(fresh)]
+                    next_index += len(fresh)
+
+                    if not chunk:
+                        # Só restam páginas em backoff: espera a primeira ficar pronta
+                        await self._gather_cancellable([asyncio.sleep(retry_queue.next_delay())],
+                                                       cancel_token, contents)
+                        continue
 
-                for i in range(0, len(selected_pages), chunk_size):
-                    chunk = selected_pages[i:i+chunk_size]
-                    logger.info(f"  Chunk {i//chunk_size + 1}: {len(chunk)} URLs")
+                    chunk_number += 1
+                    retries = sum(1 for _, attempt in chunk if attempt > 1)
+                    logger.info(f"  Chunk {chunk_number}: {len(chunk)} URLs"
+                                + (f" ({retries} retentativas)" if retries else ""))
 
                     # Paralelizar downloads
-                    tasks = [self.crawl_page_async(crawler, crawler_config, p["url"])
-                             for p in chunk]
-                    chunk_results = await asyncio.gather(*tasks, return_exceptions=True)
+                    cached_urls = {p["url"] for (_, p), _ in chunk if self._is_cached(p["url"], max_age)}
+                    if use_static:
+                        static_pages += await self._prefetch_static(
+                            [p["url"] for (_, p), _ in chunk if p["url"] not in cached_urls], cancel_token, contents
+                        )
+                    if crawler is None and not all(self._is_cached(p["url"], max_age) for (_, p), _ in chunk):
+                        crawler = await browser_stack.enter_async_context(
+                            self.browser_session("crawl", browser_cfg)
+                        )
+
+                    tasks = [self._crawl_page(crawler, crawler_config, p["url"], max_age=max_age,
+                                              render_type=render_type, attempt=attempt)
+                             for (_, p), attempt in chunk]
+                    chunk_results = await self._gather_cancellable(tasks, cancel_token, contents)
 
                     # Processar resultados
-                    for result in chunk_results:
+                    for ((index, selected), attempt), result in zip(chunk, chunk_results):
                         if isinstance(result, Exception):
                             logger.error(f"Exceção no chunk: {result}")
+                            result = {"url": selected["url"], "error": retry.classify_exception(result),
+                                      "retry_in": None}
+
+                        url = result["url"]
+                        failure = result.get("error")
+                        if failure is not None:
+                            if result["retry_in"] is not None:
+                                retry_queue.push((index, selected), attempt + 1, result["retry_in"])
+                                continue
+                            report.add(url, failure, attempt)
+                            self._notify(on_progress, progress.record(url, "failed", error=failure["kind"]))
                             continue
 
-                        url, title, markdown = result
-                        if markdown.strip():
-                            # ✅ DEDUPLICAÇÃO: Evitar salvar conteúdo repetido
-                            content_hash = hash(markdown)
-                            if content_hash in seen_hashes:
-                                logger.warning(f"⚠️ Conteúdo duplicado detectado para {url} - IGNORADO.")
-                                continue
+                        title, markdown, tokens = result["title"], result["markdown"], result["tokens"]
+                        status = "cache" if url in cached_urls else "ok"
+
+                        # ✅ DEDUPLICAÇÃO: Evitar salvar conteúdo repetido (hash feito no executor)
+                        content_hash = result["hash"]
+                        if content_hash in seen_hashes:
+                            logger.warning(f"⚠️ Conteúdo duplicado detectado para {url} - IGNORADO.")
+                            status = "duplicate"
+                        else:
                             seen_hashes.add(content_hash)
 
-                            contents.append({
+                            page = {
                                 "url": url,
                                 "title": title,
-                                "markdown": markdown
-                            })
-                            logger.info(f"    ✓ {title} ({len(markdown)} chars)")
-                        else:
-                            logger.warning(f"    ✗ {url} - conteúdo vazio")
-
-                    # Pequena pausa entre chunks
-                    await asyncio.sleep(0.5)
-
-            logger.info(f"CRAWL CONCLUÍDO: {len(contents)} páginas baixadas")
+                                "markdown": markdown,
+                                "tokens": tokens,
+                                "hash": content_hash,  # chave no page store
+                                "render_type": render_type,
+                                **self.validators_for(url)  # etag/lastmod (update incremental)
+                            }
+                            contents.append(page)
+                            positions[id(page)] = index
+                            logger.info("    ✓ %s (%d chars, %d tokens)", title, len(markdown), tokens)
+
+                            # ✅ STREAMING: Entrega a página assim que processada
+                            self._notify(on_page, page)
+
+                        self._notify(on_progress, progress.record(url, status, self._cached_html_size(url)))
+
+                    # Pequena pausa entre chunks (browser); chunk só de páginas
+                    # barradas pelo circuito não usou o browser
+                    if crawler is not None and not all(
+                            isinstance(r, dict) and (r.get("error") or {}).get("kind") == retry.CIRCUIT_OPEN
+                            for r in chunk_results):
+                        await asyncio.sleep(0.5)
+
+            # Página que só deu certo numa retentativa entrou depois das
+            # seguintes: o consolidado/manifesto seguem a ordem da seleção
+            contents.sort(key=lambda page: positions[id(page)])
+
+            total_tokens = sum(page["tokens"] for page in contents)
+            logger.info(f"CRAWL CONCLUÍDO: {len(contents)} páginas baixadas ({total_tokens} tokens)")
+            logger.info(f"  Throughput: {progress.snapshot()['pages_per_sec']} pág/s | "
+                        f"cache {progress.cache_hits} | falhas {progress.failures}")
+            if use_static:
+                logger.info(f"  Fast path SSR: {static_pages}/{len(selected_pages)} páginas sem browser")
+            report.log()
 
             return True, contents
 
+        except OperationCancelled as e:
+            # O browser já foi fechado por browser_session ao propagar a exceção
+            logger.warning(f"CRAWL CANCELADO: {len(e.partial or [])} páginas baixadas")
+            raise
+
         except Exception as e:
             logger.exception(f"Erro no crawl_selected_pages: {e}")
             return False, []
 
-    async def crawl_page_async(self, crawler, crawler_config, url: str) -> tuple[str, str, str]:
-        """Faz crawl de uma única página e retorna título + conteúdo"""
-        try:
-            # ✅ CACHE: Verifica cache primeiro
-            cached = self._get_from_cache(url)
-            if cached:
-                html, md_from_cache = cached
-                md_limpo = self.cleaner.limpar_markdown_google(md_from_cache)
-
-                titulo = "Sem Título"
-                for linha in md_limpo.split('\n'):
-                    if linha.startswith('# '):
-                        titulo = linha[2:].strip()
-                        break
-                    elif linha.startswith('## '):
-                        titulo = linha[3:].strip()
-                        break
-
-                logger.info(f"  ✓ CACHE HIT - {len(md_limpo)} chars - {titulo[:50]}")
-                return url, titulo, md_limpo
+    async def _gather_cancellable(self, tasks: list, cancel_token, partial: list) -> list:
+        """asyncio.gather de um chunk que é abortado assim que o token é cancelado"""
+        gathered = asyncio.gather(*tasks, return_exceptions=True)
+        if cancel_token is None:
+            return await gathered
 
-            # Se não está no cache, faz o crawl normal
-            logger.info(f"  Crawling: {url}")
+        on_cancel = cancel_token.cancel_future_on_cancel(gathered)
+        try:
+            return await gathered
+        except asyncio.CancelledError:
+            if cancel_token.cancelled:
+                raise OperationCancelled(partial=partial)
+            raise
+        finally:
+            cancel_token.remove_callback(on_cancel)
+
+    def _notify(self, callback, payload):
+        """Chama callback de streaming sem deixar exceções interromperem o crawl"""
+        if callback is None:
+            return
+        try:
+            callback(payload)
+        except Exception as e:
+            logger.error(f"Erro no callback {getattr(callback, '__name__', callback)}: {e}")
 
-            # ✅ ISOLAMENTO DE SESSÃO: Força contexto novo por URL
-            session_id = str(uuid.uuid4())
+    async def crawl_page_async(self, crawler, crawler_config, url: str,
+                               max_age: float = None) -> tuple[str, str, str, int]:
+        """Faz crawl de uma única página e retorna título + conteúdo + tokens
 
-            # ✅ CSS SELECTOR STRATEGY: Seletor restritivo para evitar vazamento de menus
-            css_selector = "main, article, [role='main']"
-            result = await crawler.arun(
-                url=url,
-                config=crawler_config,
-                css_selector=css_selector,  # Extrai apenas o miolo, elimina menus/headers
-                session_id=session_id  # Isolamento total por página
-            )
-
-            if result.success:
-                # ✅ CACHE: Salva no cache
-                self._save_to_cache(url, str(result.html or ""), result.markdown)
+        Returns:
+            (url, título, markdown limpo, tokens do markdown). A tupla ganhou
+            o 4º item (tokens): chamadores que desempacotavam
+            (url, título, markdown) precisam ignorá-lo
+        """
+        page = await self._crawl_page(crawler, crawler_config, url, max_age=max_age)
+        return page["url"], page["title"], page["markdown"], page["tokens"]
 
-                # Limpa o markdown
-                md_limpo = self.cleaner.limpar_markdown_google(result.markdown)
+    async def _crawl_page(self, crawler, crawler_config, url: str, max_age: float = None,
+                          render_type: str = None, attempt: int = 1) -> dict:
+        """Crawl de uma página com pós-processamento no executor
 
-                # Extrai título (primeiro H1 ou H2)
-                titulo = "Sem Título"
-                for linha in md_limpo.split('\n'):
-                    if linha.startswith('# '):
-                        titulo = linha[2:].strip()
-                        break
-                    elif linha.startswith('## '):
-                        titulo = linha[3:].strip()
-                        break
+        Args:
+            attempt: Número da tentativa (a política de retry decide se a
+                falha desta tentativa ainda será retentada)
 
-                logger.info(f"  ✓ CRAWL NOVO - {len(md_limpo)} chars - {titulo[:50]}")
-                return url, titulo, md_limpo
+        Returns:
+            {"url", "title", "markdown" (limpo), "tokens", "hash"}; em caso
+            de falha markdown vazio e "error" com a falha classificada
+            (ver retry.classify_result) + "retry_in" (s até a próxima
+            tentativa, None se definitiva)
+        """
+        with telemetry.page(url, render_type=render_type, attempt=attempt):
+            try:
+                # ✅ CACHE: Verifica cache primeiro (inclui páginas renderadas no scan)
+                with telemetry.stage("cache_lookup"):
+                    cached = self._get_from_cache(url, max_age=max_age)
+                if cached:
+                    html, md_from_cache = cached
+                    page = await self.postprocessor.process(md_from_cache)
+                    telemetry.add_timings(page.pop("timings", None))
+                    telemetry.annotate(cache="hit", bytes_in=len(html or ""), bytes_out=len(page["markdown"]))
+
+                    if page["markdown"].strip():
+                        logger.info("  ✓ CACHE HIT - %d chars - %d tokens - %.50s", len(page['markdown']), page['tokens'], page['title'])
+                        return {"url": url, **page}
+                    failure = retry.classify_empty()
+                else:
+                    # Se não está no cache, faz o crawl normal
+                    logger.info("  Crawling: %s", url)
+                    telemetry.annotate(cache="miss")
+
+                    # ✅ ISOLAMENTO DE SESSÃO: Força contexto novo por URL
+                    session_id = str(uuid.uuid4())
+
+                    # ✅ CSS SELECTOR STRATEGY: Seletor restritivo para evitar vazamento de menus
+                    css_selector = self.CONTENT_SELECTOR
+                    # ✅ POLITENESS: Vaga no host (falha na hora com o circuito aberto)
+                    async with self.hosts.slot(url):
+                        with telemetry.stage("render"):
+                            result = await crawler.arun(
+                                url=url,
+                                config=crawler_config,
+                                css_selector=css_selector,  # Extrai apenas o miolo, elimina menus/headers
+                                session_id=session_id  # Isolamento total por página
+                            )
+                        failure = retry.classify_result(result)
+                        self.hosts.record(url, failure)
+                    if failure is None:
+                        # ✅ CACHE: Salva no cache
+                        html = str(result.html or "")
+                        self._save_to_cache(url, html, result.markdown)
+                        self._validators[self._normalize_url(url)] = validators_from_headers(
+                            getattr(result, "response_headers", None))
+
+                        # Limpeza, título (primeiro H1/H2), hash e tokens fora do event loop
+                        page = await self.postprocessor.process(result.markdown)
+                        telemetry.add_timings(page.pop("timings", None))
+                        telemetry.annotate(bytes_in=len(html), bytes_out=len(page["markdown"]))
+
+                        if page["markdown"].strip():
+                            logger.info("  ✓ CRAWL NOVO - %d chars - %d tokens - %.50s", len(page['markdown']), page['tokens'], page['title'])
+                            return {"url": url, **page}
+                        failure = retry.classify_empty()
+
+            except HostUnavailable as e:
+                failure = retry.make_failure(retry.CIRCUIT_OPEN, str(e), retry_after=e.retry_after)
+
+            except Exception as e:
+                logger.debug("    ✗ Exceção em %s", url, exc_info=True)
+                failure = retry.classify_exception(e)
+                self.hosts.record(url, failure)
+
+            if failure["kind"] == retry.EMPTY_CONTENT:
+                # Conteúdo vazio no cache/render não pode ser reaproveitado na retentativa
+                self._cache.pop(self._normalize_url(url), None)
+
+            retry_in = self.retry_policy.decide(failure, attempt)
+            status = f" HTTP {failure['status_code']}" if failure["status_code"] else ""
+            if retry_in is None:
+                logger.warning(f"    ✗ Falha [{failure['kind']}{status}] {url}: {failure['message']}")
             else:
-                logger.warning(f"    ✗ Falha: {result.error_message}")
-                return url, "Erro", ""
+                logger.info(f"    ↻ Falha [{failure['kind']}{status}] {url} - "
+                            f"tentativa {attempt + 1} em {retry_in:.1f}s")
 
-        except Exception as e:
-            logger.exception(f"    ✗ Exceção: {e}")
-            return url, "Erro", ""
+            telemetry.annotate(status="failed" if retry_in is None else "retry", error=failure["kind"])
+            return {"url": url, "title": "Erro", "markdown": "", "tokens": 0, "hash": None,
+                    "error": failure, "retry_in": retry_in}
 
 
 # ===========================================
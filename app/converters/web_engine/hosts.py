@@ -0,0 +1,286 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Hosts Module - V3.0                                                    ║
+║ Circuit breaker e politeness por host (in-flight, intervalo, robots.txt)   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import asyncio
+import contextlib
+import time
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from .logger import logger
+from . import retry
+from app.utils import telemetry
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+# Renders simultâneos por host (o chunk do crawl tem até 5 páginas)
+DEFAULT_MAX_IN_FLIGHT = 3
+
+# Intervalo mínimo entre inícios de requisições ao mesmo host (s)
+DEFAULT_MIN_DELAY = 0.0
+
+# Falhas de host seguidas que abrem o circuito e quanto tempo ele fica aberto
+DEFAULT_FAILURE_THRESHOLD = 4
+DEFAULT_RESET_TIMEOUT = 30.0
+MAX_RESET_TIMEOUT = 240.0
+
+# Sondas simultâneas com o circuito meio-aberto
+HALF_OPEN_PROBES = 1
+
+# Crawl-delay do robots.txt acima disso é limitado (um valor de 60s pararia o job)
+MAX_CRAWL_DELAY = 10.0
+ROBOTS_TIMEOUT = 5.0
+
+# Classes de falha que indicam host com problema (4xx/seletor/vazio não)
+HOST_FAILURE_KINDS = (retry.TIMEOUT, retry.DNS, retry.CONNECTION, retry.HTTP_5XX, retry.RATE_LIMITED)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class HostUnavailable(Exception):
+    """Circuito do host aberto: a página falha na hora em vez de esperar o timeout"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"circuito aberto para {host} (nova sonda em {retry_after:.0f}s)")
+        self.host = host
+        self.retry_after = retry_after
+
+
+async def fetch_robots_txt(robots_url: str) -> str | None:
+    """Baixa o robots.txt (None se ausente/inacessível)"""
+    import httpx
+    from .static_fetcher import DEFAULT_HEADERS
+
+    try:
+        async with httpx.AsyncClient(timeout=ROBOTS_TIMEOUT, headers=DEFAULT_HEADERS,
+                                     follow_redirects=True) as client:
+            response = await client.get(robots_url)
+    except Exception as e:
+        logger.debug("robots.txt inacessível (%s): %s", e.__class__.__name__, robots_url)
+        return None
+    return response.text if response.status_code == 200 else None
+
+
+# ===========================================
+# ESTADO POR HOST
+# ===========================================
+
+class HostState:
+    """Circuito e agenda de requisições de um host"""
+
+    def __init__(self, max_in_flight: int):
+        self.circuit = CLOSED
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.reset_timeout = DEFAULT_RESET_TIMEOUT
+        self.probes = 0
+
+        self.next_start = 0.0
+        self.pause_until = 0.0  # Retry-After de um 429
+        self.crawl_delay = 0.0
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.robots = None  # Task do robots.txt (uma por host)
+
+
+# ===========================================
+# CONTROLADOR
+# ===========================================
+
+class HostController:
+    """Circuit breaker + politeness por host
+
+    Cada render passa por slot(url): limita os renders simultâneos do host,
+    espaça os inícios pelo maior entre min_delay e o Crawl-delay do
+    robots.txt e, com o circuito aberto, falha na hora (HostUnavailable)
+    para a página voltar à fila de retry em vez de esperar um timeout.
+
+    Circuito: fecha → abre após `failure_threshold` falhas de host seguidas
+    (HOST_FAILURE_KINDS) → meio-aberto depois de `reset_timeout`, quando só
+    HALF_OPEN_PROBES sondas passam; sonda ok fecha, sonda com falha reabre
+    com o tempo dobrado (até MAX_RESET_TIMEOUT).
+
+    O controlador vale para um processo: no crawl sharded, com o mesmo host
+    em `shared_by` processos, cada um usa 1/shared_by das vagas (no mínimo
+    uma) e espaça as requisições shared_by vezes mais (inclusive o
+    Crawl-delay do robots.txt), mantendo os limites somados.
+    """
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, min_delay: float = DEFAULT_MIN_DELAY,
+                 failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT, respect_robots: bool = True,
+                 robots_fetcher=fetch_robots_txt, clock=time.monotonic, shared_by: int = 1):
+        """Inicializa controlador
+
+        Args:
+            max_in_flight: Renders simultâneos por host
+            min_delay: Intervalo mínimo (s) entre inícios no mesmo host
+            failure_threshold: Falhas de host seguidas para abrir o circuito
+            reset_timeout: Tempo (s) aberto antes da primeira sonda
+            respect_robots: Lê o Crawl-delay do robots.txt de cada host
+            robots_fetcher: Corrotina robots_url → texto | None (injetável em testes)
+            clock: Relógio monotônico (injetável em testes)
+            shared_by: Processos que dividem os mesmos hosts (crawl sharded)
+        """
+        self.shared_by = max(1, shared_by)
+        self.max_in_flight = max(1, max_in_flight // self.shared_by)
+        self.min_delay = min_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.respect_robots = respect_robots
+        self.robots_fetcher = robots_fetcher
+        self._clock = clock
+
+        self._hosts = {}
+        self._loop = None
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def _state(self, host: str) -> HostState:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Semáforos/tasks de outro loop não servem aqui; o circuito sobrevive
+            for state in self._hosts.values():
+                state.semaphore = asyncio.Semaphore(self.max_in_flight)
+                state.robots = None
+            self._loop = loop
+
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(self.max_in_flight)
+            state.reset_timeout = self.reset_timeout
+        return state
+
+    def circuit_state(self, url: str) -> str:
+        """Estado do circuito do host de `url` (closed/open/half_open)"""
+        state = self._hosts.get(self.host_of(url))
+        return state.circuit if state else CLOSED
+
+    # =======================================
+    # CIRCUIT BREAKER
+    # =======================================
+
+    def _check_circuit(self, host: str, state: HostState) -> bool:
+        """Levanta HostUnavailable se o host não aceita requisições agora
+
+        Returns:
+            True se esta requisição é uma sonda do circuito meio-aberto
+        """
+        if state.circuit == CLOSED:
+            return False
+
+        now = self._clock()
+        if state.circuit == OPEN:
+            if now < state.open_until:
+                raise HostUnavailable(host, state.open_until - now)
+            state.circuit = HALF_OPEN
+            logger.info(f"Circuito meio-aberto: {host} (sondando)")
+
+        if state.probes >= HALF_OPEN_PROBES:
+            raise HostUnavailable(host, state.reset_timeout / 2)
+        return True
+
+    def record(self, url: str, failure: dict | None):
+        """Registra o desfecho de uma requisição ao host de `url`
+
+        Args:
+            failure: Falha classificada (ver retry) ou None em caso de sucesso
+        """
+        host = self.host_of(url)
+        state = self._hosts.get(host)
+        if state is None:
+            return
+
+        if failure is not None and failure.get("retry_after"):
+            # 429/503 com Retry-After: o host inteiro espera, não só a página
+            pause = min(failure["retry_after"], MAX_RESET_TIMEOUT)
+            state.pause_until = max(state.pause_until, self._clock() + pause)
+
+        if failure is None or failure["kind"] not in HOST_FAILURE_KINDS:
+            if state.circuit != CLOSED:
+                logger.info(f"Circuito fechado: {host}")
+            state.circuit = CLOSED
+            state.consecutive_failures = 0
+            state.reset_timeout = self.reset_timeout
+            return
+
+        state.consecutive_failures += 1
+        if state.circuit == HALF_OPEN:
+            state.reset_timeout = min(state.reset_timeout * 2, MAX_RESET_TIMEOUT)
+            self._open(host, state)
+        elif state.circuit == CLOSED and state.consecutive_failures >= self.failure_threshold:
+            self._open(host, state)
+
+    def _open(self, host: str, state: HostState):
+        state.circuit = OPEN
+        state.open_until = self._clock() + state.reset_timeout
+        logger.warning(f"Circuito ABERTO: {host} ({state.consecutive_failures} falhas seguidas, "
+                       f"nova sonda em {state.reset_timeout:.0f}s)")
+
+    # =======================================
+    # POLITENESS
+    # =======================================
+
+    async def _load_robots(self, host: str, state: HostState):
+        """Lê o Crawl-delay do robots.txt do host (uma vez por host)"""
+        if not self.respect_robots:
+            return
+        if state.robots is None:
+            state.robots = asyncio.ensure_future(self._fetch_crawl_delay(host, state))
+        await asyncio.shield(state.robots)
+
+    async def _fetch_crawl_delay(self, host: str, state: HostState):
+        try:
+            text = await self.robots_fetcher(f"{host}/robots.txt")
+        except Exception as e:
+            logger.debug("Erro ao ler robots.txt de %s: %s", host, e)
+            return
+        if not text:
+            return
+        parser = RobotFileParser()
+        parser.parse(text.splitlines())
+        delay = parser.crawl_delay("*")
+        if delay:
+            state.crawl_delay = min(float(delay), MAX_CRAWL_DELAY)
+            logger.info(f"robots.txt de {host}: Crawl-delay {delay}s"
+                        + (f" (limitado a {MAX_CRAWL_DELAY:.0f}s)" if float(delay) > MAX_CRAWL_DELAY else ""))
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str):
+        """Vaga para uma requisição ao host de `url`
+
+        Raises:
+            HostUnavailable: Circuito do host aberto (ou sonda já em andamento)
+        """
+        host = self.host_of(url)
+        state = self._state(host)
+        self._check_circuit(host, state)  # falha rápido sem entrar na fila do host
+
+        await self._load_robots(host, state)
+        async with state.semaphore:
+            probe = self._check_circuit(host, state)
+            if probe:
+                state.probes += 1
+            try:
+                # Reserva o horário de início antes de dormir: tarefas
+                # concorrentes do mesmo host ficam espaçadas entre si
+                now = self._clock()
+                start = max(now, state.next_start, state.pause_until)
+                state.next_start = start + max(self.min_delay, state.crawl_delay) * self.shared_by
+                if start > now:
+                    with telemetry.stage("host_wait"):
+                        await asyncio.sleep(start - now)
+                yield
+            finally:
+                if probe:
+                    state.probes -= 1
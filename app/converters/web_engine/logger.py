@@ -10,6 +10,7 @@ import io
 import os
 import logging
 import traceback
+import contextlib
 from pathlib import Path
 
 # ===========================================
@@ -25,12 +26,19 @@ if sys.platform.startswith('win'):
 # LOGGER PARANÓICO - DIAGNÓSTICO FORENSE
 # ===========================================
 
+# LCB_LOG_DIR=/outra/pasta troca a pasta de logs (testes, execuções isoladas)
+LOG_DIR_ENV = "LCB_LOG_DIR"
+
+
 def get_log_dir():
     """Retorna o caminho da pasta de logs centralizada na raiz do projeto"""
     # Sempre retorna PROJECT_ROOT/logs/ independente de onde o código está sendo executado
 
+    # Pasta explícita via ambiente (herdada pelos subprocessos)
+    if os.environ.get(LOG_DIR_ENV):
+        logs_dir = Path(os.environ[LOG_DIR_ENV])
     # Se estiver rodando como .exe (PyInstaller), usar o diretório do executável
-    if getattr(sys, 'frozen', False):
+    elif getattr(sys, 'frozen', False):
         exe_dir = Path(sys.executable).parent
         logs_dir = exe_dir / 'logs'
     else:
@@ -41,13 +49,112 @@ def get_log_dir():
         logs_dir = project_root / 'logs'
 
     # Garantir que a pasta existe
-    logs_dir.mkdir(exist_ok=True)
+    logs_dir.mkdir(parents=True, exist_ok=True)
 
     return logs_dir
 
 
+# Rotação do debug_trace.log (10 MB x 5 arquivos)
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# Nível do arquivo/root e níveis por logger, ex:
+#   LCB_LOG_LEVEL=INFO
+#   LCB_LOG_LEVELS="crawl4ai=DEBUG,asyncio=WARNING,web_converter=DEBUG"
+LOG_LEVEL_ENV = "LCB_LOG_LEVEL"
+LOG_LEVELS_ENV = "LCB_LOG_LEVELS"
+
+# LCB_LOG_STREAM=stderr manda banner e console para o stderr: a CLI reserva o
+# stdout para eventos JSON, e processos filhos (spawn) herdam o ambiente
+LOG_STREAM_ENV = "LCB_LOG_STREAM"
+
+# Terceiros em INFO por padrão (DEBUG deles domina o arquivo em crawls longos)
+DEFAULT_LOGGER_LEVELS = {
+    'crawl4ai': 'INFO',
+    'asyncio': 'INFO',
+    'urllib3': 'INFO',
+    'playwright': 'INFO',
+    'pymupdf': 'INFO',
+    'beautifulsoup4': 'INFO',
+    'httpx': 'INFO',
+    'httpcore': 'INFO',
+}
+
+# Listener da fila (thread única que formata e escreve em disco/console)
+_queue_listener = None
+
+
+def parse_logger_levels(spec: str) -> dict[str, str]:
+    """Converte "nome=NIVEL,nome2=NIVEL" em dict (entradas inválidas são ignoradas)"""
+    levels = {}
+    for item in (spec or "").split(","):
+        name, sep, level = item.partition("=")
+        level = level.strip().upper()
+        if sep and name.strip() and isinstance(logging.getLevelName(level), int):
+            levels[name.strip()] = level
+    return levels
+
+
+def get_console_stream():
+    """Stream do console: stdout, ou stderr com LCB_LOG_STREAM=stderr"""
+    if os.environ.get(LOG_STREAM_ENV, "").lower() == "stderr":
+        return sys.stderr
+    return sys.stdout
+
+
+def flush_logs():
+    """Esvazia a fila e força o flush dos handlers (crash/atexit)
+
+    O QueueListener.stop() processa todos os registros pendentes antes de
+    retornar; o listener é reiniciado para os logs seguintes.
+    """
+    if _queue_listener is None:
+        return
+    try:
+        if _queue_listener._thread is not None:
+            _queue_listener.stop()
+            for handler in _queue_listener.handlers:
+                try:
+                    handler.flush()
+                except (OSError, ValueError):
+                    pass
+            _queue_listener.start()
+    except Exception as e:
+        print(f"Falha no flush dos logs: {e}", file=sys.stderr)
+
+
+def _stop_queue_listener():
+    """atexit: drena a fila e encerra a thread do listener"""
+    global _queue_listener
+    if _queue_listener is not None and _queue_listener._thread is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            try:
+                handler.flush()
+                handler.close()
+            except (OSError, ValueError):
+                pass  # Stream já fechado (ex: stdout capturado no encerramento)
+    _queue_listener = None
+
+
 def setup_paranoid_logger():
-    """Configura logger paranóico para capturar TODOS os erros silenciosos"""
+    """Configura logger paranóico para capturar TODOS os erros silenciosos
+
+    Os registros entram numa fila (QueueHandler, custo mínimo na thread que
+    loga) e uma thread dedicada (QueueListener) grava o arquivo rotativo e o
+    console. Crash e saída do processo esvaziam a fila antes de terminar.
+    Banner e console vão para get_console_stream().
+    """
+    with contextlib.redirect_stdout(get_console_stream()):
+        return _setup_paranoid_logger()
+
+
+def _setup_paranoid_logger():
+    """Corpo de setup_paranoid_logger (prints já no stream do console)"""
+    global _queue_listener
+    import atexit
+    import queue
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
     # === 1. DIAGNÓSTICO DE AMBIENTE ===
     print("=" * 80)
@@ -70,7 +177,10 @@ def setup_paranoid_logger():
     # === 2. CONFIGURAÇÃO DO ROOT LOGGER (CAPTURA GLOBAL) ===
     # Configurar ROOT logger para capturar logs de TODAS as bibliotecas
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
+    root_level = os.environ.get(LOG_LEVEL_ENV, "DEBUG").upper()
+    if not isinstance(logging.getLevelName(root_level), int):
+        root_level = "DEBUG"
+    root_logger.setLevel(root_level)
 
     # Formato forense com arquivo e linha de origem
     formatter = logging.Formatter(
@@ -87,25 +197,39 @@ def setup_paranoid_logger():
     # Definir arquivo de log
     debug_log_file = logs_dir / 'debug_trace.log'
 
-    # Handler para arquivo (persistência imediata - buffer=0)
-    file_handler = logging.FileHandler(
+    # Handler para arquivo (rotativo; escrito só pela thread do listener).
+    # Processos filhos (crawl sharded, executor) só acrescentam: rotacionar o
+    # mesmo arquivo a partir de vários processos corrompe a sequência
+    from multiprocessing import parent_process
+    file_handler = RotatingFileHandler(
         debug_log_file,
-        encoding='utf-8',
-        delay=False  # Abrir arquivo imediatamente
+        maxBytes=LOG_MAX_BYTES if parent_process() is None else 0,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    # Forçar flush imediato para capturar crashes
-    file_handler.flush()
-    root_logger.addHandler(file_handler)
 
     # Handler para console (sempre ativo)
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(get_console_stream())
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
 
-    print("📝 LOGGER CENTRALIZADO ATIVO")
+    # Reconfiguração (ex: reimport em testes): encerra o listener anterior
+    if _queue_listener is not None:
+        _stop_queue_listener()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            root_logger.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(log_queue, file_handler, console_handler,
+                                    respect_handler_level=True)
+    _queue_listener.start()
+    atexit.register(_stop_queue_listener)
+
+    print("📝 LOGGER CENTRALIZADO ATIVO (fila assíncrona + rotação)")
     print(f"📄 Arquivo de debug: {debug_log_file}")
     if is_compiled:
         print("📦 Modo compilado (.EXE)")
@@ -113,21 +237,13 @@ def setup_paranoid_logger():
         print("🐍 Modo desenvolvimento")
 
     # === 4. CONFIGURAÇÃO DE LOGGERS DE TERCEIROS ===
-    # Capturar logs de bibliotecas críticas
-    third_party_loggers = [
-        'crawl4ai',
-        'asyncio',
-        'urllib3',
-        'playwright',
-        'pymupdf',
-        'beautifulsoup4'
-    ]
-
-    for logger_name in third_party_loggers:
-        third_logger = logging.getLogger(logger_name)
-        third_logger.setLevel(logging.DEBUG)
-        third_logger.addHandler(file_handler)  # Mesmo handler para consistência
-        print(f"🔍 Logger '{logger_name}' configurado para DEBUG")
+    # Nível por logger (propagam para o root; sem handler próprio = sem duplicatas)
+    logger_levels = dict(DEFAULT_LOGGER_LEVELS)
+    logger_levels.update(parse_logger_levels(os.environ.get(LOG_LEVELS_ENV, "")))
+
+    for logger_name, level in logger_levels.items():
+        logging.getLogger(logger_name).setLevel(level)
+        print(f"🔍 Logger '{logger_name}' configurado para {level}")
 
     print("=" * 80)
 
@@ -150,15 +266,27 @@ def setup_paranoid_logger():
         print(error_msg, file=sys.stderr)
         print("=" * 80, file=sys.stderr)
 
-        # Forçar flush de todos os handlers antes de morrer
-        for handler in root_logger.handlers:
-            handler.flush()
+        # Esvaziar a fila e forçar flush em disco antes de morrer
+        flush_logs()
 
         # Chamar o hook original
         sys.__excepthook__(exc_type, exc_value, exc_traceback)
 
+    def paranoid_thread_excepthook(args):
+        """Mesma garantia para exceções que matam threads (workers, listener, preload)"""
+        if args.exc_type is SystemExit:
+            return
+        thread_name = args.thread.name if args.thread else "?"
+        root_logger.critical(
+            "💥 CRASH EM THREAD %s:\n%s", thread_name,
+            "".join(traceback.format_exception(args.exc_type, args.exc_value, args.exc_traceback))
+        )
+        flush_logs()
+
     # Instalar o hook paranóico
+    import threading
     sys.excepthook = paranoid_excepthook
+    threading.excepthook = paranoid_thread_excepthook
     root_logger.info("🛡️  Excepthook paranóico instalado - capturando crashes silenciosos")
 
     print("🛡️  EXCEPT HOOK PARANÓICO INSTALADO")
@@ -0,0 +1,226 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Page Store Module - V3.0                                               ║
+║ Corpos de página endereçados por conteúdo + manifestos dos documentos      ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import os
+import json
+import time
+import uuid
+from pathlib import Path
+from datetime import datetime
+
+from .logger import logger
+from .postprocess import content_hash
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+# prune não apaga corpos mais novos que isso: um crawl em andamento grava os
+# corpos antes do manifesto que os referencia
+PRUNE_MIN_AGE = 3600
+
+# Campos de cada página guardados no manifesto (o corpo fica no store);
+# etag/lastmod permitem revalidar a página sem novo render, render_type e
+# validators_from dizem se eles valem para o conteúdo (ver updater)
+ENTRY_FIELDS = ("url", "title", "hash", "tokens", "render_type", "etag", "lastmod", "validators_from")
+
+
+def get_store_dir() -> Path:
+    """Pasta padrão do store (<raiz>/page_store, ao lado de logs/ e jobs/)"""
+    from .logger import get_log_dir
+    return get_log_dir().parent / "page_store"
+
+
+def manifest_path_for(output_path: str | Path) -> Path:
+    """docs.md → docs.manifest.json"""
+    output_p = Path(output_path)
+    return output_p.with_name(f"{output_p.stem}{MANIFEST_SUFFIX}")
+
+
+def load_manifest(path: str | Path) -> dict:
+    """Lê um manifesto de documento
+
+    Raises:
+        ValueError: Arquivo não é um manifesto (ou de versão desconhecida)
+    """
+    manifest = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Manifesto inválido ou de versão desconhecida: {path}")
+    return manifest
+
+
+def save_manifest(manifest: dict, path: str | Path):
+    """Grava o manifesto (atômico: nunca fica meio escrito)"""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ===========================================
+# CLASSE PAGE STORE
+# ===========================================
+
+class PageStore:
+    """Corpos de página limpos, endereçados pelo hash do conteúdo
+
+    Cada corpo é gravado uma única vez em objects/<2 primeiros>/<hash>.md
+    (blake2b de postprocess.content_hash, estável entre processos), não
+    importa quantos jobs/sites o produzam. Um documento passa a ser um
+    manifesto (url, título, hash, tokens por página) e o ConsolidatedWriter
+    expande o manifesto em Markdown quando precisa, lendo um corpo por vez.
+    """
+
+    def __init__(self, root: str | Path = None):
+        """Inicializa store
+
+        Args:
+            root: Pasta do store (default: get_store_dir())
+        """
+        self.root = Path(root) if root else get_store_dir()
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+    # =======================================
+    # CORPOS
+    # =======================================
+
+    def path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.md"
+
+    def has(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def put(self, markdown: str, digest: str = None) -> tuple[str, bool]:
+        """Guarda um corpo (no-op se o mesmo conteúdo já está no store)
+
+        Args:
+            markdown: Markdown limpo da página
+            digest: Hash já calculado no pós-processamento (evita recalcular)
+
+        Returns:
+            (hash, True se o corpo foi gravado agora)
+        """
+        digest = digest or content_hash(markdown)
+        path = self.path(digest)
+        if path.exists():
+            return digest, False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{digest}.{uuid.uuid4().hex}.tmp")
+        tmp.write_bytes(markdown.encode("utf-8"))
+        os.replace(tmp, path)  # dois jobs gravando o mesmo corpo: o conteúdo é idêntico
+        return digest, True
+
+    def get(self, digest: str) -> str:
+        """Lê um corpo
+
+        Raises:
+            KeyError: Hash ausente do store
+        """
+        try:
+            return self.path(digest).read_bytes().decode("utf-8")
+        except FileNotFoundError:
+            raise KeyError(f"Corpo ausente do page store: {digest}") from None
+
+    # =======================================
+    # MANIFESTOS
+    # =======================================
+
+    def build_manifest(self, contents: list[dict], **meta) -> dict:
+        """Guarda os corpos das páginas e monta o manifesto do documento
+
+        Args:
+            contents: Páginas [{"url", "title", "markdown", "tokens", "hash"?}]
+            **meta: Campos extras do manifesto (opções de gravação, origem...)
+
+        Returns:
+            {"version", "created", "pages": [{campos de ENTRY_FIELDS}], **meta}
+        """
+        entries = []
+        written = 0
+        for page in contents:
+            digest, new = self.put(page["markdown"], page.get("hash"))
+            written += new
+            entries.append({**{k: page.get(k) for k in ENTRY_FIELDS}, "hash": digest})
+
+        logger.info(f"Page store: {len(entries)} páginas, {written} corpos novos, "
+                    f"{len(entries) - written} reaproveitados")
+        return {
+            "version": MANIFEST_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "pages": entries,
+            **meta
+        }
+
+    def expand(self, manifest: dict) -> list[dict]:
+        """Páginas completas de um manifesto (corpo lido do store)
+
+        Raises:
+            KeyError: Algum corpo referenciado não está no store
+        """
+        return [{**entry, "markdown": self.get(entry["hash"])} for entry in manifest["pages"]]
+
+    def missing(self, manifest: dict) -> list[str]:
+        """Hashes referenciados pelo manifesto e ausentes do store"""
+        return [entry["hash"] for entry in manifest["pages"] if not self.has(entry["hash"])]
+
+    # =======================================
+    # LIMPEZA
+    # =======================================
+
+    def prune(self, roots: list[str | Path], min_age: float = PRUNE_MIN_AGE,
+              dry_run: bool = False) -> dict:
+        """Apaga corpos que nenhum manifesto referencia
+
+        Args:
+            roots: Manifestos ou pastas (busca recursiva por *.manifest.json)
+                com todos os documentos que ainda usam este store
+            min_age: Idade mínima (s) de um corpo para ser apagado
+            dry_run: Só conta o que seria apagado
+
+        Returns:
+            {"manifests", "referenced", "removed", "freed_bytes", "kept_recent"}
+
+        Raises:
+            ValueError: Nenhum manifesto encontrado (apagaria o store inteiro)
+        """
+        manifests = []
+        for root in map(Path, roots):
+            manifests += [root] if root.is_file() else sorted(root.rglob(f"*{MANIFEST_SUFFIX}"))
+
+        referenced = set()
+        for manifest_p in manifests:
+            try:
+                referenced.update(entry["hash"] for entry in load_manifest(manifest_p)["pages"])
+            except (ValueError, KeyError, OSError) as e:
+                # Manifesto ilegível pode referenciar qualquer corpo: não arrisca
+                raise ValueError(f"Manifesto ilegível, limpeza abortada: {manifest_p} ({e})") from e
+        if not manifests:
+            raise ValueError(f"Nenhum manifesto em {', '.join(map(str, roots))}: nada seria mantido")
+
+        stats = {"manifests": len(manifests), "referenced": len(referenced),
+                 "removed": 0, "freed_bytes": 0, "kept_recent": 0}
+        cutoff = time.time() - min_age
+        for body in self.objects.glob("*/*.md"):
+            if body.stem in referenced:
+                continue
+            info = body.stat()
+            if info.st_mtime > cutoff:
+                stats["kept_recent"] += 1
+                continue
+            stats["removed"] += 1
+            stats["freed_bytes"] += info.st_size
+            if not dry_run:
+                body.unlink(missing_ok=True)
+
+        logger.info(f"Page store prune{' (simulação)' if dry_run else ''}: {stats['removed']} corpos "
+                    f"({stats['freed_bytes'] / 1e6:.1f} MB) sem referência em {len(manifests)} manifestos")
+        return stats
@@ -0,0 +1,197 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Post-Process Module - V3.0                                             ║
+║ Pipeline CPU-bound (título, limpeza, hash, tokens) fora do event loop      ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from .logger import logger
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+# "thread": limpeza/tokens em threads (tiktoken libera o GIL)
+# "process": paralelismo real, com cleaner/tokenizer próprios por processo
+EXECUTOR_KINDS = ("thread", "process")
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+# ===========================================
+# FUNÇÕES PURAS (EXECUTADAS NO EXECUTOR)
+# ===========================================
+
+def content_hash(markdown: str) -> str:
+    """Hash de deduplicação do conteúdo (estável entre processos, ao contrário de hash())"""
+    return hashlib.blake2b(markdown.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def title_from_markdown(markdown: str) -> str:
+    """Primeiro H1 ou H2 do markdown limpo"""
+    for linha in markdown.split('\n'):
+        if linha.startswith('# '):
+            return linha[2:].strip()
+        elif linha.startswith('## '):
+            return linha[3:].strip()
+    return "Sem Título"
+
+
+def extract_title_from_html(html: str, url: str) -> str:
+    """Extrai título de <title> ou <meta property="og:title">"""
+    try:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Tenta <title>
+        if soup.title and soup.title.string:
+            return soup.title.string.strip()
+
+        # Tenta og:title
+        og_title = soup.find('meta', property='og:title')
+        if og_title and og_title.get('content'):
+            return og_title['content'].strip()
+
+    except Exception as e:
+        logger.debug("Erro ao extrair título: %s", e)
+
+    # Fallback: última parte da URL
+    path_parts = urlparse(url).path.strip('/').split('/')
+    return path_parts[-1].replace('-', ' ').title() if path_parts else "Sem Título"
+
+
+def process_markdown(markdown: str, cleaner, token_counter) -> dict:
+    """Limpeza + título + hash + tokens de uma página
+
+    Returns:
+        {"title", "markdown" (limpo), "tokens", "hash", "timings"}
+        (timings: segundos por etapa, para a telemetria do chamador)
+    """
+    clock = time.perf_counter
+    t0 = clock()
+    md_limpo = cleaner.limpar_markdown_google(markdown)
+    title = title_from_markdown(md_limpo)
+    t1 = clock()
+    digest = content_hash(md_limpo)
+    t2 = clock()
+    tokens = token_counter.count_tokens(md_limpo)
+    t3 = clock()
+    return {
+        "title": title,
+        "markdown": md_limpo,
+        "tokens": tokens,
+        "hash": digest,
+        "timings": {"clean": t1 - t0, "dedup": t2 - t1, "tokens": t3 - t2}
+    }
+
+
+# Estado dos processos do executor "process" (criado no initializer)
+_worker_cleaner = None
+_worker_token_counter = None
+
+
+def _init_process_worker(model: str):
+    global _worker_cleaner, _worker_token_counter
+    from .cleaner import WebCleaner
+    from app.utils.token_counter import TokenCounter
+    _worker_cleaner = WebCleaner()
+    _worker_token_counter = TokenCounter(model)
+
+
+def _process_markdown_in_worker(markdown: str) -> dict:
+    return process_markdown(markdown, _worker_cleaner, _worker_token_counter)
+
+
+# ===========================================
+# CLASSE POST PROCESSOR
+# ===========================================
+
+class PostProcessor:
+    """Executa o pós-processamento das páginas num executor com fila limitada
+
+    O event loop só aguarda (run_in_executor), então downloads/renders
+    seguem enquanto páginas grandes são limpas. No máximo `max_pending`
+    páginas ficam na fila do executor; acima disso quem entrega resultados
+    espera (backpressure), limitando a memória de markdown bruto retido.
+    """
+
+    def __init__(self, cleaner, token_counter, kind: str = "thread",
+                 workers: int = None, max_pending: int = None):
+        """Inicializa pipeline (o executor sobe no primeiro uso)
+
+        Args:
+            cleaner: WebCleaner usado no executor de threads
+            token_counter: TokenCounter usado no executor de threads (o de
+                processos cria o seu com o mesmo modelo)
+            kind: "thread" ou "process"
+            workers: Workers do executor (default: min(4, núcleos))
+            max_pending: Páginas aguardando/em processamento (default: 2x workers)
+
+        Raises:
+            ValueError: Se kind for inválido
+        """
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Executor de pós-processamento inválido: {kind}")
+
+        self.cleaner = cleaner
+        self.token_counter = token_counter
+        self.kind = kind
+        self.workers = workers or DEFAULT_WORKERS
+        self.max_pending = max_pending or self.workers * 2
+
+        self._executor = None
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                import multiprocessing
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_process_worker,
+                    initargs=(getattr(self.token_counter, "model", "gpt-4"),)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="postprocess")
+            logger.info(f"Pós-processamento em executor {self.kind} ({self.workers} workers, "
+                        f"fila {self.max_pending})")
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Semáforo da fila limitada (um por event loop)"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _submit(self, fn, *args):
+        async with self._get_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+
+    async def process(self, markdown: str) -> dict:
+        """Pós-processa o markdown bruto de uma página (ver process_markdown)"""
+        markdown = str(markdown or "")  # StringCompatibleMarkdown → str (picklável)
+        if self.kind == "process":
+            return await self._submit(_process_markdown_in_worker, markdown)
+        return await self._submit(process_markdown, markdown, self.cleaner, self.token_counter)
+
+    async def extract_title(self, html: str, url: str) -> str:
+        """Título do HTML (BeautifulSoup) fora do event loop"""
+        return await self._submit(extract_title_from_html, html, url)
+
+    def shutdown(self, wait: bool = True):
+        """Encerra o executor (recriado sob demanda no próximo uso)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
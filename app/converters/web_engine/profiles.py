@@ -0,0 +1,115 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Profiles Module - V3.0                                                 ║
+║ Perfis de render (texto enxuto x completo) e bloqueio de recursos          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+from urllib.parse import urlparse
+
+from .logger import logger
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+# "text": bloqueia imagens/mídia/fontes/trackers e espera DOM estável
+# "full": comportamento original (tudo carregado, networkidle)
+PROFILE_TEXT = "text"
+PROFILE_FULL = "full"
+PROFILES = (PROFILE_TEXT, PROFILE_FULL)
+
+# Tipos de recurso do Playwright que não afetam o texto extraído
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+# Domínios de analytics/tracking (bloqueados inclusive em subdomínios)
+TRACKER_DOMAINS = frozenset({
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "connect.facebook.net",
+    "hotjar.com", "clarity.ms", "segment.com", "segment.io", "mixpanel.com",
+    "amplitude.com", "fullstory.com", "intercom.io", "newrelic.com",
+    "nr-data.net", "optimizely.com", "scorecardresearch.com", "heapanalytics.com",
+})
+
+# Seletor do miolo de documentação (mesmo do crawl)
+CONTENT_ROOT_SELECTOR = "main, article, [role='main'], .content"
+
+
+def dom_stable_wait(quiet_ms: int = 500, selector: str = CONTENT_ROOT_SELECTOR) -> str:
+    """Condição `wait_for` (js:) que libera quando o DOM para de mudar
+
+    O crawl4ai avalia a função a cada 100ms; ela retorna true quando o
+    seletor de conteúdo existe e o tamanho do DOM ficou igual por quiet_ms.
+    Substitui networkidle + setTimeout fixo (sites com polling/websocket
+    nunca ficam "idle").
+
+    Args:
+        quiet_ms: Janela sem mudanças exigida
+        selector: Seletor que precisa existir (vazio = só estabilidade)
+    """
+    selector_check = f"if (!document.querySelector({selector!r})) return false;" if selector else ""
+    return f"""js:(() => {{
+        let lastSize = -1;
+        let stableSince = Date.now();
+        return () => {{
+            if (!document.body) return false;
+            {selector_check}
+            const size = document.body.getElementsByTagName('*').length + document.body.textContent.length;
+            const now = Date.now();
+            if (size !== lastSize) {{
+                lastSize = size;
+                stableSince = now;
+                return false;
+            }}
+            return now - stableSince >= {int(quiet_ms)};
+        }};
+    }})()"""
+
+
+# ===========================================
+# BLOQUEIO DE RECURSOS
+# ===========================================
+
+def is_tracker(url: str) -> bool:
+    """True se o host da URL é (subdomínio de) um tracker conhecido"""
+    host = (urlparse(url).hostname or "").lower()
+    parts = host.split(".")
+    return any(".".join(parts[i:]) in TRACKER_DOMAINS for i in range(len(parts) - 1))
+
+
+def should_block(resource_type: str, url: str) -> bool:
+    """Decide se uma requisição é abortada no perfil de texto"""
+    return resource_type in BLOCKED_RESOURCE_TYPES or is_tracker(url)
+
+
+async def _route_text_profile(route):
+    """Handler de roteamento do Playwright (abort/continue)"""
+    request = route.request
+    if should_block(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_resources_hook(page, context=None, config=None, **kwargs):
+    """Hook on_page_context_created: intercepta requisições no perfil de texto
+
+    O perfil vem de config.shared_data["render_profile"] (definido por
+    WebAnalyzer.get_crawler_config), então o mesmo browser atende runs com
+    perfis diferentes.
+    """
+    shared = getattr(config, "shared_data", None) or {}
+    if shared.get("render_profile") != PROFILE_TEXT or getattr(page, "_lcb_blocking", False):
+        return page
+
+    await page.route("**/*", _route_text_profile)
+    page._lcb_blocking = True
+    return page
+
+
+def install_resource_blocking(crawler) -> None:
+    """Registra o hook de bloqueio num AsyncWebCrawler (antes ou depois do start)"""
+    try:
+        crawler.crawler_strategy.set_hook("on_page_context_created", block_resources_hook)
+    except Exception as e:
+        logger.warning(f"Não foi possível instalar bloqueio de recursos: {e}")
@@ -0,0 +1,117 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Progress Module - V3.0                                                 ║
+║ Eventos estruturados de progresso do crawl (throughput + ETA)              ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import time
+from collections import deque
+
+# ===========================================
+# CLASSE CRAWL PROGRESS
+# ===========================================
+
+class CrawlProgress:
+    """Acumula o progresso de um crawl e gera eventos (dict) para GUI/CLI/server
+
+    O throughput é uma média móvel sobre as últimas `window` páginas
+    concluídas; o ETA usa esse throughput para as páginas restantes.
+    """
+
+    STATUSES = ("ok", "cache", "duplicate", "failed")
+
+    def __init__(self, total: int, window: int = 20, clock=time.monotonic):
+        """Inicializa acumulador
+
+        Args:
+            total: Total de páginas do job
+            window: Páginas consideradas na média móvel
+            clock: Relógio monotônico (injetável em testes)
+        """
+        self.total = total
+        self.done = 0
+        self.bytes = 0
+        self.cache_hits = 0
+        self.failures = 0
+        self.duplicates = 0
+
+        self._clock = clock
+        self._started = clock()
+        self._completions = deque([self._started], maxlen=window + 1)
+
+    def record(self, url: str, status: str, nbytes: int = 0, error: str = None) -> dict:
+        """Registra página concluída e retorna o evento de progresso
+
+        Args:
+            url: URL processada
+            status: "ok", "cache", "duplicate" ou "failed"
+            nbytes: Bytes de HTML baixados/lidos do cache
+            error: Classe da falha definitiva (ver retry), só com "failed"
+
+        Returns:
+            Evento de progresso (ver snapshot)
+        """
+        if status not in self.STATUSES:
+            raise ValueError(f"Status de progresso inválido: {status}")
+
+        self.done += 1
+        self.bytes += nbytes
+        if status == "cache":
+            self.cache_hits += 1
+        elif status == "failed":
+            self.failures += 1
+        elif status == "duplicate":
+            self.duplicates += 1
+
+        self._completions.append(self._clock())
+        return self.snapshot(url=url, status=status, error=error)
+
+    def pages_per_sec(self) -> float:
+        """Throughput pela média móvel das últimas conclusões"""
+        span = self._completions[-1] - self._completions[0]
+        if span <= 0:
+            return 0.0
+        return (len(self._completions) - 1) / span
+
+    def eta_seconds(self) -> float | None:
+        """Tempo estimado para as páginas restantes (None sem throughput)"""
+        rate = self.pages_per_sec()
+        if rate <= 0:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def snapshot(self, url: str = None, status: str = None, error: str = None) -> dict:
+        """Evento de progresso atual
+
+        Returns:
+            {"done", "total", "bytes", "cache_hits", "failures", "duplicates",
+             "pages_per_sec", "eta_seconds", "elapsed", "url", "status", "error"}
+        """
+        eta = self.eta_seconds()
+        return {
+            "done": self.done,
+            "total": self.total,
+            "bytes": self.bytes,
+            "cache_hits": self.cache_hits,
+            "failures": self.failures,
+            "duplicates": self.duplicates,
+            "pages_per_sec": round(self.pages_per_sec(), 3),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+            "elapsed": round(self._clock() - self._started, 3),
+            "url": url,
+            "status": status,
+            "error": error
+        }
+
+
+def format_progress(event: dict) -> str:
+    """Resumo de uma linha para status bar/log
+
+    Ex: "120/1000 · 3.4 pág/s · ETA 04:19 · 12.3 MB · cache 40 · falhas 2"
+    """
+    eta = event.get("eta_seconds")
+    eta_str = f"{int(eta // 60):02d}:{int(eta % 60):02d}" if eta is not None else "--:--"
+    return (f"{event['done']}/{event['total']} · {event['pages_per_sec']:.1f} pág/s · "
+            f"ETA {eta_str} · {event['bytes'] / 1_000_000:.1f} MB · "
+            f"cache {event['cache_hits']} · falhas {event['failures']}")
@@ -0,0 +1,280 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Retry Module - V3.0                                                    ║
+║ Classificação de falhas, backoff exponencial e fila de retentativas        ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import heapq
+import random
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from .logger import logger
+
+# ===========================================
+# CLASSES DE FALHA
+# ===========================================
+
+TIMEOUT = "timeout"
+DNS = "dns"
+CONNECTION = "connection"
+HTTP_4XX = "http_4xx"
+HTTP_5XX = "http_5xx"
+RATE_LIMITED = "rate_limited"
+EMPTY_CONTENT = "empty_content"
+SELECTOR_NOT_FOUND = "selector_not_found"
+CIRCUIT_OPEN = "circuit_open"
+UNKNOWN = "unknown"
+
+# Política por classe: (retentativas, atraso base em s, teto do atraso em s)
+# 4xx e seletor ausente não mudam numa nova tentativa; timeout e DNS só
+# uma vez (cada timeout custa o page_timeout inteiro); circuito aberto
+# (ver hosts) espera o Retry-After até a próxima sonda do host
+RETRY_POLICIES = {
+    TIMEOUT: (1, 2.0, 30.0),
+    DNS: (1, 5.0, 30.0),
+    CONNECTION: (2, 1.0, 20.0),
+    HTTP_4XX: (0, 0.0, 0.0),
+    HTTP_5XX: (3, 1.0, 30.0),
+    RATE_LIMITED: (4, 5.0, 120.0),
+    EMPTY_CONTENT: (1, 2.0, 10.0),
+    SELECTOR_NOT_FOUND: (0, 0.0, 0.0),
+    CIRCUIT_OPEN: (3, 5.0, 300.0),
+    UNKNOWN: (1, 1.0, 10.0),
+}
+
+# Falhas do host inteiro (outra variação de URL no mesmo host não ajuda)
+HOST_FAILURES = (TIMEOUT, DNS, CONNECTION)
+
+# Trechos de error_message (crawl4ai/Playwright/httpx) → classe; a ordem
+# importa: "Wait condition failed: Timeout..." é seletor, não timeout
+_MESSAGE_PATTERNS = (
+    (SELECTOR_NOT_FOUND, ("wait condition failed", "waiting for selector", "no elements found")),
+    (DNS, ("err_name_not_resolved", "name or service not known", "nodename nor servname",
+           "getaddrinfo failed", "temporary failure in name resolution")),
+    (CONNECTION, ("err_connection", "err_internet_disconnected", "err_address_unreachable",
+                  "err_network_changed", "connection refused", "connection reset", "connecterror")),
+    (TIMEOUT, ("timeout", "timed out", "err_timed_out")),
+)
+
+
+def make_failure(kind: str, message: str = "", status_code: int = None, retry_after: float = None) -> dict:
+    """Falha classificada: {"kind", "message", "status_code", "retry_after"}"""
+    return {"kind": kind, "message": (message or "")[:300], "status_code": status_code,
+            "retry_after": retry_after}
+
+
+def classify_status(status_code: int | None) -> str | None:
+    """Classe de um status HTTP (None se não é erro)"""
+    if not status_code or status_code < 400:
+        return None
+    if status_code == 429:
+        return RATE_LIMITED
+    if status_code == 408:
+        return TIMEOUT
+    return HTTP_5XX if status_code >= 500 else HTTP_4XX
+
+
+def classify_message(message: str) -> str:
+    """Classe de uma mensagem de erro (UNKNOWN se nenhum padrão casa)"""
+    lowered = (message or "").lower()
+    for kind, patterns in _MESSAGE_PATTERNS:
+        if any(p in lowered for p in patterns):
+            return kind
+    return UNKNOWN
+
+
+def retry_after_seconds(headers: dict | None, now: datetime = None) -> float | None:
+    """Valor de Retry-After em segundos (aceita segundos ou data HTTP)"""
+    if not headers:
+        return None
+    value = next((v for k, v in headers.items() if k.lower() == "retry-after"), None)
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+def classify_result(result) -> dict | None:
+    """Classifica um CrawlResult do crawl4ai
+
+    Returns:
+        {"kind", "message", "status_code", "retry_after"} ou None se o
+        resultado é um sucesso
+    """
+    status_code = getattr(result, "status_code", None)
+    message = getattr(result, "error_message", None) or ""
+    kind = classify_status(status_code)
+
+    if kind is not None:
+        retry_after = retry_after_seconds(getattr(result, "response_headers", None))
+        return make_failure(kind, message or f"HTTP {status_code}", status_code, retry_after)
+    if not result.success:
+        return make_failure(classify_message(message), message, status_code)
+    return None
+
+
+def classify_empty() -> dict:
+    """Render ok, mas nada sobrou após o seletor de conteúdo e a limpeza"""
+    return make_failure(EMPTY_CONTENT, "conteúdo vazio após limpeza")
+
+
+def classify_soft_404(markdown: str | None) -> dict | None:
+    """Página de erro servida com status 200 ("404" no início do conteúdo)"""
+    if "404" in (markdown or "")[:100]:
+        return make_failure(HTTP_4XX, "soft 404 (página de erro com status 200)", 404)
+    return None
+
+
+def classify_exception(exc: BaseException) -> dict:
+    """Classifica uma exceção levantada durante o render"""
+    import asyncio
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        kind = TIMEOUT
+    else:
+        kind = classify_message(f"{type(exc).__name__}: {exc}")
+    return make_failure(kind, f"{type(exc).__name__}: {exc}")
+
+
+# ===========================================
+# POLÍTICA DE BACKOFF
+# ===========================================
+
+class RetryPolicy:
+    """Decide se/quando uma falha é retentada (backoff exponencial com jitter)"""
+
+    def __init__(self, policies: dict = None, rng: random.Random = None):
+        """Inicializa política
+
+        Args:
+            policies: {classe: (retentativas, base, teto)} (default: RETRY_POLICIES)
+            rng: Gerador do jitter (injetável em testes)
+        """
+        self.policies = dict(RETRY_POLICIES if policies is None else policies)
+        self.rng = rng or random.Random()
+
+    def backoff(self, kind: str, attempt: int) -> float:
+        """Atraso antes da tentativa attempt + 1
+
+        base * 2^(attempt-1) limitado ao teto, com "equal jitter" (metade
+        fixa, metade aleatória) para as retentativas não chegarem juntas.
+        """
+        _, base, cap = self.policies.get(kind, self.policies[UNKNOWN])
+        delay = min(cap, base * 2 ** (attempt - 1))
+        return delay / 2 + self.rng.uniform(0, delay / 2)
+
+    def decide(self, failure: dict, attempt: int) -> float | None:
+        """Atraso até a próxima tentativa ou None se a falha é definitiva
+
+        Args:
+            failure: Falha classificada (ver classify_result)
+            attempt: Número da tentativa que falhou (1 = primeira)
+        """
+        retries, _, cap = self.policies.get(failure["kind"], self.policies[UNKNOWN])
+        if attempt > retries:
+            return None
+
+        retry_after = failure.get("retry_after")
+        if retry_after is not None:
+            # Servidor pediu mais do que o teto: não segura o job esperando
+            if retry_after > cap:
+                return None
+            return max(retry_after, self.backoff(failure["kind"], attempt))
+        return self.backoff(failure["kind"], attempt)
+
+
+# ===========================================
+# FILA DE RETENTATIVAS
+# ===========================================
+
+class RetryQueue:
+    """Páginas aguardando nova tentativa, ordenadas pelo horário liberado
+
+    O crawl mistura as retentativas prontas com páginas novas em cada chunk,
+    então uma página em backoff nunca segura o trabalho saudável.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, item, attempt: int, delay: float):
+        """Agenda `item` para a tentativa `attempt` daqui a `delay` segundos"""
+        heapq.heappush(self._heap, (self._clock() + delay, self._seq, item, attempt))
+        self._seq += 1
+
+    def pop_due(self, limit: int) -> list[tuple[object, int]]:
+        """Retira até `limit` itens já liberados
+
+        Returns:
+            Pares (item, tentativa)
+        """
+        now = self._clock()
+        due = []
+        while self._heap and len(due) < limit and self._heap[0][0] <= now:
+            _, _, item, attempt = heapq.heappop(self._heap)
+            due.append((item, attempt))
+        return due
+
+    def next_delay(self) -> float | None:
+        """Segundos até o próximo item ficar pronto (None se a fila está vazia)"""
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - self._clock(), 0.0)
+
+
+# ===========================================
+# RELATÓRIO DE FALHAS
+# ===========================================
+
+def summarize(failures: list[dict]) -> dict:
+    """{classe: quantidade} de uma lista de falhas do relatório"""
+    return dict(Counter(f["kind"] for f in failures))
+
+
+class FailureReport:
+    """Falhas definitivas de um job (após esgotar as retentativas)"""
+
+    def __init__(self, failures: list = None):
+        """failures: Lista que recebe as falhas (a do chamador do crawl, se houver)"""
+        self.failures = failures if failures is not None else []
+
+    def __len__(self) -> int:
+        return len(self.failures)
+
+    def add(self, url: str, failure: dict, attempts: int):
+        self.failures.append({"url": url, "attempts": attempts, **failure})
+
+    def extend(self, failures: list[dict]):
+        self.failures.extend(failures)
+
+    def summary(self) -> dict:
+        """{classe: quantidade}"""
+        return summarize(self.failures)
+
+    def log(self):
+        """Loga o resumo por classe e cada URL que falhou"""
+        if not self.failures:
+            return
+        by_kind = ", ".join(f"{kind} {count}" for kind, count in sorted(self.summary().items()))
+        logger.warning(f"FALHAS DEFINITIVAS: {len(self.failures)} páginas ({by_kind})")
+        for f in self.failures:
+            status = f" HTTP {f['status_code']}" if f.get("status_code") else ""
+            logger.warning(f"  ✗ [{f['kind']}{status}] {f['url']} "
+                           f"({f['attempts']} tentativas): {f['message']}")
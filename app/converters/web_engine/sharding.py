@@ -0,0 +1,370 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Sharding Module - V3.0                                                 ║
+║ Crawl dividido entre processos (um event loop + browser por núcleo)        ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import asyncio
+import hashlib
+import queue
+import threading
+import multiprocessing
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+from .logger import logger
+from .progress import CrawlProgress
+from .postprocess import content_hash
+from . import retry
+from app.utils.cancellation import CancellationToken, OperationCancelled
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+# Abaixo disso o custo de subir processos (crawl4ai + browser) não compensa
+SHARD_MIN_PAGES = 20
+
+# Intervalo de espera por eventos dos shards / espelhamento de pausa
+EVENT_POLL_SECONDS = 0.2
+
+PARTITION_MODES = ("auto", "host", "url")
+
+
+# ===========================================
+# PARTICIONAMENTO
+# ===========================================
+
+def stable_shard(key: str, shards: int) -> int:
+    """Shard de uma chave, estável entre processos/execuções (hash() não é)"""
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shards
+
+
+def partition_pages(pages: list[dict], shards: int, by: str = "auto") -> list[list[tuple[int, dict]]]:
+    """Divide as páginas selecionadas entre shards
+
+    Args:
+        pages: Páginas selecionadas (ordem da seleção)
+        shards: Número de shards desejado
+        by: "host" (um host fica num só processo), "url" (hash da URL) ou
+            "auto" (host quando há hosts suficientes para todos os shards)
+
+    Returns:
+        Shards não vazios com pares (índice na seleção, página)
+    """
+    if by not in PARTITION_MODES:
+        raise ValueError(f"Modo de particionamento inválido: {by}")
+
+    if by == "auto":
+        hosts = {urlparse(p["url"]).netloc for p in pages}
+        by = "host" if len(hosts) >= shards else "url"
+
+    buckets = [[] for _ in range(shards)]
+    for index, page in enumerate(pages):
+        key = urlparse(page["url"]).netloc if by == "host" else page["url"]
+        buckets[stable_shard(key, shards)].append((index, page))
+
+    return [bucket for bucket in buckets if bucket]
+
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc
+
+
+def host_sharing(shards: list[list[tuple[int, dict]]]) -> dict[str, int]:
+    """Em quantos shards cada host aparece
+
+    Com "url" (poucos hosts, ex: um único site de docs) o mesmo host fica em
+    todos os shards; cada processo divide por esse número as vagas e
+    multiplica o intervalo do seu HostController.
+    """
+    sharing = defaultdict(int)
+    for shard in shards:
+        for host in {_host(page["url"]) for _, page in shard}:
+            sharing[host] += 1
+    return dict(sharing)
+
+
+def host_options(controller) -> dict:
+    """Configuração do HostController do pai, recriado em cada shard"""
+    if controller is None:
+        return {}
+    return {"max_in_flight": controller.max_in_flight * controller.shared_by,
+            "min_delay": controller.min_delay, "failure_threshold": controller.failure_threshold,
+            "reset_timeout": controller.reset_timeout, "respect_robots": controller.respect_robots}
+
+
+# ===========================================
+# MERGE ORDENADO
+# ===========================================
+
+class OrderedMerger:
+    """Devolve as páginas dos shards na ordem da seleção, deduplicando
+
+    Resultados chegam fora de ordem; cada índice concluído (página ou None
+    para falha) libera o prefixo contíguo. A deduplicação por conteúdo é
+    feita aqui, na ordem original, então a página mantida é a mesma de um
+    crawl sequencial.
+    """
+
+    def __init__(self, total: int, on_page=None):
+        """Inicializa merger
+
+        Args:
+            total: Total de páginas da seleção
+            on_page: Callback chamado com cada página liberada (em ordem)
+        """
+        self.total = total
+        self.on_page = on_page
+        self.contents = []
+        self.duplicates = 0
+
+        self._pending = {}
+        self._next = 0
+        self._seen_hashes = set()
+
+    def add(self, index: int, page: dict | None) -> list[dict]:
+        """Registra o resultado de um índice e libera o prefixo pronto
+
+        Returns:
+            Páginas liberadas nesta chamada
+        """
+        self._pending[index] = page
+        released = []
+        while self._next in self._pending:
+            page = self._pending.pop(self._next)
+            self._next += 1
+            if page is not None and self._accept(page):
+                released.append(page)
+        return released
+
+    def drain(self) -> list[dict]:
+        """Libera tudo o que chegou, pulando lacunas (cancelamento/falha de shard)"""
+        released = []
+        for index in sorted(self._pending):
+            page = self._pending.pop(index)
+            if page is not None and self._accept(page):
+                released.append(page)
+        self._next = self.total
+        return released
+
+    def _accept(self, page: dict) -> bool:
+        digest = page.get("hash") or content_hash(page["markdown"])
+        if digest in self._seen_hashes:
+            self.duplicates += 1
+            logger.warning(f"⚠️ Conteúdo duplicado entre shards para {page['url']} - IGNORADO.")
+            return False
+
+        self._seen_hashes.add(digest)
+        self.contents.append(page)
+        if self.on_page is not None:
+            try:
+                self.on_page(page)
+            except Exception as e:
+                logger.error(f"Erro no callback on_page: {e}")
+        return True
+
+
+# ===========================================
+# PROCESSO WORKER
+# ===========================================
+
+def _mirror_control(token: CancellationToken, cancel_event, pause_event, stop: threading.Event):
+    """Thread do worker: espelha cancelamento/pausa do processo pai no token local"""
+    while not stop.wait(EVENT_POLL_SECONDS):
+        if cancel_event.is_set():
+            token.cancel()
+            return
+        if pause_event.is_set():
+            token.pause()
+        else:
+            token.resume()
+
+
+def _shard_worker(shard: list[tuple[int, dict]], options: dict, events,
+                  cancel_event, pause_event) -> list[tuple[str, str, str]]:
+    """Crawl de um shard num processo próprio (event loop + browser próprios)
+
+    Cada página concluída vira um evento ("done", índice, url, status, bytes,
+    página | None) na fila do pai, precedido de ("failure", falha) quando
+    ela falhou em definitivo (ver retry.FailureReport).
+
+    options traz o render_type detectado pelo pai e as entradas de cache do
+    pai para as URLs do shard (páginas já renderizadas no scan).
+
+    Returns:
+        Entradas (url, html, markdown) do cache do shard, para o cache do pai
+    """
+    from .crawler import WebCrawlerService
+
+    service = WebCrawlerService(static_fast_path=options.get("static_fast_path", True))
+    service.seed_cache(options.get("cache", []))
+    if options.get("host_shared_by", 1) > 1:
+        # Host dividido com outros shards: politeness somada continua a de um processo
+        from .hosts import HostController
+        service.hosts = HostController(**options.get("host_options", {}),
+                                       shared_by=options["host_shared_by"])
+    token = CancellationToken()
+    stop = threading.Event()
+    threading.Thread(target=_mirror_control, args=(token, cancel_event, pause_event, stop),
+                     daemon=True).start()
+
+    indices = defaultdict(deque)
+    for index, page in shard:
+        indices[page["url"]].append(index)
+    done_pages = {}
+
+    def on_progress(event):
+        url = event["url"]
+        if not indices[url]:
+            return
+        index = indices[url].popleft()
+        page = done_pages.pop(url, None) if event["status"] in ("ok", "cache") else None
+        if event.get("error"):
+            failure = next((f for f in reversed(service.last_failures) if f["url"] == url), None)
+            if failure is not None:
+                events.put(("failure", failure))
+        events.put(("done", index, url, event["status"], event["bytes"], page))
+
+    try:
+        asyncio.run(service.crawl_selected_pages(
+            [page for _, page in shard],
+            on_page=lambda page: done_pages.__setitem__(page["url"], page),
+            on_progress=on_progress,
+            cancel_token=token,
+            max_age=options.get("max_age"),
+            render_type=options.get("render_type")
+        ))
+    except OperationCancelled:
+        pass
+    finally:
+        stop.set()
+
+    entries = []
+    for _, page in shard:
+        cached = service._get_from_cache(page["url"])
+        if cached:
+            entries.append((page["url"], cached[0], cached[1]))
+    return entries
+
+
+# ===========================================
+# ORQUESTRAÇÃO (PROCESSO PAI)
+# ===========================================
+
+async def crawl_sharded(service, selected_pages: list[dict], processes: int, on_page=None,
+                        on_progress=None, cancel_token=None, max_age: float = None,
+                        by: str = "auto", worker=_shard_worker,
+                        failures: list = None, render_type: str = None) -> tuple[bool, list[dict]]:
+    """Crawl das páginas selecionadas em N processos, com merge ordenado
+
+    Mesmo contrato de WebCrawlerService.crawl_selected_pages: on_page recebe
+    as páginas na ordem da seleção, on_progress os eventos agregados de todos
+    os shards e o conteúdo baixado volta para o cache de `service`.
+
+    Args:
+        service: WebCrawlerService do processo pai (recebe o cache dos shards)
+        selected_pages: Páginas escolhidas
+        processes: Número máximo de processos
+        by: Modo de particionamento (ver partition_pages)
+        worker: Função executada em cada processo (injetável em testes)
+        failures: Lista que recebe as falhas definitivas (ver retry.FailureReport)
+        render_type: Tipo de renderização detectado no pai (repassado aos shards)
+
+    Raises:
+        OperationCancelled: Se o token for cancelado (partial = páginas já mescladas)
+    """
+    shards = partition_pages(selected_pages, processes, by)
+    logger.info(f"CRAWL SHARDED: {len(selected_pages)} páginas em {len(shards)} processos "
+                f"({[len(s) for s in shards]})")
+
+    sharing = host_sharing(shards)
+    progress = CrawlProgress(len(selected_pages))
+    merger = OrderedMerger(len(selected_pages), on_page=on_page)
+    report = retry.FailureReport(failures)
+    failures_by_url = {}
+    received = set()
+    options = {
+        "max_age": max_age,
+        "static_fast_path": getattr(service, "static_fetcher", None) is not None,
+        "render_type": render_type,
+        "host_options": host_options(getattr(service, "hosts", None))
+    }
+
+    # spawn: fork com threads (Qt, loop persistente) não é seguro
+    ctx = multiprocessing.get_context("spawn")
+    loop = asyncio.get_running_loop()
+
+    with ctx.Manager() as manager, ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as pool:
+        events = manager.Queue()
+        cancel_event = manager.Event()
+        pause_event = manager.Event()
+        if cancel_token:
+            cancel_token.add_callback(cancel_event.set)
+
+        # Cada shard leva o cache fresco do pai para as suas URLs (o do
+        # processo novo nasce vazio) e em quantos shards seus hosts estão
+        futures = [loop.run_in_executor(pool, worker, shard,
+                                        {**options, "cache": service.cache_entries(
+                                            [page["url"] for _, page in shard], max_age),
+                                         "host_shared_by": max(sharing[_host(page["url"])]
+                                                               for _, page in shard)},
+                                        events, cancel_event, pause_event)
+                   for shard in shards]
+
+        try:
+            while True:
+                try:
+                    event = await asyncio.to_thread(events.get, True, EVENT_POLL_SECONDS)
+                except queue.Empty:
+                    if all(f.done() for f in futures):
+                        break
+                    if cancel_token:
+                        (pause_event.set if cancel_token.paused else pause_event.clear)()
+                    continue
+
+                if event[0] == "failure":
+                    report.extend([event[1]])
+                    failures_by_url[event[1]["url"]] = event[1]["kind"]
+                    continue
+
+                _, index, url, status, nbytes, page = event
+                received.add(index)
+                merger.add(index, page)
+                service._notify(on_progress, progress.record(url, status, nbytes,
+                                                             error=failures_by_url.pop(url, None)))
+
+            results = await asyncio.gather(*futures, return_exceptions=True)
+        finally:
+            if cancel_token:
+                cancel_token.remove_callback(cancel_event.set)
+
+    # Shared cache: conteúdo dos shards disponível para jobs seguintes
+    for shard, result in zip(shards, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Shard de {len(shard)} páginas falhou: {result}")
+            continue
+        for url, html, markdown in result:
+            service._save_to_cache(url, html, markdown)
+
+    if cancel_token and cancel_token.cancelled:
+        merger.drain()
+        logger.warning(f"CRAWL SHARDED CANCELADO: {len(merger.contents)} páginas baixadas")
+        raise OperationCancelled(partial=merger.contents)
+
+    # Índices sem evento (shard que morreu) contam como falha
+    for index in range(len(selected_pages)):
+        if index not in received:
+            url = selected_pages[index]["url"]
+            merger.add(index, None)
+            report.add(url, retry.make_failure(retry.UNKNOWN, "sem resultado do processo do shard"), 0)
+            service._notify(on_progress, progress.record(url, "failed", error=retry.UNKNOWN))
+
+    logger.info(f"CRAWL SHARDED CONCLUÍDO: {len(merger.contents)} páginas "
+                f"({merger.duplicates} duplicadas entre shards) | "
+                f"{progress.snapshot()['pages_per_sec']} pág/s")
+    report.log()
+    return True, merger.contents
@@ -0,0 +1,182 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Static Fetcher Module - V3.0                                           ║
+║ Fast path SSR: HTTP puro (pool HTTP/2 + keep-alive), sem browser           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import asyncio
+import importlib.util
+
+from .logger import logger
+from app.utils import telemetry
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+}
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+
+# Conteúdo selecionado abaixo disso é tratado como "casca" (SSR parcial)
+MIN_MARKDOWN_CHARS = 50
+
+
+def validators_from_headers(headers) -> dict:
+    """ETag/Last-Modified de uma resposta ({"etag", "lastmod"}, só os presentes)
+
+    Guardados no manifesto para a revalidação condicional do update incremental.
+    """
+    if not headers:
+        return {}
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    found = {"etag": lowered.get("etag"), "lastmod": lowered.get("last-modified")}
+    return {k: v for k, v in found.items() if v}
+
+
+def http2_available() -> bool:
+    """True se o pacote h2 está instalado (httpx só negocia HTTP/2 com ele)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+# ===========================================
+# CLASSE STATIC FETCHER
+# ===========================================
+
+class StaticFetcher:
+    """Baixa páginas SSR com httpx e converte o miolo para markdown em processo
+
+    Usa o mesmo pipeline de scraping/markdown do crawl4ai (LXMLWebScrapingStrategy
+    com css_selector + DefaultMarkdownGenerator), então o markdown sai no
+    mesmo formato do render via browser. Retorna None quando a página não
+    serve para o fast path (status != 200, não-HTML, seletor vazio) e o
+    chamador cai para o browser.
+    """
+
+    def __init__(self, selector: str, max_connections: int = 20, timeout: float = 15.0,
+                 headers: dict = None, transport=None):
+        """Inicializa fetcher (o cliente HTTP é criado no primeiro fetch)
+
+        Args:
+            selector: Seletor CSS do miolo (mesmo do crawl via browser)
+            max_connections: Tamanho do pool de conexões (keep-alive)
+            timeout: Timeout total por requisição em segundos
+            headers: Headers HTTP (padrão: mesmos do browser do scan)
+            transport: Transport httpx alternativo (ex: MockTransport em testes)
+        """
+        self.selector = selector
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self._transport = transport
+
+        self._client = None
+        self._client_loop = None
+
+        # Validadores HTTP das páginas baixadas ({url: {"etag", "lastmod"}})
+        self.validators = {}
+
+    # =======================================
+    # CLIENTE HTTP (POOL)
+    # =======================================
+
+    def _get_client(self):
+        """Cliente httpx do loop atual (recriado se o loop mudou)"""
+        import httpx
+
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._client_loop is loop:
+            return self._client
+
+        # Cliente de outro loop não pode ser reaproveitado (conexões presas a ele)
+        use_http2 = self._transport is None and http2_available()
+        self._client = httpx.AsyncClient(
+            http2=use_http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            ),
+            timeout=self.timeout,
+            headers=self.headers,
+            follow_redirects=True,
+            transport=self._transport
+        )
+        self._client_loop = loop
+        logger.info(f"Cliente HTTP do fast path SSR criado (http2={use_http2}, pool={self.max_connections})")
+        return self._client
+
+    async def close(self):
+        """Fecha o cliente HTTP (se criado no loop atual)"""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            if self._client_loop is asyncio.get_running_loop():
+                await client.aclose()
+        except Exception as e:
+            logger.error(f"Erro ao fechar cliente HTTP: {e}")
+        finally:
+            self._client_loop = None
+
+    # =======================================
+    # CONVERSÃO HTML → MARKDOWN
+    # =======================================
+
+    def html_to_markdown(self, html: str, base_url: str) -> str:
+        """Aplica o seletor de conteúdo e converte para markdown (sem browser)
+
+        Returns:
+            Markdown do miolo ("" se o seletor não encontrou nada)
+        """
+        from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+        from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+        # Instâncias por chamada: roda em threads do executor em paralelo
+        scraped = LXMLWebScrapingStrategy().scrap(base_url, html, css_selector=self.selector)
+        cleaned_html = scraped.cleaned_html or ""
+        if not cleaned_html.strip():
+            return ""
+
+        result = DefaultMarkdownGenerator().generate_markdown(cleaned_html, base_url=base_url)
+        return result.raw_markdown or ""
+
+    # =======================================
+    # FETCH
+    # =======================================
+
+    async def fetch(self, url: str) -> tuple[str, str] | None:
+        """Baixa e converte uma página
+
+        Args:
+            url: URL da página
+
+        Returns:
+            (html, markdown) ou None se a página precisa do browser
+        """
+        try:
+            with telemetry.stage("fetch"):
+                response = await self._get_client().get(url)
+        except Exception as e:
+            logger.debug("  Fast path SSR falhou (%s): %s", e.__class__.__name__, url)
+            return None
+
+        content_type = response.headers.get("content-type", "").lower()
+        if response.status_code != 200 or not content_type.startswith(HTML_CONTENT_TYPES):
+            logger.debug("  Fast path SSR ignorado (%s, %s): %s", response.status_code, content_type, url)
+            return None
+
+        html = response.text
+        self.validators[url] = validators_from_headers(response.headers)
+        # Conversão é CPU-bound: roda fora do event loop
+        with telemetry.stage("html_to_md"):
+            markdown = await asyncio.to_thread(self.html_to_markdown, html, str(response.url))
+        telemetry.annotate(bytes_in=len(response.content), http_version=response.http_version)
+        if len(markdown.strip()) < MIN_MARKDOWN_CHARS:
+            logger.debug("  Fast path SSR sem conteúdo no seletor: %s", url)
+            return None
+
+        return html, markdown
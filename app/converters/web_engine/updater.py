@@ -0,0 +1,305 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Updater Module - V3.0                                                  ║
+║ Update incremental: revalida, re-renderiza só o que mudou e gera changelog ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import json
+import asyncio
+from pathlib import Path
+from datetime import datetime
+
+from .logger import logger
+from . import retry
+from .page_store import ENTRY_FIELDS, PageStore, load_manifest, save_manifest
+from .static_fetcher import DEFAULT_HEADERS, validators_from_headers
+
+# ===========================================
+# CONFIGURAÇÕES
+# ===========================================
+
+CHANGELOG_SUFFIX = ".changelog.jsonl"
+
+# Requisições condicionais simultâneas na revalidação
+REVALIDATE_CONCURRENCY = 10
+REVALIDATE_TIMEOUT = 15.0
+
+# Resultado da revalidação de uma página
+NOT_MODIFIED = "not_modified"
+MODIFIED = "modified"
+GONE = "gone"
+UNKNOWN = "unknown"  # sem validadores ou resposta inconclusiva: re-renderiza
+
+GONE_STATUS = (404, 410)
+
+
+def changelog_path_for(manifest_path: str | Path) -> Path:
+    """docs.manifest.json → docs.changelog.jsonl"""
+    manifest_p = Path(manifest_path)
+    stem = manifest_p.name.removesuffix(".manifest.json")
+    return manifest_p.with_name(f"{stem}{CHANGELOG_SUFFIX}")
+
+
+# ===========================================
+# REVALIDAÇÃO CONDICIONAL
+# ===========================================
+
+def classify_revalidation(entry: dict, status_code: int, headers) -> tuple[str, dict]:
+    """Desfecho de um GET condicional
+
+    Returns:
+        (NOT_MODIFIED | MODIFIED | GONE | UNKNOWN, validadores novos)
+    """
+    fresh = validators_from_headers(headers)
+    if fresh and entry.get("validators_from"):
+        fresh["validators_from"] = entry["validators_from"]
+    if status_code == 304:
+        return NOT_MODIFIED, {**_validators(entry), **fresh}
+    if status_code in GONE_STATUS:
+        return GONE, {}
+    if status_code != 200:
+        return UNKNOWN, {}
+
+    # Servidor que ignora o condicional mas devolve os mesmos validadores
+    if entry.get("etag") and fresh.get("etag") == entry["etag"]:
+        return NOT_MODIFIED, fresh
+    if not entry.get("etag") and entry.get("lastmod") and fresh.get("lastmod") == entry["lastmod"]:
+        return NOT_MODIFIED, fresh
+    return MODIFIED, fresh
+
+
+def _validators(entry: dict) -> dict:
+    return {k: entry[k] for k in ("etag", "lastmod") if entry.get(k)}
+
+
+def revalidatable(entry: dict) -> bool:
+    """True se um GET condicional responde se o conteúdo da página mudou
+
+    Em SPAs (CSR_*) os validadores do render são os do shell HTML, que fica
+    idêntico enquanto o conteúdo muda via JS/JSON: só os do fast path
+    estático (o HTML é o conteúdo) valem.
+    """
+    if not _validators(entry):
+        return False
+    if (entry.get("render_type") or "").startswith("CSR"):
+        return entry.get("validators_from") == "static"
+    return True
+
+
+async def revalidate(entries: list[dict], transport=None,
+                     concurrency: int = REVALIDATE_CONCURRENCY) -> dict[str, tuple[str, dict]]:
+    """GET condicional (If-None-Match / If-Modified-Since) de cada página
+
+    Páginas sem ETag/Last-Modified no manifesto, ou de SPA com validadores
+    do shell (ver revalidatable), não são consultadas (UNKNOWN): só um novo
+    render diz se o conteúdo mudou.
+
+    Args:
+        entries: Entradas do manifesto
+        transport: Transport httpx alternativo (ex: MockTransport em testes)
+
+    Returns:
+        {url: (desfecho, validadores novos)}
+    """
+    import httpx
+
+    outcomes = {entry["url"]: (UNKNOWN, {}) for entry in entries}
+    candidates = [entry for entry in entries if revalidatable(entry)]
+    if not candidates:
+        return outcomes
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(client, entry: dict):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastmod"):
+            headers["If-Modified-Since"] = entry["lastmod"]
+        async with semaphore:
+            try:
+                response = await client.get(entry["url"], headers=headers)
+            except Exception as e:
+                logger.debug("Revalidação falhou (%s): %s", e.__class__.__name__, entry["url"])
+                return
+        outcomes[entry["url"]] = classify_revalidation(entry, response.status_code, response.headers)
+
+    async with httpx.AsyncClient(timeout=REVALIDATE_TIMEOUT, headers=DEFAULT_HEADERS,
+                                 follow_redirects=True, transport=transport) as client:
+        await asyncio.gather(*(check(client, entry) for entry in candidates))
+    return outcomes
+
+
+# ===========================================
+# CLASSE INCREMENTAL UPDATER
+# ===========================================
+
+class IncrementalUpdater:
+    """Atualiza um documento gravado com manifesto sem refazer scan + crawl
+
+    1. Descobre páginas novas/removidas a partir da seed do manifesto
+       (um único download, ver WebCrawlerService.discover_links)
+    2. Revalida as páginas existentes com GET condicional (ETag/Last-Modified)
+    3. Re-renderiza só as novas, as modificadas e as sem validador
+    4. Atualiza o manifesto (mesma ordem, novas no fim), regrava o .md a
+       partir do page store e acrescenta o changelog da execução
+    """
+
+    def __init__(self, crawler_service, store: PageStore = None, writer=None, transport=None):
+        """Inicializa updater
+
+        Args:
+            crawler_service: WebCrawlerService usado para discovery e re-render
+            store: PageStore com os corpos do manifesto (default: get_store_dir())
+            writer: ConsolidatedWriter para regravar o .md (criado sob demanda)
+            transport: Transport httpx da revalidação (injetável em testes)
+        """
+        self.service = crawler_service
+        self.store = store or PageStore()
+        self.writer = writer
+        self.transport = transport
+
+    async def update(self, manifest_path: str, discover: bool = True, on_page=None,
+                     on_progress=None, cancel_token=None) -> tuple[bool, dict]:
+        """Executa o update incremental de um documento
+
+        Args:
+            manifest_path: <saída>.manifest.json gravado pelo crawl (com store)
+            discover: Procura páginas novas/removidas a partir da seed
+            on_page / on_progress / cancel_token: Repassados ao crawl das
+                páginas re-renderizadas (ver crawl_selected_pages)
+
+        Returns:
+            (sucesso, changelog {"added", "removed", "changed", "unchanged",
+             "failed", "revalidation", "rendered", ...})
+        """
+        manifest = load_manifest(manifest_path)
+        entries = manifest["pages"]
+        normalize = self.service._normalize_url
+        by_key = {normalize(e["url"]): e for e in entries}
+        logger.info(f"UPDATE INCREMENTAL: {manifest_path} ({len(entries)} páginas)")
+
+        # 1. Discovery: novas e removidas
+        added_urls, removed = [], set()
+        seed = manifest.get("source", {}).get("seed")
+        if discover and seed:
+            discovered = await self.service.discover_links(seed)
+            if discovered is None:
+                return False, {"error": f"Falha ao baixar a seed {seed}"}
+            discovered_keys = {normalize(u) for u in discovered}
+            added_urls = [u for u in discovered if normalize(u) not in by_key]
+            removed = {key for key in by_key if key not in discovered_keys}
+        elif discover:
+            logger.info("Manifesto sem seed (crawl sem spider): só revalidação")
+
+        kept = [e for e in entries if normalize(e["url"]) not in removed]
+
+        # 2. Revalidação condicional das existentes
+        outcomes = await revalidate(kept, transport=self.transport)
+        revalidation = {}
+        for outcome, _ in outcomes.values():
+            revalidation[outcome] = revalidation.get(outcome, 0) + 1
+        gone = {normalize(url) for url, (outcome, _) in outcomes.items() if outcome == GONE}
+        logger.info(f"  Revalidação: {revalidation} | novas {len(added_urls)} | removidas {len(removed)}")
+
+        # 3. Re-render só do que pode ter mudado
+        to_render = [{"url": e["url"], "title": e["title"]} for e in kept
+                     if outcomes[e["url"]][0] in (MODIFIED, UNKNOWN)]
+        to_render += [{"url": u, "title": ""} for u in added_urls]
+        rendered = {}
+        failures = {}
+        if to_render:
+            crawl_failures = []
+            success, contents = await self.service.crawl_selected_pages(
+                to_render, on_page=on_page, on_progress=on_progress, cancel_token=cancel_token,
+                max_age=0,  # conteúdo em memória pode ser anterior à mudança
+                failures=crawl_failures
+            )
+            if not success:
+                return False, {"error": "Falha no crawl das páginas a atualizar"}
+            rendered = {normalize(p["url"]): p for p in contents}
+            failures = {normalize(f["url"]): f for f in crawl_failures}
+
+        # Página que o crawl confirmou 404/410 também saiu do site
+        for key, failure in failures.items():
+            if failure["kind"] == retry.HTTP_4XX and failure.get("status_code") in GONE_STATUS:
+                gone.add(key)
+
+        # 4. Manifesto novo: ordem original, alteradas no lugar, novas no fim
+        changelog = {"added": [], "removed": [], "changed": [], "unchanged": 0, "failed": [],
+                     "revalidation": revalidation, "rendered": len(to_render)}
+        new_entries = []
+        for entry in entries:
+            key = normalize(entry["url"])
+            if key in removed or key in gone:
+                changelog["removed"].append(entry["url"])
+                continue
+
+            page = rendered.get(key)
+            if page is not None:
+                updated = self._store_page(page)
+                if updated["hash"] != entry["hash"]:
+                    changelog["changed"].append(entry["url"])
+                else:
+                    changelog["unchanged"] += 1
+                new_entries.append(updated)
+                continue
+
+            if key in failures:
+                # Falha transitória: mantém a versão anterior (desatualizada > perdida)
+                changelog["failed"].append({"url": entry["url"], "kind": failures[key]["kind"]})
+            else:
+                changelog["unchanged"] += 1
+            new_entries.append({**entry, **outcomes.get(entry["url"], (None, {}))[1]})
+
+        known_hashes = {e["hash"] for e in new_entries}
+        for url in added_urls:
+            key = normalize(url)
+            page = rendered.get(key)
+            if page is None:
+                if key in failures and key not in gone:
+                    changelog["failed"].append({"url": url, "kind": failures[key]["kind"]})
+                continue
+            updated = self._store_page(page)
+            if updated["hash"] in known_hashes:
+                logger.warning(f"⚠️ Página nova com conteúdo já presente no documento: {url} - IGNORADA.")
+                continue
+            known_hashes.add(updated["hash"])
+            new_entries.append(updated)
+            changelog["added"].append(url)
+
+        manifest = {**manifest, "pages": new_entries,
+                    "updated": datetime.now().isoformat(timespec="seconds")}
+        save_manifest(manifest, manifest_path)
+
+        # 5. .md regravado do store (sem crawl) e changelog acumulado
+        success, message = self._get_writer().write_manifest(manifest_path)
+        changelog.update(ts=manifest["updated"], message=message)
+        self._append_changelog(manifest_path, changelog)
+
+        logger.info(f"UPDATE CONCLUÍDO: +{len(changelog['added'])} -{len(changelog['removed'])} "
+                    f"~{len(changelog['changed'])} ={changelog['unchanged']} "
+                    f"(falhas {len(changelog['failed'])}, {len(to_render)}/{len(entries)} re-renderizadas)")
+        return success, changelog
+
+    # =======================================
+    # UTILITÁRIOS
+    # =======================================
+
+    def _store_page(self, page: dict) -> dict:
+        """Grava o corpo no store e devolve a entrada de manifesto da página"""
+        digest, _ = self.store.put(page["markdown"], page.get("hash"))
+        return {**{k: page.get(k) for k in ENTRY_FIELDS}, "hash": digest}
+
+    def _get_writer(self):
+        if self.writer is None:
+            from .writer import ConsolidatedWriter
+            self.writer = ConsolidatedWriter(self.service.token_counter, store=self.store)
+        return self.writer
+
+    def _append_changelog(self, manifest_path: str, changelog: dict):
+        path = changelog_path_for(manifest_path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(changelog, ensure_ascii=False) + "\n")
+        logger.info(f"Changelog: {path}")
@@ -0,0 +1,236 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ Web Writer Module - V3.0                                                   ║
+║ Geração do arquivo Markdown consolidado (cabeçalho + índice + conteúdo)    ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+"""
+
+import os
+from pathlib import Path
+from datetime import datetime
+
+from .logger import logger
+from .page_store import load_manifest, manifest_path_for, save_manifest
+from app.utils.context_packer import ContextPacker
+
+# ===========================================
+# CLASSE CONSOLIDATED WRITER
+# ===========================================
+
+class ConsolidatedWriter:
+    """Monta e salva o Markdown consolidado, opcionalmente dentro de um orçamento de tokens"""
+
+    def __init__(self, token_counter=None, store=None):
+        """Inicializa writer
+
+        Args:
+            token_counter: TokenCounter (criado sob demanda se houver orçamento)
+            store: PageStore opcional; com ele cada documento gravado também
+                ganha um manifesto (<saída>.manifest.json) que referencia os
+                corpos no store e pode ser reexpandido com write_manifest
+        """
+        self.token_counter = token_counter
+        self.store = store
+
+    # =======================================
+    # RENDERIZAÇÃO
+    # =======================================
+
+    def render(self, contents: list[dict], part: int = None, total_parts: int = None) -> str:
+        """Monta o documento consolidado
+
+        Args:
+            contents: Páginas [{"url", "title", "markdown", ...}]
+            part: Número da parte (modo partes)
+            total_parts: Total de partes (modo partes)
+
+        Returns:
+            Texto Markdown final
+        """
+        return "\n".join(self._iter_render(contents, part, total_parts))
+
+    def _iter_render(self, contents: list[dict], part: int = None, total_parts: int = None,
+                     load_markdown=None):
+        """Blocos do documento (unidos por "\\n" formam o texto de render)
+
+        Args:
+            load_markdown: Função entrada → markdown; com ela o corpo de cada
+                página é lido só na hora de ser escrito (entradas de manifesto)
+        """
+        if part:
+            yield f"# Documentação (parte {part}/{total_parts})\n"
+        else:
+            yield "# Documentação\n"
+        yield f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')}\n"
+
+        # Índice
+        yield "## 📑 Índice\n"
+        for i, page in enumerate(contents, 1):
+            yield f"{i}. {page['title']}"
+
+        yield "\n---\n"
+
+        # Conteúdo de cada página
+        for page in contents:
+            yield f"\n## 📄 {page['title']}\n"
+            yield f"> Fonte: {page['url']}\n"
+            yield page['markdown'] if load_markdown is None else load_markdown(page)
+            yield "\n---\n"
+
+    # =======================================
+    # GRAVAÇÃO
+    # =======================================
+
+    def write(self, contents: list[dict], output_path: str,
+              token_budget: int = None, split_shards: bool = False,
+              source: dict = None) -> tuple[bool, str]:
+        """Salva o documento consolidado (e o manifesto, se houver store)
+
+        Args:
+            contents: Páginas com contagem de tokens por página
+            output_path: Caminho do arquivo .md de saída
+            token_budget: Orçamento de tokens por arquivo (None = sem limite)
+            split_shards: Se True, gera N partes em vez de truncar
+            source: Origem gravada no manifesto (ex: {"seed": url} de um
+                spider, usada pelo update incremental para achar páginas novas)
+
+        Returns:
+            (sucesso, mensagem)
+        """
+        success, message = self._write(contents, output_path, token_budget, split_shards)
+        if not success or self.store is None:
+            return success, message
+
+        try:
+            manifest = self.store.build_manifest(
+                contents,
+                output=Path(output_path).name,
+                options={"token_budget": token_budget, "split_shards": split_shards},
+                source=source or {}
+            )
+            manifest_p = manifest_path_for(output_path)
+            save_manifest(manifest, manifest_p)
+            message += f"\nManifesto: {manifest_p}"
+        except Exception as e:
+            # O .md já foi salvo; sem manifesto só não há rebuild/update incremental
+            logger.exception(f"Erro ao gravar manifesto de {output_path}: {e}")
+        return success, message
+
+    def write_manifest(self, manifest_path: str, output_path: str = None,
+                       token_budget: int = None, split_shards: bool = None) -> tuple[bool, str]:
+        """Reconstrói um documento a partir do manifesto (sem crawl nem limpeza)
+
+        Sem orçamento o documento é escrito em streaming, lendo um corpo do
+        store por vez; com orçamento as páginas são expandidas para o packer.
+
+        Args:
+            manifest_path: Manifesto gravado por write (com store)
+            output_path: Arquivo .md (default: o registrado no manifesto)
+            token_budget: Orçamento (default: o do manifesto)
+            split_shards: Modo partes (default: o do manifesto)
+
+        Returns:
+            (sucesso, mensagem)
+        """
+        try:
+            from .page_store import PageStore
+            store = self.store or PageStore()
+            manifest = load_manifest(manifest_path)
+            missing = store.missing(manifest)
+            if missing:
+                return False, f"{len(missing)} corpos ausentes do page store ({store.root})"
+
+            options = manifest.get("options", {})
+            token_budget = options.get("token_budget") if token_budget is None else token_budget
+            split_shards = options.get("split_shards", False) if split_shards is None else split_shards
+            output_path = output_path or str(Path(manifest_path).with_name(manifest["output"]))
+            pages = manifest["pages"]
+
+            if token_budget:
+                return self._write(store.expand(manifest), output_path, token_budget, split_shards)
+
+            # Streaming num .part: erro no meio (corpo corrompido, disco cheio)
+            # não deixa o documento anterior truncado
+            part_p = Path(f"{output_path}.part")
+            try:
+                with open(part_p, "w", encoding="utf-8") as f:
+                    for i, block in enumerate(self._iter_render(
+                            pages, load_markdown=lambda entry: store.get(entry["hash"]))):
+                        f.write(block if i == 0 else "\n" + block)
+                os.replace(part_p, output_path)
+            finally:
+                part_p.unlink(missing_ok=True)
+            return True, f"Arquivo salvo: {output_path}\n{len(pages)} páginas (do manifesto)"
+
+        except Exception as e:
+            logger.exception(f"Erro ao expandir manifesto {manifest_path}: {e}")
+            return False, f"Erro ao expandir manifesto: {e}"
+
+    def _write(self, contents: list[dict], output_path: str,
+               token_budget: int = None, split_shards: bool = False) -> tuple[bool, str]:
+        """Grava o .md (ou as partes) a partir das páginas completas"""
+        try:
+            output_p = Path(output_path)
+
+            if not token_budget:
+                output_p.write_text(self.render(contents), encoding='utf-8')
+                return True, f"Arquivo salvo: {output_path}\n{len(contents)} páginas"
+
+            packer = self._create_packer(token_budget)
+
+            if split_shards:
+                shards = packer.shard(contents)
+                if len(shards) == 1:
+                    output_p.write_text(self.render(shards[0]), encoding='utf-8')
+                    return True, f"Arquivo salvo: {output_path}\n{len(contents)} páginas"
+
+                paths = []
+                for k, shard in enumerate(shards, 1):
+                    shard_p = output_p.with_name(f"{output_p.stem}_parte{k:02d}{output_p.suffix}")
+                    shard_p.write_text(self.render(shard, k, len(shards)), encoding='utf-8')
+                    paths.append(str(shard_p))
+                    logger.info(f"Parte {k}/{len(shards)} salva: {shard_p} ({len(shard)} páginas)")
+
+                return True, (f"{len(shards)} partes salvas (≤ {token_budget:,} tokens cada):\n"
+                              + "\n".join(paths))
+
+            packed = packer.pack(contents)
+            output_p.write_text(self.render(packed["pages"]), encoding='utf-8')
+
+            message = (f"Arquivo salvo: {output_path}\n{len(packed['pages'])} páginas "
+                       f"(~{packed['tokens']:,}/{token_budget:,} tokens)")
+            if packed["truncated"]:
+                message += f"\n{len(packed['truncated'])} páginas truncadas"
+            if packed["dropped"]:
+                message += f"\n{len(packed['dropped'])} páginas fora do orçamento"
+            return True, message
+
+        except Exception as e:
+            logger.exception(f"Erro ao gerar arquivo consolidado: {e}")
+            return False, f"Erro ao gerar arquivo: {e}"
+
+    # =======================================
+    # UTILITÁRIOS
+    # =======================================
+
+    def _create_packer(self, token_budget: int) -> ContextPacker:
+        """Cria empacotador com o overhead real do layout deste writer"""
+        if self.token_counter is None:
+            from app.utils.token_counter import TokenCounter
+            self.token_counter = TokenCounter()
+
+        counter = self.token_counter
+        reserved = counter.count_tokens(self.render([], 99, 99))
+
+        def page_overhead(page: dict) -> int:
+            # Linha do índice + cabeçalho da seção + fonte + separador
+            return counter.count_tokens(
+                f"999. {page['title']}\n\n## 📄 {page['title']}\n\n> Fonte: {page['url']}\n\n\n\n---\n"
+            )
+
+        return ContextPacker(
+            token_budget,
+            token_counter=counter,
+            reserved_tokens=reserved,
+            page_overhead=page_overhead
+        )
@@ -3,11 +3,15 @@ GUI Dialogs Module - V3.0
 Diálogos para interface gráfica
 """
 
+import re
+
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListWidget,
-    QListWidgetItem, QPushButton, QLabel, QCheckBox
+    QDialog, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView,
+    QAbstractItemView, QPushButton, QLabel, QCheckBox, QLineEdit
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+
+from app.gui.models import PageTableModel
 
 # ===========================================
 # 1. PAGE SELECTION DIALOG
@@ -26,36 +30,84 @@ class PageSelectionDialog(QDialog):
         super().__init__(parent)
         self.pages = pages
         self.selected_pages = []
+        self.model = PageTableModel(pages, self)
+
+        # Debounce do filtro (evita refiltrar 100k linhas a cada tecla)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(200)
+        self._filter_timer.timeout.connect(self._apply_filter)
 
         self.setWindowTitle("Selecionar Páginas para Download")
-        self.setMinimumSize(800, 600)
+        self.setMinimumSize(900, 600)
         self._setup_ui()
-        self._populate_list()
+        self._update_summary()
 
     def _setup_ui(self):
         """Configura layout do dialog"""
         layout = QVBoxLayout(self)
 
+        # Custo estimado (apenas páginas já presentes no cache do scan)
+        known_tokens = [p["tokens"] for p in self.pages if p.get("tokens") is not None]
+        tokens_info = ""
+        if known_tokens:
+            tokens_info = (f"<p>🔢 ~{sum(known_tokens):,} tokens estimados "
+                           f"({len(known_tokens)} páginas em cache)</p>")
+
         # Cabeçalho
         header = QLabel(
             f"<h3>📑 {len(self.pages)} Páginas Encontradas</h3>"
             "<p>Selecione as páginas que deseja baixar.</p>"
+            f"{tokens_info}"
         )
         layout.addWidget(header)
 
-        # Botões de seleção
+        # Filtro (prefixo de caminho, trecho de URL/título ou regex)
+        filter_layout = QHBoxLayout()
+        self.txt_filter = QLineEdit()
+        self.txt_filter.setPlaceholderText("Filtrar: /docs/api (prefixo), trecho da URL/título ou regex")
+        self.txt_filter.textChanged.connect(lambda _: self._filter_timer.start())
+
+        self.chk_regex = QCheckBox("Regex")
+        self.chk_regex.toggled.connect(lambda _: self._apply_filter())
+
+        filter_layout.addWidget(self.txt_filter)
+        filter_layout.addWidget(self.chk_regex)
+        layout.addLayout(filter_layout)
+
+        # Botões de seleção (atuam sobre as linhas visíveis)
         btn_layout = QHBoxLayout()
-        self.chk_select_all = QCheckBox("Selecionar Todos")
+        self.chk_select_all = QCheckBox("Selecionar Visíveis")
         self.chk_select_all.setChecked(True)
         self.chk_select_all.toggled.connect(self._toggle_all)
 
+        self.lbl_summary = QLabel()
+
         btn_layout.addWidget(self.chk_select_all)
         btn_layout.addStretch()
+        btn_layout.addWidget(self.lbl_summary)
         layout.addLayout(btn_layout)
 
-        # Lista de páginas (com checkboxes)
-        self.list_widget = QListWidget()
-        layout.addWidget(self.list_widget)
+        # Tabela virtualizada (linhas de altura fixa, sem item por página)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setWordWrap(False)
+        self.table_view.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(22)
+
+        h_header = self.table_view.horizontalHeader()
+        h_header.setSectionResizeMode(PageTableModel.COL_URL, QHeaderView.ResizeMode.Stretch)
+        h_header.setSectionResizeMode(PageTableModel.COL_TITLE, QHeaderView.ResizeMode.Interactive)
+        h_header.resizeSection(PageTableModel.COL_TITLE, 260)
+        h_header.resizeSection(PageTableModel.COL_TOKENS, 90)
+        h_header.resizeSection(PageTableModel.COL_CACHE, 60)
+
+        self.model.selection_changed.connect(lambda *_: self._update_summary())
+        layout.addWidget(self.table_view)
 
         # Botões de ação
         action_layout = QHBoxLayout()
@@ -79,35 +131,33 @@ class PageSelectionDialog(QDialog):
         action_layout.addWidget(self.btn_confirm)
         layout.addLayout(action_layout)
 
-    def _populate_list(self):
-        """Popula lista com páginas encontradas"""
-        for page in self.pages:
-            item = QListWidgetItem()
-            item.setText(f"📄 {page['title']}\n   {page['url']}")
-            item.setData(Qt.ItemDataRole.UserRole, page)
-            item.setCheckState(Qt.CheckState.Checked)  # Default: marcado
-            self.list_widget.addItem(item)
+    def _apply_filter(self):
+        """Aplica filtro digitado (regex inválida é sinalizada sem filtrar)"""
+        try:
+            self.model.set_filter(self.txt_filter.text(), self.chk_regex.isChecked())
+            self.txt_filter.setStyleSheet("")
+        except re.error:
+            self.txt_filter.setStyleSheet("QLineEdit { border: 1px solid #dc3545; }")
+            return
+        self._update_summary()
 
     def _toggle_all(self, checked: bool):
-        """Marca/desmarca todos os itens"""
-        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            item.setCheckState(state)
+        """Marca/desmarca todas as linhas visíveis"""
+        self.model.set_visible_checked(checked)
+
+    def _update_summary(self):
+        """Atualiza contadores de seleção"""
+        self.lbl_summary.setText(
+            f"{self.model.checked_count():,}/{len(self.pages):,} marcadas · "
+            f"~{self.model.checked_tokens():,} tokens · "
+            f"{self.model.visible_count():,} visíveis"
+        )
 
     def _confirm_selection(self):
         """Coleta páginas marcadas e fecha dialog"""
-        selected = []
-
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if item.checkState() == Qt.CheckState.Checked:
-                page = item.data(Qt.ItemDataRole.UserRole)
-                selected.append(page)
-
-        self.selected_pages = selected
+        self.selected_pages = self.model.selected_pages()
         self.accept()
 
     def get_selected_pages(self) -> list[dict]:
         """Retorna páginas selecionadas pelo usuário"""
-        return self.selected_pages
\ No newline at end of file
+        return self.selected_pages
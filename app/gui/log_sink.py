@@ -0,0 +1,135 @@
+"""
+GUI Log Sink Module - V3.0
+Log de execução bufferizado (fila + flush em lotes por timer)
+"""
+
+import html
+import logging
+import itertools
+from collections import deque
+from datetime import datetime
+
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import QObject, QTimer
+
+# ===========================================
+# 1. LOG SINK
+# ===========================================
+
+class LogSink(QObject):
+    """Buffer de log entre workers e o QPlainTextEdit
+
+    write() é thread-safe e barato (só enfileira); um QTimer na thread da GUI
+    descarrega a fila em lotes. O widget guarda no máximo max_blocks linhas e
+    a fila no máximo max_pending (linhas mais antigas são descartadas).
+    """
+
+    ERROR_STYLE = 'color:#ff5555;'
+
+    def __init__(self, widget: QPlainTextEdit, interval_ms: int = 100,
+                 max_batch: int = 500, max_blocks: int = 5000, max_pending: int = 20000):
+        """Inicializa sink
+
+        Args:
+            widget: QPlainTextEdit de destino
+            interval_ms: Intervalo entre flushes
+            max_batch: Máximo de linhas por flush
+            max_blocks: Máximo de linhas mantidas no widget
+            max_pending: Máximo de linhas aguardando flush
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.widget.setMaximumBlockCount(max_blocks)
+        self.max_batch = max_batch
+
+        self._pending = deque(maxlen=max_pending)
+        self._seq = itertools.count()  # next() é atômico: detecta linhas descartadas
+        self._next_seq = 0
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    # =======================================
+    # ENTRADA (QUALQUER THREAD)
+    # =======================================
+
+    def write(self, message: str, error: bool = False):
+        """Enfileira uma linha de log (thread-safe)"""
+        self._pending.append((next(self._seq), datetime.now(), message, error))
+
+    # =======================================
+    # SAÍDA (THREAD DA GUI)
+    # =======================================
+
+    def flush(self):
+        """Descarrega até max_batch linhas no widget"""
+        if not self._pending:
+            return
+
+        batch = []
+        while self._pending and len(batch) < self.max_batch:
+            batch.append(self._pending.popleft())
+
+        # Linhas descartadas por estouro da fila (buraco na sequência)
+        dropped = batch[0][0] - self._next_seq
+        self._next_seq = batch[-1][0] + 1
+
+        scrollbar = self.widget.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        self.widget.setUpdatesEnabled(False)
+        try:
+            if dropped > 0:
+                self.widget.appendPlainText(f"... {dropped} linhas de log descartadas (fila cheia)")
+
+            plain = []
+            for _, ts, message, error in batch:
+                line = f"[{ts:%H:%M:%S}] {message}"
+                if not error:
+                    plain.append(line)
+                    continue
+
+                # Agrupa linhas normais consecutivas em um único append
+                if plain:
+                    self.widget.appendPlainText("\n".join(plain))
+                    plain = []
+                self.widget.appendHtml(
+                    f'<span style="{self.ERROR_STYLE}">{html.escape(f"[{ts:%H:%M:%S}] 💥 {message}")}</span>'
+                )
+
+            if plain:
+                self.widget.appendPlainText("\n".join(plain))
+        finally:
+            self.widget.setUpdatesEnabled(True)
+
+        # Só acompanha o fim se o usuário não rolou para cima
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def clear(self):
+        """Descarta pendências e limpa o widget"""
+        self._pending.clear()
+        self._seq = itertools.count()
+        self._next_seq = 0
+        self.widget.clear()
+
+
+# ===========================================
+# 2. HANDLER DE LOGGING
+# ===========================================
+
+class LogSinkHandler(logging.Handler):
+    """Encaminha registros do logging (threads dos workers) para o LogSink"""
+
+    def __init__(self, sink: LogSink, level: int = logging.WARNING):
+        super().__init__(level)
+        self.sink = sink
+        self.setFormatter(logging.Formatter("%(name)s: %(message)s"))
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.sink.write(self.format(record), error=record.levelno >= logging.ERROR)
+        except Exception:
+            self.handleError(record)
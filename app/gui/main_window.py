@@ -155,4 +155,14 @@ class Pdf2mdWindow(QMainWindow):
     def closeEvent(self, event):
         """Evento chamado quando a aplicação é fechada pelo usuário"""
         log_app_shutdown_by_user()
+
+        # Cancela jobs em andamento (browser e arquivos temporários são liberados pelo job)
+        for tab in (self.web_tab, self.pdf_tab):
+            if tab is not None:
+                tab.shutdown()
+
+        # Fecha browsers aquecidos e encerra o event loop persistente
+        from app.utils.async_loop import shutdown_loop_thread
+        shutdown_loop_thread()
+
         event.accept()
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""
+GUI Models Module - V3.0
+Modelos Qt (Model/View) para listas grandes
+"""
+
+import re
+from array import array
+from urllib.parse import urlparse
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+# ===========================================
+# 1. PAGE TABLE MODEL
+# ===========================================
+
+class PageTableModel(QAbstractTableModel):
+    """Modelo virtualizado de páginas do scan (URL, título, tokens, cache)
+
+    Os dados ficam em arrays compactos (uma posição por página) e a view só
+    consulta as linhas visíveis; filtro e seleção em massa operam sobre os
+    arrays sem criar um item Qt por página.
+    """
+
+    COLUMNS = ["URL", "Título", "Tokens", "Cache"]
+    COL_URL, COL_TITLE, COL_TOKENS, COL_CACHE = range(4)
+
+    selection_changed = pyqtSignal(int, int)  # (páginas marcadas, tokens estimados marcados)
+
+    def __init__(self, pages: list[dict], parent=None):
+        """Inicializa modelo
+
+        Args:
+            pages: Lista de páginas [{"url", "title", "selected", "tokens", "cached"}]
+            parent: QObject pai
+        """
+        super().__init__(parent)
+        self._pages = pages
+
+        # Store compacto (colunas paralelas)
+        self._urls = [p["url"] for p in pages]
+        self._titles = [p.get("title") or "" for p in pages]
+        self._paths = [urlparse(url).path or "/" for url in self._urls]
+        self._tokens = array('q', (p["tokens"] if p.get("tokens") is not None else -1 for p in pages))
+        self._cached = bytearray(1 if p.get("cached", p.get("tokens") is not None) else 0 for p in pages)
+        self._checked = bytearray(1 if p.get("selected", True) else 0 for p in pages)
+
+        # Índices visíveis (após filtro/ordenação)
+        self._visible = array('I', range(len(pages)))
+        self._sort_column = -1  # última ordenação pedida pela view (reaplicada pelo filtro)
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+        self._checked_count = sum(self._checked)
+        self._checked_tokens = sum(t for t, c in zip(self._tokens, self._checked) if c and t > 0)
+
+    # =======================================
+    # INTERFACE QAbstractTableModel
+    # =======================================
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        base = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() == self.COL_URL:
+            base |= Qt.ItemFlag.ItemIsUserCheckable
+        return base
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        i = self._visible[index.row()]
+        col = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == self.COL_URL:
+                return self._urls[i]
+            if col == self.COL_TITLE:
+                return self._titles[i]
+            if col == self.COL_TOKENS:
+                return f"{self._tokens[i]:,}" if self._tokens[i] >= 0 else "—"
+            if col == self.COL_CACHE:
+                return "✓" if self._cached[i] else ""
+
+        elif role == Qt.ItemDataRole.CheckStateRole and col == self.COL_URL:
+            return Qt.CheckState.Checked if self._checked[i] else Qt.CheckState.Unchecked
+
+        elif role == Qt.ItemDataRole.TextAlignmentRole and col in (self.COL_TOKENS, self.COL_CACHE):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+        elif role == Qt.ItemDataRole.ToolTipRole and col in (self.COL_URL, self.COL_TITLE):
+            return f"{self._titles[i]}\n{self._urls[i]}"
+
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.CheckStateRole or index.column() != self.COL_URL:
+            return False
+
+        i = self._visible[index.row()]
+        checked = 1 if Qt.CheckState(value) == Qt.CheckState.Checked else 0
+        if self._checked[i] != checked:
+            self._set_checked(i, checked)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+            self._emit_selection()
+        return True
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self._visible = array('I', self._ordered(self._visible))
+        self.layoutChanged.emit()
+
+    def _ordered(self, indices) -> list[int]:
+        """Índices na ordenação corrente (sem coluna: ordem original do scan)"""
+        if self._sort_column < 0:
+            return sorted(indices)
+
+        keys = {
+            self.COL_URL: self._urls,
+            self.COL_TITLE: self._titles,
+            self.COL_TOKENS: self._tokens,
+            self.COL_CACHE: self._cached,
+        }[self._sort_column]
+        return sorted(indices, key=keys.__getitem__,
+                      reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+
+    # =======================================
+    # FILTRO E SELEÇÃO EM MASSA
+    # =======================================
+
+    def set_filter(self, text: str, use_regex: bool = False):
+        """Filtra linhas visíveis
+
+        Args:
+            text: Prefixo de caminho ("/docs/api"), trecho de URL/título ou regex
+            use_regex: Se True, aplica text como regex sobre a URL
+
+        Raises:
+            re.error: Regex inválida
+        """
+        text = text.strip()
+        n = len(self._urls)
+
+        if not text:
+            visible = range(n)
+        elif use_regex:
+            pattern = re.compile(text, re.IGNORECASE)
+            visible = [i for i in range(n) if pattern.search(self._urls[i])]
+        elif text.startswith("/"):
+            visible = [i for i in range(n) if self._paths[i].startswith(text)]
+        else:
+            needle = text.casefold()
+            visible = [i for i in range(n)
+                       if needle in self._urls[i].casefold() or needle in self._titles[i].casefold()]
+
+        if self._sort_column >= 0:
+            # Filtrado em ordem de scan: reaplica a ordenação do cabeçalho
+            visible = self._ordered(visible)
+
+        self.beginResetModel()
+        self._visible = array('I', visible)
+        self.endResetModel()
+
+    def set_visible_checked(self, checked: bool):
+        """Marca/desmarca todas as linhas visíveis (um único dataChanged)"""
+        value = 1 if checked else 0
+        for i in self._visible:
+            if self._checked[i] != value:
+                self._set_checked(i, value)
+
+        if self._visible:
+            self.dataChanged.emit(self.index(0, self.COL_URL),
+                                  self.index(len(self._visible) - 1, self.COL_URL),
+                                  [Qt.ItemDataRole.CheckStateRole])
+        self._emit_selection()
+
+    def selected_pages(self) -> list[dict]:
+        """Retorna dicts das páginas marcadas (ordem original do scan)"""
+        return [page for page, checked in zip(self._pages, self._checked) if checked]
+
+    def visible_count(self) -> int:
+        return len(self._visible)
+
+    def checked_count(self) -> int:
+        return self._checked_count
+
+    def checked_tokens(self) -> int:
+        return self._checked_tokens
+
+    # =======================================
+    # UTILITÁRIOS
+    # =======================================
+
+    def _set_checked(self, i: int, value: int):
+        """Atualiza marcação e contadores incrementais"""
+        self._checked[i] = value
+        delta = 1 if value else -1
+        self._checked_count += delta
+        if self._tokens[i] > 0:
+            self._checked_tokens += delta * self._tokens[i]
+
+    def _emit_selection(self):
+        self.selection_changed.emit(self._checked_count, self._checked_tokens)
@@ -333,4 +333,9 @@ class PdfTab(QWidget):
 
     def set_status_message(self, message: str):
         """Define mensagem de status"""
-        self.lbl_status.setText(message)
\ No newline at end of file
+        self.lbl_status.setText(message)
+
+    def shutdown(self, timeout_ms: int = 10000):
+        """Cancela conversão em andamento (para no próximo lote de páginas)"""
+        if self.worker is not None:
+            self.worker.shutdown(timeout_ms)
\ No newline at end of file
@@ -6,19 +6,20 @@ Aba Web isolada como componente autônomo
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QPushButton, QCheckBox, QSplitter,
-    QProgressBar, QGroupBox, QTextEdit, QListWidget
+    QProgressBar, QGroupBox, QPlainTextEdit, QListWidget, QComboBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtCore import pyqtSignal
 
-from app.converters.web_converter import WebToMarkdownConverter
 from app.gui.workers import WebScanWorker, WebCrawlWorker
 from app.gui.dialogs import PageSelectionDialog
+from app.gui.log_sink import LogSink, LogSinkHandler
 from app.converters.web_engine.logger import (
     log_button_click, log_worker_start, log_worker_finished,
     log_conversion_start, log_conversion_finished, log_spider_decision,
-    log_scan_results
+    log_scan_results, logger as engine_logger
 )
+from app.converters.web_engine.progress import format_progress
 from app.utils.token_counter import TokenCounter
 from pathlib import Path
 
@@ -44,6 +45,7 @@ class WebTab(QWidget):
         self.parent_window = parent  # Reference to main window for file dialogs
         self.scan_worker = None
         self.crawl_worker = None
+        self.crawl_tokens = 0
 
         self._setup_ui()
         self._connect_signals()
@@ -86,10 +88,24 @@ class WebTab(QWidget):
         action_layout = QHBoxLayout()
         self.chk_spider = QCheckBox("🕷️ Spider Mode")
         self.chk_spider.setToolTip("Baixar página atual e todos os links internos da documentação")
+        self.lbl_budget = QLabel("Orçamento:")
+        self.cmb_budget = QComboBox()
+        self.cmb_budget.setToolTip("Janela de contexto alvo do arquivo consolidado (Spider Mode)")
+        self.cmb_budget.addItem("Sem limite", None)
+        for model, window in TokenCounter.CONTEXT_WINDOWS.items():
+            self.cmb_budget.addItem(f"{model} ({window // 1000}k)", window)
+        self.chk_shards = QCheckBox("Dividir em partes")
+        self.chk_shards.setToolTip("Gera N arquivos que cabem no orçamento em vez de truncar páginas")
+        self.chk_chunks = QCheckBox("🧩 Chunks RAG")
+        self.chk_chunks.setToolTip("Exporta também chunks por heading (.chunks.jsonl) para vector store")
         self.btn_convert_web = QPushButton("🚀 Iniciar Missão")
         self.btn_convert_web.setFixedHeight(35)
         self._apply_green_button_style(self.btn_convert_web)
         action_layout.addWidget(self.chk_spider)
+        action_layout.addWidget(self.lbl_budget)
+        action_layout.addWidget(self.cmb_budget)
+        action_layout.addWidget(self.chk_shards)
+        action_layout.addWidget(self.chk_chunks)
         action_layout.addStretch()
         action_layout.addWidget(self.btn_convert_web)
 
@@ -110,10 +126,10 @@ class WebTab(QWidget):
         self.list_links.addItem("🔍 Aguardando missão...")
 
         # Log de Execução (lado direito)
-        self.txt_log = QTextEdit()
+        self.txt_log = QPlainTextEdit()
         self.txt_log.setReadOnly(True)
         self.txt_log.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1e1e1e;
                 color: #00ff00;
                 font-family: Consolas;
@@ -122,6 +138,12 @@ class WebTab(QWidget):
             }
         """)
 
+        # Sink bufferizado: add_log só enfileira, timer descarrega em lotes
+        self.log_sink = LogSink(self.txt_log)
+        self.log_handler = LogSinkHandler(self.log_sink)
+        engine_logger.addHandler(self.log_handler)
+        self.destroyed.connect(lambda: engine_logger.removeHandler(self.log_handler))
+
         # Adicionar ao splitter
         self.splitter.addWidget(self.list_links)
         self.splitter.addWidget(self.txt_log)
@@ -140,8 +162,22 @@ class WebTab(QWidget):
         self.lbl_status = QLabel("🎯 Pronto para missão")
         self.lbl_status.setStyleSheet("color: #666; font-weight: bold;")
 
+        # Controles do job em andamento (pausar/retomar e cancelar)
+        job_layout = QHBoxLayout()
+        self.btn_pause = QPushButton("⏸ Pausar")
+        self.btn_pause.setCheckable(True)
+        self.btn_pause.setEnabled(False)
+        self.btn_pause.setToolTip("Termina as páginas em andamento e pausa antes do próximo lote")
+        self.btn_cancel = QPushButton("⏹ Cancelar")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.setToolTip("Aborta o job e fecha o navegador")
+        job_layout.addWidget(self.lbl_status)
+        job_layout.addStretch()
+        job_layout.addWidget(self.btn_pause)
+        job_layout.addWidget(self.btn_cancel)
+
         progress_layout.addWidget(self.progress_bar)
-        progress_layout.addWidget(self.lbl_status)
+        progress_layout.addLayout(job_layout)
 
         # === LAYOUT PRINCIPAL ===
         layout.addWidget(config_group)
@@ -152,6 +188,8 @@ class WebTab(QWidget):
         """Conecta sinais dos widgets"""
         self.btn_folder.clicked.connect(self._select_folder)
         self.btn_convert_web.clicked.connect(self._convert_web)
+        self.btn_pause.toggled.connect(self._toggle_pause)
+        self.btn_cancel.clicked.connect(self._cancel_job)
 
     def _apply_green_button_style(self, button: QPushButton):
         """Aplica estilo verde aos botões de conversão"""
@@ -182,12 +220,8 @@ class WebTab(QWidget):
     # =======================================
 
     def add_log(self, message: str):
-        """Adiciona mensagem ao log de execução"""
-        timestamp = "[{:%H:%M:%S}]".format(__import__('datetime').datetime.now())
-        self.txt_log.append(f"{timestamp} {message}")
-        # Rola para o fim automaticamente
-        scrollbar = self.txt_log.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """Adiciona mensagem ao log de execução (bufferizado)"""
+        self.log_sink.write(message)
 
     def add_link_to_list(self, url: str, title: str = "", status: str = "🔍"):
         """Adiciona link à lista de links encontrados"""
@@ -197,17 +231,13 @@ class WebTab(QWidget):
         self.list_links.addItem(item_text)
 
     def add_error_log(self, message: str):
-        """Adiciona mensagem de erro em vermelho no log"""
-        timestamp = "[{:%H:%M:%S}]".format(__import__('datetime').datetime.now())
-        # Usa HTML para cor vermelha
-        self.txt_log.append(f'<span style="color:#ff5555;">{timestamp} 💥 {message}</span>')
-        scrollbar = self.txt_log.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        """Adiciona mensagem de erro em vermelho no log (bufferizado)"""
+        self.log_sink.write(message, error=True)
 
     def clear_dashboard(self):
         """Limpa o dashboard para nova missão"""
         self.list_links.clear()
-        self.txt_log.clear()
+        self.log_sink.clear()
         self.list_links.addItem("🔍 Aguardando missão...")
         self.progress_bar.setVisible(False)
         self.lbl_status.setText("🎯 Pronto para missão")
@@ -321,11 +351,19 @@ class WebTab(QWidget):
         self.scan_worker.progress.connect(self._on_worker_progress)
         self.scan_worker.scan_finished.connect(self._on_scan_finished)
         self.scan_worker.start()
+        self._set_job_controls(True)
 
     def _on_scan_finished(self, success: bool, pages: list[dict]):
         """Callback após Scan - Abre Dialog de Seleção"""
         # Log resultado do worker
         log_worker_finished("WebScanWorker", success, f"{len(pages)} páginas encontradas")
+        self._set_job_controls(False)
+
+        if self.scan_worker.cancel_token.cancelled:
+            self.add_log("⏹ SCAN CANCELADO")
+            self.lbl_status.setText("Cancelado")
+            self._re_enable_controls()
+            return
 
         if not success or not pages:
             self.add_log("❌ MISSÃO FALHADA: Nenhuma página encontrada")
@@ -368,38 +406,47 @@ class WebTab(QWidget):
         # Log de início do worker de crawl
         log_worker_start("WebCrawlWorker", {
             "paginas_selecionadas": len(selected),
-            "output": self._get_current_output_path()
+            "output": self._get_current_output_path(),
+            "orcamento_tokens": self.cmb_budget.currentData(),
+            "partes": self.chk_shards.isChecked()
         })
 
         self.lbl_status.setText(f"Crawling: {len(selected)} páginas selecionadas...")
 
-        self.crawl_worker = WebCrawlWorker(selected, self._get_current_output_path())
+        self.crawl_tokens = 0
+        self.crawl_worker = WebCrawlWorker(
+            selected,
+            self._get_current_output_path(),
+            token_budget=self.cmb_budget.currentData(),
+            split_shards=self.chk_shards.isChecked(),
+            export_chunks=self.chk_chunks.isChecked()
+        )
         self.crawl_worker.progress.connect(self._on_worker_progress)
+        self.crawl_worker.page_crawled.connect(self._on_page_crawled)
+        self.crawl_worker.crawl_progress.connect(self._on_crawl_progress)
         self.crawl_worker.crawl_finished.connect(self._on_crawl_finished)
         self.crawl_worker.start()
+        self._set_job_controls(True)
 
     def _on_crawl_finished(self, success: bool, message: str):
         """Callback após Crawl"""
         # Log resultado do worker
         log_worker_finished("WebCrawlWorker", success, message)
+        self._set_job_controls(False)
 
         # Esconder barra de progresso
         self.progress_bar.setVisible(False)
 
-        if success:
-            # Contar tokens do arquivo gerado
-            try:
-                counter = TokenCounter()
-                output_file = Path(self._get_current_output_path())
-                if output_file.exists():
-                    tokens = counter.count_tokens_in_file(output_file)
-                    tokens_formatted = counter.format_token_count(tokens)
-                    self.add_log(f"🔢 Total de Tokens Gerados: {tokens_formatted}")
-                    self.lbl_status.setText(f"🎉 Sucesso! ({len(self.crawl_worker.selected_pages)} páginas | {tokens_formatted})")
-                else:
-                    self.lbl_status.setText("🎉 Missão concluída!")
-            except Exception as e:
-                self.lbl_status.setText("🎉 Missão concluída!")
+        if self.crawl_worker.cancel_token.cancelled:
+            self.add_log(f"⏹ {message}")
+            self.lbl_status.setText("⏹ Missão cancelada")
+            self.lbl_status.setStyleSheet("color: #666; font-weight: bold;")
+        elif success:
+            # Total de tokens = soma das contagens por página (sem reler o arquivo)
+            tokens_formatted = TokenCounter.format_token_count(self.crawl_worker.total_tokens)
+            self.add_log(f"🔢 Total de Tokens Gerados: {tokens_formatted}")
+            self.lbl_status.setText(f"🎉 Sucesso! ({len(self.crawl_worker.selected_pages)} páginas | {tokens_formatted})")
+            self.status_message_emitted.emit(f"Tokens: {tokens_formatted}")
             self.lbl_status.setStyleSheet("color: green; font-weight: bold;")
             self.add_log("✅ MISSÃO CONCLUÍDA COM SUCESSO!")
         else:
@@ -427,22 +474,88 @@ class WebTab(QWidget):
         # Emitir sinal de fim
         self.conversion_finished.emit(success, message)
 
+    def _on_page_crawled(self, page: dict):
+        """Handler para cada página processada pelo crawl (tokens em streaming)"""
+        self.crawl_tokens += page.get("tokens", 0)
+        tokens_formatted = TokenCounter.format_token_count(self.crawl_tokens)
+
+        self.add_log(f"✓ {page['title']} ({page.get('tokens', 0)} tokens)")
+        self.status_message_emitted.emit(f"Tokens: {tokens_formatted}")
+
+    def _on_crawl_progress(self, event: dict):
+        """Handler do progresso estruturado do crawl (barra determinada + throughput/ETA)"""
+        self.progress_bar.setRange(0, event["total"])
+        self.progress_bar.setValue(event["done"])
+        self.lbl_status.setText(f"Crawling: {format_progress(event)}")
+        if event["status"] == "failed":
+            kind = f" [{event['error']}]" if event.get("error") else ""
+            self.add_error_log(f"Falha{kind}: {event['url']}")
+
     def _on_worker_progress(self, message: str):
         """Handler para progresso dos workers"""
         self.add_log(f"⚡ {message}")
         self.lbl_status.setText(message)
         self.status_message_emitted.emit(message)
 
-        # Atualizar barra de progresso se detectar conclusão de página
-        if "✓" in message and ("chars" in message or "CRAWL NOVO" in message):
-            current_value = self.progress_bar.value()
-            self.progress_bar.setValue(current_value + 1)
-
     def _re_enable_controls(self):
         """Reabilita controles da interface"""
         self.btn_convert_web.setEnabled(True)
         self.btn_folder.setEnabled(True)
 
+    # =======================================
+    # CANCELAMENTO E PAUSA
+    # =======================================
+
+    def _active_worker(self):
+        """Worker cancelável em execução (scan ou crawl)"""
+        for worker in (self.crawl_worker, self.scan_worker):
+            if worker is not None and worker.isRunning():
+                return worker
+        return None
+
+    def _set_job_controls(self, running: bool):
+        """Habilita Pausar/Cancelar enquanto há job em andamento"""
+        self.btn_pause.blockSignals(True)
+        self.btn_pause.setChecked(False)
+        self.btn_pause.setText("⏸ Pausar")
+        self.btn_pause.blockSignals(False)
+        self.btn_pause.setEnabled(running)
+        self.btn_cancel.setEnabled(running)
+
+    def _toggle_pause(self, paused: bool):
+        """Pausa/retoma o job atual"""
+        worker = self._active_worker()
+        if worker is None:
+            return
+
+        if paused:
+            worker.pause()
+            self.btn_pause.setText("▶ Retomar")
+            self.add_log("⏸ Pausando após as páginas em andamento...")
+        else:
+            worker.resume()
+            self.btn_pause.setText("⏸ Pausar")
+            self.add_log("▶ Retomado")
+
+    def _cancel_job(self):
+        """Cancela o job atual (browser fechado pelo próprio job)"""
+        worker = self._active_worker()
+        if worker is None:
+            return
+
+        log_button_click("Cancelar", {"worker": type(worker).__name__})
+        worker.cancel()
+        self.btn_pause.setEnabled(False)
+        self.btn_cancel.setEnabled(False)
+        self.lbl_status.setText("⏹ Cancelando...")
+        self.add_log("⏹ Cancelamento solicitado")
+
+    def shutdown(self, timeout_ms: int = 10000):
+        """Cancela workers em andamento e aguarda (fechamento da janela)"""
+        for worker in (self.scan_worker, self.crawl_worker):
+            if worker is not None and not worker.shutdown(timeout_ms):
+                engine_logger.warning(f"{type(worker).__name__} não terminou em {timeout_ms} ms")
+
     def _get_current_output_path(self) -> str:
         """Retorna o caminho de saída atual baseado nos campos da GUI"""
         filename = self.txt_filename.text().strip()
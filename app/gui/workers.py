@@ -3,34 +3,70 @@ GUI Workers Module - V3.0
 Workers Qt para operações assíncronas
 """
 
-import asyncio
 from PyQt6.QtCore import QThread, pyqtSignal
 
-from app.converters.pdf_converter import PdfToMarkdownConverter
-from app.converters.web_converter import WebToMarkdownConverter
 from app.converters.web_engine.logger import (
     log_worker_start, log_worker_finished,
     log_conversion_start, log_conversion_finished, logger
 )
+from app.utils.cancellation import CancellationToken, OperationCancelled
+
+# ===========================================
+# 0. WORKER BASE (CANCELÁVEL)
+# ===========================================
+
+class CancellableWorker(QThread):
+    """QThread com CancellationToken (cancelar / pausar / retomar)"""
+
+    def __init__(self, profile: bool = None):
+        """profile: Perfila o job (cProfile/tracemalloc em logs/profiles; None = LCB_PROFILE)"""
+        super().__init__()
+        self.cancel_token = CancellationToken()
+        self.profile = profile
+
+    def cancel(self):
+        """Solicita cancelamento (o job para no próximo checkpoint)"""
+        self.cancel_token.cancel()
+
+    def pause(self):
+        """Pausa no próximo checkpoint (trabalho em andamento termina)"""
+        self.cancel_token.pause()
+
+    def resume(self):
+        """Retoma após pausa"""
+        self.cancel_token.resume()
+
+    def shutdown(self, timeout_ms: int = 10000) -> bool:
+        """Cancela e aguarda a thread terminar (fechamento da janela)
+
+        Returns:
+            True se a thread terminou dentro do timeout
+        """
+        if not self.isRunning():
+            return True
+        self.cancel()
+        return self.wait(timeout_ms)
 
 # ===========================================
 # 1. WORKER PDF
 # ===========================================
 
-class ConverterWorker(QThread):
+class ConverterWorker(CancellableWorker):
     """Executa conversão PDF em thread separada"""
 
     progress = pyqtSignal(str)
     finished = pyqtSignal(bool, str)
 
-    def __init__(self, pdf_path: str, output_path: str):
+    def __init__(self, pdf_path: str, output_path: str, profile: bool = None):
         """Inicializa worker
 
         Args:
             pdf_path: Caminho do PDF
             output_path: Caminho de destino do .md
+            profile: Perfila o job (None = LCB_PROFILE)
         """
-        super().__init__()
+        super().__init__(profile)
+        from app.converters.pdf_converter import PdfToMarkdownConverter
         self.converter = PdfToMarkdownConverter()
         self.pdf_path = pdf_path
         self.output_path = output_path
@@ -39,7 +75,10 @@ class ConverterWorker(QThread):
         """Executa conversão e emite signals"""
         try:
             self.progress.emit("Iniciando conversão PDF...")
-            success, message = self.converter.process(self.pdf_path, self.output_path)
+            success, message = self.converter.process(
+                self.pdf_path, self.output_path, cancel_token=self.cancel_token,
+                profile=self.profile
+            )
             self.finished.emit(success, message)
 
         except Exception as e:
@@ -65,7 +104,8 @@ class WebConverterWorker(QThread):
             spider_mode: Se True, ativa modo spider
         """
         super().__init__()
-        self.converter = WebToMarkdownConverter()
+        from app.converters.web_converter import get_shared_converter
+        self.converter = get_shared_converter()
         self.url = url
         self.output_path = output_path
         self.spider_mode = spider_mode
@@ -92,28 +132,37 @@ class WebConverterWorker(QThread):
 # 3. WORKER WEB SCAN (NOVO V3.0)
 # ===========================================
 
-class WebScanWorker(QThread):
+class WebScanWorker(CancellableWorker):
     """PASSO A: Worker que apenas SCANEIA páginas"""
 
     progress = pyqtSignal(str)
     scan_finished = pyqtSignal(bool, list)  # (sucesso, lista_de_paginas)
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, profile: bool = None):
         """Inicializa worker de scan
 
         Args:
             url: URL da seed para scan
+            profile: Perfila o job (None = LCB_PROFILE)
         """
-        super().__init__()
-        self.converter = WebToMarkdownConverter()
+        super().__init__(profile)
+        from app.converters.web_converter import get_shared_converter
+        self.converter = get_shared_converter()
         self.url = url
 
     def run(self):
         """Executa scan e emite signals"""
         try:
             self.progress.emit("Detectando tipo de renderização...")
-            success, pages = asyncio.run(self.converter.scan_pages(self.url))
+            from app.utils.async_loop import run_coroutine
+            success, pages = run_coroutine(
+                self.converter.scan_pages(self.url, cancel_token=self.cancel_token,
+                                          profile=self.profile)
+            )
             self.scan_finished.emit(success, pages)
+        except OperationCancelled:
+            self.progress.emit("Scan cancelado pelo usuário")
+            self.scan_finished.emit(False, [])
         except Exception as e:
             logger.exception(f"Erro no WebScanWorker: {e}")
             self.scan_finished.emit(False, [])
@@ -122,71 +171,90 @@ class WebScanWorker(QThread):
 # 4. WORKER WEB CRAWL (NOVO V3.0)
 # ===========================================
 
-class WebCrawlWorker(QThread):
+class WebCrawlWorker(CancellableWorker):
     """PASSO C: Worker que CRAWLA páginas selecionadas"""
 
     progress = pyqtSignal(str)
+    page_crawled = pyqtSignal(dict)  # Página processada (com contagem de tokens)
+    crawl_progress = pyqtSignal(dict)  # Evento de progresso (done/total, throughput, ETA)
     crawl_finished = pyqtSignal(bool, str)
 
-    def __init__(self, selected_pages: list, output_path: str):
+    def __init__(self, selected_pages: list, output_path: str,
+                 token_budget: int = None, split_shards: bool = False,
+                 export_chunks: bool = False, profile: bool = None):
         """Inicializa worker de crawl
 
         Args:
             selected_pages: Páginas selecionadas pelo usuário
             output_path: Caminho do arquivo de saída
+            token_budget: Orçamento de tokens do arquivo (None = sem limite)
+            split_shards: Se True, divide a saída em partes que cabem no orçamento
+            export_chunks: Se True, exporta também chunks RAG (.chunks.jsonl)
+            profile: Perfila o job (None = LCB_PROFILE)
         """
-        super().__init__()
-        self.converter = WebToMarkdownConverter()
+        super().__init__(profile)
+        from app.converters.web_converter import get_shared_converter
+        self.converter = get_shared_converter()
         self.selected_pages = selected_pages
         self.output_path = output_path
+        self.token_budget = token_budget
+        self.split_shards = split_shards
+        self.export_chunks = export_chunks
+        self.total_tokens = 0
 
     def run(self):
         """Executa crawl e gera arquivo consolidado"""
         try:
             self.progress.emit("Baixando conteúdo das páginas selecionadas...")
-            success, contents = asyncio.run(self.converter.crawl_selected_pages(self.selected_pages))
+            from app.utils.async_loop import run_coroutine
+            success, contents = run_coroutine(self.converter.crawl_selected_pages(
+                self.selected_pages,
+                on_page=self.page_crawled.emit,
+                on_progress=self.crawl_progress.emit,
+                cancel_token=self.cancel_token,
+                profile=self.profile
+            ))
+
+            # Total = soma das contagens por página (sem reler o arquivo gerado)
+            self.total_tokens = sum(page.get("tokens", 0) for page in contents)
 
             if success and contents:
                 success, message = self._generate_consolidated_markdown(contents)
+                if success and self.export_chunks:
+                    self.progress.emit("Gerando chunks para RAG...")
+                    _, chunks_message = self._export_rag_chunks(contents)
+                    message += f"\n{chunks_message}"
                 self.crawl_finished.emit(success, message)
             else:
                 self.crawl_finished.emit(False, "Nenhum conteúdo baixado")
+        except OperationCancelled as e:
+            partial = e.partial or []
+            self.total_tokens = sum(page.get("tokens", 0) for page in partial)
+            self.crawl_finished.emit(False, f"Cancelado pelo usuário ({len(partial)} páginas baixadas, nada foi salvo)")
         except Exception as e:
             logger.exception(f"Erro no WebCrawlWorker: {e}")
             self.crawl_finished.emit(False, f"Erro: {e}")
 
     def _generate_consolidated_markdown(self, contents: list) -> tuple[bool, str]:
         """Gera arquivo consolidado (cabeçalho + índice + conteúdo)"""
-        try:
-            from datetime import datetime
-            from pathlib import Path
-
-            output_p = Path(self.output_path)
-
-            documento = []
-            documento.append("# Documentação\n")
-            documento.append(f"Gerado em {datetime.now().strftime('%d/%m/%Y %H:%M')}\n")
-
-            # Índice
-            documento.append("## 📑 Índice\n")
-            for i, page in enumerate(contents, 1):
-                documento.append(f"{i}. {page['title']}")
-
-            documento.append("\n---\n")
-
-            # Conteúdo de cada página
-            for page in contents:
-                documento.append(f"\n## 📄 {page['title']}\n")
-                documento.append(f"> Fonte: {page['url']}\n")
-                documento.append(page['markdown'])
-                documento.append("\n---\n")
-
-            # Salvar
-            texto_final = "\n".join(documento)
-            output_p.write_text(texto_final, encoding='utf-8')
-
-            return True, f"Arquivo salvo: {self.output_path}\n{len(contents)} páginas"
-
-        except Exception as e:
-            logger.exception(f"Erro ao gerar arquivo consolidado: {e}")
-            return False, f"Erro ao gerar arquivo: {e}"
\ No newline at end of file
+        from app.converters.web_engine.page_store import PageStore
+        from app.converters.web_engine.writer import ConsolidatedWriter
+
+        writer = ConsolidatedWriter(self.converter.crawler_service.token_counter, store=PageStore())
+        return writer.write(
+            contents,
+            self.output_path,
+            token_budget=self.token_budget,
+            split_shards=self.split_shards
+        )
+
+    def _export_rag_chunks(self, contents: list) -> tuple[bool, str]:
+        """Exporta chunks por heading (JSONL) ao lado do arquivo consolidado"""
+        from pathlib import Path
+        from app.utils.chunker import SemanticChunker
+
+        output_p = Path(self.output_path)
+        chunks_path = output_p.with_name(f"{output_p.stem}.chunks.jsonl")
+
+        chunker = SemanticChunker(self.converter.crawler_service.token_counter)
+        return chunker.export(contents, str(chunks_path))
@@ -0,0 +1,445 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Job Server                                        ║
+║ API HTTP/JSON local com fila persistente e pool de workers                   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Endpoints:
+    POST /jobs                {"type": "web", "url": ..., "spider": true, "model": "gpt-4o"}
+                              {"type": "pdf", "pdf_path": "/caminho/manual.pdf"}
+    GET  /jobs                Lista jobs
+    GET  /jobs/<id>           Status + progresso
+    GET  /jobs/<id>/result    Download do Markdown gerado
+
+Uma única instância mantém o encoder tiktoken, o cache do crawler e os
+browsers aquecidos entre jobs; a fila cheia responde 429 (backpressure).
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import json
+import uuid
+import time
+import sqlite3
+import asyncio
+import threading
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.converters.web_engine.logger import logger, get_log_dir
+
+JOB_TYPES = ("web", "pdf")
+
+# Intervalo mínimo (s) entre gravações do progresso de um job no SQLite:
+# o callback roda no event loop compartilhado por todos os workers
+PROGRESS_WRITE_INTERVAL = 1.0
+
+# ===========================================
+# 2. FILA PERSISTENTE (SQLITE)
+# ===========================================
+
+class JobStore:
+    """Fila de jobs persistida em SQLite (sobrevive a reinícios do servidor)"""
+
+    def __init__(self, db_path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress TEXT NOT NULL DEFAULT '{}',
+                    message TEXT NOT NULL DEFAULT '',
+                    result_path TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            # Jobs interrompidos por queda do servidor voltam para a fila
+            self._conn.execute("UPDATE jobs SET status = 'queued' WHERE status = 'running'")
+
+    def add(self, job_type: str, params: dict) -> dict:
+        """Insere job na fila"""
+        now = time.time()
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, type, params, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?)",
+                (job_id, job_type, json.dumps(params), now, now)
+            )
+        return self.get(job_id)
+
+    def update(self, job_id: str, **fields):
+        """Atualiza campos do job (progress é serializado em JSON)"""
+        if "progress" in fields:
+            fields["progress"] = json.dumps(fields["progress"])
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> dict | None:
+        """Retorna job como dict (ou None)"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self, status: str = None) -> list[dict]:
+        """Lista jobs (mais antigos primeiro)"""
+        query = "SELECT * FROM jobs"
+        args = ()
+        if status:
+            query += " WHERE status = ?"
+            args = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", args).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def count_pending(self) -> int:
+        """Jobs aguardando ou em execução (base do backpressure)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchone()
+        return row[0]
+
+    def _to_dict(self, row) -> dict:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["progress"] = json.loads(job["progress"])
+        return job
+
+
+# ===========================================
+# 3. WORKERS
+# ===========================================
+
+def _convert_pdf_job(pdf_path: str, output_path: str) -> tuple[bool, str]:
+    """Executa conversão PDF em processo do pool (função de módulo = picklable)"""
+    from app.converters.pdf_converter import PdfToMarkdownConverter
+    return PdfToMarkdownConverter().process(pdf_path, output_path)
+
+
+class JobServer:
+    """Servidor de jobs: fila persistente + workers assíncronos (web) e processos (PDF)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, crawl_workers: int = 2,
+                 pdf_workers: int = 2, max_queue: int = 100, data_dir: str = None):
+        """Inicializa servidor
+
+        Args:
+            host: Interface de escuta (default: apenas local)
+            port: Porta HTTP
+            crawl_workers: Workers assíncronos de crawl (mesmo event loop/converter)
+            pdf_workers: Processos do pool de conversão PDF
+            max_queue: Máximo de jobs pendentes antes de responder 429
+            data_dir: Pasta para o banco da fila e os resultados
+        """
+        self.host = host
+        self.port = port
+        self.crawl_workers = crawl_workers
+        self.pdf_workers = pdf_workers
+        self.max_queue = max_queue
+
+        self.data_dir = Path(data_dir) if data_dir else get_log_dir().parent / "jobs"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.store = JobStore(self.data_dir / "jobs.db")
+
+        self._loop = None
+        self._web_queue = None
+        self._pdf_queue = None
+        self._pdf_pool = None
+        self._converter = None
+        self._httpd = None
+        self._http_thread = None
+
+    # =======================================
+    # CICLO DE VIDA
+    # =======================================
+
+    def serve_forever(self):
+        """Sobe loop de workers + servidor HTTP (bloqueia até Ctrl+C)"""
+        self.start()
+        try:
+            # join com timeout: Ctrl+C só chega à thread principal entre esperas
+            while self._http_thread.is_alive():
+                self._http_thread.join(0.5)
+        except KeyboardInterrupt:
+            logger.info("Job server interrompido pelo usuário")
+        finally:
+            self.stop()
+
+    def start(self):
+        """Inicia thread do event loop, pool de processos e servidor HTTP (thread própria)"""
+        self._pdf_pool = ProcessPoolExecutor(max_workers=self.pdf_workers)
+
+        ready = threading.Event()
+        threading.Thread(target=self._run_loop, args=(ready,), name="job-server-loop",
+                         daemon=True).start()
+        ready.wait()
+
+        # Aquece crawler/encoder no loop antes do primeiro job
+        self._loop.call_soon_threadsafe(self._get_converter)
+
+        # Re-enfileira jobs persistidos (inclusive os interrompidos)
+        for job in self.store.list(status="queued"):
+            self._enqueue(job)
+
+        handler = type("JobRequestHandler", (_JobRequestHandler,), {"server_app": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.port = self._httpd.server_address[1]  # porta 0 = escolhida pelo SO
+        self._http_thread = threading.Thread(target=self._httpd.serve_forever, name="job-server-http",
+                                             daemon=True)
+        self._http_thread.start()
+        logger.info(f"Job server ouvindo em http://{self.host}:{self.port} "
+                    f"({self.crawl_workers} workers web, {self.pdf_workers} workers PDF)")
+
+    def stop(self):
+        """Encerra servidor HTTP, loop e pool de processos"""
+        if self._httpd:
+            # shutdown() espera o serve_forever sair; só então o socket fecha
+            self._httpd.shutdown()
+            self._http_thread.join(timeout=10)
+            self._httpd.server_close()
+        if self._loop:
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_workers(), self._loop).result(timeout=10)
+            except Exception as e:
+                logger.warning(f"Workers não finalizaram a tempo: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._pdf_pool:
+            self._pdf_pool.shutdown(wait=False, cancel_futures=True)
+        logger.info("Job server encerrado")
+
+    def _run_loop(self, ready: threading.Event):
+        """Thread do event loop: mantém workers web e PDF consumindo as filas"""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._web_queue = asyncio.Queue()
+        self._pdf_queue = asyncio.Queue()
+
+        for _ in range(self.crawl_workers):
+            self._loop.create_task(self._worker(self._web_queue, self._run_web_job))
+        for _ in range(self.pdf_workers):
+            self._loop.create_task(self._worker(self._pdf_queue, self._run_pdf_job))
+
+        ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _cancel_workers(self):
+        """Cancela workers pendentes (jobs em execução voltam para a fila no próximo start)"""
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Browsers aquecidos, pool HTTP e executor do converter compartilhado
+        if self._converter is not None:
+            await self._converter.crawler_service.close()
+
+    # =======================================
+    # FILA
+    # =======================================
+
+    def submit(self, payload: dict) -> tuple[int, dict]:
+        """Valida e enfileira job (chamado pelas threads HTTP)
+
+        Returns:
+            (status_http, corpo_json)
+        """
+        job_type = payload.get("type")
+        if job_type not in JOB_TYPES:
+            return 400, {"error": f"type deve ser um de {JOB_TYPES}"}
+        if job_type == "web" and not (payload.get("url") or payload.get("pages")):
+            return 400, {"error": "job web requer 'url' ou 'pages'"}
+        if job_type == "pdf" and not payload.get("pdf_path"):
+            return 400, {"error": "job pdf requer 'pdf_path'"}
+
+        # Backpressure: fila cheia → cliente deve tentar de novo mais tarde
+        if self.store.count_pending() >= self.max_queue:
+            return 429, {"error": "fila cheia", "max_queue": self.max_queue}
+
+        params = {k: v for k, v in payload.items() if k != "type"}
+        job = self.store.add(job_type, params)
+        self._enqueue(job)
+        return 202, job
+
+    def _enqueue(self, job: dict):
+        """Entrega job à fila do worker correspondente (thread-safe)"""
+        queue = self._web_queue if job["type"] == "web" else self._pdf_queue
+        self._loop.call_soon_threadsafe(queue.put_nowait, job["id"])
+
+    async def _worker(self, queue: asyncio.Queue, handler):
+        """Consome jobs da fila indefinidamente"""
+        while True:
+            job_id = await queue.get()
+            job = self.store.get(job_id)
+            if not job or job["status"] != "queued":
+                continue
+
+            self.store.update(job_id, status="running")
+            logger.info(f"JOB {job_id} ({job['type']}) iniciado")
+            try:
+                success, message, result_path = await handler(job)
+                self.store.update(job_id, status="done" if success else "failed",
+                                  message=message, result_path=result_path)
+            except Exception as e:
+                logger.exception(f"Erro no job {job_id}: {e}")
+                self.store.update(job_id, status="failed", message=f"Erro: {e}")
+            logger.info(f"JOB {job_id} finalizado")
+
+    # =======================================
+    # EXECUÇÃO DOS JOBS
+    # =======================================
+
+    def _get_converter(self):
+        """Instância aquecida compartilhada por todos os jobs web (criada uma vez)
+
+        Com keep_browsers_warm os jobs reaproveitam o mesmo browser (um por
+        tipo de sessão) em vez de abrir e fechar um Chromium a cada job; os
+        browsers são fechados em stop().
+        """
+        if self._converter is None:
+            from app.converters.web_converter import WebToMarkdownConverter
+            self._converter = WebToMarkdownConverter(keep_browsers_warm=True)
+        return self._converter
+
+    async def _run_web_job(self, job: dict) -> tuple[bool, str, str | None]:
+        """Scan (opcional) + crawl + consolidado usando o converter aquecido"""
+        from app.converters.web_engine.page_store import PageStore
+        from app.converters.web_engine.writer import ConsolidatedWriter
+
+        converter = self._get_converter()
+        params = job["params"]
+        output_path = str(self.data_dir / f"{job['id']}.md")
+        progress = {"pages_done": 0, "tokens": 0}
+
+        if params.get("pages"):
+            pages = params["pages"]
+        elif params.get("spider"):
+            success, pages = await converter.scan_pages(params["url"])
+            if not success:
+                return False, "Falha no scan", None
+        else:
+            pages = [{"url": params["url"], "title": "", "selected": True}]
+
+        progress["pages_total"] = len(pages)
+        self.store.update(job["id"], progress=progress)
+
+        def on_page(page: dict):
+            progress["tokens"] += page["tokens"]
+
+        last_write = [0.0]
+
+        def on_progress(event: dict):
+            progress.update(pages_done=event["done"], bytes=event["bytes"],
+                            cache_hits=event["cache_hits"], failures=event["failures"],
+                            pages_per_sec=event["pages_per_sec"], eta_seconds=event["eta_seconds"])
+            # Sem gravar a cada página: o UPDATE síncrono seguraria o loop dos outros jobs
+            now = time.monotonic()
+            if now - last_write[0] >= PROGRESS_WRITE_INTERVAL:
+                last_write[0] = now
+                self.store.update(job["id"], progress=progress)
+
+        # Falhas deste job (o crawler_service é compartilhado entre os workers)
+        failures = []
+        success, contents = await converter.crawl_selected_pages(
+            pages, on_page=on_page, on_progress=on_progress, failures=failures
+        )
+        if failures:
+            from app.converters.web_engine.retry import summarize
+            progress["failures_by_kind"] = summarize(failures)
+        self.store.update(job["id"], progress=progress)
+        if not success or not contents:
+            return False, "Nenhum conteúdo baixado", None
+
+        token_counter = converter.crawler_service.token_counter
+        token_budget = params.get("budget") or token_counter.CONTEXT_WINDOWS.get(params.get("model"))
+        # Corpos compartilhados entre jobs; cada resultado ganha <id>.manifest.json
+        writer = ConsolidatedWriter(token_counter, store=PageStore(self.data_dir / "page_store"))
+        success, message = writer.write(contents, output_path, token_budget=token_budget)
+        return success, message, output_path if success else None
+
+    async def _run_pdf_job(self, job: dict) -> tuple[bool, str, str | None]:
+        """Conversão PDF no pool de processos (não bloqueia o event loop)"""
+        output_path = str(self.data_dir / f"{job['id']}.md")
+        success, message = await self._loop.run_in_executor(
+            self._pdf_pool, _convert_pdf_job, job["params"]["pdf_path"], output_path
+        )
+        return success, message, output_path if success else None
+
+
+# ===========================================
+# 4. HANDLER HTTP
+# ===========================================
+
+class _JobRequestHandler(BaseHTTPRequestHandler):
+    """Rotas HTTP/JSON do job server"""
+
+    server_app: JobServer = None
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "rota não encontrada"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            return self._send_json(400, {"error": "JSON inválido"})
+
+        status, body = self.server_app.submit(payload)
+        headers = {"Retry-After": "30"} if status == 429 else {}
+        self._send_json(status, body, headers)
+
+    def do_GET(self):
+        parts = [p for p in self.path.split("?")[0].split("/") if p]
+
+        if parts == ["jobs"]:
+            return self._send_json(200, {"jobs": self.server_app.store.list()})
+
+        if len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.server_app.store.get(parts[1])
+            if not job:
+                return self._send_json(404, {"error": "job não encontrado"})
+            if len(parts) == 2:
+                return self._send_json(200, job)
+            if parts[2] == "result":
+                return self._send_result(job)
+
+        self._send_json(404, {"error": "rota não encontrada"})
+
+    def _send_result(self, job: dict):
+        if job["status"] != "done" or not job["result_path"]:
+            return self._send_json(409, {"error": "resultado indisponível", "status": job["status"]})
+
+        data = Path(job["result_path"]).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/markdown; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        logger.debug("HTTP %s - %s", self.address_string(), format % args)
@@ -0,0 +1,172 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Async Loop Thread Module                          ║
+║ Event loop asyncio persistente (uma thread) compartilhado pelos workers      ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import atexit
+import asyncio
+import logging
+import threading
+import concurrent.futures
+
+logger = logging.getLogger(__name__)
+
+# ===========================================
+# 2. CLASSE PRINCIPAL
+# ===========================================
+
+class AsyncLoopThread:
+    """Event loop de vida longa rodando numa thread dedicada
+
+    Workers (QThreads) submetem corrotinas com run_coroutine_threadsafe em vez
+    de asyncio.run, então recursos assíncronos (browsers aquecidos, pools de
+    conexão, caches) sobrevivem entre jobs.
+    """
+
+    def __init__(self, name: str = "asyncio-loop"):
+        """Inicializa (o loop só sobe no primeiro submit/start)
+
+        Args:
+            name: Nome da thread
+        """
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks = []
+
+    # =======================================
+    # 2.1: CICLO DE VIDA
+    # =======================================
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    def start(self) -> None:
+        """Sobe a thread do loop (idempotente)"""
+        with self._lock:
+            if self.running:
+                return
+
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(ready,), name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            logger.info(f"Event loop persistente iniciado ({self.name})")
+
+    def _run(self, ready: threading.Event):
+        """Corpo da thread: run_forever até stop()"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+    def stop(self, timeout: float = 10) -> None:
+        """Executa hooks de shutdown, cancela tarefas pendentes e encerra o loop"""
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.error(f"Erro no shutdown do event loop: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        logger.info(f"Event loop persistente encerrado ({self.name})")
+
+    def add_shutdown_hook(self, hook) -> None:
+        """Registra corrotina (sem argumentos) executada no loop antes de encerrar
+
+        Ex: fechar browsers aquecidos e clientes HTTP.
+        """
+        self._shutdown_hooks.append(hook)
+
+    async def _shutdown(self):
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Erro no hook de shutdown {hook}: {e}")
+
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # =======================================
+    # 2.2: SUBMISSÃO DE CORROTINAS
+    # =======================================
+
+    def in_loop_thread(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Agenda corrotina no loop (não bloqueia)"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro, timeout: float = None):
+        """Agenda corrotina e espera o resultado (substitui asyncio.run nos workers)
+
+        Raises:
+            RuntimeError: Se chamado de dentro da própria thread do loop (deadlock)
+        """
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("run() chamado dentro da thread do event loop; use await")
+        return self.submit(coro).result(timeout)
+
+
+# ===========================================
+# 3. INSTÂNCIA DA APLICAÇÃO
+# ===========================================
+
+_loop_thread = None
+_loop_thread_lock = threading.Lock()
+
+
+def get_loop_thread() -> AsyncLoopThread:
+    """Retorna o event loop persistente da aplicação (criado sob demanda)"""
+    global _loop_thread
+    with _loop_thread_lock:
+        if _loop_thread is None:
+            _loop_thread = AsyncLoopThread()
+            atexit.register(_loop_thread.stop)
+        return _loop_thread
+
+
+def run_coroutine(coro, timeout: float = None):
+    """Atalho: executa corrotina no loop persistente e retorna o resultado"""
+    return get_loop_thread().run(coro, timeout)
+
+
+def shutdown_loop_thread(timeout: float = 10) -> None:
+    """Encerra o loop persistente se ele foi iniciado (fechamento da janela)"""
+    if _loop_thread is not None:
+        _loop_thread.stop(timeout)
@@ -0,0 +1,162 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Cancellation Module                               ║
+║ Cancelamento cooperativo e pausa/retomada de jobs longos                     ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Intervalo de verificação enquanto pausado (checkpoint assíncrono)
+PAUSE_POLL_SECONDS = 0.2
+
+
+class OperationCancelled(Exception):
+    """Job interrompido por CancellationToken.cancel()
+
+    Attributes:
+        partial: Resultado parcial já processado (ex: páginas baixadas)
+    """
+
+    def __init__(self, message: str = "Operação cancelada pelo usuário", partial=None):
+        super().__init__(message)
+        self.partial = partial
+
+
+# ===========================================
+# 2. CLASSE PRINCIPAL
+# ===========================================
+
+class CancellationToken:
+    """Token compartilhado entre a thread da GUI e o job (thread/loop do worker)
+
+    A GUI chama cancel()/pause()/resume(); o job chama checkpoint() entre
+    unidades de trabalho (chunks de páginas, lotes de páginas do PDF). Pausar
+    deixa o trabalho em andamento terminar e bloqueia no próximo checkpoint,
+    que guarda o estado informado em `state`.
+    """
+
+    def __init__(self):
+        """Inicializa token (não cancelado, não pausado)"""
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self.state = {}
+
+    # =======================================
+    # 2.1: CONTROLE (QUALQUER THREAD)
+    # =======================================
+
+    def cancel(self):
+        """Solicita cancelamento e dispara callbacks de teardown"""
+        with self._lock:
+            if self._cancelled.is_set():
+                return
+            self._cancelled.set()
+            self._running.set()  # Libera quem está pausado
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Erro no callback de cancelamento: {e}")
+
+    def pause(self):
+        """Pausa no próximo checkpoint"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        """Retoma job pausado"""
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set()
+
+    def add_callback(self, callback) -> None:
+        """Registra callback chamado no cancelamento (imediato se já cancelado)"""
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback) -> None:
+        """Remove callback registrado (ex: ao fim de um chunk)"""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    # =======================================
+    # 2.2: CHECKPOINTS (LADO DO JOB)
+    # =======================================
+
+    def raise_if_cancelled(self, partial=None):
+        """Levanta OperationCancelled se cancelado"""
+        if self._cancelled.is_set():
+            raise OperationCancelled(partial=partial)
+
+    def checkpoint_sync(self, state: dict = None, partial=None):
+        """Checkpoint bloqueante (threads): salva estado, espera se pausado
+
+        Raises:
+            OperationCancelled: Se cancelado antes ou durante a pausa
+        """
+        if state is not None:
+            self.state = state
+        self.raise_if_cancelled(partial)
+        if self.paused:
+            logger.info(f"Job pausado em checkpoint: {self.state}")
+            self._running.wait()
+            logger.info("Job retomado")
+        self.raise_if_cancelled(partial)
+
+    async def checkpoint(self, state: dict = None, partial=None):
+        """Checkpoint assíncrono: como checkpoint_sync sem bloquear o loop
+
+        Raises:
+            OperationCancelled: Se cancelado antes ou durante a pausa
+        """
+        if state is not None:
+            self.state = state
+        self.raise_if_cancelled(partial)
+        if self.paused:
+            logger.info(f"Job pausado em checkpoint: {self.state}")
+            import asyncio
+            while self.paused:
+                await asyncio.sleep(PAUSE_POLL_SECONDS)
+            logger.info("Job retomado")
+        self.raise_if_cancelled(partial)
+
+    def cancel_future_on_cancel(self, future: "asyncio.Future"):
+        """Cancela a future (ex: gather de um chunk) assim que o token for cancelado
+
+        Returns:
+            Callback registrado (remover com remove_callback ao terminar)
+        """
+        import asyncio  # Lazy: a GUI importa este módulo antes de existir loop
+        loop = asyncio.get_running_loop()
+
+        def _cancel():
+            loop.call_soon_threadsafe(future.cancel)
+
+        self.add_callback(_cancel)
+        return _cancel
@@ -0,0 +1,242 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Semantic Chunker Module                           ║
+║ Chunks por heading com limite de tokens e overlap (exportação RAG)           ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import re
+import json
+import hashlib
+import logging
+from bisect import bisect_left
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Heading Markdown (# até ######) no início da linha
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+FENCE_PREFIXES = ("```", "~~~")
+
+# ===========================================
+# 2. CLASSE PRINCIPAL
+# ===========================================
+
+class SemanticChunker:
+    """Divide páginas em chunks por heading, limitados em tokens e com overlap
+
+    Cada página é codificada UMA vez; os chunks são recortados do texto
+    original pelos offsets de caractere dos tokens, sem recodificar
+    substrings candidatas (o que tornaria o chunker quadrático).
+    """
+
+    # =======================================
+    # 2.1: INICIALIZAÇÃO
+    # =======================================
+
+    def __init__(self, token_counter=None, max_tokens: int = 512,
+                 overlap_tokens: int = 64, min_section_tokens: int = 16):
+        """Inicializa chunker
+
+        Args:
+            token_counter: TokenCounter (criado sob demanda se None)
+            max_tokens: Limite de tokens por chunk
+            overlap_tokens: Tokens repetidos entre chunks consecutivos da mesma seção
+            min_section_tokens: Seções menores são anexadas à seção seguinte
+        """
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens deve ser menor que max_tokens")
+
+        if token_counter is None:
+            from app.utils.token_counter import TokenCounter
+            token_counter = TokenCounter()
+
+        self.token_counter = token_counter
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_section_tokens = min_section_tokens
+
+    # =======================================
+    # 2.2: CHUNKING
+    # =======================================
+
+    def chunk_pages(self, pages: list[dict]) -> list[dict]:
+        """Gera chunks para as páginas de crawl_selected_pages
+
+        Args:
+            pages: Páginas [{"url", "title", "markdown", ...}]
+
+        Returns:
+            Lista de chunks com metadados (url, heading_path, tokens, text)
+        """
+        chunks = []
+        for page in pages:
+            chunks.extend(self.chunk_page(page))
+
+        logger.info(f"Chunking: {len(pages)} páginas → {len(chunks)} chunks")
+        return chunks
+
+    def chunk_page(self, page: dict) -> list[dict]:
+        """Gera chunks de uma página
+
+        Args:
+            page: {"url", "title", "markdown", ...}
+
+        Returns:
+            Lista de chunks da página
+        """
+        text = page.get("markdown") or ""
+        if not text.strip():
+            return []
+
+        tokens, offsets = self.token_counter.encode_with_offsets(text)
+        total = len(tokens)
+
+        def char_at(token_index: int) -> int:
+            return offsets[token_index] if token_index < total else len(text)
+
+        def token_at(char_index: int) -> int:
+            return bisect_left(offsets, char_index) if char_index < len(text) else total
+
+        # Seções em posições de token (mesma codificação da página inteira)
+        spans = [(token_at(start), token_at(end), path)
+                 for start, end, path in self._sections(text, page.get("title", ""))]
+        spans = self._merge_short_spans(spans)
+
+        chunks = []
+        for first, last, heading_path in spans:
+            start = first
+            while start < last:
+                end = min(start + self.max_tokens, last)
+                chunk_text = text[char_at(start):char_at(end)]
+
+                if chunk_text.strip():
+                    chunks.append(self._make_chunk(page, len(chunks), heading_path,
+                                                   end - start, chunk_text))
+
+                if end >= last:
+                    break
+                start = end - self.overlap_tokens
+
+        return chunks
+
+    # =======================================
+    # 2.3: EXPORTAÇÃO
+    # =======================================
+
+    def export(self, pages: list[dict], output_path: str) -> tuple[bool, str]:
+        """Gera chunks e salva em JSONL ou Parquet (pela extensão)
+
+        Args:
+            pages: Páginas de crawl_selected_pages
+            output_path: Destino .jsonl ou .parquet
+
+        Returns:
+            (sucesso, mensagem)
+        """
+        try:
+            chunks = self.chunk_pages(pages)
+            output_p = Path(output_path)
+
+            if output_p.suffix.lower() == ".parquet":
+                self.write_parquet(chunks, output_p)
+            else:
+                self.write_jsonl(chunks, output_p)
+
+            return True, f"Chunks salvos: {output_path}\n{len(chunks)} chunks"
+
+        except Exception as e:
+            logger.exception(f"Erro ao exportar chunks: {e}")
+            return False, f"Erro ao exportar chunks: {e}"
+
+    def write_jsonl(self, chunks: list[dict], output_path: Path) -> None:
+        """Salva um chunk por linha (JSON Lines)"""
+        with open(output_path, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(json.dumps(chunk, ensure_ascii=False))
+                f.write("\n")
+
+    def write_parquet(self, chunks: list[dict], output_path: Path) -> None:
+        """Salva chunks em Parquet (requer pyarrow)"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Exportação Parquet requer 'pyarrow' (pip install pyarrow)") from e
+
+        columns = ["id", "url", "title", "heading_path", "chunk_index", "tokens", "text"]
+        table = pa.table({col: [chunk[col] for chunk in chunks] for col in columns})
+        pq.write_table(table, output_path)
+
+    # =======================================
+    # 2.4: UTILITÁRIOS
+    # =======================================
+
+    def _sections(self, text: str, page_title: str) -> list[tuple[int, int, list[str]]]:
+        """Divide o texto em seções por heading (ignora headings em blocos de código)
+
+        Returns:
+            Lista de (offset_inicial, offset_final, heading_path) em caracteres
+        """
+        root = [page_title] if page_title else []
+        starts = [(0, root)]
+        stack = []
+        in_fence = False
+        pos = 0
+
+        for line in text.splitlines(keepends=True):
+            stripped = line.strip()
+            if stripped.startswith(FENCE_PREFIXES):
+                in_fence = not in_fence
+            elif not in_fence:
+                match = HEADING_RE.match(stripped)
+                if match:
+                    level = len(match.group(1))
+                    stack = [(lvl, title) for lvl, title in stack if lvl < level]
+                    stack.append((level, match.group(2)))
+                    path = root + [title for _, title in stack]
+                    if pos == 0:
+                        starts[0] = (0, path)
+                    else:
+                        starts.append((pos, path))
+            pos += len(line)
+
+        bounds = [start for start, _ in starts[1:]] + [len(text)]
+        return [(start, end, path) for (start, path), end in zip(starts, bounds)]
+
+    def _merge_short_spans(self, spans: list[tuple]) -> list[tuple]:
+        """Anexa seções muito curtas (ex: heading seguido de sub-heading) à seguinte"""
+        merged = []
+        pending_start = None
+
+        for i, (first, last, path) in enumerate(spans):
+            begin = first if pending_start is None else pending_start
+            if i + 1 < len(spans) and last - begin < self.min_section_tokens:
+                pending_start = begin
+                continue
+            merged.append((begin, last, path))
+            pending_start = None
+
+        return merged
+
+    def _make_chunk(self, page: dict, index: int, heading_path: list[str],
+                    tokens: int, text: str) -> dict:
+        """Monta dict de chunk com metadados para o vector store"""
+        url = page.get("url", "")
+        url_hash = hashlib.blake2b(url.encode('utf-8'), digest_size=8).hexdigest()
+        return {
+            "id": f"{url_hash}-{index:04d}",
+            "url": url,
+            "title": page.get("title", ""),
+            "heading_path": heading_path,
+            "chunk_index": index,
+            "tokens": tokens,
+            "text": text
+        }
@@ -0,0 +1,237 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Context Packer Module                             ║
+║ Empacotamento de páginas dentro de um orçamento de tokens                    ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import logging
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+# Marcador anexado às páginas truncadas para caber no orçamento
+TRUNCATION_MARKER = "\n\n> ✂️ [... conteúdo truncado para caber no orçamento de tokens ...]\n"
+
+
+def _lastmod_timestamp(page: dict) -> float:
+    """"lastmod" (data HTTP do Last-Modified) em segundos; 0 se ausente/inválido"""
+    try:
+        return parsedate_to_datetime(page["lastmod"]).timestamp()
+    except (KeyError, TypeError, ValueError, IndexError):
+        return 0.0
+
+
+def _part_title(title: str, k: int, total: int) -> str:
+    """Título de um pedaço de página dividida"""
+    return f"{title} (parte {k}/{total})"
+
+
+# ===========================================
+# 2. CLASSE PRINCIPAL
+# ===========================================
+
+class ContextPacker:
+    """Empacota páginas (com contagem de tokens) em um orçamento de tokens
+
+    Dois modos:
+    - pack(): arquivo único que cabe no orçamento (prioridade/recência,
+      truncando as páginas de menor valor)
+    - shard(): N partes que cabem individualmente no orçamento
+
+    Ambos são gulosos e lineares no número de páginas; só recodificam o
+    texto das páginas que precisam ser truncadas ou divididas.
+    """
+
+    # =======================================
+    # 2.1: INICIALIZAÇÃO
+    # =======================================
+
+    def __init__(self, token_budget: int, token_counter=None, reserved_tokens: int = 0,
+                 page_overhead=None, min_truncated_tokens: int = 256):
+        """Inicializa empacotador
+
+        Args:
+            token_budget: Orçamento total de tokens (ex: 128000 para gpt-4o)
+            token_counter: TokenCounter usado para truncar/dividir páginas
+            reserved_tokens: Tokens reservados para cabeçalho do documento
+            page_overhead: Função page -> tokens de cabeçalho/índice da página
+            min_truncated_tokens: Menor trecho que vale a pena manter truncado
+        """
+        self.token_budget = token_budget
+        self.token_counter = token_counter
+        self.reserved_tokens = reserved_tokens
+        self.page_overhead = page_overhead or (lambda page: 0)
+        self.min_truncated_tokens = min_truncated_tokens
+        self._marker_cost = None
+
+    # =======================================
+    # 2.2: ARQUIVO ÚNICO
+    # =======================================
+
+    def pack(self, pages: list[dict]) -> dict:
+        """Seleciona páginas que cabem no orçamento (arquivo único)
+
+        Ordem de preenchimento: maior "priority", depois "lastmod" mais
+        recente, depois ordem original. A saída mantém a ordem original.
+
+        Args:
+            pages: Páginas [{"url", "title", "markdown", "tokens", ...}]
+
+        Returns:
+            {"pages": [...], "dropped": [...], "truncated": [urls], "tokens": int}
+        """
+        budget = self.token_budget - self.reserved_tokens
+
+        order = list(range(len(pages)))
+        order.sort(key=lambda i: _lastmod_timestamp(pages[i]), reverse=True)
+        order.sort(key=lambda i: pages[i].get("priority", 0), reverse=True)
+
+        chosen = {}
+        dropped = []
+        truncated = []
+        used = 0
+
+        for i in order:
+            page = pages[i]
+            overhead = self.page_overhead(page)
+            cost = page.get("tokens", 0) + overhead
+            remaining = budget - used
+
+            if cost <= remaining:
+                chosen[i] = page
+                used += cost
+            elif self.token_counter and remaining - overhead - self._marker_tokens() >= self.min_truncated_tokens:
+                cut_page = self._truncate_page(page, remaining - overhead)
+                chosen[i] = cut_page
+                used += cut_page["tokens"] + overhead
+                truncated.append(page["url"])
+            else:
+                dropped.append(page)
+
+        logger.info(f"Empacotamento: {len(chosen)}/{len(pages)} páginas, "
+                    f"{len(truncated)} truncadas, {used + self.reserved_tokens}/{self.token_budget} tokens")
+
+        return {
+            "pages": [chosen[i] for i in sorted(chosen)],
+            "dropped": dropped,
+            "truncated": truncated,
+            "tokens": used + self.reserved_tokens
+        }
+
+    # =======================================
+    # 2.3: PARTES (SHARDS)
+    # =======================================
+
+    def shard(self, pages: list[dict]) -> list[list[dict]]:
+        """Divide páginas em partes que cabem individualmente no orçamento
+
+        Preenche as partes na ordem original (next-fit); páginas maiores
+        que o orçamento são divididas em pedaços por offset de tokens.
+
+        Args:
+            pages: Páginas [{"url", "title", "markdown", "tokens", ...}]
+
+        Returns:
+            Lista de partes (cada parte é uma lista de páginas)
+        """
+        budget = self.token_budget - self.reserved_tokens
+
+        shards = []
+        current = []
+        used = 0
+
+        for page in pages:
+            for piece in self._split_oversized(page, budget):
+                cost = piece.get("tokens", 0) + self.page_overhead(piece)
+                if current and used + cost > budget:
+                    shards.append(current)
+                    current = []
+                    used = 0
+                current.append(piece)
+                used += cost
+
+        if current:
+            shards.append(current)
+
+        logger.info(f"Empacotamento em partes: {len(pages)} páginas → {len(shards)} partes")
+        return shards
+
+    # =======================================
+    # 2.4: UTILITÁRIOS
+    # =======================================
+
+    def _marker_tokens(self) -> int:
+        """Tokens do marcador de truncamento (contado uma vez)"""
+        if self._marker_cost is None:
+            self._marker_cost = self.token_counter.count_tokens(TRUNCATION_MARKER)
+        return self._marker_cost
+
+    def _truncate_page(self, page: dict, max_tokens: int) -> dict:
+        """Retorna cópia da página truncada para max_tokens (marcador incluído)
+
+        O corte reserva os tokens do marcador; se o texto cortado + marcador
+        recodificar com mais tokens (junção na fronteira), corta de novo pelo
+        excesso.
+        """
+        limit = max_tokens - self._marker_tokens()
+        while True:
+            markdown = self.token_counter.truncate_to_tokens(page["markdown"], max(limit, 0))
+            markdown += TRUNCATION_MARKER
+            tokens = self.token_counter.count_tokens(markdown)
+            if tokens <= max_tokens or limit <= 0:
+                break
+            limit -= tokens - max_tokens
+
+        cut_page = dict(page)
+        cut_page["markdown"] = markdown
+        cut_page["tokens"] = tokens
+        cut_page["truncated"] = True
+        return cut_page
+
+    def _split_oversized(self, page: dict, budget: int) -> list[dict]:
+        """Divide uma página maior que o orçamento em pedaços que cabem
+
+        O overhead de cada pedaço é medido com o título já sufixado
+        "(parte N/N)": com o do título original, cada pedaço estouraria o
+        orçamento pelos tokens do sufixo. Se o espaço menor gerar mais
+        pedaços que o estimado, refaz com o novo N; se algum pedaço
+        recodificar acima do limite (corte na fronteira de caractere), refaz
+        com o limite reduzido pelo excesso.
+        """
+        max_tokens = budget - self.page_overhead(page)
+        if page.get("tokens", 0) <= max_tokens or not self.token_counter or max_tokens <= 0:
+            return [page]
+
+        total = -(-page.get("tokens", 0) // max_tokens)
+        shrink = 0
+        while True:
+            probe = {**page, "title": _part_title(page["title"], total, total)}
+            room = budget - self.page_overhead(probe)
+            max_tokens = room - shrink
+            if max_tokens <= 0:
+                return [page]
+            parts = self.token_counter.split_by_tokens(page["markdown"], max_tokens)
+            if len(parts) > total:
+                total = len(parts)
+                continue
+            counts = [self.token_counter.count_tokens(markdown) for markdown in parts]
+            if max(counts) <= room:
+                break
+            shrink += max(counts) - room
+
+        pieces = []
+        for k, (markdown, tokens) in enumerate(zip(parts, counts), 1):
+            piece = dict(page)
+            piece["title"] = _part_title(page["title"], k, len(parts))
+            piece["markdown"] = markdown
+            piece["tokens"] = tokens
+            pieces.append(piece)
+        return pieces
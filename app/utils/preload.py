@@ -0,0 +1,65 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Preload Module                                    ║
+║ Import em segundo plano das dependências pesadas (após a janela abrir)       ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import os
+import time
+import logging
+import importlib
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Carregados sob demanda pelos conversores; pré-carregar evita a espera no
+# primeiro clique (ordem: mais usados primeiro)
+HEAVY_MODULES = (
+    "tiktoken",
+    "pymupdf4llm",
+    "bs4",
+    "app.converters.web_converter",  # crawl4ai + playwright
+)
+
+# LCB_PRELOAD=0 desliga o pré-carregamento (ex: medir o import sob demanda)
+PRELOAD_ENV = "LCB_PRELOAD"
+
+# ===========================================
+# 2. PRÉ-CARREGAMENTO
+# ===========================================
+
+def _preload(modules: tuple[str, ...]):
+    for name in modules:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name)
+            logger.debug(f"Pré-carregado {name} em {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            # Falha aqui não é fatal: o import sob demanda reporta o erro no uso
+            logger.warning(f"Pré-carregamento de {name} falhou: {e}")
+
+
+def preload_in_background(modules: tuple[str, ...] = HEAVY_MODULES) -> threading.Thread | None:
+    """Importa as dependências pesadas numa thread daemon
+
+    Chamado depois que a janela aparece: o usuário já interage enquanto
+    crawl4ai/pymupdf4llm/tiktoken carregam. Um import sob demanda concorrente
+    apenas espera o lock do módulo, sem importar duas vezes.
+
+    Returns:
+        Thread iniciada ou None se desligado via LCB_PRELOAD=0
+    """
+    if os.environ.get(PRELOAD_ENV, "1") == "0":
+        return None
+
+    thread = threading.Thread(target=_preload, args=(modules,), name="preload", daemon=True)
+    thread.start()
+    return thread
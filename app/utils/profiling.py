@@ -0,0 +1,277 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Profiling Module                                  ║
+║ cProfile + tracemalloc + tasks asyncio por job (diagnóstico em produção)     ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    with profiling.profile_job("crawl", enabled=True):
+        ...
+
+Ligado por job (parâmetro `profile` dos conversores/workers, `--profile` na
+CLI) ou para tudo com LCB_PROFILE=1, inclusive no executável do PyInstaller.
+Cada job gera em logs/profiles/:
+
+    <job>.prof        cProfile (snakeviz <job>.prof / pstats.Stats)
+    <job>.tracemalloc tracemalloc.Snapshot.load(...) para comparar snapshots
+    <job>.tasks.csv   tasks asyncio vivas e memória rastreada ao longo do job
+    <job>.txt         resumo: funções mais caras e maiores alocações
+
+O cProfile mede a thread que executa o job (thread do worker no PDF, thread
+do event loop persistente no crawl); pós-processamento no executor aparece
+na telemetria por etapa, não aqui. cProfile e tracemalloc são globais do
+processo: com jobs simultâneos (server, loop compartilhado) só o primeiro é
+perfilado.
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import io
+import os
+import time
+import pstats
+import asyncio
+import logging
+import cProfile
+import threading
+import contextlib
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# LCB_PROFILE=1 liga o profiling de todos os jobs
+PROFILE_ENV = "LCB_PROFILE"
+PROFILES_DIR = "profiles"
+
+DEFAULT_TOP_N = 25
+SAMPLE_INTERVAL = 0.5  # segundos entre amostras de tasks/memória
+# 1 frame basta para o top-N por linha; cada frame extra multiplica o custo
+# de rastrear alocações (import do pymupdf4llm: ~8s com 1 frame, ~21s com 10)
+TRACEMALLOC_FRAMES = 1
+
+# Alocações do próprio instrumental ficam fora do top-N (filtradas nas
+# estatísticas agregadas: filter_traces em ~250k traces leva segundos)
+_IGNORED_ALLOC_FILES = (tracemalloc.__file__, "<frozen importlib._bootstrap>",
+                        "<frozen importlib._bootstrap_external>", "<unknown>")
+
+# Um job perfilado por vez: cProfile e tracemalloc são do processo inteiro, e
+# server/loop compartilhado rodam jobs simultâneos (um misturaria as amostras
+# do outro, e o primeiro a parar desligaria o tracemalloc do outro)
+_active_lock = threading.Lock()
+_active_profiler = None
+
+
+def profiling_enabled(profile: bool = None) -> bool:
+    """Resolve o switch: parâmetro explícito vence a variável de ambiente"""
+    if profile is not None:
+        return profile
+    return os.environ.get(PROFILE_ENV, "0") not in ("", "0")
+
+
+def get_profiles_dir() -> Path:
+    from app.converters.web_engine.logger import get_log_dir
+    profiles_dir = get_log_dir() / PROFILES_DIR
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    return profiles_dir
+
+
+# ===========================================
+# 2. PROFILER DE UM JOB
+# ===========================================
+
+class JobProfiler:
+    """cProfile + tracemalloc + amostragem de tasks asyncio de um job"""
+
+    def __init__(self, name: str, output_dir: Path = None, top_n: int = DEFAULT_TOP_N,
+                 interval: float = SAMPLE_INTERVAL, loop: asyncio.AbstractEventLoop = None):
+        """Inicializa profiler
+
+        Args:
+            name: Nome do job (prefixo dos arquivos)
+            output_dir: Pasta de saída (None = logs/profiles)
+            top_n: Linhas do resumo (funções e alocações)
+            interval: Intervalo (s) da amostragem de tasks/memória
+            loop: Event loop cujas tasks são contadas (None = sem contagem)
+        """
+        self.name = name
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.interval = interval
+        self.loop = loop
+        self.samples = []  # [(segundos desde o início, tasks, KB rastreados)]
+        self.paths = {}
+
+        self._profile = cProfile.Profile()
+        self._owns_tracemalloc = False
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+        self._started = None
+        self.elapsed = None
+
+    def start(self):
+        """Liga os coletores (chamar na thread que executa o job)"""
+        self._started = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._owns_tracemalloc = True
+        tracemalloc.reset_peak()
+
+        self._sampler = threading.Thread(target=self._sample_loop, name=f"profile-{self.name}", daemon=True)
+        self._sampler.start()
+        try:
+            self._profile.enable()  # ValueError se outro profiler já está ativo
+        except BaseException:
+            self._stop_sampling.set()
+            self._sampler.join()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+            raise
+
+    def stop(self) -> dict:
+        """Desliga os coletores e grava os arquivos
+
+        Returns:
+            {"prof", "tracemalloc", "tasks", "summary"}: caminhos gerados
+        """
+        self._profile.disable()
+        self.elapsed = time.perf_counter() - self._started
+        self._stop_sampling.set()
+        self._sampler.join()
+        self._sample()  # amostra final
+
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        self.paths = self._write(snapshot, peak)
+        return self.paths
+
+    # =======================================
+    # AMOSTRAGEM
+    # =======================================
+
+    def _sample(self):
+        tasks = None
+        if self.loop is not None and not self.loop.is_closed():
+            try:
+                tasks = len(asyncio.all_tasks(self.loop))
+            except RuntimeError:
+                pass  # conjunto de tasks mudou durante a leitura; próxima amostra
+        current = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        self.samples.append((time.perf_counter() - self._started, tasks, current // 1024))
+
+    def _sample_loop(self):
+        while not self._stop_sampling.wait(self.interval):
+            self._sample()
+
+    # =======================================
+    # SAÍDA
+    # =======================================
+
+    def _write(self, snapshot: tracemalloc.Snapshot, peak: int) -> dict:
+        output_dir = Path(self.output_dir) if self.output_dir else get_profiles_dir()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{datetime.now():%Y%m%d_%H%M%S}_{self.name}_{os.getpid()}"
+        paths = {
+            "prof": output_dir / f"{stem}.prof",
+            "tracemalloc": output_dir / f"{stem}.tracemalloc",
+            "tasks": output_dir / f"{stem}.tasks.csv",
+            "summary": output_dir / f"{stem}.txt"
+        }
+
+        self._profile.dump_stats(str(paths["prof"]))
+        snapshot.dump(str(paths["tracemalloc"]))
+
+        with open(paths["tasks"], "w", encoding="utf-8") as f:
+            f.write("elapsed_s,tasks,traced_kb\n")
+            for elapsed, tasks, traced_kb in self.samples:
+                f.write(f"{elapsed:.3f},{'' if tasks is None else tasks},{traced_kb}\n")
+
+        stats_text = io.StringIO()
+        pstats.Stats(self._profile, stream=stats_text).sort_stats("cumulative").print_stats(self.top_n)
+
+        elapsed = self.elapsed
+        task_counts = [tasks for _, tasks, _ in self.samples if tasks is not None]
+        lines = [
+            f"Job: {self.name}",
+            f"Duração: {elapsed:.2f}s",
+            f"Pico de memória rastreada: {peak / 1024 / 1024:.1f} MB",
+            f"Tasks asyncio (máx): {max(task_counts) if task_counts else 'n/a'}",
+            "",
+            f"Top {self.top_n} alocações (tracemalloc, por linha):"
+        ]
+        top_allocs = [stat for stat in snapshot.statistics("lineno")
+                      if stat.traceback[0].filename not in _IGNORED_ALLOC_FILES][:self.top_n]
+        for stat in top_allocs:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:10.1f} KB  {stat.count:7d} blocos  {frame.filename}:{frame.lineno}")
+        lines += ["", "cProfile (ordenado por tempo cumulativo):", stats_text.getvalue()]
+        paths["summary"].write_text("\n".join(lines), encoding="utf-8")
+
+        logger.info("Perfil do job %s salvo em %s (%.2fs, pico %.1f MB)",
+                    self.name, paths["prof"], elapsed, peak / 1024 / 1024)
+        return paths
+
+
+# ===========================================
+# 3. API
+# ===========================================
+
+@contextlib.contextmanager
+def profile_job(name: str, enabled: bool = None, output_dir: Path = None,
+                top_n: int = DEFAULT_TOP_N, interval: float = SAMPLE_INTERVAL):
+    """Perfila o bloco se ligado (parâmetro ou LCB_PROFILE)
+
+    Dentro de uma coroutine, conta as tasks do loop corrente. Só um job é
+    perfilado por vez no processo: os simultâneos rodam sem perfil (aviso
+    no log).
+
+    Yields:
+        JobProfiler ativo (paths preenchido ao sair) ou None se desligado,
+        ocupado por outro job ou se o profiler não pôde ser iniciado
+    """
+    global _active_profiler
+    if not profiling_enabled(enabled):
+        yield None
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    profiler = JobProfiler(name, output_dir=output_dir, top_n=top_n, interval=interval, loop=loop)
+    with _active_lock:
+        active = _active_profiler
+        if active is None:
+            _active_profiler = profiler
+    if active is not None:
+        logger.warning("Job %s sem perfil: o job %s já está sendo perfilado", name, active.name)
+        yield None
+        return
+
+    try:
+        try:
+            profiler.start()
+        except Exception as e:
+            # Falha no diagnóstico não pode derrubar o job
+            logger.warning("Falha ao iniciar o perfil do job %s: %s", name, e)
+            profiler = None
+        yield profiler
+    finally:
+        try:
+            if profiler is not None:
+                profiler.stop()
+        except Exception as e:
+            logger.warning("Falha ao gravar o perfil do job %s: %s", name, e)
+        finally:
+            with _active_lock:
+                _active_profiler = None
@@ -0,0 +1,337 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Telemetry Module                                  ║
+║ Métricas estruturadas por job/página/etapa em JSON Lines                     ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    with telemetry.job("crawl", pages=120):
+        with telemetry.page(url, render_type="SSR"):
+            with telemetry.stage("render"):
+                ...
+            telemetry.annotate(bytes_in=len(html), cache="miss")
+
+Cada página vira uma linha {"type": "page", ...} e cada job termina com uma
+linha {"type": "summary", ...} (p50/p95 por etapa, pág/s) em
+logs/telemetry.jsonl. Sem job ativo, todas as funções são no-op.
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import os
+import json
+import time
+import uuid
+import atexit
+import logging
+import threading
+import contextlib
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+# LCB_TELEMETRY=0 desliga a gravação (jobs continuam funcionando)
+TELEMETRY_ENV = "LCB_TELEMETRY"
+TELEMETRY_FILE = "telemetry.jsonl"
+
+# Rotação do telemetry.jsonl (mesma política do debug_trace.log)
+TELEMETRY_MAX_BYTES = 10 * 1024 * 1024
+TELEMETRY_BACKUP_COUNT = 3
+
+# Job e página correntes (cada task asyncio herda a sua cópia do contexto)
+_current_job = ContextVar("telemetry_job", default=None)
+_current_page = ContextVar("telemetry_page", default=None)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Percentil por nearest-rank (q em 0..100)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil sem float
+    return ordered[int(rank) - 1]
+
+
+# ===========================================
+# 2. ESCRITA JSON LINES
+# ===========================================
+
+class _JsonlWriter:
+    """Arquivo JSONL compartilhado (append + flush por linha, seguro entre threads)
+
+    Rotaciona como o RotatingFileHandler: ao passar de `max_bytes` o arquivo
+    vira .1 (o .1 vira .2...) e só `backup_count` cópias são mantidas.
+    """
+
+    def __init__(self, path=None, max_bytes: int = TELEMETRY_MAX_BYTES,
+                 backup_count: int = TELEMETRY_BACKUP_COUNT):
+        """Inicializa writer
+
+        Args:
+            path: Arquivo de destino (None = logs/telemetry.jsonl, resolvido na 1ª escrita)
+            max_bytes: Tamanho que dispara a rotação (0 = nunca rotaciona)
+            backup_count: Cópias rotacionadas mantidas
+        """
+        self._lock = threading.Lock()
+        self._file = None
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+    def write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                if self.path is None:
+                    from app.converters.web_engine.logger import get_log_dir
+                    self.path = get_log_dir() / TELEMETRY_FILE
+                self._file = open(self.path, "a", encoding="utf-8")
+            if self.max_bytes and self._file.tell() and self._file.tell() + len(line) > self.max_bytes:
+                self._rotate()
+            # Linha inteira + flush: processos do crawl sharded escrevem no mesmo arquivo
+            self._file.write(line)
+            self._file.flush()
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backup_count:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_writer = _JsonlWriter()
+atexit.register(_writer.close)
+
+
+def telemetry_enabled() -> bool:
+    return os.environ.get(TELEMETRY_ENV, "1") != "0"
+
+
+# ===========================================
+# 3. JOB
+# ===========================================
+
+class JobTelemetry:
+    """Acumula as amostras de um job e grava registros/resumo"""
+
+    def __init__(self, kind: str, fields: dict = None, writer=None, clock=time.perf_counter):
+        """Inicializa job
+
+        Args:
+            kind: Tipo do job ("scan", "crawl", "pdf"...)
+            fields: Campos extras do resumo (url, arquivo, total...)
+            writer: Destino dos registros (None = logs/telemetry.jsonl)
+            clock: Relógio monotônico (injetável em testes)
+        """
+        self.kind = kind
+        self.job_id = uuid.uuid4().hex[:12]
+        self.fields = fields or {}
+        self.stage_samples = {}
+        self.pages = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+        self.failures = 0
+
+        self._writer = writer if writer is not None else _writer
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+
+    def add_sample(self, stage: str, seconds: float):
+        with self._lock:
+            self.stage_samples.setdefault(stage, []).append(seconds)
+
+    def write(self, record: dict):
+        record = {"job": self.job_id, "kind": self.kind, "ts": round(time.time(), 3), **record}
+        try:
+            self._writer.write(record)
+        except Exception as e:
+            logger.debug("Falha ao gravar telemetria: %s", e)
+
+    def add_page(self, trace: dict, counted: bool):
+        """Consolida a trace de uma página e grava o registro"""
+        with self._lock:
+            for stage, ms in trace["stages"].items():
+                self.stage_samples.setdefault(stage, []).append(ms / 1000)
+            if trace.get("status") == "retry":
+                # Tentativa que volta para a fila: conta só como retentativa
+                self.retries += 1
+            elif counted:
+                self.pages += 1
+                self.bytes_in += trace.get("bytes_in", 0)
+                self.bytes_out += trace.get("bytes_out", 0)
+                self.retries += trace.get("retries", 0)
+                if trace.get("cache") == "hit":
+                    self.cache_hits += 1
+                elif trace.get("cache") == "miss":
+                    self.cache_misses += 1
+                if trace.get("status") == "failed":
+                    self.failures += 1
+        self.write({"type": "page", **trace})
+
+    def summary(self) -> dict:
+        """Resumo agregado (latências em ms por etapa, pág/s)"""
+        elapsed = self._clock() - self._started
+        with self._lock:
+            stages = {
+                stage: {
+                    "count": len(samples),
+                    "p50_ms": round(percentile(samples, 50) * 1000, 2),
+                    "p95_ms": round(percentile(samples, 95) * 1000, 2),
+                    "total_s": round(sum(samples), 3)
+                }
+                for stage, samples in self.stage_samples.items()
+            }
+            return {
+                **self.fields,
+                "elapsed_s": round(elapsed, 3),
+                "pages": self.pages,
+                "pages_per_sec": round(self.pages / elapsed, 3) if elapsed > 0 else 0.0,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "retries": self.retries,
+                "failures": self.failures,
+                "stages": stages
+            }
+
+    def finish(self, status: str = "ok") -> dict:
+        """Grava a linha de resumo e loga as etapas mais lentas"""
+        summary = self.summary()
+        self.write({"type": "summary", "status": status, **summary})
+
+        top = sorted(summary["stages"].items(), key=lambda kv: kv[1]["total_s"], reverse=True)[:4]
+        logger.info(
+            "Telemetria %s %s: %d páginas em %.1fs (%.2f pág/s) | %s", self.kind, self.job_id,
+            summary["pages"], summary["elapsed_s"], summary["pages_per_sec"],
+            ", ".join(f"{name} p50={s['p50_ms']}ms p95={s['p95_ms']}ms" for name, s in top) or "sem etapas"
+        )
+        return summary
+
+
+# ===========================================
+# 4. API DE INSTRUMENTAÇÃO
+# ===========================================
+
+def current_job() -> JobTelemetry | None:
+    return _current_job.get()
+
+
+@contextlib.contextmanager
+def job(kind: str, writer=None, **fields):
+    """Escopo de um job; jobs aninhados (ex: scan dentro do spider) somam no externo
+
+    Yields:
+        JobTelemetry ativo (None se a telemetria estiver desligada)
+    """
+    active = _current_job.get()
+    if active is not None or not telemetry_enabled():
+        yield active
+        return
+
+    telemetry = JobTelemetry(kind, fields, writer=writer)
+    token = _current_job.set(telemetry)
+    status = "ok"
+    try:
+        yield telemetry
+    except BaseException as e:
+        status = "cancelled" if e.__class__.__name__ == "OperationCancelled" else "error"
+        raise
+    finally:
+        _current_job.reset(token)
+        telemetry.finish(status)
+
+
+@contextlib.contextmanager
+def page(url: str, counted: bool = True, **fields):
+    """Escopo de uma página (uma linha "page" no JSONL ao sair)
+
+    Args:
+        url: URL/arquivo processado
+        counted: False para etapas auxiliares (ex: prefetch) que não contam
+            como página concluída no resumo
+    """
+    telemetry = _current_job.get()
+    if telemetry is None:
+        yield None
+        return
+
+    trace = {"url": url, "stages": {}, "retries": 0, **fields}
+    token = _current_page.set(trace)
+    try:
+        yield trace
+    except BaseException:
+        trace.setdefault("status", "failed")
+        raise
+    finally:
+        _current_page.reset(token)
+        trace.setdefault("status", "ok")
+        trace["stages"] = {k: round(v, 3) for k, v in trace["stages"].items()}
+        telemetry.add_page(trace, counted)
+
+
+def _add_stage(name: str, seconds: float):
+    trace = _current_page.get()
+    if trace is not None:
+        trace["stages"][name] = trace["stages"].get(name, 0.0) + seconds * 1000
+        return
+    telemetry = _current_job.get()
+    if telemetry is not None:
+        telemetry.add_sample(name, seconds)
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Cronometra uma etapa (na página corrente ou, fora de página, no job)"""
+    if _current_job.get() is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _add_stage(name, time.perf_counter() - started)
+
+
+def add_timings(timings: dict):
+    """Registra etapas medidas em outra thread/processo ({etapa: segundos})"""
+    if _current_job.get() is None:
+        return
+    for name, seconds in (timings or {}).items():
+        _add_stage(name, seconds)
+
+
+def annotate(**fields):
+    """Acrescenta campos à página corrente (bytes_in, cache, render_type...)"""
+    trace = _current_page.get()
+    if trace is not None:
+        trace.update(fields)
+
+
+def count_retry():
+    """Soma uma nova tentativa na página corrente"""
+    trace = _current_page.get()
+    if trace is not None:
+        trace["retries"] += 1
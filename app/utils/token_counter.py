@@ -12,20 +12,10 @@ VAI CORINTHIANS!!
 # 1. IMPORTS E CONFIGURAÇÕES
 # ===========================================
 
-import tiktoken
 from pathlib import Path
 import logging
 
-# Configuração de logging
-LOG_FILE = Path(__file__).parent / "token_counter.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# Handlers/níveis ficam a cargo do pipeline central (web_engine.logger)
 logger = logging.getLogger(__name__)
 
 # ===========================================
@@ -41,6 +31,14 @@ class TokenCounter:
     - gpt-4o
     """
 
+    # Janelas de contexto (tokens) usadas como orçamento de empacotamento
+    CONTEXT_WINDOWS = {
+        "gpt-3.5-turbo": 16385,
+        "gpt-4": 8192,
+        "gpt-4-turbo": 128000,
+        "gpt-4o": 128000,
+    }
+
     # =======================================
     # 2.1: INICIALIZAÇÃO
     # =======================================
@@ -51,6 +49,8 @@ class TokenCounter:
         Args:
             model: Modelo tiktoken (default: gpt-4)
         """
+        import tiktoken  # Lazy: importar o módulo não carrega o encoder
+
         self.model = model
         self.encoding = None
 
@@ -112,7 +112,8 @@ class TokenCounter:
             logger.exception(f"Erro ao ler arquivo {file_path}: {e}")
             return 0
 
-    def format_token_count(self, count: int) -> str:
+    @staticmethod
+    def format_token_count(count: int) -> str:
         """Formata contagem de tokens para display
 
         Args:
@@ -127,7 +128,79 @@ class TokenCounter:
             return f"{count} tokens"
 
     # =======================================
-    # 2.3: UTILITÁRIOS
+    # 2.3: FATIAMENTO POR TOKENS
+    # =======================================
+
+    def encode(self, text: str) -> list[int]:
+        """Codifica texto em tokens (para fatiar sem recodificar substrings)
+
+        Args:
+            text: Texto a codificar
+
+        Returns:
+            Lista de ids de tokens
+        """
+        if not text:
+            return []
+        return self.encoding.encode(text, disallowed_special=())
+
+    def encode_with_offsets(self, text: str) -> tuple[list[int], list[int]]:
+        """Codifica texto e retorna o offset (em caracteres) de cada token
+
+        Permite fatiar o texto original por posição de token sem
+        recodificar substrings candidatas.
+
+        Args:
+            text: Texto a codificar
+
+        Returns:
+            (tokens, offsets) onde offsets[i] é o índice do caractere
+            em que o token i começa
+        """
+        tokens = self.encode(text)
+        decoded, offsets = self.encoding.decode_with_offsets(tokens)
+        if decoded != text:
+            raise ValueError("Texto não preserva ida-e-volta no encoding")
+        return tokens, offsets
+
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        """Trunca texto mantendo no máximo max_tokens tokens do início
+
+        Args:
+            text: Texto original
+            max_tokens: Limite de tokens
+
+        Returns:
+            Texto truncado (ou original se já cabe no limite)
+        """
+        tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        _, offsets = self.encoding.decode_with_offsets(tokens)  # corte sem partir caractere
+        return text[:offsets[max(max_tokens, 0)]]
+
+    def split_by_tokens(self, text: str, max_tokens: int) -> list[str]:
+        """Divide texto em partes de no máximo max_tokens tokens
+
+        Args:
+            text: Texto original
+            max_tokens: Limite de tokens por parte
+
+        Returns:
+            Lista de partes (codifica o texto uma única vez)
+        """
+        tokens = self.encode(text)
+        if len(tokens) <= max_tokens:
+            return [text]
+
+        # Corta nos offsets de caractere (como o chunker): decodificar fatias
+        # de tokens parte caracteres multi-byte (CJK, emoji) em U+FFFD
+        _, offsets = self.encoding.decode_with_offsets(tokens)
+        bounds = [offsets[i] for i in range(0, len(tokens), max_tokens)] + [len(text)]
+        return [text[start:end] for start, end in zip(bounds, bounds[1:]) if start < end]
+
+    # =======================================
+    # 2.4: UTILITÁRIOS
     # =======================================
 
     def estimate_cost(self, token_count: int, model: str = None) -> dict:
@@ -0,0 +1,247 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Corpus Benchmark                                  ║
+║ MB/s, alocações e saída golden do cleaner e do TokenCounter                  ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    python benchmarks/bench_corpus.py                         # 1KB..10MB, 4 formatos
+    python benchmarks/bench_corpus.py --sizes 1KB,64KB,1MB,10MB,50MB --repeat 5
+    python benchmarks/bench_corpus.py --targets cleaner --shapes nav,table
+    python benchmarks/bench_corpus.py --update-golden         # mudança intencional
+    python benchmarks/bench_corpus.py --compare benchmarks/results/<base>.json
+
+Cada caso (formato x tamanho) mede o melhor tempo de --repeat execuções e, numa
+execução separada com tracemalloc, o pico de alocação. A saída é conferida com
+tests/golden/corpus/manifest.json (blake2b da saída do cleaner e dos ids de
+token): uma otimização só passa se for byte-idêntica. Se a diferença for
+intencional, --update-golden regrava o manifesto e os arquivos .clean.md dos
+casos pequenos, e o diff deles entra no commit. Sai com código 1 se algum caso
+diverge do golden ou (com --compare) piorou além de --threshold.
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import sys
+import json
+import time
+import array
+import hashlib
+import logging
+import argparse
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.corpus import SHAPES, SIZES, generate, parse_size  # noqa: E402
+from benchmarks.bench_suite import RESULTS_DIR, compare, metadata, peak_rss_mb  # noqa: E402
+
+GOLDEN_DIR = PROJECT_ROOT / "tests" / "golden" / "corpus"
+MANIFEST = GOLDEN_DIR / "manifest.json"
+
+# Casos até este tamanho também guardam a saída inteira (diff legível no git)
+GOLDEN_FILE_MAX = SIZES["64KB"]
+
+DEFAULT_SIZES = ("1KB", "64KB", "1MB", "10MB")
+TARGETS = ("cleaner", "tokens")
+
+
+def digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def case_name(shape: str, size: str) -> str:
+    return f"{shape}_{size}"
+
+
+def load_manifest() -> dict:
+    if MANIFEST.exists():
+        return json.loads(MANIFEST.read_text(encoding="utf-8"))
+    return {target: {} for target in TARGETS}
+
+
+# ===========================================
+# 2. ALVOS
+# ===========================================
+
+def make_cleaner():
+    """limpar_markdown_google → (saída em bytes, resumo da saída)"""
+    from app.converters.web_engine.cleaner import WebCleaner
+    cleaner = WebCleaner()
+
+    def run(text: str):
+        return cleaner.limpar_markdown_google(text)
+
+    def output(result) -> tuple[bytes, dict]:
+        data = result.encode("utf-8")
+        return data, {"output_bytes": len(data)}
+
+    return run, output
+
+
+def make_tokens():
+    """TokenCounter.encode → (ids em bytes, contagem)"""
+    from app.utils.token_counter import TokenCounter
+    counter = TokenCounter()
+
+    def run(text: str):
+        return counter.encode(text)
+
+    def output(result) -> tuple[bytes, dict]:
+        return array.array("I", result).tobytes(), {"tokens": len(result)}
+
+    return run, output
+
+
+_FACTORIES = {"cleaner": make_cleaner, "tokens": make_tokens}
+
+
+# ===========================================
+# 3. MEDIÇÃO E GOLDEN
+# ===========================================
+
+def measure(run, text: str, repeat: int) -> tuple[object, dict]:
+    """Melhor tempo de `repeat` execuções + pico de alocação (execução à parte)
+
+    Returns:
+        (resultado da última execução, métricas)
+    """
+    size = len(text.encode("utf-8"))
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(text)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run(text)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, {
+        "bytes": size,
+        "seconds": round(best, 5),
+        "mb_per_s": round(size / best / 1e6, 2),
+        "peak_alloc_mb": round(peak / 1e6, 2),
+        "alloc_per_input": round(peak / size, 2)  # bytes alocados por byte de entrada
+    }
+
+
+def check_golden(entry: dict | None, input_hash: str, output_hash: str) -> str:
+    """"ok", "different", "missing" ou "corpus_changed" (gerador mudou: regravar)"""
+    if entry is None:
+        return "missing"
+    if entry["input"] != input_hash:
+        return "corpus_changed"
+    return "ok" if entry["output"] == output_hash else "different"
+
+
+def run_cases(args: argparse.Namespace, manifest: dict) -> dict:
+    results = {}
+    for target in args.targets:
+        try:
+            run, output = _FACTORIES[target]()
+        except Exception as e:
+            results[target] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"  {target}: indisponível ({type(e).__name__}: {e})")
+            continue
+
+        results[target] = {}
+        for shape in args.shapes:
+            for size in args.sizes:
+                name = case_name(shape, size)
+                text = generate(shape, parse_size(size), seed=args.seed)
+                input_hash = digest(text.encode("utf-8"))
+
+                result, metrics = measure(run, text, args.repeat)
+                data, summary = output(result)
+                output_hash = digest(data)
+                entry = manifest[target].get(name)
+                metrics.update(summary)
+                metrics["golden"] = check_golden(entry, input_hash, output_hash)
+
+                if args.update_golden:
+                    manifest[target][name] = {"input": input_hash, "output": output_hash, **summary}
+                    if target == "cleaner" and parse_size(size) <= GOLDEN_FILE_MAX:
+                        (GOLDEN_DIR / f"{name}.clean.md").write_bytes(data)
+                    if metrics["golden"] != "ok":
+                        metrics["golden"] = "updated"
+
+                results[target].setdefault(shape, {})[size] = metrics
+                print(f"  {target:8s} {name:12s} {metrics['mb_per_s']:9.2f} MB/s  "
+                      f"pico {metrics['peak_alloc_mb']:8.2f} MB  golden={metrics['golden']}", flush=True)
+    return results
+
+
+# ===========================================
+# 4. EXECUÇÃO
+# ===========================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Throughput e golden do cleaner/TokenCounter")
+    parser.add_argument("--shapes", default=",".join(SHAPES))
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"De {', '.join(SIZES)}")
+    parser.add_argument("--targets", default=",".join(TARGETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0, help="Golden só vale para a seed 0")
+    parser.add_argument("--update-golden", action="store_true", help="Regrava o golden dos casos executados")
+    parser.add_argument("-o", "--output", help="Arquivo JSON (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Resultado base para comparar")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Piora tolerada (%%)")
+    args = parser.parse_args(argv)
+    args.shapes = args.shapes.split(",")
+    args.sizes = args.sizes.split(",")
+    args.targets = args.targets.split(",")
+    if args.update_golden and args.seed != 0:
+        parser.error("--update-golden exige --seed 0")
+
+    # Um registro INFO por chamada do cleaner distorce a medição do próprio cleaner
+    logging.disable(logging.INFO)
+
+    manifest = load_manifest()
+    if args.update_golden:
+        GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+    results = run_cases(args, manifest)
+    if args.update_golden:
+        MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Golden atualizado: {MANIFEST}")
+
+    report = {"meta": metadata(args), "results": results, "peak_rss_mb": peak_rss_mb()}
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"corpus_{datetime.now():%Y%m%d_%H%M%S}_{report['meta']['commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultado: {output}")
+
+    failed = [f"{target}.{shape}.{size}"
+              for target, shapes in results.items() if "error" not in shapes
+              for shape, sizes in shapes.items()
+              for size, metrics in sizes.items()
+              if metrics["golden"] not in ("ok", "updated") and args.seed == 0]
+    if failed:
+        print(f"Divergem do golden: {', '.join(failed)}")
+
+    regressed = False
+    if args.compare:
+        base = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        for name, old, new, change, worse in compare(base, report, args.threshold):
+            regressed |= worse
+            print(f"  {name:40s} {old:>12} → {new:>12}  ({change:+.1f}%){'  << REGRESSÃO' if worse else ''}")
+
+    return 1 if failed or regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
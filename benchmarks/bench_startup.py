@@ -0,0 +1,134 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Startup Benchmark                                 ║
+║ Tempo até a janela + import mais caros (python -X importtime)                ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    python benchmarks/bench_startup.py            # 5 execuções, top 15 imports
+    python benchmarks/bench_startup.py --runs 10 --top 30
+
+Cada medição roda num processo novo (imports frios do ponto de vista do
+Python; o cache de disco do SO fica quente após a primeira execução).
+Sem display, usa QT_QPA_PLATFORM=offscreen.
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Dependências que não devem ser carregadas antes da janela aparecer
+HEAVY_MODULES = ("crawl4ai", "playwright", "pymupdf4llm", "tiktoken", "bs4")
+
+# Só PyQt6: piso do tempo até a janela
+QT_ONLY = """
+import time; t0 = time.perf_counter()
+from PyQt6.QtWidgets import QApplication, QMainWindow
+app = QApplication([]); w = QMainWindow(); w.show(); app.processEvents()
+print(time.perf_counter() - t0)
+"""
+
+# Aplicação real (sem pré-carregamento em segundo plano)
+APP_WINDOW = """
+import time; t0 = time.perf_counter()
+import sys
+from PyQt6.QtWidgets import QApplication
+from app.gui.main_window import Pdf2mdWindow
+app = QApplication([]); w = Pdf2mdWindow(); w.show(); app.processEvents()
+elapsed = time.perf_counter() - t0
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(elapsed, ",".join(heavy))
+"""
+
+# ===========================================
+# 2. MEDIÇÕES
+# ===========================================
+
+def _env() -> dict:
+    env = dict(os.environ)
+    if not env.get("DISPLAY") and not env.get("WAYLAND_DISPLAY") and sys.platform.startswith("linux"):
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["LCB_PRELOAD"] = "0"
+    env["PYTHONPATH"] = str(PROJECT_ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=PROJECT_ROOT, env=_env(),
+                          capture_output=True, text=True, check=True)
+
+
+def time_to_window(runs: int) -> tuple[list[float], list[float], set[str]]:
+    """Mede PyQt6 sozinho x janela da aplicação
+
+    Returns:
+        (tempos só Qt, tempos da aplicação, módulos pesados carregados)
+    """
+    qt_times, app_times, heavy = [], [], set()
+    for _ in range(runs):
+        qt_times.append(float(_run(QT_ONLY).stdout.split()[-1]))
+        # Última linha: os logs do motor também vão para o stdout
+        elapsed, _, loaded = _run(APP_WINDOW.format(heavy=HEAVY_MODULES)).stdout.strip().splitlines()[-1].partition(" ")
+        app_times.append(float(elapsed))
+        heavy.update(filter(None, loaded.split(",")))
+    return qt_times, app_times, heavy
+
+
+def import_profile(module: str = "app.gui.main_window") -> list[tuple[int, int, str]]:
+    """Executa `python -X importtime -c "import <module>"` e agrega a saída
+
+    Returns:
+        [(self_us, cumulativo_us, módulo)] na ordem do importtime
+    """
+    result = _run(f"import {module}", "-X", "importtime")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # Um espaço separa a coluna; a indentação restante é a profundidade
+        rows.append((int(self_us), int(cumulative_us), name[1:].rstrip()))
+    return rows
+
+
+# ===========================================
+# 3. RELATÓRIO
+# ===========================================
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização da GUI")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    qt_times, app_times, heavy = time_to_window(args.runs)
+    qt_med, app_med = statistics.median(qt_times), statistics.median(app_times)
+    print(f"Tempo até a janela (mediana de {args.runs}):")
+    print(f"  PyQt6 sozinho : {qt_med * 1000:8.1f} ms")
+    print(f"  Aplicação     : {app_med * 1000:8.1f} ms  (+{(app_med - qt_med) * 1000:.1f} ms)")
+    print(f"  Dependências pesadas antes da janela: {', '.join(sorted(heavy)) or 'nenhuma'}")
+
+    rows = import_profile()
+    top_level = [r for r in rows if not r[2].startswith(" ")]
+    print(f"\nImports mais caros de app.gui.main_window (-X importtime, total "
+          f"{sum(r[1] for r in top_level) / 1000:.1f} ms):")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms  {name.strip()}")
+
+    return 1 if heavy else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
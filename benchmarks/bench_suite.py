@@ -0,0 +1,311 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Benchmark Suite                                   ║
+║ Scan, crawl, limpeza, links e tokens contra sites sintéticos locais          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    python benchmarks/bench_suite.py                          # 50 páginas, sem latência
+    python benchmarks/bench_suite.py --pages 200 --latency 30 --kinds ssr,react
+    python benchmarks/bench_suite.py --skip-browser           # só HTTP + micro
+    python benchmarks/bench_suite.py --compare benchmarks/results/<base>.json
+
+Tudo roda offline contra benchmarks/fixture_server.py. O resultado vai para
+benchmarks/results/<data>_<commit>.json; --compare imprime a variação de
+cada métrica e sai com código 1 se alguma piorou além de --threshold.
+
+Seções que dependem de algo ausente (Chromium do Playwright, encoding do
+tiktoken) gravam {"error": ...} em vez de abortar a suíte.
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.fixture_server import SITE_KINDS, FixtureServer  # noqa: E402
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# Sufixos de métrica em que maior é melhor (o resto: menor é melhor)
+HIGHER_IS_BETTER = ("per_sec", "mb_per_s")
+# Contagens/tamanhos: mudam com a entrada, não indicam regressão
+NOT_COMPARED = ("pages", "pages_found", "links", "bytes", "output_bytes", "tokens", "repeat")
+
+
+def peak_rss_mb() -> float | None:
+    """Pico de memória residente do processo (None onde `resource` não existe)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _best_of(repeat: int, fn) -> float:
+    """Melhor tempo (s) de `repeat` execuções (reduz ruído dos micro-benchmarks)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _section(name: str, fn, *args) -> dict:
+    print(f"  {name}...", flush=True)
+    try:
+        result = fn(*args)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+# ===========================================
+# 2. ENTRADAS (HTML E MARKDOWN DO SITE SSR)
+# ===========================================
+
+def load_ssr_pages(server: FixtureServer) -> list[tuple[str, str, str]]:
+    """Baixa o site SSR e converte como o crawl faz
+
+    Returns:
+        [(url, html, markdown)]
+    """
+    import httpx
+    from app.converters.web_engine.crawler import WebCrawlerService
+    from app.converters.web_engine.static_fetcher import StaticFetcher
+
+    fetcher = StaticFetcher(WebCrawlerService.CONTENT_SELECTOR)
+    pages = []
+    with httpx.Client() as client:
+        for url in server.page_urls("ssr"):
+            html = client.get(url).text
+            pages.append((url, html, fetcher.html_to_markdown(html, url)))
+    return pages
+
+
+# ===========================================
+# 3. MEDIÇÕES
+# ===========================================
+
+def bench_scan(server: FixtureServer, kinds: list[str]) -> dict:
+    """Tempo do scan (detecção + links + títulos) por tipo de site"""
+    from app.converters.web_engine.crawler import WebCrawlerService
+
+    results = {}
+    for kind in kinds:
+        service = WebCrawlerService()
+        start = time.perf_counter()
+        success, pages = asyncio.run(service.scan_pages(server.seed_url(kind)))
+        results[kind] = {"seconds": round(time.perf_counter() - start, 3),
+                         "pages_found": len(pages), "success": success}
+    return results
+
+
+def bench_crawl(server: FixtureServer, kinds: list[str]) -> dict:
+    """Páginas/s do crawl completo (cache frio) por tipo de site"""
+    from app.converters.web_engine.crawler import WebCrawlerService
+
+    results = {}
+    for kind in kinds:
+        service = WebCrawlerService()
+        selected = [{"url": url, "title": ""} for url in server.page_urls(kind)]
+        requests_before = server.requests
+        start = time.perf_counter()
+        success, contents = asyncio.run(service.crawl_selected_pages(selected))
+        elapsed = time.perf_counter() - start
+        results[kind] = {
+            "seconds": round(elapsed, 3),
+            "pages": len(contents),
+            "pages_per_sec": round(len(contents) / elapsed, 2) if elapsed else 0.0,
+            "requests": server.requests - requests_before,
+            "success": success
+        }
+    return results
+
+
+def bench_cleaner(pages: list, repeat: int) -> dict:
+    """Throughput de WebCleaner.limpar_markdown_google"""
+    from app.converters.web_engine.cleaner import WebCleaner
+
+    cleaner = WebCleaner()
+    markdowns = [markdown for _, _, markdown in pages]
+    total = sum(len(m.encode("utf-8")) for m in markdowns)
+    seconds = _best_of(repeat, lambda: [cleaner.limpar_markdown_google(m) for m in markdowns])
+    return {"bytes": total, "repeat": repeat, "seconds": round(seconds, 4),
+            "mb_per_s": round(total / seconds / 1e6, 2),
+            "pages_per_sec": round(len(markdowns) / seconds, 1)}
+
+
+def bench_links(pages: list, repeat: int) -> dict:
+    """Throughput de WebCrawlerService.extract_internal_links (BeautifulSoup)"""
+    from app.converters.web_engine.crawler import WebCrawlerService
+
+    extract = WebCrawlerService().extract_internal_links
+    total = sum(len(html.encode("utf-8")) for _, html, _ in pages)
+    found = sum(len(extract(html, url)) for url, html, _ in pages)
+    seconds = _best_of(repeat, lambda: [extract(html, url) for url, html, _ in pages])
+    return {"bytes": total, "links": found, "repeat": repeat, "seconds": round(seconds, 4),
+            "mb_per_s": round(total / seconds / 1e6, 2),
+            "pages_per_sec": round(len(pages) / seconds, 1)}
+
+
+def bench_tokens(pages: list, repeat: int) -> dict:
+    """Throughput de TokenCounter.count_tokens (tiktoken)"""
+    from app.utils.token_counter import TokenCounter
+
+    counter = TokenCounter()
+    markdowns = [markdown for _, _, markdown in pages]
+    total = sum(len(m.encode("utf-8")) for m in markdowns)
+    tokens = sum(counter.count_tokens(m) for m in markdowns)
+    seconds = _best_of(repeat, lambda: [counter.count_tokens(m) for m in markdowns])
+    return {"bytes": total, "tokens": tokens, "repeat": repeat, "seconds": round(seconds, 4),
+            "mb_per_s": round(total / seconds / 1e6, 2),
+            "tokens_per_sec": round(tokens / seconds)}
+
+
+# ===========================================
+# 4. RESULTADOS E COMPARAÇÃO
+# ===========================================
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def metadata(args: argparse.Namespace) -> dict:
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "args": {k: v for k, v in vars(args).items() if k not in ("compare", "output")}
+    }
+
+
+def flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    """{"crawl": {"ssr": {"seconds": 1.2}}} → {"crawl.ssr.seconds": 1.2}"""
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(base: dict, current: dict, threshold: float) -> list[tuple[str, float, float, float, bool]]:
+    """Variação de cada métrica presente nos dois resultados
+
+    Returns:
+        [(métrica, base, atual, variação %, regressão?)]
+    """
+    base_flat, current_flat = flatten(base["results"]), flatten(current["results"])
+    rows = []
+    for name in sorted(base_flat.keys() & current_flat.keys()):
+        if name.rsplit(".", 1)[-1] in NOT_COMPARED:
+            continue
+        old, new = base_flat[name], current_flat[name]
+        if not old:
+            continue
+        change = (new - old) / old * 100
+        worse = -change if name.endswith(HIGHER_IS_BETTER) else change
+        rows.append((name, old, new, round(change, 1), worse > threshold))
+    return rows
+
+
+# ===========================================
+# 5. EXECUÇÃO
+# ===========================================
+
+def run(args: argparse.Namespace) -> dict:
+    kinds = [k for k in args.kinds.split(",") if k in SITE_KINDS]
+    results = {}
+    with FixtureServer(pages=args.pages, latency_ms=args.latency) as server:
+        print(f"Servidor de fixtures em {server.base_url} ({args.pages} páginas/site)")
+        try:
+            pages = load_ssr_pages(server)
+        except Exception as e:
+            pages = []
+            results["inputs"] = {"error": f"{type(e).__name__}: {e}"}
+
+        if pages:
+            results["cleaner"] = _section("cleaner", bench_cleaner, pages, args.repeat)
+            results["links"] = _section("links", bench_links, pages, args.repeat)
+            results["tokens"] = _section("tokens", bench_tokens, pages, args.repeat)
+
+        if args.skip_browser:
+            # Só o site SSR, que o crawl baixa pelo fast path HTTP
+            kinds = [k for k in kinds if k == "ssr"]
+        else:
+            results["scan"] = _section("scan", bench_scan, server, kinds)
+        results["crawl"] = _section("crawl", bench_crawl, server, kinds)
+
+    return {"meta": metadata(args), "results": results, "peak_rss_mb": peak_rss_mb()}
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark offline com sites sintéticos locais")
+    parser.add_argument("--pages", type=int, default=50, help="Páginas por site")
+    parser.add_argument("--latency", type=int, default=0, help="Latência por requisição (ms)")
+    parser.add_argument("--kinds", default=",".join(SITE_KINDS), help="Sites: ssr,angular,react")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetições dos micro-benchmarks")
+    parser.add_argument("--skip-browser", action="store_true", help="Pula o que exige Chromium")
+    parser.add_argument("-o", "--output", help="Arquivo JSON (default: benchmarks/results/)")
+    parser.add_argument("--compare", help="Resultado base para comparar")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Piora tolerada (%%)")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now():%Y%m%d_%H%M%S}_{report['meta']['commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResultado: {output}")
+    for section, data in report["results"].items():
+        print(f"  {section:8s} {json.dumps(data, ensure_ascii=False)}")
+
+    if not args.compare:
+        return 0
+
+    base = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    rows = compare(base, report, args.threshold)
+    print(f"\nComparação com {base['meta'].get('commit')} ({args.compare}):")
+    if base["meta"].get("args") != report["meta"]["args"]:
+        print(f"  ATENÇÃO: parâmetros diferentes ({base['meta'].get('args')}); tempos não são comparáveis")
+    for name, old, new, change, regressed in rows:
+        flag = "  << REGRESSÃO" if regressed else ""
+        print(f"  {name:40s} {old:>12} → {new:>12}  ({change:+.1f}%){flag}")
+    return 1 if any(row[4] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
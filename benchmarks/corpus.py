@@ -0,0 +1,162 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Markdown Corpus                                   ║
+║ Markdown sintético com a cara do que o crawl4ai gera (1 KB a 50 MB)          ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Formatos (o que mais pesa em cada um):
+
+    nav    menus laterais, breadcrumbs, "On this Page", links soltos
+    code   blocos de código, <script>/<style> vazados, código inline
+    table  tabelas pipe largas e listas de parâmetros
+    mixed  os três intercalados (página típica de documentação)
+
+generate(shape, size, seed) é determinístico: a mesma chamada produz os
+mesmos bytes (o sha do input fica no manifesto golden para detectar mudança
+do gerador).
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import random
+
+SHAPES = ("nav", "code", "table", "mixed")
+
+SIZES = {
+    "1KB": 1024,
+    "64KB": 64 * 1024,
+    "1MB": 1024 * 1024,
+    "10MB": 10 * 1024 * 1024,
+    "50MB": 50 * 1024 * 1024,
+}
+
+_WORDS = (
+    "crawler page cache markdown token selector browser render content index "
+    "configuration install example parameter return error query server client "
+    "queue batch window context model file directory route component state "
+    "event request response latency throughput limit retry página conteúdo "
+    "configuração exceção índice"
+).split()
+
+_NAV_ITEMS = ("Overview", "Quickstart", "Installation", "Configuration", "API Reference",
+              "Guides", "Tutorials", "Examples", "FAQ", "Troubleshooting", "Migration")
+
+# Termos que o cleaner trata como navegação (exercitam a zona de segurança)
+_NAV_NOISE = ("keyboard_arrow_down", "expand_more", "menu", "On this Page", "Edit this page",
+              "Next page", "Previous page", "Stay up-to-date", "download", "Pricing",
+              "Blog", "Changelog", "Support", "side_navigation")
+
+
+# ===========================================
+# 2. BLOCOS
+# ===========================================
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _paragraph(rng: random.Random) -> str:
+    sentences = []
+    for _ in range(rng.randint(2, 5)):
+        text = _words(rng, rng.randint(6, 18))
+        if rng.random() < 0.15:
+            text += f" ({rng.choice(_NAV_NOISE)})"  # termo de menu dentro de texto corrido
+        sentences.append(text[0].upper() + text[1:] + ".")
+    return " ".join(sentences)
+
+
+def _nav_block(rng: random.Random) -> str:
+    lines = [rng.choice(_NAV_NOISE)]
+    for item in rng.sample(_NAV_ITEMS, rng.randint(3, 8)):
+        slug = item.lower().replace(" ", "-")
+        lines.append(rng.choice((f"[{item}](/docs/{slug})", f"* [{item}](/docs/{slug})",
+                                 f"[{item}](https://example.com/{slug})")))
+    if rng.random() < 0.5:
+        lines.append(f"[Home](/) > [Docs](/docs) > [{rng.choice(_NAV_ITEMS)}](/docs/x)")
+    if rng.random() < 0.3:
+        lines.append(rng.choice(("On this Page", "Edit this page", "Next page", "Previous page")))
+    return "\n".join(lines)
+
+
+def _code_block(rng: random.Random) -> str:
+    lang = rng.choice(("python", "bash", "json", "javascript"))
+    body = []
+    for i in range(rng.randint(3, 14)):
+        indent = "    " * rng.randint(0, 2)
+        body.append(rng.choice((
+            f"{indent}result = client.{rng.choice(_WORDS)}(url, timeout={rng.randint(1, 60)})",
+            f"{indent}# {_words(rng, rng.randint(3, 8))}",
+            f"{indent}items[{i}] = [\"{rng.choice(_WORDS)}\", {rng.randint(0, 999)}]",
+            f"{indent}menu.download(\"{rng.choice(_WORDS)}.md\")",
+            f"{indent}if not {rng.choice(_WORDS)}:",
+        )))
+    block = f"```{lang}\n" + "\n".join(body) + "\n```"
+    if rng.random() < 0.2:
+        block += f"\n<script>window.__data = {{\"{rng.choice(_WORDS)}\": {rng.randint(0, 99)}}};</script>"
+    if rng.random() < 0.1:
+        block += "\n<style>.sidebar { display: none; }</style>"
+    return block
+
+
+def _table_block(rng: random.Random) -> str:
+    columns = rng.randint(3, 7)
+    header = "| " + " | ".join(rng.choice(_WORDS).title() for _ in range(columns)) + " |"
+    rows = [header, "|" + "---|" * columns]
+    for _ in range(rng.randint(3, 20)):
+        cells = [rng.choice((f"`{rng.choice(_WORDS)}`", str(rng.randint(0, 10_000)), _words(rng, 3),
+                             f"[{rng.choice(_NAV_ITEMS)}](/docs/{rng.randint(1, 99)})", "download"))
+                 for _ in range(columns)]
+        rows.append("| " + " | ".join(cells) + " |")
+    return "\n".join(rows)
+
+
+def _heading(rng: random.Random) -> str:
+    return "#" * rng.randint(1, 4) + " " + _words(rng, rng.randint(2, 6)).title()
+
+
+# Peso de cada bloco por formato
+_MIXES = {
+    "nav": ((_nav_block, 6), (_paragraph, 2), (_heading, 1), (_code_block, 1)),
+    "code": ((_code_block, 6), (_paragraph, 2), (_heading, 1), (_nav_block, 1)),
+    "table": ((_table_block, 6), (_paragraph, 2), (_heading, 1), (_nav_block, 1)),
+    "mixed": ((_paragraph, 4), (_heading, 2), (_nav_block, 2), (_code_block, 2), (_table_block, 1)),
+}
+
+
+# ===========================================
+# 3. GERAÇÃO
+# ===========================================
+
+def generate(shape: str, size: int, seed: int = 0) -> str:
+    """Gera um documento Markdown de ~size bytes (UTF-8)
+
+    Args:
+        shape: Um de SHAPES
+        size: Tamanho alvo em bytes (para no primeiro bloco que o atinge)
+        seed: Semente (mesma semente = mesmos bytes)
+
+    Raises:
+        ValueError: Formato desconhecido
+    """
+    if shape not in _MIXES:
+        raise ValueError(f"Formato inválido: {shape} (use {', '.join(SHAPES)})")
+
+    rng = random.Random(f"{shape}:{seed}")
+    builders, weights = zip(*_MIXES[shape])
+    blocks = [_heading(rng)]
+    total = len(blocks[0].encode("utf-8"))
+    while total < size:
+        block = rng.choices(builders, weights)[0](rng)
+        blocks.append(block)
+        total += len(block.encode("utf-8")) + 2
+    return "\n\n".join(blocks) + "\n"
+
+
+def parse_size(text: str) -> int:
+    """"64KB" → 65536 (aceita as chaves de SIZES ou bytes)"""
+    return SIZES[text] if text in SIZES else int(text)
@@ -0,0 +1,322 @@
+"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║ LLM Context Builder V3.0 - Fixture Web Server                                ║
+║ Sites de documentação sintéticos (SSR, Angular, React) servidos localmente   ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+Taller Dev - 2026
+VAI CORINTHIANS!!
+═══════════════════════════════════════════════════════════════════════════════
+
+Uso:
+    python benchmarks/fixture_server.py --pages 200 --latency 50   # serve até Ctrl+C
+
+    with FixtureServer(pages=50, latency_ms=20) as server:
+        server.seed_url("ssr")      # http://127.0.0.1:<porta>/ssr/docs/
+        server.page_urls("react")   # todas as páginas do site React
+
+Três sites com as mesmas páginas (conteúdo determinístico por seed):
+
+    /ssr/docs/page-N      HTML completo do servidor (<main>, sidebar, rodapé)
+    /angular/docs/page-N  shell <app-root ng-version> + JS que busca o JSON
+    /react/docs/page-N    shell <div id="root"> + JS que busca o JSON
+
+Os shells SPA só têm conteúdo depois do JavaScript rodar (precisam do
+browser); o SSR é servido pronto (fast path HTTP).
+"""
+
+# ===========================================
+# 1. IMPORTS E CONFIGURAÇÕES
+# ===========================================
+
+import sys
+import json
+import time
+import html
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SITE_KINDS = ("ssr", "angular", "react")
+
+# Links da sidebar por página (janela em torno da página atual, como docs reais)
+NAV_LINKS = 40
+
+_WORDS = (
+    "crawler página cache markdown token seletor browser render conteúdo índice "
+    "configuração instalação exemplo parâmetro retorno erro consulta servidor "
+    "cliente fila lote janela contexto modelo arquivo diretório rota componente "
+    "estado evento requisição resposta latência throughput limite tentativa"
+).split()
+
+_TOPICS = ("Instalação", "Configuração", "API", "Autenticação", "Deploy", "CLI",
+           "Plugins", "Cache", "Roteamento", "Testes", "Migração", "FAQ")
+
+
+# ===========================================
+# 2. CONTEÚDO SINTÉTICO
+# ===========================================
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def page_title(index: int) -> str:
+    return f"Guia {index}: {_TOPICS[index % len(_TOPICS)]}"
+
+
+def page_content(index: int, seed: int = 0) -> dict:
+    """Conteúdo de uma página (igual nos três sites)
+
+    Returns:
+        {"title", "sections": [{"heading", "paragraphs", "code", "table"}]}
+    """
+    rng = random.Random(seed * 100003 + index)
+    sections = []
+    for s in range(rng.randint(3, 6)):
+        sections.append({
+            "heading": f"{_TOPICS[(index + s) % len(_TOPICS)]} {s + 1}",
+            "paragraphs": [" ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(2, 5)))
+                           for _ in range(rng.randint(1, 3))],
+            "code": (f"service = WebCrawlerService()\nresult = service.run({index}, retries={s})\n"
+                     if rng.random() < 0.6 else None),
+            "table": ([[rng.choice(_WORDS), str(rng.randint(1, 999)), rng.choice(_WORDS)]
+                       for _ in range(rng.randint(2, 6))]
+                      if rng.random() < 0.4 else None)
+        })
+    return {"title": page_title(index), "sections": sections}
+
+
+def _nav_window(index: int, pages: int) -> range:
+    start = max(0, min(index - NAV_LINKS // 2, pages - NAV_LINKS))
+    return range(start, min(pages, start + NAV_LINKS))
+
+
+def render_ssr_page(index: int, pages: int, seed: int = 0) -> str:
+    """HTML completo do site SSR (cabeçalho, sidebar, <main>, rodapé)"""
+    content = page_content(index, seed)
+    nav = "\n".join(
+        f'<li><a href="/ssr/docs/page-{i}"{" aria-current=page" if i == index else ""}>'
+        f'{html.escape(page_title(i))}</a></li>'
+        for i in _nav_window(index, pages)
+    )
+    body = []
+    for section in content["sections"]:
+        body.append(f"<h2>{html.escape(section['heading'])}</h2>")
+        body.extend(f"<p>{html.escape(p)}</p>" for p in section["paragraphs"])
+        if section["code"]:
+            body.append(f"<pre><code class=\"language-python\">{html.escape(section['code'])}</code></pre>")
+        if section["table"]:
+            rows = "".join("<tr>" + "".join(f"<td>{html.escape(c)}</td>" for c in row) + "</tr>"
+                           for row in section["table"])
+            body.append(f"<table><thead><tr><th>Nome</th><th>Valor</th><th>Tipo</th></tr></thead>"
+                        f"<tbody>{rows}</tbody></table>")
+    next_link = f'<a href="/ssr/docs/page-{index + 1}">Próxima</a>' if index + 1 < pages else ""
+
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(content['title'])} | Docs</title>
+<link rel="stylesheet" href="/ssr/assets/site.css">
+<link rel="icon" href="/ssr/assets/favicon.ico">
+<script src="/ssr/assets/analytics.js" defer></script>
+</head>
+<body>
+<header class="site-header"><a href="/ssr/docs/">Docs</a> <a href="/ssr/blog/">Blog</a>
+<a href="https://github.com/exemplo/docs">GitHub</a> <input type="search" placeholder="Buscar"></header>
+<nav class="sidebar" aria-label="Documentação"><ul>
+{nav}
+</ul></nav>
+<main>
+<article>
+<h1>{html.escape(content['title'])}</h1>
+{chr(10).join(body)}
+<div class="pagination">{next_link}</div>
+</article>
+</main>
+<footer><p>© 2026 Docs de exemplo</p><a href="/ssr/sitemap.xml">Sitemap</a>
+<img src="/ssr/assets/logo.png" alt="logo"></footer>
+</body>
+</html>
+"""
+
+
+_SPA_ROOT = {
+    "angular": '<app-root ng-version="17.3.0"></app-root>',
+    "react": '<div id="root"></div>',
+}
+
+# Renderiza nav + <main> a partir do JSON (equivalente ao bundle da SPA)
+_SPA_SCRIPT = """
+(async () => {
+  const kind = document.documentElement.dataset.kind;
+  const index = Number(location.pathname.split("page-")[1] || 0);
+  const response = await fetch(`/${kind}/api/page-${index}.json`);
+  const data = await response.json();
+  await new Promise(r => setTimeout(r, Number(document.documentElement.dataset.hydrate)));
+  const root = document.querySelector("app-root, #root");
+  const esc = s => s.replace(/[&<>]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;"}[c]));
+  const nav = data.nav.map(n => `<li><a href="/${kind}/docs/page-${n.index}">${esc(n.title)}</a></li>`).join("");
+  const body = data.sections.map(s =>
+    `<h2>${esc(s.heading)}</h2>` + s.paragraphs.map(p => `<p>${esc(p)}</p>`).join("") +
+    (s.code ? `<pre><code>${esc(s.code)}</code></pre>` : "") +
+    (s.table ? `<table>${s.table.map(r => `<tr>${r.map(c => `<td>${esc(c)}</td>`).join("")}</tr>`).join("")}</table>` : "")
+  ).join("");
+  root.innerHTML = `<nav class="sidebar"><ul>${nav}</ul></nav><main><article><h1>${esc(data.title)}</h1>${body}</article></main>`;
+  document.title = data.title;
+})();
+"""
+
+
+def render_spa_shell(kind: str, hydrate_ms: int = 50) -> str:
+    """Shell da SPA: sem conteúdo no HTML inicial"""
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR" data-kind="{kind}" data-hydrate="{hydrate_ms}">
+<head><meta charset="utf-8"><title>Docs</title>
+<script src="/{kind}/main.js" defer></script></head>
+<body>{_SPA_ROOT[kind]}<noscript>Habilite JavaScript</noscript></body>
+</html>
+"""
+
+
+def render_spa_data(kind: str, index: int, pages: int, seed: int = 0) -> str:
+    data = page_content(index, seed)
+    data["nav"] = [{"index": i, "title": page_title(i)} for i in _nav_window(index, pages)]
+    return json.dumps(data, ensure_ascii=False)
+
+
+# ===========================================
+# 3. SERVIDOR
+# ===========================================
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FixtureDocs/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, como um servidor real
+
+    def log_message(self, format, *args):
+        pass  # Sem log por requisição (atrapalha a medição)
+
+    def _send(self, status: int, content_type: str, body: str):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        site = self.server.site
+        if site["latency_ms"]:
+            time.sleep(site["latency_ms"] / 1000)
+        site["requests"] += 1
+
+        path = self.path.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+        parts = path.strip("/").split("/")
+        kind = parts[0] if parts else ""
+        if kind not in SITE_KINDS:
+            return self._send(404, "text/plain", "not found")
+
+        pages = site["pages"]
+        rest = "/".join(parts[1:])
+        index = None
+        if rest in ("docs", ""):
+            index = 0
+        elif rest.startswith("docs/page-"):
+            index = _parse_index(rest[len("docs/page-"):], pages)
+        elif kind != "ssr" and rest.startswith("api/page-") and rest.endswith(".json"):
+            data_index = _parse_index(rest[len("api/page-"):-len(".json")], pages)
+            if data_index is None:
+                return self._send(404, "application/json", "{}")
+            return self._send(200, "application/json", render_spa_data(kind, data_index, pages, site["seed"]))
+        elif kind != "ssr" and rest == "main.js":
+            return self._send(200, "application/javascript", _SPA_SCRIPT)
+
+        if index is None:
+            return self._send(404, "text/html; charset=utf-8", "<h1>404</h1>")
+        if kind == "ssr":
+            return self._send(200, "text/html; charset=utf-8", render_ssr_page(index, pages, site["seed"]))
+        return self._send(200, "text/html; charset=utf-8", render_spa_shell(kind, site["hydrate_ms"]))
+
+
+def _parse_index(text: str, pages: int) -> int | None:
+    return int(text) if text.isdigit() and int(text) < pages else None
+
+
+class FixtureServer:
+    """Servidor HTTP local (thread daemon) com os sites sintéticos"""
+
+    def __init__(self, pages: int = 50, latency_ms: int = 0, hydrate_ms: int = 50,
+                 seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+        """Inicializa servidor
+
+        Args:
+            pages: Páginas por site
+            latency_ms: Atraso fixo por requisição
+            hydrate_ms: Atraso do JS das SPAs antes de renderizar o conteúdo
+            seed: Semente do conteúdo (mesma seed = mesmos bytes)
+            host: Interface (default: só loopback)
+            port: Porta (0 = livre, escolhida pelo SO)
+        """
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.site = {"pages": pages, "latency_ms": latency_ms, "hydrate_ms": hydrate_ms,
+                            "seed": seed, "requests": 0}
+        self._thread = None
+        self.pages = pages
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self) -> int:
+        """Requisições atendidas até agora"""
+        return self._httpd.site["requests"]
+
+    def seed_url(self, kind: str) -> str:
+        return f"{self.base_url}/{kind}/docs/"
+
+    def page_urls(self, kind: str) -> list[str]:
+        return [f"{self.base_url}/{kind}/docs/page-{i}" for i in range(self.pages)]
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sites de documentação sintéticos para benchmark")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--latency", type=int, default=0, help="Atraso por requisição (ms)")
+    parser.add_argument("--hydrate", type=int, default=50, help="Atraso do JS das SPAs (ms)")
+    parser.add_argument("--port", type=int, default=8800)
+    args = parser.parse_args(argv)
+
+    server = FixtureServer(pages=args.pages, latency_ms=args.latency, hydrate_ms=args.hydrate, port=args.port)
+    for kind in SITE_KINDS:
+        print(f"{kind:8s} {server.seed_url(kind)}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
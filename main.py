@@ -14,10 +14,6 @@ VAI CORINTHIANS!!
 
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-from app.gui.main_window import Pdf2mdWindow
-from app.converters.web_engine.logger import log_app_startup
 
 
 def resource_path(relative_path):
@@ -35,6 +31,19 @@ def resource_path(relative_path):
 
 def main():
     """Inicializa aplicação e inicia loop de eventos"""
+    # Modo headless (sem PyQt6): python main.py scan|crawl|pdf|count ...
+    from app.cli import COMMANDS
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        from app.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon
+    from PyQt6.QtCore import QTimer
+    from app.gui.main_window import Pdf2mdWindow
+    from app.converters.web_engine.logger import log_app_startup
+    from app.utils.preload import preload_in_background
+
     # Log de inicialização da aplicação
     log_app_startup()
 
@@ -42,6 +51,9 @@ def main():
     app.setWindowIcon(QIcon(resource_path("imagens/icone_principal.png")))
     window = Pdf2mdWindow()
     window.show()
+
+    # crawl4ai/pymupdf4llm/tiktoken carregam depois que a janela aparece
+    QTimer.singleShot(300, preload_in_background)
     sys.exit(app.exec())
 
 
@@ -50,4 +62,7 @@ def main():
 # ===========================================
 
 if __name__ == "__main__":
+    # Processos do crawl sharded (spawn) no executável congelado
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
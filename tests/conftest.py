@@ -0,0 +1,21 @@
+"""Fixtures compartilhadas: nenhum teste grava em <raiz>/logs"""
+
+import os
+import tempfile
+
+import pytest
+
+# Antes de qualquer import do motor: o handler do debug_trace.log (e os
+# subprocessos dos testes) usam a pasta de logs temporária
+os.environ.setdefault("LCB_LOG_DIR", tempfile.mkdtemp(prefix="lcb-test-logs-"))
+
+from app.utils import telemetry  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _telemetry_em_tmp(tmp_path, monkeypatch):
+    """Telemetria dos jobs executados nos testes vai para tmp_path"""
+    writer = telemetry._JsonlWriter(tmp_path / telemetry.TELEMETRY_FILE)
+    monkeypatch.setattr(telemetry, "_writer", writer)
+    yield
+    writer.close()
@@ -0,0 +1,65 @@
+"""Testes do event loop persistente compartilhado pelos workers"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.utils.async_loop import AsyncLoopThread
+
+
+def test_loop_persiste_entre_jobs_e_threads():
+    loop_thread = AsyncLoopThread(name="test-loop")
+    state = {}
+
+    async def job(name):
+        state.setdefault("loop", asyncio.get_running_loop())
+        state.setdefault("lock", asyncio.Lock())  # recurso assíncrono vivo entre jobs
+        async with state["lock"]:
+            return name, asyncio.get_running_loop() is state["loop"]
+
+    try:
+        results = []
+        workers = [threading.Thread(target=lambda n=n: results.append(loop_thread.run(job(n))))
+                   for n in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(5)
+
+        assert sorted(results) == [(n, True) for n in range(4)]
+        assert loop_thread.run(job("depois"))[1]
+    finally:
+        loop_thread.stop()
+
+    assert not loop_thread.running
+    assert state["loop"].is_closed()
+
+
+def test_shutdown_executa_hooks_e_cancela_pendentes():
+    loop_thread = AsyncLoopThread(name="test-loop")
+    closed = []
+
+    async def close_browsers():
+        closed.append(True)
+
+    loop_thread.add_shutdown_hook(close_browsers)
+    pending = loop_thread.submit(asyncio.sleep(60))
+    loop_thread.stop(timeout=5)
+
+    assert closed == [True]
+    assert pending.cancelled()
+
+
+def test_run_dentro_do_loop_nao_trava():
+    loop_thread = AsyncLoopThread(name="test-loop")
+
+    async def nested():
+        with pytest.raises(RuntimeError):
+            loop_thread.run(asyncio.sleep(0))
+        return "ok"
+
+    try:
+        assert loop_thread.run(nested(), timeout=5) == "ok"
+    finally:
+        loop_thread.stop()
@@ -0,0 +1,23 @@
+"""Testes da comparação de resultados do benchmark"""
+
+from benchmarks.bench_suite import compare, flatten
+
+
+def _report(**results) -> dict:
+    return {"meta": {"commit": "abc"}, "results": results}
+
+
+def test_flatten_ignora_textos_e_booleanos():
+    data = {"crawl": {"ssr": {"seconds": 1.5, "success": True}}, "links": {"error": "x"}}
+    assert flatten(data) == {"crawl.ssr.seconds": 1.5}
+
+
+def test_compare_respeita_direcao_de_cada_metrica():
+    base = _report(crawl={"ssr": {"pages_per_sec": 10.0, "seconds": 2.0, "pages": 20}})
+    current = _report(crawl={"ssr": {"pages_per_sec": 8.0, "seconds": 2.1, "pages": 40}})
+
+    rows = {name: (change, regressed) for name, _, _, change, regressed in compare(base, current, 10.0)}
+    assert rows == {
+        "crawl.ssr.pages_per_sec": (-20.0, True),  # maior é melhor: caiu 20%
+        "crawl.ssr.seconds": (5.0, False)          # piorou dentro da tolerância
+    }
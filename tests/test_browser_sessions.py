@@ -0,0 +1,81 @@
+"""Testes dos browsers aquecidos compartilhados entre jobs simultâneos"""
+
+import asyncio
+
+import pytest
+
+crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+
+
+class WordCounter:
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class FakeBrowser:
+    """AsyncWebCrawler falso: só registra start/close"""
+
+    def __init__(self, config=None):
+        self.started = False
+        self.closed = False
+
+    async def start(self):
+        self.started = True
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    monkeypatch.setattr(crawler_module, "AsyncWebCrawler", FakeBrowser)
+    monkeypatch.setattr(crawler_module, "install_resource_blocking", lambda crawler: None)
+    return crawler_module.WebCrawlerService(keep_browsers_warm=True)
+
+
+def test_cancelamento_de_um_job_nao_fecha_o_browser_dos_outros(service):
+    async def scenario():
+        inside = asyncio.Event()
+        release = asyncio.Event()
+
+        async def job(fail: bool):
+            async with service.browser_session("padrao", None) as browser:
+                inside.set()
+                if fail:
+                    raise asyncio.CancelledError()
+                await release.wait()
+                return browser, browser.closed
+
+        other = asyncio.create_task(job(False))
+        await inside.wait()
+        with pytest.raises(asyncio.CancelledError):
+            await job(True)
+
+        shared = service._browsers.get("padrao")
+        assert shared is None  # quebrado: jobs novos sobem outro
+        async with service.browser_session("padrao", None) as fresh:
+            pass
+
+        release.set()
+        browser, closed_while_in_use = await other
+        return browser, closed_while_in_use, fresh
+
+    browser, closed_while_in_use, fresh = asyncio.run(scenario())
+
+    assert not closed_while_in_use
+    assert browser.closed  # fechado quando o último job terminou
+    assert fresh is not browser and not fresh.closed
+    assert service._browsers == {"padrao": fresh} and not service._browser_users
+
+
+def test_browser_saudavel_continua_aquecido(service):
+    async def scenario():
+        async with service.browser_session("padrao", None) as first:
+            pass
+        async with service.browser_session("padrao", None) as second:
+            pass
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first is second and first.started and not first.closed
@@ -0,0 +1,91 @@
+"""Testes de cancelamento cooperativo e pausa/retomada"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils.cancellation import CancellationToken, OperationCancelled
+
+
+def test_pausa_bloqueia_ate_retomar():
+    token = CancellationToken()
+    token.pause()
+    passed = threading.Event()
+
+    def job():
+        token.checkpoint_sync({"pagina": 10})
+        passed.set()
+
+    thread = threading.Thread(target=job)
+    thread.start()
+    time.sleep(0.1)
+    assert not passed.is_set()
+    assert token.state == {"pagina": 10}
+
+    token.resume()
+    thread.join(2)
+    assert passed.is_set()
+
+
+def test_cancelar_durante_pausa_levanta_com_parcial():
+    token = CancellationToken()
+    token.pause()
+    errors = []
+
+    def job():
+        try:
+            token.checkpoint_sync(partial=["p1"])
+        except OperationCancelled as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=job)
+    thread.start()
+    token.cancel()
+    thread.join(2)
+    assert errors and errors[0].partial == ["p1"]
+
+
+def test_cancelamento_aborta_gather_em_andamento():
+    token = CancellationToken()
+
+    async def main():
+        gathered = asyncio.gather(asyncio.sleep(30), asyncio.sleep(30))
+        on_cancel = token.cancel_future_on_cancel(gathered)
+        threading.Timer(0.05, token.cancel).start()
+        started = time.perf_counter()
+        with pytest.raises(asyncio.CancelledError):
+            await gathered
+        token.remove_callback(on_cancel)
+        return time.perf_counter() - started
+
+    assert asyncio.run(main()) < 2
+    with pytest.raises(OperationCancelled):
+        asyncio.run(token.checkpoint())
+
+
+def test_pdf_em_lotes_e_cancelamento(tmp_path):
+    pymupdf = pytest.importorskip("pymupdf")
+    pytest.importorskip("pymupdf4llm")
+    from app.converters.pdf_converter import PdfToMarkdownConverter
+
+    pdf_path = tmp_path / "manual.pdf"
+    doc = pymupdf.open()
+    for i in range(25):
+        doc.new_page().insert_text((72, 72), f"Pagina {i}")
+    doc.save(pdf_path)
+
+    converter = PdfToMarkdownConverter()
+    output = tmp_path / "manual.md"
+    success, _ = converter.process(str(pdf_path), str(output), cancel_token=CancellationToken())
+    assert success
+    assert output.read_text(encoding="utf-8") == converter.convert_pdf_to_markdown(pdf_path)
+
+    cancelled = CancellationToken()
+    cancelled.cancel()
+    other = tmp_path / "cancelado.md"
+    success, message = converter.process(str(pdf_path), str(other), cancel_token=cancelled)
+    assert not success and "cancelada" in message
+    assert not other.exists()
+    assert not (tmp_path / "cancelado.md.part").exists()
@@ -0,0 +1,73 @@
+"""Testes do chunker semântico (exportação RAG)"""
+
+import re
+import json
+
+from app.utils.chunker import SemanticChunker
+
+
+class WordCounter:
+    """Contador simples (palavra + espaços = 1 token) com offsets, sem tiktoken"""
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode_with_offsets(self, text: str) -> tuple[list[int], list[int]]:
+        self.encode_calls += 1
+        offsets = [m.start() for m in re.finditer(r'\s*\S+', text)]
+        return list(range(len(offsets))), offsets
+
+
+PAGE = {
+    "url": "https://docs.exemplo.com/guia",
+    "title": "Guia",
+    "markdown": (
+        "# Guia\n\nIntrodução " + "texto " * 30 + "\n\n"
+        "## Instalação\n\n" + "passo " * 120 + "\n\n"
+        "```bash\n# não é heading\npip install app\n```\n\n"
+        "### Windows\n\n" + "detalhe " * 20 + "\n"
+    )
+}
+
+
+def test_chunks_follow_headings_and_respect_limit():
+    chunker = SemanticChunker(WordCounter(), max_tokens=50, overlap_tokens=10, min_section_tokens=3)
+    chunks = chunker.chunk_page(PAGE)
+
+    assert all(chunk["tokens"] <= 50 for chunk in chunks)
+    assert chunks[0]["heading_path"] == ["Guia", "Guia"]
+    assert ["Guia", "Guia", "Instalação"] in [c["heading_path"] for c in chunks]
+    assert chunks[-1]["heading_path"] == ["Guia", "Guia", "Instalação", "Windows"]
+    assert all("não é heading" not in " ".join(c["heading_path"]) for c in chunks)
+    assert [c["chunk_index"] for c in chunks] == list(range(len(chunks)))
+
+
+def test_overlap_between_consecutive_chunks_of_a_section():
+    chunker = SemanticChunker(WordCounter(), max_tokens=50, overlap_tokens=10, min_section_tokens=3)
+    chunks = [c for c in chunker.chunk_page(PAGE) if c["heading_path"][-1] == "Instalação"]
+
+    assert len(chunks) >= 3
+    tail = chunks[0]["text"].split()[-10:]
+    assert chunks[1]["text"].split()[:10] == tail
+
+
+def test_page_is_encoded_once():
+    counter = WordCounter()
+    SemanticChunker(counter, max_tokens=20, overlap_tokens=5).chunk_page(PAGE)
+    assert counter.encode_calls == 1
+
+
+def test_chunks_cover_whole_page_without_overlap():
+    chunker = SemanticChunker(WordCounter(), max_tokens=1000, overlap_tokens=0, min_section_tokens=0)
+    chunks = chunker.chunk_page(PAGE)
+    assert "".join(c["text"] for c in chunks) == PAGE["markdown"]
+
+
+def test_export_jsonl(tmp_path):
+    output = tmp_path / "chunks.jsonl"
+    success, _ = SemanticChunker(WordCounter(), max_tokens=50, overlap_tokens=10).export([PAGE], str(output))
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert success and lines
+    first = json.loads(lines[0])
+    assert first["url"] == PAGE["url"] and first["id"].endswith("-0000")
@@ -0,0 +1,172 @@
+"""Testes da CLI headless (parser, despacho e stdout só com eventos JSON)"""
+
+import io
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from app import cli
+from app.converters.web_engine.page_store import PageStore, manifest_path_for
+from app.converters.web_engine.postprocess import content_hash
+from app.converters.web_engine.writer import ConsolidatedWriter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class WordCounter:
+    """TokenCounter falso (1 token por palavra), sem baixar o encoding"""
+
+    def __init__(self, model: str = None):
+        self.model = model
+
+    def count_tokens_in_file(self, path: Path) -> int:
+        return len(path.read_text(encoding="utf-8").split())
+
+
+@pytest.fixture(autouse=True)
+def _log_stream(monkeypatch):
+    # main() aponta o console do logger para o stderr via ambiente; o
+    # monkeypatch desfaz isso ao fim de cada teste
+    monkeypatch.setenv(cli.LOG_STREAM_ENV, "stderr")
+
+
+@pytest.fixture
+def events(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(cli, "_EVENTS_OUT", out)
+    return lambda: [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    """Documento de 2 páginas gravado com page store em tmp_path"""
+    store = PageStore(tmp_path / "store")
+    pages = []
+    for n in (1, 2):
+        markdown = f"## Página {n}\n\nConteúdo da página {n}."
+        pages.append({"url": f"https://docs.exemplo.com/{n}", "title": f"Página {n}",
+                      "markdown": markdown, "tokens": len(markdown.split()),
+                      "hash": content_hash(markdown)})
+    output = tmp_path / "docs.md"
+    ConsolidatedWriter(store=store).write(pages, str(output))
+    output.unlink()
+    return manifest_path_for(output)
+
+
+@pytest.mark.parametrize("argv", [
+    ["scan", "https://docs.exemplo.com"],
+    ["crawl", "--url", "https://docs.exemplo.com", "--spider", "-o", "docs.md"],
+    ["build", "docs.manifest.json"],
+    ["update", "docs.manifest.json"],
+    ["prune", "saida/"],
+    ["pdf", "manual.pdf"],
+    ["count", "docs.md"],
+    ["serve"],
+])
+def test_cada_comando_tem_subparser(argv):
+    args = cli.build_parser().parse_args(argv)
+    assert args.command == argv[0]
+    assert args.func is getattr(cli, f"cmd_{argv[0]}")
+
+
+def test_todos_os_comandos_estao_no_parser():
+    parsed = {cli.build_parser().parse_args(argv).command for argv in (
+        ["scan", "u"], ["crawl", "--url", "u", "-o", "o"], ["build", "m"], ["update", "m"],
+        ["prune", "p"], ["pdf", "f"], ["count", "f"], ["serve"])}
+    assert parsed == set(cli.COMMANDS)
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["crawl", "-o", "docs.md"],  # sem --pages nem --url
+    ["crawl", "--pages", "pages.json", "--url", "https://docs.exemplo.com", "-o", "docs.md"],
+    ["crawl", "--pages", "pages.json", "--spider", "-o", "docs.md"],  # spider sem url
+    ["prune"],  # sem manifestos: apagaria o store inteiro
+])
+def test_argumentos_invalidos_saem_com_erro_de_uso(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_count_despacha_e_emite_eventos(tmp_path, monkeypatch, events):
+    import app.utils.token_counter as token_counter_module
+    monkeypatch.setattr(token_counter_module, "TokenCounter", WordCounter)
+    files = [tmp_path / "a.md", tmp_path / "b.md"]
+    files[0].write_text("uma duas três", encoding="utf-8")
+    files[1].write_text("quatro cinco", encoding="utf-8")
+
+    assert cli.main(["count", *map(str, files), "--model", "gpt-4o"]) == 0
+
+    emitted = events()
+    assert [e["event"] for e in emitted] == ["count", "count", "count_finished"]
+    assert [e["tokens"] for e in emitted] == [3, 2, 5]
+    assert emitted[-1]["model"] == "gpt-4o"
+
+
+def test_excecao_do_comando_vira_evento_de_erro(tmp_path, monkeypatch, events):
+    import app.utils.token_counter as token_counter_module
+    monkeypatch.setattr(token_counter_module, "TokenCounter", WordCounter)
+
+    assert cli.main(["count", str(tmp_path / "inexistente.md")]) == 1
+
+    emitted = events()
+    assert emitted[-1]["event"] == "error" and emitted[-1]["command"] == "count"
+
+
+def test_build_e_prune_do_manifesto(tmp_path, manifest, events):
+    store = str(tmp_path / "store")
+    output = tmp_path / "rebuilt.md"
+
+    assert cli.main(["build", str(manifest), "--store", store, "-o", str(output)]) == 0
+    assert "Conteúdo da página 2." in output.read_text(encoding="utf-8")
+
+    assert cli.main(["prune", str(tmp_path), "--store", store, "--min-age", "0"]) == 0
+    finished = events()[-1]
+    assert finished["event"] == "prune_finished" and finished["success"]
+    assert finished["manifests"] == 1 and finished["removed"] == 0
+
+
+def _run_cli(tmp_path, *argv) -> subprocess.CompletedProcess:
+    env = {**os.environ, "LCB_LOG_DIR": str(tmp_path / "logs"), "LCB_TELEMETRY": "0"}
+    env.pop(cli.LOG_STREAM_ENV, None)  # a própria CLI tem que configurar
+    return subprocess.run([sys.executable, "-m", "app.cli", *argv], cwd=ROOT, env=env,
+                          capture_output=True, text=True, encoding="utf-8", timeout=180)
+
+
+def test_stdout_so_tem_eventos_json_e_logs_vao_para_stderr(tmp_path, manifest):
+    result = _run_cli(tmp_path, "build", str(manifest), "--store", str(tmp_path / "store"))
+
+    assert result.returncode == 0, result.stderr
+    emitted = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [e["event"] for e in emitted] == ["build_finished"]
+    assert emitted[0]["success"]
+    assert "LOGGER" in result.stderr  # banner e handlers do motor no stderr
+
+
+def test_crawl_em_processos_nao_suja_o_stdout(tmp_path):
+    # Os processos do crawl sharded importam o logger do motor (banner +
+    # console) antes de qualquer código da CLI; sem browser/rede as páginas
+    # falham, mas os shards sobem do mesmo jeito
+    try:
+        from app.utils.token_counter import TokenCounter
+        TokenCounter()
+    except Exception as e:
+        pytest.skip(f"encoding cl100k_base indisponível (rede ou TIKTOKEN_CACHE_DIR): {e}")
+    from app.converters.web_engine.sharding import SHARD_MIN_PAGES
+
+    pages = tmp_path / "pages.json"
+    pages.write_text(json.dumps([{"url": f"http://127.0.0.1:9/p{i}", "title": f"P{i}"}
+                                 for i in range(SHARD_MIN_PAGES)]), encoding="utf-8")
+    result = _run_cli(tmp_path, "crawl", "--pages", str(pages), "-j", "2", "-o", str(tmp_path / "docs.md"),
+                      "--store", str(tmp_path / "store"))
+
+    assert "CRAWL SHARDED" in result.stderr
+    emitted = [json.loads(line) for line in result.stdout.splitlines()]
+    assert emitted[0]["event"] == "crawl_started" and emitted[-1]["event"] == "crawl_finished"
+    assert result.stderr.count("LOGGER PARANÓICO - DIAGNÓSTICO") == 3  # pai + 2 shards
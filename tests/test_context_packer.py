@@ -0,0 +1,159 @@
+"""Testes do empacotador de contexto (orçamento de tokens)"""
+
+import pytest
+
+from app.utils.context_packer import TRUNCATION_MARKER, ContextPacker
+
+
+class WordCounter:
+    """Contador simples (1 token por palavra) para testes sem tiktoken"""
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        return " ".join(text.split()[:max_tokens])
+
+    def split_by_tokens(self, text: str, max_tokens: int) -> list[str]:
+        words = text.split()
+        return [" ".join(words[i:i + max_tokens]) for i in range(0, len(words), max_tokens)]
+
+
+def make_page(n: int, tokens: int, **extra) -> dict:
+    page = {"url": f"https://docs.exemplo.com/{n}", "title": f"Página {n}",
+            "markdown": " ".join(["palavra"] * tokens), "tokens": tokens}
+    page.update(extra)
+    return page
+
+
+def test_pack_keeps_everything_when_budget_is_enough():
+    pages = [make_page(i, 100) for i in range(5)]
+    result = ContextPacker(1000, WordCounter()).pack(pages)
+
+    assert [p["url"] for p in result["pages"]] == [p["url"] for p in pages]
+    assert result["tokens"] == 500
+    assert not result["dropped"] and not result["truncated"]
+
+
+def test_pack_prefers_priority_and_keeps_original_order():
+    pages = [make_page(0, 400), make_page(1, 400, priority=1), make_page(2, 400, priority=2)]
+    result = ContextPacker(800, WordCounter(), min_truncated_tokens=50).pack(pages)
+
+    assert [p["url"] for p in result["pages"]] == [pages[1]["url"], pages[2]["url"]]
+    assert result["dropped"] == [pages[0]]
+    assert result["tokens"] <= 800
+
+
+def test_pack_prefers_most_recent_http_lastmod():
+    # Datas HTTP (Last-Modified): como string, "Wed, ..." venceria "Mon, ..."
+    pages = [make_page(0, 100, lastmod="Wed, 01 Jan 2020 00:00:00 GMT"),
+             make_page(1, 100, lastmod="Mon, 05 Oct 2026 10:00:00 GMT"),
+             make_page(2, 100, lastmod="data inválida")]
+    result = ContextPacker(150, WordCounter(), min_truncated_tokens=100).pack(pages)
+
+    assert [p["url"] for p in result["pages"]] == [pages[1]["url"]]
+    assert result["dropped"] == [pages[0], pages[2]]
+
+
+def test_pack_truncates_page_that_does_not_fit():
+    pages = [make_page(0, 600), make_page(1, 600)]
+    result = ContextPacker(1000, WordCounter(), min_truncated_tokens=100).pack(pages)
+
+    assert len(result["pages"]) == 2
+    assert result["truncated"] == [pages[1]["url"]]
+    assert result["pages"][1]["truncated"] is True
+    assert result["tokens"] <= 1000
+
+
+def test_shard_splits_into_parts_within_budget():
+    pages = [make_page(i, 300) for i in range(10)]
+    shards = ContextPacker(1000, WordCounter()).shard(pages)
+
+    assert len(shards) == 4
+    assert all(sum(p["tokens"] for p in shard) <= 1000 for shard in shards)
+    assert [p["url"] for shard in shards for p in shard] == [p["url"] for p in pages]
+
+
+def test_shard_splits_oversized_page():
+    shards = ContextPacker(1000, WordCounter()).shard([make_page(0, 2500)])
+
+    assert len(shards) == 3
+    assert shards[0][0]["title"] == "Página 0 (parte 1/3)"
+    assert sum(p["tokens"] for shard in shards for p in shard) == 2500
+
+
+def test_shard_budget_counts_the_part_suffix_in_the_title():
+    counter = WordCounter()
+
+    def overhead(page):  # título entra no índice e no cabeçalho da seção
+        return 2 * counter.count_tokens(page["title"])
+
+    shards = ContextPacker(1000, counter, page_overhead=overhead).shard([make_page(0, 2500)])
+
+    assert all(sum(p["tokens"] + overhead(p) for p in shard) <= 1000 for shard in shards)
+    assert sum(p["tokens"] for shard in shards for p in shard) == 2500
+
+
+def test_split_by_tokens_keeps_multibyte_characters():
+    try:
+        from app.utils.token_counter import TokenCounter
+        counter = TokenCounter()
+    except Exception as e:
+        pytest.skip(f"encoding cl100k_base indisponível (rede ou TIKTOKEN_CACHE_DIR): {e}")
+
+    text = "## 配置说明\n\n" + "服务器配置🚀需要重启。" * 200
+    parts = counter.split_by_tokens(text, 7)
+
+    assert "".join(parts) == text
+    assert not any("\ufffd" in part for part in parts)
+    assert "\ufffd" not in counter.truncate_to_tokens(text, 7)
+
+
+class CountingCounter(WordCounter):
+    """WordCounter que conta as recodificações"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def count_tokens(self, text: str) -> int:
+        self.calls += 1
+        return super().count_tokens(text)
+
+    def truncate_to_tokens(self, text: str, max_tokens: int) -> str:
+        self.calls += 1
+        return super().truncate_to_tokens(text, max_tokens)
+
+    def split_by_tokens(self, text: str, max_tokens: int) -> list[str]:
+        self.calls += 1
+        return super().split_by_tokens(text, max_tokens)
+
+
+def test_only_cut_pages_are_reencoded():
+    # Linear no número de páginas: só a página truncada/dividida é recodificada
+    pages = [make_page(i, 50 + i % 400) for i in range(5000)]
+    counter = CountingCounter()
+
+    result = ContextPacker(128000, counter).pack(pages)
+    assert len(result["truncated"]) <= 1 and result["dropped"]
+    assert counter.calls <= 3  # marcador, corte e contagem final
+
+    counter.calls = 0
+    ContextPacker(128000, counter).shard(pages)
+    assert counter.calls == 0
+
+    ContextPacker(1000, counter).shard(pages[:10] + [make_page(10, 2500)])
+    assert counter.calls == 4  # um split + a contagem de cada pedaço
+
+
+def test_truncated_page_fits_with_the_marker():
+    marker_words = len(TRUNCATION_MARKER.split())
+    pages = [make_page(0, 100), make_page(1, 500)]
+    result = ContextPacker(100 + marker_words + 10, WordCounter(), min_truncated_tokens=5).pack(pages)
+
+    assert result["truncated"] == [pages[1]["url"]]
+    assert result["pages"][1]["tokens"] == marker_words + 10
+    assert result["tokens"] <= 100 + marker_words + 10
+
+    # Sem espaço para o marcador + o mínimo de texto, a página sai inteira
+    result = ContextPacker(100 + marker_words + 4, WordCounter(), min_truncated_tokens=5).pack(pages)
+    assert result["dropped"] == [pages[1]]
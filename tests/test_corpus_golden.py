@@ -0,0 +1,72 @@
+"""Golden do cleaner/TokenCounter sobre o corpus sintético
+
+Uma otimização do WebCleaner ou do TokenCounter precisa manter a saída
+byte-idêntica; mudança intencional: python benchmarks/bench_corpus.py --update-golden
+"""
+
+import array
+import logging
+
+import pytest
+
+from benchmarks.bench_corpus import GOLDEN_DIR, case_name, digest, load_manifest
+from benchmarks.corpus import SHAPES, SIZES, generate
+
+# Casos rápidos o bastante para a suíte; os maiores rodam no bench_corpus.py
+TEST_SIZES = ("1KB", "64KB", "1MB")
+
+MANIFEST = load_manifest()
+
+
+@pytest.fixture(scope="module")
+def cleaner():
+    from app.converters.web_engine.cleaner import WebCleaner
+    return WebCleaner()
+
+
+def test_gerador_e_deterministico():
+    assert generate("mixed", SIZES["1KB"]) == generate("mixed", SIZES["1KB"])
+    assert generate("mixed", SIZES["1KB"], seed=1) != generate("mixed", SIZES["1KB"])
+    with pytest.raises(ValueError):
+        generate("html", 10)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("size", TEST_SIZES)
+def test_cleaner_igual_ao_golden(cleaner, shape, size, caplog):
+    name = case_name(shape, size)
+    entry = MANIFEST["cleaner"][name]
+    text = generate(shape, SIZES[size])
+    assert digest(text.encode("utf-8")) == entry["input"], "gerador do corpus mudou: regravar o golden"
+
+    caplog.set_level(logging.WARNING)
+    output = cleaner.limpar_markdown_google(text).encode("utf-8")
+
+    golden_file = GOLDEN_DIR / f"{name}.clean.md"
+    if golden_file.exists():
+        assert output.decode("utf-8") == golden_file.read_text(encoding="utf-8")
+    assert digest(output) == entry["output"]
+
+
+@pytest.fixture(scope="module")
+def token_counter():
+    # Sem rede, o encoding vem do cache do tiktoken (TIKTOKEN_CACHE_DIR com o
+    # arquivo do cl100k_base); sem ele não há como conferir o golden
+    try:
+        from app.utils.token_counter import TokenCounter
+        return TokenCounter()
+    except Exception as e:
+        pytest.skip(f"encoding cl100k_base indisponível (rede ou TIKTOKEN_CACHE_DIR): {e}")
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+@pytest.mark.parametrize("size", TEST_SIZES)
+def test_tokens_iguais_ao_golden(token_counter, shape, size):
+    name = case_name(shape, size)
+    entry = MANIFEST["tokens"][name]
+    text = generate(shape, SIZES[size])
+    assert digest(text.encode("utf-8")) == entry["input"], "gerador do corpus mudou: regravar o golden"
+
+    ids = token_counter.encode(text)
+    assert len(ids) == entry["tokens"]
+    assert digest(array.array("I", ids).tobytes()) == entry["output"]
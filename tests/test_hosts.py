@@ -0,0 +1,205 @@
+"""Testes do circuit breaker e da politeness por host"""
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+from app.converters.web_engine import hosts, retry
+
+crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+
+URL = "https://docs.exemplo.com/guia"
+TIMEOUT = retry.make_failure(retry.TIMEOUT, "Timeout 30000ms exceeded")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _controller(clock=None, **kwargs) -> hosts.HostController:
+    kwargs.setdefault("respect_robots", False)
+    return hosts.HostController(clock=clock or FakeClock(), **kwargs)
+
+
+async def _request(controller, url=URL, failure=None):
+    async with controller.slot(url):
+        controller.record(url, failure)
+
+
+def test_circuito_abre_apos_falhas_seguidas_e_sonda_fecha():
+    clock = FakeClock()
+    controller = _controller(clock, failure_threshold=3, reset_timeout=10.0)
+
+    async def run():
+        for _ in range(3):
+            await _request(controller, failure=TIMEOUT)
+        assert controller.circuit_state(URL) == hosts.OPEN
+
+        with pytest.raises(hosts.HostUnavailable) as info:
+            await _request(controller)
+        assert info.value.retry_after == 10.0
+
+        # Outro host não é afetado
+        await _request(controller, url="https://outro.exemplo.com/a")
+
+        clock.now += 10.0
+        await _request(controller)  # sonda com sucesso
+        assert controller.circuit_state(URL) == hosts.CLOSED
+
+    asyncio.run(run())
+
+
+def test_sonda_com_falha_reabre_com_tempo_dobrado():
+    clock = FakeClock()
+    controller = _controller(clock, failure_threshold=1, reset_timeout=10.0)
+
+    async def run():
+        await _request(controller, failure=TIMEOUT)
+        clock.now += 10.0
+        await _request(controller, failure=TIMEOUT)
+        assert controller.circuit_state(URL) == hosts.OPEN
+        with pytest.raises(hosts.HostUnavailable) as info:
+            await _request(controller)
+        assert info.value.retry_after == 20.0
+
+    asyncio.run(run())
+
+
+def test_falhas_da_pagina_nao_abrem_o_circuito():
+    controller = _controller(failure_threshold=2)
+
+    async def run():
+        for _ in range(5):
+            await _request(controller, failure=retry.make_failure(retry.HTTP_4XX, status_code=404))
+        assert controller.circuit_state(URL) == hosts.CLOSED
+
+    asyncio.run(run())
+
+
+def test_limita_requisicoes_simultaneas_por_host():
+    controller = _controller(max_in_flight=2)
+    active, peak = [0], [0]
+
+    async def request(url):
+        async with controller.slot(url):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+
+    async def run():
+        await asyncio.gather(*(request(f"{URL}/{i}") for i in range(6)))
+        assert peak[0] == 2
+        # Hosts diferentes não dividem a vaga
+        peak[0] = 0
+        await asyncio.gather(*(request(f"https://h{i}.exemplo.com/") for i in range(4)))
+        assert peak[0] == 4
+
+    asyncio.run(run())
+
+
+def test_intervalo_minimo_espaca_requisicoes():
+    controller = _controller(min_delay=0.05)
+    starts = []
+
+    async def request(url):
+        async with controller.slot(url):
+            starts.append(asyncio.get_running_loop().time())
+
+    async def run():
+        await asyncio.gather(*(request(f"{URL}/{i}") for i in range(3)))
+
+    asyncio.run(run())
+    assert all(b - a >= 0.04 for a, b in zip(starts, starts[1:]))
+
+
+def test_crawl_delay_do_robots_txt():
+    fetched = []
+
+    async def robots(robots_url):
+        fetched.append(robots_url)
+        return "User-agent: *\nCrawl-delay: 1\n"
+
+    controller = hosts.HostController(robots_fetcher=robots)
+    starts = []
+
+    async def request(url):
+        async with controller.slot(url):
+            starts.append(asyncio.get_running_loop().time())
+
+    async def run():
+        await asyncio.gather(*(request(f"{URL}/{i}") for i in range(2)))
+
+    asyncio.run(run())
+    assert fetched == ["https://docs.exemplo.com/robots.txt"]  # uma vez por host
+    assert starts[1] - starts[0] >= 0.9
+
+
+class DeadHostCrawler:
+    """Todo render no host termina em timeout"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def arun(self, url, config=None, **kwargs):
+        self.calls.append(url)
+        return SimpleNamespace(success=False, status_code=None, html="", markdown="",
+                               error_message="Page.goto: Timeout 30000ms exceeded", response_headers={})
+
+
+def test_crawl_de_host_fora_do_ar_falha_rapido(monkeypatch):
+    class WordCounter:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def count_tokens(self, text: str) -> int:
+            return len(text.split())
+
+    monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    service = crawler_module.WebCrawlerService(static_fast_path=False)
+    service.retry_policy = retry.RetryPolicy({kind: (retries, 0.0, cap)
+                                              for kind, (retries, _, cap) in retry.RETRY_POLICIES.items()})
+    # Relógio parado: o circuito não chega a meio-abrir durante o teste
+    service.hosts = _controller(failure_threshold=2, reset_timeout=0.05)
+    crawler = DeadHostCrawler()
+
+    async def detect(url):
+        return "CSR"
+
+    @contextlib.asynccontextmanager
+    async def browser_session(key, browser_cfg):
+        yield crawler
+
+    monkeypatch.setattr(service.analyzer, "detect_render_type", detect)
+    monkeypatch.setattr(service, "browser_session", browser_session)
+
+    urls = [f"https://docs.exemplo.com/p{i}" for i in range(10)]
+    success, contents = asyncio.run(service.crawl_selected_pages([{"url": u, "title": ""} for u in urls]))
+
+    assert success and contents == []
+    assert len(service.last_failures) == len(urls)
+    # Sem o circuito seriam 20 renders (1 retentativa de timeout por página)
+    assert len(crawler.calls) == 2  # só até abrir o circuito
+    assert retry.summarize(service.last_failures) == {retry.CIRCUIT_OPEN: len(urls)}
+
+
+def test_host_dividido_entre_shards_mantem_a_politeness_somada():
+    controller = _controller(max_in_flight=4, min_delay=0.02, shared_by=2)
+    assert controller.max_in_flight == 2
+    starts = []
+
+    async def request(url):
+        async with controller.slot(url):
+            starts.append(asyncio.get_running_loop().time())
+
+    async def run():
+        await asyncio.gather(*(request(f"{URL}/{i}") for i in range(3)))
+
+    asyncio.run(run())
+    assert all(b - a >= 0.035 for a, b in zip(starts, starts[1:]))  # 2 × min_delay
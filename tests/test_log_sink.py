@@ -0,0 +1,70 @@
+"""Testes do sink de log bufferizado da GUI"""
+
+import os
+import logging
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from app.gui.log_sink import LogSink, LogSinkHandler
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def test_flush_em_lotes_com_limite_de_linhas(qapp):
+    widget = QtWidgets.QPlainTextEdit()
+    sink = LogSink(widget, max_batch=100, max_blocks=50)
+
+    threads = [threading.Thread(target=lambda: [sink.write(f"linha {i}") for i in range(100)])
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert widget.blockCount() == 1  # nada vai para o widget antes do flush
+    sink.flush()
+    assert len(sink._pending) == 300  # um lote por flush
+    while sink._pending:
+        sink.flush()
+
+    assert widget.blockCount() == 50
+    assert widget.toPlainText().splitlines()[-1].endswith("linha 99")
+
+
+def test_fila_cheia_descarta_antigas(qapp):
+    widget = QtWidgets.QPlainTextEdit()
+    sink = LogSink(widget, max_pending=10)
+
+    for i in range(25):
+        sink.write(f"linha {i}")
+    sink.write("<falha>", error=True)
+    sink.flush()
+
+    lines = widget.toPlainText().splitlines()
+    assert "16 linhas de log descartadas" in lines[0]
+    assert lines[1].endswith("linha 16")
+    assert lines[-1].endswith("💥 <falha>")
+
+
+def test_handler_encaminha_warnings(qapp):
+    widget = QtWidgets.QPlainTextEdit()
+    sink = LogSink(widget)
+    log = logging.getLogger("test_log_sink")
+    handler = LogSinkHandler(sink)
+    log.addHandler(handler)
+    try:
+        log.info("ignorado")
+        log.warning("atenção")
+    finally:
+        log.removeHandler(handler)
+
+    sink.flush()
+    assert widget.toPlainText().endswith("test_log_sink: atenção")
@@ -0,0 +1,46 @@
+"""Testes do pipeline de logging (fila + rotação + flush no crash)"""
+
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+from app.converters.web_engine.logger import LOG_DIR_ENV, parse_logger_levels
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_parse_logger_levels_ignora_entradas_invalidas():
+    spec = "crawl4ai=debug, asyncio=WARNING,quebrado,nivel=ALTO,=INFO"
+    assert parse_logger_levels(spec) == {"crawl4ai": "DEBUG", "asyncio": "WARNING"}
+    assert parse_logger_levels("") == {}
+
+
+def _run_and_read_log(code: str, marker: str, log_dir: Path) -> str:
+    # Pasta de logs própria: sem sujar <raiz>/logs nem disputar a rotação
+    env = {**os.environ, LOG_DIR_ENV: str(log_dir)}
+    subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, env=env)
+    log_file = log_dir / "debug_trace.log"
+    return next((line for line in log_file.read_text(encoding="utf-8").splitlines() if marker in line), "")
+
+
+def test_crash_grava_a_fila_antes_de_morrer(tmp_path):
+    marker = f"crash-{uuid.uuid4().hex}"
+    code = (
+        "from app.converters.web_engine.logger import logger\n"
+        f"logger.debug('antes do crash %s', {marker!r})\n"
+        f"raise RuntimeError({marker!r})\n"
+    )
+    assert "antes do crash" in _run_and_read_log(code, marker, tmp_path)
+
+
+def test_nivel_por_logger_via_ambiente(monkeypatch, tmp_path):
+    marker = f"nivel-{uuid.uuid4().hex}"
+    monkeypatch.setenv("LCB_LOG_LEVELS", "web_converter=WARNING")
+    code = (
+        "from app.converters.web_engine.logger import logger\n"
+        f"logger.info('descartado %s', {marker!r})\n"
+        f"logger.warning('gravado %s', {marker!r})\n"
+    )
+    assert "gravado" in _run_and_read_log(code, marker, tmp_path)
@@ -0,0 +1,92 @@
+"""Testes do modelo virtualizado de seleção de páginas"""
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+from PyQt6.QtCore import Qt
+
+from app.gui.models import PageTableModel
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def make_pages(n: int) -> list[dict]:
+    return [{"url": f"https://docs.exemplo.com/{'api' if i % 2 else 'guia'}/p{i}",
+             "title": f"Página {i}", "selected": True,
+             "tokens": i if i % 3 else None}
+            for i in range(n)]
+
+
+def test_filtro_por_prefixo_e_regex(qapp):
+    model = PageTableModel(make_pages(10))
+
+    model.set_filter("/api")
+    assert model.rowCount() == 5
+
+    model.set_filter(r"p[12]$", use_regex=True)
+    assert model.rowCount() == 2
+
+    model.set_filter("")
+    assert model.rowCount() == 10
+
+
+def test_selecao_em_massa_so_nas_visiveis(qapp):
+    pages = make_pages(10)
+    model = PageTableModel(pages)
+
+    model.set_filter("/guia")
+    model.set_visible_checked(False)
+
+    selected = model.selected_pages()
+    assert len(selected) == 5
+    assert all("/api/" in p["url"] for p in selected)
+    assert selected[0] is pages[1]  # mesmos dicts, ordem original
+    assert model.checked_tokens() == sum(p["tokens"] or 0 for p in selected)
+
+
+def test_check_individual_e_ordenacao(qapp):
+    model = PageTableModel(make_pages(6))
+
+    model.sort(PageTableModel.COL_TOKENS, Qt.SortOrder.DescendingOrder)
+    top = model.index(0, PageTableModel.COL_URL)
+    assert model.data(top).endswith("/p5")
+
+    model.setData(top, Qt.CheckState.Unchecked.value, Qt.ItemDataRole.CheckStateRole)
+    assert model.checked_count() == 5
+    assert model.data(top, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+
+
+def test_filtro_mantem_a_ordenacao_do_cabecalho(qapp):
+    model = PageTableModel(make_pages(10))
+    model.sort(PageTableModel.COL_TOKENS, Qt.SortOrder.DescendingOrder)
+
+    def urls():
+        return [model.data(model.index(row, PageTableModel.COL_URL)).rsplit("/", 1)[-1]
+                for row in range(model.rowCount())]
+
+    model.set_filter("/api")
+    assert urls() == ["p7", "p5", "p1", "p3", "p9"]  # p3/p9 sem tokens (-1) no fim
+
+    model.set_filter("")
+    assert urls()[:3] == ["p8", "p7", "p5"]
+
+    model.sort(-1)
+    model.set_filter("/guia")
+    assert urls() == ["p0", "p2", "p4", "p6", "p8"]
+
+
+def test_cem_mil_linhas(qapp):
+    model = PageTableModel(make_pages(100_000))
+
+    model.set_filter("/api")
+    model.set_visible_checked(False)
+
+    assert model.rowCount() == 50_000
+    assert model.checked_count() == 50_000
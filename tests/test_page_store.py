@@ -0,0 +1,125 @@
+"""Testes do page store (corpos por hash) e da expansão de manifestos"""
+
+import os
+import json
+import time
+
+import pytest
+
+from app.converters.web_engine.page_store import PageStore, load_manifest, manifest_path_for
+from app.converters.web_engine.postprocess import content_hash
+from app.converters.web_engine.sharding import OrderedMerger
+from app.converters.web_engine.writer import ConsolidatedWriter
+
+
+def make_page(n: int, text: str = None) -> dict:
+    markdown = text or f"## Página {n}\n\nConteúdo da página {n}."
+    return {"url": f"https://docs.exemplo.com/v{n}", "title": f"Página {n}",
+            "markdown": markdown, "tokens": len(markdown.split()), "hash": content_hash(markdown)}
+
+
+def test_corpo_repetido_e_gravado_uma_vez(tmp_path):
+    store = PageStore(tmp_path / "store")
+    shared = "## Instalação\n\nMesmo conteúdo na doc atual e no espelho versionado."
+    contents = [make_page(1, shared), make_page(2, shared), make_page(3)]
+
+    manifest = store.build_manifest(contents)
+    assert [e["hash"] for e in manifest["pages"]] == [p["hash"] for p in contents]
+    assert len(list(store.objects.glob("*/*.md"))) == 2
+
+    # Outro job com o mesmo conteúdo não grava nada novo
+    _, new = store.put(shared)
+    assert not new
+    assert store.expand(manifest)[1]["markdown"] == shared
+
+
+def test_manifesto_reconstroi_o_mesmo_documento(tmp_path):
+    store = PageStore(tmp_path / "store")
+    writer = ConsolidatedWriter(store=store)
+    output = tmp_path / "docs.md"
+    contents = [make_page(i) for i in range(4)]
+
+    success, message = writer.write(contents, str(output))
+    assert success and "Manifesto" in message
+
+    manifest_p = manifest_path_for(output)
+    manifest = load_manifest(manifest_p)
+    assert manifest["output"] == "docs.md"
+    assert "markdown" not in json.dumps(manifest["pages"])  # só referências
+
+    rebuilt = tmp_path / "rebuilt.md"
+    success, _ = ConsolidatedWriter(store=store).write_manifest(str(manifest_p), str(rebuilt))
+    assert success
+
+    def body(path):  # sem a linha "Gerado em" (pode virar o minuto entre as gravações)
+        return [line for line in path.read_text(encoding="utf-8").splitlines()
+                if not line.startswith("Gerado em")]
+
+    assert body(rebuilt) == body(output)
+
+
+def test_manifesto_com_corpo_ausente_falha_sem_gravar(tmp_path):
+    store = PageStore(tmp_path / "store")
+    output = tmp_path / "docs.md"
+    ConsolidatedWriter(store=store).write([make_page(1)], str(output))
+    output.unlink()
+    for body in store.objects.glob("*/*.md"):
+        body.unlink()
+
+    success, message = ConsolidatedWriter(store=store).write_manifest(str(manifest_path_for(output)))
+    assert not success and "ausentes" in message
+    assert not output.exists()
+
+
+def test_erro_no_streaming_preserva_o_documento_anterior(tmp_path):
+    store = PageStore(tmp_path / "store")
+    output = tmp_path / "docs.md"
+    contents = [make_page(1), make_page(2)]
+    ConsolidatedWriter(store=store).write(contents, str(output))
+    before = output.read_bytes()
+    store.path(contents[1]["hash"]).write_bytes(b"\xff corpo corrompido")
+
+    success, _ = ConsolidatedWriter(store=store).write_manifest(str(manifest_path_for(output)))
+    assert not success
+    assert output.read_bytes() == before
+    assert not (tmp_path / "docs.md.part").exists()
+
+
+def test_prune_apaga_so_corpos_sem_referencia(tmp_path):
+    store = PageStore(tmp_path / "store")
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    ConsolidatedWriter(store=store).write([make_page(1), make_page(2)], str(jobs / "docs.md"))
+    orphan, _ = store.put("## Órfã\n\nPágina que saiu do documento.")
+    recent, _ = store.put("## Recente\n\nCorpo de um crawl em andamento.")
+    old = time.time() - 2 * 3600
+    for body in store.objects.glob("*/*.md"):
+        if body.stem != recent:
+            os.utime(body, (old, old))
+
+    stats = store.prune([jobs], dry_run=True)
+    assert stats["removed"] == 1 and stats["kept_recent"] == 1 and store.has(orphan)
+
+    stats = store.prune([jobs])
+    assert stats["manifests"] == 1 and stats["referenced"] == 2 and stats["removed"] == 1
+    assert not store.has(orphan) and store.has(recent)
+    assert not store.missing(load_manifest(manifest_path_for(jobs / "docs.md")))
+
+
+def test_prune_sem_manifesto_nao_apaga_nada(tmp_path):
+    store = PageStore(tmp_path / "store")
+    digest, _ = store.put("## Qualquer\n\nCorpo.")
+    with pytest.raises(ValueError):
+        store.prune([tmp_path / "vazio"], min_age=0)
+    assert store.has(digest)
+
+
+def test_merge_deduplica_pelo_hash_estavel():
+    merger = OrderedMerger(3)
+    page = make_page(1)
+    merger.add(0, page)
+    merger.add(1, {**page, "url": "https://espelho.exemplo.com/v1"})
+    merger.add(2, {**make_page(2), "hash": None})  # sem hash: calculado do conteúdo
+
+    assert [p["url"] for p in merger.contents] == [page["url"], make_page(2)["url"]]
+    assert merger.duplicates == 1
@@ -0,0 +1,74 @@
+"""Testes da contagem de tokens por página no crawl e do stream on_page"""
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+
+REAL_TOKEN_COUNTER = crawler_module.TokenCounter
+
+
+class WordCounter:
+    """Contador simples (1 token por palavra), sem tiktoken"""
+
+    def __init__(self, *args, **kwargs):
+        self.model = "palavras"
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class FakeCrawler:
+    async def arun(self, url, config=None, **kwargs):
+        markdown = f"# Página {url}\n\nConteúdo da página {url}: instalação, configuração e 配置说明."
+        return SimpleNamespace(success=True, status_code=200, error_message="", response_headers={},
+                               html=f"<html><title>{url}</title></html>", markdown=markdown)
+
+
+@pytest.fixture(params=["palavras", "tiktoken"])
+def service(request, monkeypatch):
+    if request.param == "palavras":
+        monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    else:
+        try:
+            REAL_TOKEN_COUNTER()
+        except Exception as e:
+            pytest.skip(f"encoding cl100k_base indisponível (rede ou TIKTOKEN_CACHE_DIR): {e}")
+    service = crawler_module.WebCrawlerService(static_fast_path=False)
+    crawler = FakeCrawler()
+
+    async def detect(url):
+        return "CSR_REACT"
+
+    @contextlib.asynccontextmanager
+    async def browser_session(key, browser_cfg):
+        yield crawler
+
+    monkeypatch.setattr(service.analyzer, "detect_render_type", detect)
+    monkeypatch.setattr(service, "browser_session", browser_session)
+    return service
+
+
+def test_cada_pagina_traz_seus_tokens_e_sai_no_stream(service):
+    urls = [f"https://docs.exemplo.com/p{i}" for i in range(7)]
+    streamed = []
+    success, contents = asyncio.run(service.crawl_selected_pages(
+        [{"url": url, "title": ""} for url in urls], on_page=streamed.append
+    ))
+
+    assert success and [p["url"] for p in contents] == urls
+    for page in contents:
+        assert page["tokens"] == service.token_counter.count_tokens(page["markdown"]) > 0
+    assert sorted(p["url"] for p in streamed) == urls  # uma vez por página
+    assert {id(p) for p in streamed} == {id(p) for p in contents}
+
+
+def test_crawl_page_async_devolve_os_tokens(service):
+    url = "https://docs.exemplo.com/unica"
+    page_url, title, markdown, tokens = asyncio.run(service.crawl_page_async(FakeCrawler(), None, url))
+
+    assert page_url == url and title
+    assert tokens == service.token_counter.count_tokens(markdown)
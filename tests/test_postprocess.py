@@ -0,0 +1,80 @@
+"""Testes do pós-processamento em executor (limpeza/título/hash/tokens)"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.converters.web_engine.postprocess import (
+    PostProcessor, content_hash, process_markdown, title_from_markdown
+)
+
+
+class WordCounter:
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class SlowCleaner:
+    """Cleaner que ocupa a thread e registra a concorrência máxima"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+
+    def limpar_markdown_google(self, texto: str) -> str:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return texto.strip()
+
+
+def test_process_markdown_gera_titulo_hash_e_tokens():
+    page = process_markdown("\n## Instalação\n\npip install pacote\n", SlowCleaner(0), WordCounter())
+
+    assert page["title"] == "Instalação"
+    assert page["tokens"] == 5
+    assert page["hash"] == content_hash(page["markdown"])
+    assert title_from_markdown("texto sem heading") == "Sem Título"
+
+
+def test_executor_roda_fora_do_loop_e_respeita_a_fila():
+    cleaner = SlowCleaner()
+    processor = PostProcessor(cleaner, WordCounter(), workers=4, max_pending=2)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        pages = await asyncio.gather(*(processor.process(f"# Página {i}") for i in range(8)))
+        task.cancel()
+        return pages, ticks
+
+    try:
+        pages, ticks = asyncio.run(run())
+    finally:
+        processor.shutdown()
+
+    assert [p["title"] for p in pages] == [f"Página {i}" for i in range(8)]
+    assert cleaner.peak == 2  # fila limitada em max_pending
+    assert threading.get_ident() not in cleaner.threads
+    assert ticks >= 10  # loop seguiu atendendo outras tarefas
+
+
+def test_executor_invalido():
+    with pytest.raises(ValueError):
+        PostProcessor(SlowCleaner(), WordCounter(), kind="gpu")
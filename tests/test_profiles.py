@@ -0,0 +1,91 @@
+"""Testes do perfil de render enxuto (bloqueio de recursos e espera por DOM estável)"""
+
+import asyncio
+import shutil
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+profiles = pytest.importorskip("app.converters.web_engine.profiles")
+from app.converters.web_engine.analyzer import WebAnalyzer
+
+
+def test_bloqueia_recursos_pesados_e_trackers():
+    assert profiles.should_block("image", "https://docs.exemplo.com/logo.png")
+    assert profiles.should_block("font", "https://fonts.gstatic.com/x.woff2")
+    assert profiles.should_block("script", "https://www.googletagmanager.com/gtm.js")
+    assert profiles.should_block("xhr", "https://api-js.mixpanel.com/track")
+    assert not profiles.should_block("script", "https://docs.exemplo.com/app.js")
+    assert not profiles.should_block("document", "https://notgoogle-analytics.com/")
+
+
+def test_hook_so_intercepta_no_perfil_texto():
+    class FakePage:
+        def __init__(self):
+            self.routes = []
+
+        async def route(self, pattern, handler):
+            self.routes.append(pattern)
+
+    text_cfg = SimpleNamespace(shared_data={"render_profile": "text"})
+    full_cfg = SimpleNamespace(shared_data=None)
+
+    page = FakePage()
+    asyncio.run(profiles.block_resources_hook(page, config=full_cfg))
+    assert page.routes == []
+
+    asyncio.run(profiles.block_resources_hook(page, config=text_cfg))
+    asyncio.run(profiles.block_resources_hook(page, config=text_cfg))
+    assert page.routes == ["**/*"]
+
+
+def test_perfil_por_render_type():
+    analyzer = WebAnalyzer(profiles={"CSR_ANGULAR": "full"})
+
+    react = analyzer.get_crawler_config("CSR_REACT")
+    assert react.wait_until == "domcontentloaded"
+    assert react.wait_for.startswith("js:")
+    assert react.shared_data == {"render_profile": "text"}
+
+    angular = analyzer.get_crawler_config("CSR_ANGULAR")
+    assert angular.wait_until == "networkidle"
+    assert "setTimeout" in angular.js_code
+
+    assert analyzer.get_crawler_config("CSR_ANGULAR", profile="text").shared_data["render_profile"] == "text"
+
+    with pytest.raises(ValueError):
+        WebAnalyzer(profiles={"SSR": "turbo"})
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node indisponível")
+def test_espera_dom_estavel_libera_apos_janela_sem_mudancas():
+    condition = profiles.dom_stable_wait(quiet_ms=200)[3:]
+    script = f"""
+    let now = 0, ticks = 0;
+    Date.now = () => now;
+    const body = {{ textContent: "", getElementsByTagName: () => ({{ length: 10 }}) }};
+    global.document = {{ body, querySelector: () => (ticks >= 3 ? {{}} : null) }};
+    const ready = {condition};
+    let releasedAt = null;
+    for (; ticks < 30 && releasedAt === null; ticks++, now += 100) {{
+        if (ticks < 6) body.textContent += "x";   // DOM mudando até t=500ms
+        if (ready()) releasedAt = now;
+    }}
+    console.log(releasedAt);
+    """
+    out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "700"
+
+
+def test_render_do_scan_tem_tempo_limitado():
+    crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+    # Sem __init__: _title_config não usa estado (nem o TokenCounter, que precisa de rede)
+    service = crawler_module.WebCrawlerService.__new__(crawler_module.WebCrawlerService)
+    for render_type in ("CSR_ANGULAR", "CSR_REACT"):
+        crawl_config = WebAnalyzer().get_crawler_config(render_type)
+        scan_config = service._title_config(crawl_config)
+        assert scan_config.page_timeout <= crawler_module.SCAN_PAGE_TIMEOUT
+        assert scan_config.wait_for_timeout <= crawler_module.SCAN_WAIT_TIMEOUT
+        assert scan_config.wait_for == crawl_config.wait_for  # mesma espera, só mais curta
+        assert crawl_config.page_timeout > crawler_module.SCAN_PAGE_TIMEOUT  # crawl intacto
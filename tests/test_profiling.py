@@ -0,0 +1,79 @@
+"""Testes do modo de profiling por job (cProfile + tracemalloc + tasks)"""
+
+import asyncio
+import pstats
+import tracemalloc
+
+from app.utils import profiling
+
+
+def _trabalho():
+    return [str(i) * 10 for i in range(20000)]
+
+
+def test_desligado_nao_gera_arquivos(tmp_path, monkeypatch):
+    monkeypatch.delenv("LCB_PROFILE", raising=False)
+    with profiling.profile_job("pdf", output_dir=tmp_path) as profiler:
+        _trabalho()
+    assert profiler is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_variavel_de_ambiente_liga_e_parametro_vence(monkeypatch):
+    monkeypatch.setenv("LCB_PROFILE", "1")
+    assert profiling.profiling_enabled()
+    assert not profiling.profiling_enabled(False)
+    monkeypatch.setenv("LCB_PROFILE", "0")
+    assert profiling.profiling_enabled(True)
+
+
+def test_job_sincrono_gera_prof_e_snapshot(tmp_path):
+    with profiling.profile_job("pdf", enabled=True, output_dir=tmp_path, top_n=5) as profiler:
+        data = _trabalho()
+    assert data
+
+    paths = profiler.paths
+    stats = pstats.Stats(str(paths["prof"]))
+    assert any(func[2] == "_trabalho" for func in stats.stats)
+    assert tracemalloc.Snapshot.load(str(paths["tracemalloc"])).traces
+    summary = paths["summary"].read_text(encoding="utf-8")
+    assert "Top 5 alocações" in summary and "_trabalho" in summary
+    assert not tracemalloc.is_tracing()  # desliga o que ligou
+
+
+def test_job_async_amostra_tasks(tmp_path):
+    async def job():
+        with profiling.profile_job("crawl", enabled=True, output_dir=tmp_path, interval=0.02) as profiler:
+            await asyncio.gather(*(asyncio.sleep(0.15) for _ in range(5)))
+        return profiler
+
+    profiler = asyncio.run(job())
+    rows = profiler.paths["tasks"].read_text(encoding="utf-8").splitlines()
+    assert rows[0] == "elapsed_s,tasks,traced_kb"
+    task_counts = [int(row.split(",")[1]) for row in rows[1:]]
+    assert max(task_counts) >= 6  # job + 5 sleeps
+
+
+def test_um_job_perfilado_por_vez(tmp_path, caplog):
+    with profiling.profile_job("crawl", enabled=True, output_dir=tmp_path) as first:
+        with profiling.profile_job("pdf", enabled=True, output_dir=tmp_path) as second:
+            _trabalho()
+        assert second is None
+        assert tracemalloc.is_tracing()  # o segundo não desliga o do primeiro
+    assert first.paths and "já está sendo perfilado" in caplog.text
+
+    with profiling.profile_job("pdf", enabled=True, output_dir=tmp_path) as later:
+        pass
+    assert later is not None  # guarda liberada ao fim do primeiro
+
+
+def test_falha_ao_iniciar_nao_derruba_o_job(tmp_path, monkeypatch, caplog):
+    def fail(self):
+        raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling.JobProfiler, "start", fail)
+    with profiling.profile_job("pdf", enabled=True, output_dir=tmp_path) as profiler:
+        data = _trabalho()
+    assert data and profiler is None
+    assert "Falha ao iniciar o perfil" in caplog.text
+    assert profiling._active_profiler is None
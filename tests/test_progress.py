@@ -0,0 +1,54 @@
+"""Testes dos eventos de progresso do crawl"""
+
+import pytest
+
+from app.converters.web_engine.progress import CrawlProgress, format_progress
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_contadores_throughput_e_eta():
+    clock = FakeClock()
+    progress = CrawlProgress(total=10, window=4, clock=clock)
+
+    statuses = ["ok", "cache", "failed", "duplicate", "ok", "ok"]
+    for i, status in enumerate(statuses):
+        clock.now += 0.5
+        event = progress.record(f"https://x/{i}", status, nbytes=1000)
+
+    assert event["done"] == 6
+    assert event["bytes"] == 6000
+    assert (event["cache_hits"], event["failures"], event["duplicates"]) == (1, 1, 1)
+    assert event["pages_per_sec"] == pytest.approx(2.0)
+    assert event["eta_seconds"] == pytest.approx(2.0)
+    assert event["url"] == "https://x/5"
+    assert "6/10 · 2.0 pág/s · ETA 00:02" in format_progress(event)
+
+
+def test_media_movel_reage_a_mudanca_de_ritmo():
+    clock = FakeClock()
+    progress = CrawlProgress(total=100, window=3, clock=clock)
+
+    for _ in range(5):
+        clock.now += 0.1
+        progress.record("https://x", "cache")
+    for _ in range(3):
+        clock.now += 2.0
+        event = progress.record("https://x", "ok")
+
+    assert event["pages_per_sec"] == pytest.approx(0.5)
+
+
+def test_sem_throughput_e_status_invalido():
+    progress = CrawlProgress(total=3, clock=FakeClock())
+    assert progress.snapshot()["eta_seconds"] is None
+    assert "ETA --:--" in format_progress(progress.snapshot())
+
+    with pytest.raises(ValueError):
+        progress.record("https://x", "talvez")
@@ -0,0 +1,145 @@
+"""Testes da classificação de falhas, do backoff e da fila de retentativas"""
+
+import asyncio
+import contextlib
+import random
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.converters.web_engine import retry
+
+crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+
+
+def _result(success=True, status_code=200, error_message="", headers=None, markdown="# Ok\n\nTexto."):
+    return SimpleNamespace(success=success, status_code=status_code, error_message=error_message,
+                           response_headers=headers or {}, html="<html></html>", markdown=markdown)
+
+
+@pytest.mark.parametrize("result, kind", [
+    (_result(success=False, status_code=None, error_message="Page.goto: Timeout 30000ms exceeded"), retry.TIMEOUT),
+    (_result(success=False, status_code=None, error_message="net::ERR_NAME_NOT_RESOLVED at https://x"), retry.DNS),
+    (_result(success=False, status_code=None, error_message="net::ERR_CONNECTION_REFUSED"), retry.CONNECTION),
+    (_result(success=False, status_code=None,
+             error_message="Wait condition failed: Timeout after 10000ms waiting for selector 'main'"),
+     retry.SELECTOR_NOT_FOUND),
+    (_result(status_code=404), retry.HTTP_4XX),
+    (_result(success=False, status_code=503), retry.HTTP_5XX),
+    (_result(status_code=429), retry.RATE_LIMITED),
+    (_result(status_code=408), retry.TIMEOUT),
+])
+def test_classifica_falhas(result, kind):
+    assert retry.classify_result(result)["kind"] == kind
+
+
+def test_sucesso_e_soft_404():
+    assert retry.classify_result(_result()) is None
+    assert retry.classify_soft_404("# 404 - Page not found")["kind"] == retry.HTTP_4XX
+    assert retry.classify_soft_404("# Guia") is None
+    assert retry.classify_exception(asyncio.TimeoutError())["kind"] == retry.TIMEOUT
+
+
+def test_retry_after_em_segundos_e_data_http():
+    assert retry.retry_after_seconds({"Retry-After": "7"}) == 7.0
+    now = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert retry.retry_after_seconds({"retry-after": "Thu, 01 Jan 2026 12:00:30 GMT"}, now=now) == 30.0
+    assert retry.retry_after_seconds({"Retry-After": "amanhã"}) is None
+
+    failure = retry.classify_result(_result(status_code=429, headers={"Retry-After": "12"}))
+    assert failure["retry_after"] == 12.0
+
+
+def test_backoff_exponencial_com_jitter_e_teto():
+    policy = retry.RetryPolicy(rng=random.Random(0))
+    for attempt in range(1, 8):
+        full = min(30.0, 1.0 * 2 ** (attempt - 1))
+        assert full / 2 <= policy.backoff(retry.HTTP_5XX, attempt) <= full
+
+
+def test_decide_respeita_retentativas_e_retry_after():
+    policy = retry.RetryPolicy(rng=random.Random(0))
+    assert policy.decide(retry.make_failure(retry.HTTP_4XX), 1) is None
+    assert policy.decide(retry.make_failure(retry.TIMEOUT), 1) is not None
+    assert policy.decide(retry.make_failure(retry.TIMEOUT), 2) is None
+
+    assert policy.decide(retry.make_failure(retry.RATE_LIMITED, retry_after=60.0), 1) >= 60.0
+    # Retry-After acima do teto da classe: falha definitiva em vez de segurar o job
+    assert policy.decide(retry.make_failure(retry.RATE_LIMITED, retry_after=3600.0), 1) is None
+
+
+def test_fila_libera_na_ordem_do_horario():
+    now = [0.0]
+    queue = retry.RetryQueue(clock=lambda: now[0])
+    queue.push("b", 2, 5.0)
+    queue.push("a", 2, 1.0)
+    queue.push("c", 3, 1.0)
+
+    assert queue.pop_due(10) == []
+    assert queue.next_delay() == 1.0
+    now[0] = 2.0
+    assert queue.pop_due(10) == [("a", 2), ("c", 3)]
+    assert len(queue) == 1 and queue.next_delay() == 3.0
+
+
+class WordCounter:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class FlakyCrawler:
+    """Primeiro render de /instavel responde 503; /sumida sempre 404"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def arun(self, url, config=None, **kwargs):
+        self.calls.append(url)
+        if url.endswith("/sumida"):
+            return _result(status_code=404, markdown="")
+        if url.endswith("/instavel") and self.calls.count(url) == 1:
+            return _result(success=False, status_code=503, markdown="")
+        return _result(markdown=f"# {url}\n\nConteúdo da página {url} com texto suficiente.")
+
+
+def test_crawl_retenta_transitorias_e_relata_definitivas(monkeypatch):
+    monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    service = crawler_module.WebCrawlerService(static_fast_path=False)
+    service.retry_policy = retry.RetryPolicy({kind: (retries, 0.0, 0.0)
+                                              for kind, (retries, _, _) in retry.RETRY_POLICIES.items()})
+    crawler = FlakyCrawler()
+
+    async def detect(url):
+        return "CSR"
+
+    @contextlib.asynccontextmanager
+    async def browser_session(key, browser_cfg):
+        yield crawler
+
+    monkeypatch.setattr(service.analyzer, "detect_render_type", detect)
+    monkeypatch.setattr(service, "browser_session", browser_session)
+
+    urls = [f"https://docs.exemplo.com/p{i}" for i in range(6)]
+    urls[1] = "https://docs.exemplo.com/instavel"
+    urls[3] = "https://docs.exemplo.com/sumida"
+    events = []
+    success, contents = asyncio.run(service.crawl_selected_pages(
+        [{"url": u, "title": ""} for u in urls], on_progress=events.append
+    ))
+
+    assert success
+    # /instavel só deu certo na retentativa, mas mantém a posição da seleção
+    assert [p["url"] for p in contents] == [u for u in urls if u != urls[3]]
+    assert crawler.calls.count(urls[1]) == 2
+    assert crawler.calls.count(urls[3]) == 1  # 4xx não é retentado
+
+    # Progresso só registra o desfecho final de cada página
+    assert len(events) == len(urls)
+    (failed,) = [e for e in events if e["status"] == "failed"]
+    assert (failed["url"], failed["error"]) == (urls[3], retry.HTTP_4XX)
+    (failure,) = service.last_failures
+    assert (failure["url"], failure["status_code"], failure["attempts"]) == (urls[3], 404, 1)
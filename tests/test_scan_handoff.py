@@ -0,0 +1,96 @@
+"""Testes do handoff scan → crawl (conteúdo renderado no scan reaproveitado)"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+from app.converters.web_engine.analyzer import WebAnalyzer  # noqa: E402
+
+# Config do crawl que o scan recebe (perfil de texto: scan com as mesmas esperas)
+TEXT_CONFIG = WebAnalyzer().get_crawler_config("CSR_REACT")
+
+
+class WordCounter:
+    """Contador simples (1 token por palavra), sem tiktoken"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class FakeCrawler:
+    """AsyncWebCrawler falso que conta renders"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def arun(self, url, config=None, **kwargs):
+        self.calls.append(url)
+        return SimpleNamespace(
+            success=True,
+            html=f"<html><head><title>Título {url}</title></head><body></body></html>",
+            markdown=f"# Página {url}\n\nConteúdo renderado da página com texto suficiente.",
+            error_message=""
+        )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    return crawler_module.WebCrawlerService()
+
+
+def test_pagina_renderada_no_scan_nao_volta_ao_browser(service):
+    crawler = FakeCrawler()
+    url = "https://docs.exemplo.com/guia"
+
+    title = asyncio.run(service._get_page_title(crawler, url, keep_content=True, crawler_config=TEXT_CONFIG))
+    assert title == f"Título {url}"
+    assert service.estimate_cached_tokens(url) is not None
+
+    _, page_title, markdown, tokens = asyncio.run(service.crawl_page_async(crawler, None, url))
+    assert crawler.calls == [url]  # só o render do scan
+    assert page_title == f"Página {url}"
+    assert tokens == len(markdown.split())
+
+
+def test_conteudo_antigo_e_renderado_de_novo(service):
+    crawler = FakeCrawler()
+    url = "https://docs.exemplo.com/api"
+
+    asyncio.run(service._get_page_title(crawler, url, keep_content=True, crawler_config=TEXT_CONFIG))
+    html_md, _ = service._cache[service._normalize_url(url)]
+    service._cache[service._normalize_url(url)] = (html_md, time.time() - 120)
+
+    assert service._is_cached(url)
+    assert not service._is_cached(url, max_age=60)
+
+    asyncio.run(service.crawl_page_async(crawler, None, url, max_age=60))
+    assert crawler.calls == [url, url]
+
+
+def test_scan_sem_keep_content_nao_guarda(service):
+    crawler = FakeCrawler()
+    url = "https://docs.exemplo.com/faq"
+
+    asyncio.run(service._get_page_title(crawler, url, keep_content=False, crawler_config=TEXT_CONFIG))
+    assert service.estimate_cached_tokens(url) is None
+
+
+def test_scan_do_perfil_completo_nao_alimenta_o_crawl(service):
+    # Perfil completo: o scan é o render rápido, sem as esperas de SPA do crawl
+    crawler = FakeCrawler()
+    url = "https://docs.exemplo.com/app"
+    full_config = WebAnalyzer(profiles={"CSR_ANGULAR": "full"}).get_crawler_config("CSR_ANGULAR")
+
+    title = asyncio.run(service._get_page_title(crawler, url, keep_content=True, crawler_config=full_config))
+    assert title == f"Título {url}"
+    assert service.estimate_cached_tokens(url) is None
+
+    asyncio.run(service.crawl_page_async(crawler, full_config, url))
+    assert crawler.calls == [url, url]  # crawl renderiza com a config completa
@@ -0,0 +1,148 @@
+"""Testes do job server (fila SQLite + HTTP) com um converter falso"""
+
+import json
+import time
+import urllib.error
+import urllib.request
+from types import SimpleNamespace
+
+import pytest
+
+from app.converters.web_engine import retry
+from app.server import JobServer
+
+
+class FakeCrawlerService:
+    token_counter = SimpleNamespace(CONTEXT_WINDOWS={})
+
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeConverter:
+    """Páginas com "falha" na URL viram falhas definitivas do crawl"""
+
+    def __init__(self):
+        self.crawler_service = FakeCrawlerService()
+
+    async def scan_pages(self, url):
+        return True, [{"url": f"{url}/a", "title": "A"}, {"url": f"{url}/b", "title": "B"}]
+
+    async def crawl_selected_pages(self, pages, on_page=None, on_progress=None, failures=None):
+        contents = []
+        for done, page in enumerate(pages, 1):
+            if "falha" in page["url"]:
+                failures.append({"url": page["url"], **retry.make_failure(retry.HTTP_4XX, status_code=404)})
+            else:
+                markdown = f"## {page['url']}\n\nConteúdo."
+                contents.append({"url": page["url"], "title": page.get("title") or "Página",
+                                 "markdown": markdown, "tokens": 3})
+                on_page(contents[-1])
+            on_progress({"done": done, "bytes": 0, "cache_hits": 0, "failures": len(failures),
+                         "pages_per_sec": 1.0, "eta_seconds": 0})
+        return True, contents
+
+
+@pytest.fixture
+def server(tmp_path):
+    app = JobServer(port=0, crawl_workers=2, pdf_workers=1, max_queue=3, data_dir=str(tmp_path))
+    app._converter = FakeConverter()
+    app.start()
+    yield app
+    app.stop()
+
+
+_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))  # localhost direto
+
+
+def _request(server, method: str, path: str, payload: dict = None) -> tuple[int, bytes]:
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(f"http://127.0.0.1:{server.port}{path}", data=data, method=method)
+    try:
+        with _opener.open(request, timeout=10) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+def _wait(server, job_id: str) -> dict:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        _, body = _request(server, "GET", f"/jobs/{job_id}")
+        job = json.loads(body)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} não terminou")
+
+
+def test_submit_status_e_resultado(server):
+    status, body = _request(server, "POST", "/jobs", {"type": "web", "url": "https://docs.exemplo.com",
+                                                      "spider": True})
+    assert status == 202
+    job = _wait(server, json.loads(body)["id"])
+
+    assert job["status"] == "done"
+    assert job["progress"]["pages_done"] == 2 and job["progress"]["tokens"] == 6
+    status, markdown = _request(server, "GET", f"/jobs/{job['id']}/result")
+    assert status == 200 and "https://docs.exemplo.com/b" in markdown.decode("utf-8")
+
+    _, listing = _request(server, "GET", "/jobs")
+    assert [j["id"] for j in json.loads(listing)["jobs"]] == [job["id"]]
+
+
+def test_job_sem_conteudo_falha_com_falhas_do_proprio_job(server):
+    _, body = _request(server, "POST", "/jobs", {"type": "web", "url": "https://docs.exemplo.com/falha"})
+    job = _wait(server, json.loads(body)["id"])
+
+    assert job["status"] == "failed"
+    assert job["progress"]["failures_by_kind"] == {retry.HTTP_4XX: 1}
+    status, _ = _request(server, "GET", f"/jobs/{job['id']}/result")
+    assert status == 409
+
+
+def test_validacao_e_rotas_desconhecidas(server):
+    assert _request(server, "POST", "/jobs", {"type": "video"})[0] == 400
+    assert _request(server, "POST", "/jobs", {"type": "web"})[0] == 400
+    assert _request(server, "GET", "/jobs/inexistente")[0] == 404
+    assert _request(server, "GET", "/outra")[0] == 404
+
+
+def test_stop_fecha_o_converter_aquecido(tmp_path):
+    app = JobServer(port=0, crawl_workers=1, pdf_workers=1, data_dir=str(tmp_path))
+    app._converter = FakeConverter()
+    app.start()
+    app.stop()
+    assert app._converter.crawler_service.closed
+
+
+def test_stop_encerra_e_aguarda_a_thread_http(tmp_path):
+    app = JobServer(port=0, crawl_workers=1, pdf_workers=1, data_dir=str(tmp_path))
+    app._converter = FakeConverter()
+    app.start()
+    assert _request(app, "GET", "/jobs")[0] == 200
+    app.stop()
+
+    assert not app._http_thread.is_alive()
+    assert app._httpd.socket.fileno() == -1  # socket fechado depois do serve_forever sair
+
+
+def test_progresso_gravado_com_intervalo_minimo(server):
+    writes = []
+    update = server.store.update
+
+    def counting_update(job_id, **fields):
+        if "progress" in fields:
+            writes.append(dict(fields["progress"]))
+        update(job_id, **fields)
+
+    server.store.update = counting_update
+    pages = [{"url": f"https://docs.exemplo.com/p{i}", "title": ""} for i in range(50)]
+    _, body = _request(server, "POST", "/jobs", {"type": "web", "pages": pages})
+    job = _wait(server, json.loads(body)["id"])
+
+    assert job["progress"]["pages_done"] == 50  # gravação final sempre acontece
+    assert len(writes) <= 4  # não uma por página
@@ -0,0 +1,140 @@
+"""Testes do crawl sharded (particionamento, merge ordenado, processos)"""
+
+import asyncio
+
+import pytest
+
+from app.converters.web_engine.sharding import OrderedMerger, crawl_sharded, partition_pages
+
+
+def make_pages(n, hosts=1):
+    return [{"url": f"https://h{i % hosts}.exemplo.com/p{i}"} for i in range(n)]
+
+
+def page(i, markdown=None):
+    return {"url": f"u{i}", "title": f"P{i}", "markdown": markdown or f"# P{i}", "tokens": 2}
+
+
+def fake_worker(shard, options, events, cancel_event, pause_event):
+    """Worker sem browser: /p3 falha, /p5 repete o conteúdo de /p4"""
+    entries = []
+    for index, selected in reversed(shard):
+        url = selected["url"]
+        if url.endswith("/p3"):
+            events.put(("done", index, url, "failed", 0, None))
+            continue
+        markdown = "# conteúdo repetido" if url.endswith(("/p4", "/p5")) else f"# {url}"
+        events.put(("done", index, url, "ok", 100, {"url": url, "title": url,
+                                                     "markdown": markdown, "tokens": 1}))
+        entries.append((url, "<html></html>", markdown))
+    return entries
+
+
+def cache_worker(shard, options, events, cancel_event, pause_event):
+    """Worker que só usa o cache recebido do pai (título = render_type recebido)"""
+    cached = {url: markdown for url, _, markdown, _ in options["cache"]}
+    for index, selected in shard:
+        url = selected["url"]
+        if url not in cached:
+            events.put(("done", index, url, "failed", 0, None))
+            continue
+        events.put(("done", index, url, "cache", 0, {"url": url, "title": options["render_type"],
+                                                      "markdown": cached[url], "tokens": 1}))
+    return []
+
+
+class FakeService:
+    static_fetcher = None
+
+    def __init__(self, cache=None):
+        self.cache = dict(cache or {})
+
+    def cache_entries(self, urls, max_age=None):
+        return [(url, *self.cache[url], 0.0) for url in urls if url in self.cache]
+
+    def _notify(self, callback, payload):
+        if callback:
+            callback(payload)
+
+    def _save_to_cache(self, url, html, markdown):
+        self.cache[url] = (html, markdown)
+
+
+def test_particao_cobre_tudo_e_e_estavel():
+    pages = make_pages(50)
+    shards = partition_pages(pages, 4, by="url")
+
+    indices = sorted(i for shard in shards for i, _ in shard)
+    assert indices == list(range(50))
+    assert shards == partition_pages(pages, 4, by="url")
+    assert len(shards) > 1
+
+
+def test_particao_por_host_agrupa_o_host():
+    pages = make_pages(40, hosts=8)
+    shards_by_host = {}
+    for n, shard in enumerate(partition_pages(pages, 3)):  # auto → host (8 hosts >= 3 shards)
+        for _, p in shard:
+            shards_by_host.setdefault(p["url"].split("/")[2], set()).add(n)
+
+    assert len(shards_by_host) == 8
+    assert all(len(shards) == 1 for shards in shards_by_host.values())
+
+
+def test_merger_libera_na_ordem_e_deduplica():
+    released = []
+    merger = OrderedMerger(4, on_page=released.append)
+
+    assert merger.add(2, page(2)) == []
+    assert merger.add(0, page(0)) == [page(0)]
+    assert merger.add(1, None) == [page(2)]
+    assert merger.add(3, page(3, markdown="# P0")) == []
+
+    assert [p["url"] for p in released] == ["u0", "u2"]
+    assert merger.duplicates == 1
+
+
+def test_merger_drain_pula_lacunas():
+    merger = OrderedMerger(5)
+    merger.add(3, page(3))
+    merger.add(1, page(1))
+    assert [p["url"] for p in merger.drain()] == ["u1", "u3"]
+
+
+def test_crawl_sharded_em_processos():
+    pages = make_pages(8)
+    service = FakeService()
+    streamed, events = [], []
+
+    ok, contents = asyncio.run(crawl_sharded(service, pages, 3, on_page=streamed.append,
+                                             on_progress=events.append, worker=fake_worker))
+
+    expected = [p["url"] for i, p in enumerate(pages) if i not in (3, 5)]
+    assert ok
+    assert [p["url"] for p in contents] == expected
+    assert streamed == contents
+    assert len(events) == 8 and events[-1]["done"] == 8
+    assert sum(e["status"] == "failed" for e in events) == 1
+    assert set(service.cache) == {p["url"] for i, p in enumerate(pages) if i != 3}
+
+
+def test_shards_recebem_cache_e_render_type_do_pai():
+    pages = make_pages(6)
+    service = FakeService({p["url"]: ("<html></html>", f"# {p['url']}") for p in pages[:4]})
+
+    ok, contents = asyncio.run(crawl_sharded(service, pages, 2, by="url", worker=cache_worker,
+                                             render_type="CSR_REACT"))
+
+    assert ok
+    assert [p["url"] for p in contents] == [p["url"] for p in pages[:4]]  # sem re-render
+    assert {p["title"] for p in contents} == {"CSR_REACT"}
+
+
+def test_host_em_todos_os_shards_divide_a_politeness():
+    from app.converters.web_engine.sharding import host_sharing
+
+    one_host = partition_pages(make_pages(40), 4, by="auto")  # 1 host < 4 shards → url
+    assert host_sharing(one_host) == {"h0.exemplo.com": len(one_host)}
+
+    by_host = partition_pages(make_pages(40, hosts=8), 4, by="host")
+    assert set(host_sharing(by_host).values()) == {1}
@@ -0,0 +1,35 @@
+"""Testes de inicialização: a GUI abre sem carregar dependências pesadas"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+HEAVY_MODULES = ("crawl4ai", "playwright", "pymupdf4llm", "tiktoken", "bs4")
+
+
+def test_importar_a_janela_nao_carrega_dependencias_pesadas():
+    code = (
+        "import sys, app.gui.main_window\n"
+        f"print('HEAVY=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    # stdout também recebe o console do logger do motor
+    assert "HEAVY=\n" in result.stdout
+
+
+def test_preload_desligado_por_variavel(monkeypatch):
+    from app.utils.preload import preload_in_background
+
+    monkeypatch.setenv("LCB_PRELOAD", "0")
+    assert preload_in_background(("json",)) is None
+
+    monkeypatch.delenv("LCB_PRELOAD")
+    thread = preload_in_background(("json",))
+    thread.join(5)
+    assert not thread.is_alive()
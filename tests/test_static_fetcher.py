@@ -0,0 +1,124 @@
+"""Testes do fast path SSR (HTTP puro, sem browser)"""
+
+import asyncio
+import contextlib
+from types import SimpleNamespace
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+from app.converters.web_engine.static_fetcher import StaticFetcher
+
+PARAGRAFO = "Este parágrafo tem texto suficiente para passar do mínimo do fast path. " * 2
+
+PAGES = {
+    "/guia": f"<html><head><title>Guia</title></head><body><nav>Menu lateral</nav>"
+             f"<main><h1>Guia</h1><p>{PARAGRAFO}<a href='/api'>API</a></p></main></body></html>",
+    "/api": f"<html><head><title>API</title></head><body><article><h2>API</h2>"
+            f"<p>{PARAGRAFO}</p></article><footer>Rodapé</footer></body></html>",
+    "/spa": "<html><head><title>SPA</title></head><body><div id='root'></div></body></html>",
+}
+
+
+def handler(request):
+    path = request.url.path
+    if path == "/dados.json":
+        return httpx.Response(200, json={"ok": True})
+    if path not in PAGES:
+        return httpx.Response(404, text="não encontrado")
+    return httpx.Response(200, text=PAGES[path], headers={"content-type": "text/html; charset=utf-8"})
+
+
+def make_fetcher():
+    return StaticFetcher(crawler_module.WebCrawlerService.CONTENT_SELECTOR,
+                         transport=httpx.MockTransport(handler))
+
+
+class WordCounter:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+class FakeCrawler:
+    def __init__(self):
+        self.calls = []
+
+    async def arun(self, url, config=None, **kwargs):
+        self.calls.append(url)
+        return SimpleNamespace(success=True, html="<html></html>",
+                               markdown=f"# Renderada\n\n{url} via browser", error_message="")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    service = crawler_module.WebCrawlerService()
+    service.static_fetcher = make_fetcher()
+
+    async def detect(url):
+        return "SSR"
+    monkeypatch.setattr(service.analyzer, "detect_render_type", detect)
+
+    service.fake_crawler = FakeCrawler()
+    service.sessions = 0
+
+    @contextlib.asynccontextmanager
+    async def fake_session(key, cfg):
+        service.sessions += 1
+        yield service.fake_crawler
+    monkeypatch.setattr(service, "browser_session", fake_session)
+    return service
+
+
+def test_fetch_aplica_seletor_de_conteudo():
+    async def run():
+        fetcher = make_fetcher()
+        try:
+            return await fetcher.fetch("https://docs.exemplo.com/guia")
+        finally:
+            await fetcher.close()
+
+    html, markdown = asyncio.run(run())
+    assert "<nav>" in html
+    assert markdown.startswith("# Guia")
+    assert "[API](https://docs.exemplo.com/api)" in markdown
+    assert "Menu lateral" not in markdown
+
+
+@pytest.mark.parametrize("path", ["/spa", "/inexistente", "/dados.json"])
+def test_fetch_recusa_paginas_que_precisam_do_browser(path):
+    async def run():
+        fetcher = make_fetcher()
+        try:
+            return await fetcher.fetch(f"https://docs.exemplo.com{path}")
+        finally:
+            await fetcher.close()
+
+    assert asyncio.run(run()) is None
+
+
+def test_crawl_ssr_nao_abre_browser(service):
+    pages = [{"url": "https://docs.exemplo.com/guia"}, {"url": "https://docs.exemplo.com/api"}]
+    events = []
+
+    ok, contents = asyncio.run(service.crawl_selected_pages(pages, on_progress=events.append))
+
+    assert ok
+    assert [p["title"] for p in contents] == ["Guia", "API"]
+    assert service.sessions == 0
+    assert [e["status"] for e in events] == ["ok", "ok"]
+
+
+def test_crawl_ssr_cai_para_o_browser(service):
+    pages = [{"url": "https://docs.exemplo.com/guia"}, {"url": "https://docs.exemplo.com/spa"}]
+
+    ok, contents = asyncio.run(service.crawl_selected_pages(pages))
+
+    assert ok
+    assert service.sessions == 1
+    assert service.fake_crawler.calls == ["https://docs.exemplo.com/spa"]
+    assert [p["title"] for p in contents] == ["Guia", "Renderada"]
@@ -0,0 +1,153 @@
+"""Testes da telemetria JSON Lines (páginas, etapas e resumo do job)"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import telemetry
+
+
+class ListWriter:
+    """Destino em memória no lugar de logs/telemetry.jsonl"""
+
+    def __init__(self):
+        self.records = []
+
+    def write(self, record: dict):
+        self.records.append(record)
+
+    def of_type(self, kind: str) -> list[dict]:
+        return [r for r in self.records if r["type"] == kind]
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert telemetry.percentile(values, 50) == 50.0
+    assert telemetry.percentile(values, 95) == 95.0
+    assert telemetry.percentile([3.0], 95) == 3.0
+    assert telemetry.percentile([], 50) is None
+
+
+def test_sem_job_tudo_e_no_op():
+    with telemetry.page("https://exemplo.com") as trace:
+        with telemetry.stage("render"):
+            telemetry.annotate(cache="hit")
+            telemetry.count_retry()
+    assert trace is None
+    assert telemetry.current_job() is None
+
+
+def test_job_grava_paginas_e_resumo():
+    writer = ListWriter()
+    with telemetry.job("crawl", writer=writer, pages_selected=3) as job:
+        for i in range(3):
+            with telemetry.page(f"https://exemplo.com/{i}", render_type="SSR"):
+                telemetry.add_timings({"render": 0.01 * (i + 1), "clean": 0.001})
+                telemetry.annotate(cache="miss" if i else "hit", bytes_in=100, bytes_out=40)
+        with telemetry.page("https://exemplo.com/extra", counted=False):
+            telemetry.count_retry()
+
+    pages = writer.of_type("page")
+    assert [p["url"] for p in pages][:3] == [f"https://exemplo.com/{i}" for i in range(3)]
+    assert pages[0]["stages"] == {"render": 10.0, "clean": 1.0}
+    assert all(p["job"] == job.job_id and p["status"] == "ok" for p in pages)
+
+    (summary,) = writer.of_type("summary")
+    assert summary["status"] == "ok"
+    assert summary["pages_selected"] == 3
+    assert summary["pages"] == 3  # a página auxiliar não conta
+    assert (summary["cache_hits"], summary["cache_misses"]) == (1, 2)
+    assert (summary["bytes_in"], summary["bytes_out"]) == (300, 120)
+    assert summary["retries"] == 0
+    assert summary["stages"]["render"]["count"] == 3
+    assert summary["stages"]["render"]["p50_ms"] == 20.0
+    assert summary["stages"]["render"]["p95_ms"] == 30.0
+    assert summary["pages_per_sec"] > 0
+
+
+def test_jobs_aninhados_somam_no_externo_e_erro_marca_status():
+    writer = ListWriter()
+    with pytest.raises(RuntimeError):
+        with telemetry.job("scan", writer=writer) as outer:
+            with telemetry.job("crawl") as inner:
+                assert inner is outer
+                with telemetry.page("https://exemplo.com"):
+                    raise RuntimeError("falhou")
+
+    (page,) = writer.of_type("page")
+    assert page["status"] == "failed"
+    (summary,) = writer.of_type("summary")
+    assert (summary["kind"], summary["status"], summary["failures"]) == ("scan", "error", 1)
+
+
+def test_paginas_concorrentes_tem_traces_isoladas():
+    writer = ListWriter()
+
+    async def crawl(url: str, delay: float):
+        with telemetry.page(url):
+            with telemetry.stage("render"):
+                await asyncio.sleep(delay)
+            telemetry.annotate(delay=delay)
+
+    async def run():
+        with telemetry.job("crawl", writer=writer):
+            await asyncio.gather(crawl("a", 0.05), crawl("b", 0.0))
+
+    asyncio.run(run())
+    by_url = {p["url"]: p for p in writer.of_type("page")}
+    assert by_url["a"]["delay"] == 0.05 and by_url["b"]["delay"] == 0.0
+    assert by_url["a"]["stages"]["render"] > by_url["b"]["stages"]["render"]
+
+
+def test_crawl_de_pagina_registra_etapas(monkeypatch):
+    crawler_module = pytest.importorskip("app.converters.web_engine.crawler")
+
+    class WordCounter:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def count_tokens(self, text: str) -> int:
+            return len(text.split())
+
+    class FakeCrawler:
+        async def arun(self, url, config=None, **kwargs):
+            return SimpleNamespace(success=True, html="<html><body>x</body></html>",
+                                   markdown="# Guia\n\nConteúdo da página com texto suficiente.",
+                                   error_message="")
+
+    monkeypatch.setattr(crawler_module, "TokenCounter", WordCounter)
+    service = crawler_module.WebCrawlerService(static_fast_path=False)
+    writer = ListWriter()
+    url = "https://docs.exemplo.com/guia"
+
+    async def run():
+        with telemetry.job("crawl", writer=writer):
+            first = await service._crawl_page(FakeCrawler(), None, url, render_type="CSR")
+            await service._crawl_page(FakeCrawler(), None, url, render_type="CSR")
+        return first
+
+    page = asyncio.run(run())
+    assert "timings" not in page
+
+    miss, hit = writer.of_type("page")
+    assert miss["cache"] == "miss" and hit["cache"] == "hit"
+    assert miss["render_type"] == "CSR"
+    assert {"cache_lookup", "render", "clean", "dedup", "tokens"} <= set(miss["stages"])
+    assert "render" not in hit["stages"]
+    (summary,) = writer.of_type("summary")
+    assert (summary["pages"], summary["cache_hits"], summary["cache_misses"]) == (2, 1, 1)
+
+
+def test_jsonl_rotaciona_ao_passar_do_limite(tmp_path):
+    path = tmp_path / "telemetry.jsonl"
+    writer = telemetry._JsonlWriter(path, max_bytes=200, backup_count=2)
+    for i in range(20):
+        writer.write({"type": "page", "n": i, "pad": "x" * 40})
+    writer.close()
+
+    assert path.stat().st_size <= 200
+    assert (tmp_path / "telemetry.jsonl.1").exists() and (tmp_path / "telemetry.jsonl.2").exists()
+    assert not (tmp_path / "telemetry.jsonl.3").exists()
+    last = path.read_text(encoding="utf-8").splitlines()[-1]
+    assert '"n": 19' in last
@@ -0,0 +1,155 @@
+"""Testes do update incremental (revalidação condicional, patch do manifesto e changelog)"""
+
+import json
+import asyncio
+
+import httpx
+
+from app.converters.web_engine import retry, updater
+from app.converters.web_engine.page_store import PageStore, load_manifest, manifest_path_for
+from app.converters.web_engine.postprocess import content_hash
+from app.converters.web_engine.writer import ConsolidatedWriter
+
+SEED = "https://docs.exemplo.com"
+
+
+def make_page(name: str, text: str = None, **validators) -> dict:
+    markdown = text or f"## {name}\n\nConteúdo de {name}."
+    return {"url": f"{SEED}/{name}", "title": name, "markdown": markdown,
+            "tokens": len(markdown.split()), "hash": content_hash(markdown), **validators}
+
+
+class FakeService:
+    """Site atual: discovery devolve `links` e o crawl renderiza de `site`"""
+
+    token_counter = None
+
+    def __init__(self, links: list[str], site: dict[str, str], failing: dict[str, dict] = None):
+        self.links = links
+        self.site = site
+        self.failing = failing or {}
+        self.rendered = []
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        return url.rstrip("/")
+
+    async def discover_links(self, seed_url: str):
+        return self.links
+
+    async def crawl_selected_pages(self, pages, on_page=None, on_progress=None,
+                                   cancel_token=None, max_age=None, failures=None):
+        assert max_age == 0
+        self.rendered = [p["url"] for p in pages]
+        failures.extend({"url": p["url"], **self.failing[p["url"]]}
+                        for p in pages if p["url"] in self.failing)
+        contents = []
+        for p in pages:
+            if p["url"] in self.site:
+                name = p["url"].rsplit("/", 1)[-1]
+                contents.append(make_page(name, self.site[p["url"]]))
+        return True, contents
+
+
+def test_revalidacao_condicional():
+    seen = {}
+
+    def handler(request):
+        seen[request.url.path] = dict(request.headers)
+        return {
+            "/a": httpx.Response(304),
+            "/b": httpx.Response(200, headers={"ETag": '"v2"'}, text="novo"),
+            "/c": httpx.Response(200, headers={"ETag": '"v1"'}, text="igual"),  # ignora o condicional
+            "/d": httpx.Response(404),
+        }[request.url.path]
+
+    entries = [{"url": f"{SEED}/{name}", "etag": '"v1"'} for name in "abcd"]
+    entries.append({"url": f"{SEED}/e"})  # sem validador: nem consulta
+    outcomes = asyncio.run(updater.revalidate(entries, transport=httpx.MockTransport(handler)))
+
+    assert {url.rsplit("/", 1)[-1]: outcome for url, (outcome, _) in outcomes.items()} == {
+        "a": updater.NOT_MODIFIED, "b": updater.MODIFIED, "c": updater.NOT_MODIFIED,
+        "d": updater.GONE, "e": updater.UNKNOWN}
+    assert seen["/a"]["if-none-match"] == '"v1"'
+    assert "/e" not in seen
+    assert outcomes[f"{SEED}/b"][1] == {"etag": '"v2"'}
+
+
+def test_update_aplica_apenas_as_mudancas(tmp_path):
+    store = PageStore(tmp_path / "store")
+    output = tmp_path / "docs.md"
+    old = [make_page("a", etag='"a1"'), make_page("b", etag='"b1"'), make_page("c"),
+           make_page("d", etag='"d1"'), make_page("e")]
+    ConsolidatedWriter(store=store).write(old, str(output), source={"seed": SEED})
+    manifest_p = manifest_path_for(output)
+
+    def handler(request):
+        return {"/a": httpx.Response(304),
+                "/b": httpx.Response(200, headers={"ETag": '"b2"'}),
+                "/d": httpx.Response(304)}[request.url.path]
+
+    # b mudou, c (sem validador) não mudou, e falha transitória, d saiu do
+    # site e f é nova
+    links = [f"{SEED}/{name}" for name in "abcef"]
+    service = FakeService(links, site={f"{SEED}/b": "## b\n\nVersão nova de b.",
+                                       f"{SEED}/c": old[2]["markdown"],
+                                       f"{SEED}/f": "## f\n\nPágina nova."},
+                          failing={f"{SEED}/e": retry.make_failure(retry.TIMEOUT, "Timeout")})
+    upd = updater.IncrementalUpdater(service, store, transport=httpx.MockTransport(handler))
+    success, changelog = asyncio.run(upd.update(str(manifest_p)))
+
+    assert success
+    assert sorted(service.rendered) == [f"{SEED}/{name}" for name in "bcef"]  # a não re-renderiza
+    assert changelog["added"] == [f"{SEED}/f"]
+    assert changelog["removed"] == [f"{SEED}/d"]
+    assert changelog["changed"] == [f"{SEED}/b"]
+    assert changelog["unchanged"] == 2
+    assert changelog["failed"] == [{"url": f"{SEED}/e", "kind": retry.TIMEOUT}]
+
+    manifest = load_manifest(manifest_p)
+    assert [e["url"].rsplit("/", 1)[-1] for e in manifest["pages"]] == ["a", "b", "c", "e", "f"]
+    assert manifest["pages"][3]["hash"] == old[4]["hash"]  # falha mantém a versão anterior
+    assert manifest["source"] == {"seed": SEED}
+
+    text = output.read_text(encoding="utf-8")
+    assert "Versão nova de b." in text and "Página nova." in text
+    assert "Conteúdo de d." not in text and "Conteúdo de e." in text
+
+    log = updater.changelog_path_for(manifest_p).read_text(encoding="utf-8").splitlines()
+    assert len(log) == 1 and json.loads(log[0])["changed"] == [f"{SEED}/b"]
+
+
+def test_update_sem_mudancas_nao_renderiza(tmp_path):
+    store = PageStore(tmp_path / "store")
+    output = tmp_path / "docs.md"
+    ConsolidatedWriter(store=store).write([make_page("a", lastmod="Mon, 05 Oct 2026 10:00:00 GMT")],
+                                          str(output))
+
+    service = FakeService([], site={})
+    upd = updater.IncrementalUpdater(service, store,
+                                     transport=httpx.MockTransport(lambda request: httpx.Response(304)))
+    success, changelog = asyncio.run(upd.update(str(manifest_path_for(output))))
+
+    assert success and service.rendered == []
+    assert changelog["unchanged"] == 1 and changelog["rendered"] == 0
+    assert not changelog["added"] and not changelog["removed"] and not changelog["changed"]
+
+
+def test_spa_com_validadores_do_shell_sempre_re_renderiza():
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(304)
+
+    entries = [
+        {"url": f"{SEED}/shell", "etag": '"s1"', "render_type": "CSR_REACT", "validators_from": "render"},
+        {"url": f"{SEED}/estatica", "etag": '"e1"', "render_type": "CSR_ANGULAR", "validators_from": "static"},
+        {"url": f"{SEED}/ssr", "etag": '"r1"', "render_type": "SSR", "validators_from": "render"},
+    ]
+    outcomes = asyncio.run(updater.revalidate(entries, transport=httpx.MockTransport(handler)))
+
+    assert outcomes[f"{SEED}/shell"][0] == updater.UNKNOWN  # shell igual não diz nada do conteúdo
+    assert outcomes[f"{SEED}/estatica"][0] == updater.NOT_MODIFIED
+    assert outcomes[f"{SEED}/ssr"][0] == updater.NOT_MODIFIED
+    assert sorted(seen) == ["/estatica", "/ssr"]
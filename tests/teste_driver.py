@@ -1,18 +1,20 @@
 import asyncio
-import logging
-from converter_web import WebToMarkdownConverter
+import sys
+from pathlib import Path
 
-# Configura logger para ver no console
-logging.basicConfig(level=logging.INFO)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-async def main():
+from app.converters.web_converter import WebToMarkdownConverter
+from benchmarks.fixture_server import FixtureServer
+
+
+async def main(seed_url: str):
     print("--- INICIANDO TESTE ISOLADO ---")
     converter = WebToMarkdownConverter()
-    url = "https://antigravity.google/docs/get-started"
 
-    print(f"Tentando Scan em: {url}")
-    # Isso vai testar se a importação global resolveu o travamento
-    success, pages = await converter.scan_pages(url)
+    print(f"Tentando Scan em: {seed_url}")
+    # Scan completo com browser real (detecção + links + títulos)
+    success, pages = await converter.scan_pages(seed_url)
 
     if success:
         print(f"SUCESSO! Encontradas {len(pages)} páginas.")
@@ -22,4 +24,9 @@ async def main():
         print("FALHA no Scan (mas pelo menos não travou silenciosamente).")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Site Angular sintético local (ver benchmarks/fixture_server.py); ou passe uma URL
+    if len(sys.argv) > 1:
+        asyncio.run(main(sys.argv[1]))
+    else:
+        with FixtureServer(pages=10) as server:
+            asyncio.run(main(server.seed_url("angular")))